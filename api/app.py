@@ -6,7 +6,7 @@ load_dotenv()
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse
 from pathlib import Path
 from .routers import charts as charts_router
 
@@ -24,9 +24,14 @@ from .routers import yearly_forecast_report as yearly_report_router
 from .routers import monthly as monthly_router
 from .routers import panchang as panchang_router
 from .jobs.render_report import ensure_worker_started
+from .jobs import render_pool
+from .services import cpu_executor, metrics, response_cache, single_flight
+from .services.panchang_cache import get_cache as get_panchang_cache
 from .middleware.auth import APIKeyMiddleware
 from .middleware.ratelimit import RateLimitMiddleware
 from .middleware.logging import LoggingMiddleware
+from .middleware.metrics import MetricsMiddleware
+from .middleware.profiling import ProfilingMiddleware
 
 
 
@@ -66,9 +71,12 @@ else:
         max_age=86400,
     )
 
-app.add_middleware(APIKeyMiddleware)
+app.add_middleware(ProfilingMiddleware)
+# Added before APIKeyMiddleware so it runs inside it, after the key is validated.
 app.add_middleware(RateLimitMiddleware)
+app.add_middleware(APIKeyMiddleware)
 app.add_middleware(LoggingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(charts_router.router)
 
@@ -96,10 +104,61 @@ def _start_worker() -> None:
     ensure_worker_started()
 
 
+@app.on_event("startup")
+def _warm_cpu_executor() -> None:
+    if cpu_executor.warm_enabled():
+        cpu_executor.get_executor().warm()
+
+
+@app.on_event("shutdown")
+def _stop_cpu_executor() -> None:
+    cpu_executor.get_executor().shutdown()
+
+
 
 @app.get("/__health")
 def health():
-    return {"ok": True}
+    return {
+        "ok": True,
+        "cpu_executor": cpu_executor.get_executor().stats(),
+        "render_pool": render_pool.get_pool().stats(),
+        "response_cache": response_cache.get_response_cache().stats(),
+        "single_flight": single_flight.stats(),
+    }
+
+
+_POOL_QUEUE_DEPTH = metrics.gauge("wh_pool_queue_depth", "Tasks waiting for a pool worker.", ("pool",))
+_POOL_IN_FLIGHT = metrics.gauge("wh_pool_in_flight", "Tasks running on pool workers.", ("pool",))
+_CACHE_HITS = metrics.counter("wh_cache_hits_total", "Cache hits.", ("cache",))
+_CACHE_MISSES = metrics.counter("wh_cache_misses_total", "Cache misses.", ("cache",))
+_CACHE_HIT_RATIO = metrics.gauge("wh_cache_hit_ratio", "Share of lookups served from cache.", ("cache",))
+_COALESCED = metrics.counter(
+    "wh_single_flight_coalesced_total", "Calls that waited on an identical in-flight call.", ("group",)
+)
+
+
+def _collect_runtime():
+    cpu = cpu_executor.get_executor().stats()
+    yield _POOL_QUEUE_DEPTH, {"pool": "cpu_executor"}, cpu["queue_depth"]
+    yield _POOL_IN_FLIGHT, {"pool": "cpu_executor"}, cpu["in_flight"]
+    renders = render_pool.get_pool().stats()
+    yield _POOL_QUEUE_DEPTH, {"pool": "render"}, renders["queue"]["depth"]
+    yield _POOL_IN_FLIGHT, {"pool": "render"}, renders["in_flight"]
+    for name, cache in (("response", response_cache.get_response_cache()), ("panchang", get_panchang_cache())):
+        lookups = cache.hits + cache.misses
+        yield _CACHE_HITS, {"cache": name}, cache.hits
+        yield _CACHE_MISSES, {"cache": name}, cache.misses
+        yield _CACHE_HIT_RATIO, {"cache": name}, cache.hits / lookups if lookups else 0.0
+    for name, counts in single_flight.stats().items():
+        yield _COALESCED, {"group": name}, counts["coalesced"]
+
+
+metrics.register_collector(_collect_runtime)
+
+
+@app.get("/__metrics")
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 
 # Dev assets static serve (for quick PDF/SVG previews saved under data/dev-assets)
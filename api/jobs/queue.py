@@ -1,9 +1,11 @@
 from ..services.job_store import STORE
-from ..services.inproc_queue import Q
+from .render_pool import get_pool
 
 
 def enqueue_report_job(payload: dict) -> str:
     idk = payload.pop("idempotency_key", None)
+    pool = get_pool()
+    pool.check_capacity()
     rid = STORE.create(payload=payload, idempotency_key=idk)
-    Q.put(rid)
+    pool.submit(rid, payload.get("product", ""))
     return rid
@@ -0,0 +1,391 @@
+"""Worker pool that renders queued report jobs.
+
+Report ids travel through a :mod:`~api.services.job_queue` queue with a
+priority per product (natal-sized products ahead of yearly forecasts). A
+dispatcher thread receives at most ``workers`` of them at a time and hands them
+to a spawn-context ``ProcessPoolExecutor``, so rendering neither holds the API
+process's GIL nor lets one slow yearly PDF block the natal PDFs queued behind
+it. The pool runs inside the API (``RENDER_POOL_EMBEDDED``) or as a standalone
+worker fleet (``python -m api.jobs.render_report``) against a shared SQLite or
+SQS queue. A message is deleted once its job is done or failed; a worker that
+dies mid-render leaves it to reappear after the visibility timeout, and a job
+delivered more than ``max_receives`` times goes to the dead-letter queue. While
+a render runs, a heartbeat thread extends its message's visibility timeout (and
+the job's ``updated_at``), so a render longer than the timeout is not delivered
+and rendered a second time.
+
+Admission is bounded: once ``max_queue`` jobs are waiting, ``submit`` (and
+the advisory ``check_capacity``) raise :class:`QueueFull` with a Retry-After
+estimate from recent render times. Queue wait and render time of every job are written to
+the ``JobStore``.
+
+``RENDER_POOL_MODE`` (``process`` or ``thread``) picks the executor; it
+defaults to threads of the API process in development, where the Panchang and
+chart caches stay warm between jobs.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Deque, Dict, Optional
+
+from ..services import metrics
+from ..services.job_queue import InProcessQueue, JobQueue, Message, get_queue
+from ..services.job_store import STORE, JobStore
+from . import render_report
+
+logger = logging.getLogger(__name__)
+
+# Lower renders first; products not listed use DEFAULT_PRIORITY.
+PRODUCT_PRIORITY: Dict[str, int] = {
+    "western_natal_pdf": 0,
+    "advanced_natal_pdf": 0,
+    "vedic_natal_pdf": 0,
+    "full_natal_pdf": 0,
+    "remedies_pdf": 0,
+    "spiritual_mission_pdf": 0,
+    "compatibility_pdf": 1,
+    "transit_forecast_pdf": 1,
+    "monthly_horoscope_pdf": 1,
+    "full_monthly_pdf": 1,
+    "yearly_forecast_pdf": 2,
+    "full_yearly_pdf": 2,
+}
+DEFAULT_PRIORITY = 1
+# Retry-After guess per queued job before any render has been timed.
+_DEFAULT_RENDER_SECONDS = 2.0
+_TIMING_SAMPLES = 64
+# Longest a dispatcher blocks in one receive; bounds how long shutdown waits.
+_RECEIVE_WAIT_SECONDS = 5.0
+
+
+def _workers() -> int:
+    default = min(4, max(1, os.cpu_count() or 1))
+    return max(1, int(os.getenv("RENDER_WORKERS", str(default))))
+
+
+def _max_queue() -> int:
+    return max(1, int(os.getenv("RENDER_MAX_QUEUE", "64")))
+
+
+def _mode() -> str:
+    # Development and CI render in threads (no spawn cost per test run); any
+    # other APP_ENV, e.g. the Docker images' "production", gets processes.
+    app_env = (os.getenv("APP_ENV") or "dev").lower()
+    default = "thread" if app_env in {"dev", "development"} else "process"
+    return os.getenv("RENDER_POOL_MODE", default).lower()
+
+
+def embedded_enabled() -> bool:
+    return os.getenv("RENDER_POOL_EMBEDDED", "true").lower() == "true"
+
+
+def _warm_enabled() -> bool:
+    return os.getenv("RENDER_POOL_WARM", "true").lower() == "true"
+
+
+def priority_for(product: str) -> int:
+    return PRODUCT_PRIORITY.get(product, DEFAULT_PRIORITY)
+
+
+class QueueFull(Exception):
+    """Raised when the render queue is at its maximum depth."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"render queue full; retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class RenderPool:
+    """Bounded worker pool consuming report ids from a job queue."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        mode: Optional[str] = None,
+        store: JobStore = STORE,
+        queue: Optional[JobQueue] = None,
+    ) -> None:
+        self.workers = workers or _workers()
+        self.max_queue = max_queue or _max_queue()
+        self.mode = mode or _mode()
+        self.store = store
+        self.queue = queue if queue is not None else InProcessQueue()
+        self._cond = threading.Condition()
+        self._admit = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._timings: Dict[str, Deque[float]] = {}
+        self._executor: Optional[Executor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._heartbeat: Optional[threading.Thread] = None
+        self._leases: Dict[str, Message] = {}
+        self._halt = threading.Event()
+        self._stopping = False
+
+    # Executor ------------------------------------------------------------
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "thread":
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="render"
+                )
+            else:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=render_report.warm_worker,
+                )
+        return self._executor
+
+    def start(self) -> None:
+        """Start the dispatcher thread (and warm the workers) if not running."""
+
+        with self._cond:
+            self._stopping = False
+            self._halt.clear()
+            if self._dispatcher and self._dispatcher.is_alive():
+                return
+            executor = self._get_executor()
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_loop, name="render-dispatcher", daemon=True
+            )
+            self._dispatcher.start()
+            if not (self._heartbeat and self._heartbeat.is_alive()):
+                self._heartbeat = threading.Thread(
+                    target=self._heartbeat_loop, name="render-heartbeat", daemon=True
+                )
+                self._heartbeat.start()
+        if self.mode != "thread" and _warm_enabled():
+            for _ in range(self.workers):
+                executor.submit(os.getpid)
+
+    # Admission -------------------------------------------------------------
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog should have drained."""
+
+        return self._retry_after(self.queue.depth())
+
+    def _retry_after(self, depth: int) -> int:
+        with self._cond:
+            samples = [ms for lane in self._timings.values() for ms in lane]
+            backlog = depth + self._in_flight
+        per_job = (sum(samples) / len(samples) / 1000.0) if samples else _DEFAULT_RENDER_SECONDS
+        return max(1, math.ceil(backlog * per_job / self.workers))
+
+    def check_capacity(self) -> None:
+        """Raise :class:`QueueFull` when no more jobs may be queued.
+
+        Advisory, so callers can refuse before creating a job; ``submit``
+        enforces the bound itself.
+        """
+
+        depth = self.queue.depth()
+        if depth >= self.max_queue:
+            raise QueueFull(self._retry_after(depth))
+
+    def submit(self, rid: str, product: str) -> bool:
+        """Send ``rid`` to the queue with its product's priority.
+
+        Returns ``False`` when the job was queued before (an idempotent
+        resubmission) or is already rendering or finished, ``True`` otherwise.
+        Raises :class:`QueueFull` when ``max_queue`` jobs are waiting; the
+        depth check and the send happen under one lock, so concurrent
+        submissions cannot overshoot the bound. The job then stays queued
+        but unsent, and resubmitting it retries the send.
+        """
+
+        with self._admit:
+            job = self.store.get(rid)
+            if job is None or job["status"] != "queued" or job.get("enqueued_at"):
+                return False
+            self.check_capacity()
+            self.store.update(rid, enqueued_at=time.time())
+            self.queue.send(rid, priority_for(product))
+        return True
+
+    # Dispatch --------------------------------------------------------------
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopping and self._in_flight >= self.workers:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                free = self.workers - self._in_flight
+            try:
+                messages = self.queue.receive(max_messages=free, wait_seconds=_RECEIVE_WAIT_SECONDS)
+            except Exception:
+                logger.exception("render_pool_receive_failed")
+                time.sleep(1.0)
+                continue
+            for message in messages:
+                if self._stopping:
+                    self.queue.release(message)
+                else:
+                    self._accept(message)
+
+    def _accept(self, message: Message) -> None:
+        rid = message.body
+        job = self.store.get(rid)
+        # Duplicates of a job that is rendering elsewhere arrive on their first
+        # receive; a redelivery (receive_count > 1) means that render died.
+        if (
+            job is None
+            or job["status"] in ("done", "error")
+            or (job["status"] == "processing" and message.receive_count == 1)
+        ):
+            self.queue.delete(message)
+            return
+        if message.receive_count > self.queue.max_receives:
+            self.queue.dead_letter(message)
+            self.store.update(rid, status="error", error="RENDER_ABANDONED", finished_at=time.time())
+            with self._cond:
+                self._failed += 1
+            return
+        with self._cond:
+            self._in_flight += 1
+            self._leases[rid] = message
+        self._dispatch(rid, job, message)
+
+    def _dispatch(self, rid: str, job: Dict[str, Any], message: Message) -> None:
+        payload = job.get("payload") or {}
+        started_at = time.time()
+        self.store.update(
+            rid,
+            status="processing",
+            started_at=started_at,
+            queue_ms=round((started_at - job.get("created_at", started_at)) * 1000.0, 1),
+        )
+        try:
+            future = self._get_executor().submit(render_report.render_job, rid, payload)
+        except Exception as exc:  # pool shut down or broken while idle
+            self._reset_executor()
+            future = Future()
+            future.set_exception(exc)
+        future.add_done_callback(
+            lambda fut: self._finished(rid, payload.get("product", ""), started_at, message, fut)
+        )
+
+    def _finished(
+        self, rid: str, product: str, started_at: float, message: Message, future: Future
+    ) -> None:
+        with self._cond:
+            self._leases.pop(rid, None)
+        finished_at = time.time()
+        total_ms = round((finished_at - started_at) * 1000.0, 1)
+        exc = CancelledError() if future.cancelled() else future.exception()
+        if exc is None:
+            result = future.result()
+            self.store.update(
+                rid,
+                status="done",
+                file_path=result["file_path"],
+                finished_at=finished_at,
+                render_ms=result["render_ms"],
+                run_ms=total_ms,
+                worker_pid=result["worker_pid"],
+            )
+            self.queue.delete(message)
+            metrics.STAGE_LATENCY.observe(result["render_ms"] / 1000.0, stage=f"render:{product}")
+        elif isinstance(exc, (BrokenProcessPool, CancelledError)):
+            # The worker died or the pool shut down: let another attempt (or
+            # another worker) pick the job up; repeated deaths dead-letter it.
+            if isinstance(exc, BrokenProcessPool):
+                self._reset_executor()
+            self.store.update(rid, status="queued")
+            self.queue.release(message)
+        else:
+            logger.error(
+                "render_job_failed", exc_info=exc, extra={"rid": rid, "product": product}
+            )
+            self.store.update(
+                rid,
+                status="error",
+                error="RENDER_FAILED",
+                finished_at=finished_at,
+                run_ms=total_ms,
+            )
+            self.queue.delete(message)
+        with self._cond:
+            self._in_flight -= 1
+            if exc is None:
+                self._completed += 1
+                self._timings.setdefault(product, deque(maxlen=_TIMING_SAMPLES)).append(total_ms)
+            else:
+                self._failed += 1
+            self._cond.notify()
+
+    def _heartbeat_loop(self) -> None:
+        interval = max(0.01, self.queue.visibility_timeout / 3.0)
+        while not self._halt.wait(interval):
+            with self._cond:
+                leases = list(self._leases.items())
+            now = time.time()
+            for rid, message in leases:
+                try:
+                    self.queue.extend(message)
+                    self.store.update(rid, updated_at=now)
+                except Exception:
+                    logger.exception("render_pool_heartbeat_failed", extra={"rid": rid})
+
+    def _reset_executor(self) -> None:
+        # A worker that died takes the whole ProcessPoolExecutor with it.
+        with self._cond:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # Introspection ---------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        queue = self.queue.stats()
+        with self._cond:
+            stats = {
+                "mode": self.mode,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queue": queue,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "failed": self._failed,
+            }
+        stats["retry_after"] = self._retry_after(queue["depth"])
+        return stats
+
+    def shutdown(self) -> None:
+        """Stop dispatching; queued jobs stay queued until a pool starts again."""
+
+        with self._cond:
+            self._stopping = True
+            self._halt.set()
+            self._cond.notify_all()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_POOL: Optional[RenderPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool() -> RenderPool:
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = RenderPool(queue=get_queue())
+    return _POOL
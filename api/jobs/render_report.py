@@ -1,12 +1,11 @@
-"""Background worker that renders PDF reports in-process."""
+"""Render PDF reports; jobs are dispatched by :mod:`api.jobs.render_pool`."""
 
-import threading
-import traceback
+import logging
+import os
+import time
 from pathlib import Path
 from typing import Dict, Any
 
-from ..services.inproc_queue import Q
-from ..services.job_store import STORE
 from ..services.pdf_renderer import render_western_natal_pdf, render_viewmodel_pdf
 from ..services.forecast_reports import (
     build_yearly_pdf_payload,
@@ -17,7 +16,8 @@ from ..services.wheel_svg import simple_wheel_svg
 from ..routers.charts import compute_chart
 from ..schemas import ComputeRequest
 
-import os
+logger = logging.getLogger(__name__)
+
 _ASSETS_BASE = Path(os.getenv("HOME", "/opt/app")) / "data" / "dev-assets" / "reports"
 
 
@@ -31,146 +31,166 @@ def _build_payload(chart_req: Dict[str, Any]) -> Dict[str, Any]:
     return data
 
 
-def worker_loop() -> None:
-    while True:
-        rid = Q.get()
-        try:
-            STORE.update(rid, status="processing")
-            job = STORE.get(rid)
-            payload = job["payload"]
-            product = payload["product"]
-            ci = payload.get("chart_input")
-            brand = payload.get("branding") or {}
-            options = payload.get("options") or {}
-            out = _ASSETS_BASE / f"{rid}.pdf"
-            if product == "western_natal_pdf":
-                data = _build_payload(payload)
-                render_western_natal_pdf(data, str(out), branding=brand)
-            elif product == "advanced_natal_pdf":
-                from ..services.narratives.assembler import interpret_natal
-
-                data = interpret_natal(ci, payload.get("options") or {})
-                render_western_natal_pdf(
-                    data, str(out), branding=brand, template_name="advanced_natal.html.j2"
-                )
-            elif product == "transit_forecast_pdf":
-                from ..services.narratives.assembler import interpret_transits
-
-                window = payload.get(
-                    "window", {"from": "2025-01-01", "to": "2025-01-31"}
-                )
-                data = interpret_transits(ci, window, payload.get("options") or {})
-                render_western_natal_pdf(
-                    data,
-                    str(out),
-                    branding=brand,
-                    template_name="transit_forecast.html.j2",
-                )
-            elif product == "yearly_forecast_pdf":
-                from ..services.forecast_builders import yearly_payload
-                payload_opts = options or {"year": 2025}
-                data = yearly_payload(ci, payload_opts)
-                context = build_yearly_pdf_payload(ci, payload_opts, data)
-                render_western_natal_pdf(
-                    context,
-                    str(out),
-                    branding=brand,
-                    template_name="yearly_forecast.html.j2",
-                )
-            elif product == "monthly_horoscope_pdf":
-                from ..services.forecast_builders import monthly_payload
-                payload_opts = options or {"year": 2025, "month": 8}
-                data = monthly_payload(ci, payload_opts)
-                context = build_monthly_pdf_payload(ci, payload_opts, data)
-                render_western_natal_pdf(
-                    context,
-                    str(out),
-                    branding=brand,
-                    template_name="monthly_horoscope.html.j2",
-                )
-            elif product == "compatibility_pdf":
-                from ..services.narratives.assembler import interpret_compatibility
-
-                other = payload.get("partner_chart_input") or {}
-                data = interpret_compatibility(ci, other, payload.get("options") or {})
-                render_western_natal_pdf(
-                    data,
-                    str(out),
-                    branding=brand,
-                    template_name="compatibility_detailed.html.j2",
-                )
-            elif product == "remedies_pdf":
-                from ..services.remedies_engine import compute_remedies
-                data = {"items": compute_remedies(ci, allow_gemstones=True)}
-                render_western_natal_pdf(
-                    data,
-                    str(out),
-                    branding=brand,
-                    template_name="remedies.html.j2",
-                )
-            elif product == "full_natal_pdf":
-                vm = payload.get("viewmodel")
-                if not vm:
-                    raise ValueError("full_natal_pdf requires 'viewmodel' in payload")
-                render_viewmodel_pdf(
-                    vm, str(out), branding=brand, template_name="full_natal.html.j2"
-                )
-            elif product == "full_yearly_pdf":
-                vm = payload.get("viewmodel")
-                if not vm:
-                    raise ValueError("full_yearly_pdf requires 'viewmodel' in payload")
-                render_viewmodel_pdf(
-                    vm, str(out), branding=brand, template_name="full_yearly.html.j2"
-                )
-            elif product == "full_monthly_pdf":
-                vm = payload.get("viewmodel")
-                if not vm:
-                    raise ValueError("full_monthly_pdf requires 'viewmodel' in payload")
-                render_viewmodel_pdf(
-                    vm, str(out), branding=brand, template_name="full_monthly.html.j2"
-                )
-            elif product == "spiritual_mission_pdf":
-                data = {
-                    "themes": [
-                        "Growth via service and learning",
-                        "Letting go of past attachments",
-                    ],
-                    "notes": [],
-                }
-                render_western_natal_pdf(
-                    data,
-                    str(out),
-                    branding=brand,
-                    template_name="spiritual_mission.html.j2",
-                )
-            else:
-                raise ValueError("UNKNOWN_PRODUCT")
-            STORE.update(rid, status="done", file_path=str(out))
-        except Exception:
-            traceback.print_exc()
-            STORE.update(rid, status="error", error="RENDER_FAILED")
-        finally:
-            Q.task_done()
-
-
-_worker_thread = None
+def _render(rid: str, payload: Dict[str, Any]) -> Path:
+    """Render one report job to ``{rid}.pdf`` under the dev assets directory."""
+
+    product = payload["product"]
+    ci = payload.get("chart_input")
+    brand = payload.get("branding") or {}
+    options = payload.get("options") or {}
+    out = _ASSETS_BASE / f"{rid}.pdf"
+    if product == "western_natal_pdf":
+        data = _build_payload(payload)
+        render_western_natal_pdf(data, str(out), branding=brand)
+    elif product == "advanced_natal_pdf":
+        from ..services.narratives.assembler import interpret_natal
+
+        data = interpret_natal(ci, payload.get("options") or {})
+        render_western_natal_pdf(
+            data, str(out), branding=brand, template_name="advanced_natal.html.j2"
+        )
+    elif product == "transit_forecast_pdf":
+        from ..services.narratives.assembler import interpret_transits
+
+        window = payload.get(
+            "window", {"from": "2025-01-01", "to": "2025-01-31"}
+        )
+        data = interpret_transits(ci, window, payload.get("options") or {})
+        render_western_natal_pdf(
+            data,
+            str(out),
+            branding=brand,
+            template_name="transit_forecast.html.j2",
+        )
+    elif product == "yearly_forecast_pdf":
+        from ..services.forecast_builders import yearly_payload
+        payload_opts = options or {"year": 2025}
+        data = yearly_payload(ci, payload_opts)
+        context = build_yearly_pdf_payload(ci, payload_opts, data)
+        render_western_natal_pdf(
+            context,
+            str(out),
+            branding=brand,
+            template_name="yearly_forecast.html.j2",
+        )
+    elif product == "monthly_horoscope_pdf":
+        from ..services.forecast_builders import monthly_payload
+        payload_opts = options or {"year": 2025, "month": 8}
+        data = monthly_payload(ci, payload_opts)
+        context = build_monthly_pdf_payload(ci, payload_opts, data)
+        render_western_natal_pdf(
+            context,
+            str(out),
+            branding=brand,
+            template_name="monthly_horoscope.html.j2",
+        )
+    elif product == "compatibility_pdf":
+        from ..services.narratives.assembler import interpret_compatibility
+
+        other = payload.get("partner_chart_input") or {}
+        data = interpret_compatibility(ci, other, payload.get("options") or {})
+        render_western_natal_pdf(
+            data,
+            str(out),
+            branding=brand,
+            template_name="compatibility_detailed.html.j2",
+        )
+    elif product == "remedies_pdf":
+        from ..services.remedies_engine import compute_remedies
+        data = {"items": compute_remedies(ci, allow_gemstones=True)}
+        render_western_natal_pdf(
+            data,
+            str(out),
+            branding=brand,
+            template_name="remedies.html.j2",
+        )
+    elif product == "full_natal_pdf":
+        vm = payload.get("viewmodel")
+        if not vm:
+            raise ValueError("full_natal_pdf requires 'viewmodel' in payload")
+        render_viewmodel_pdf(
+            vm, str(out), branding=brand, template_name="full_natal.html.j2"
+        )
+    elif product == "full_yearly_pdf":
+        vm = payload.get("viewmodel")
+        if not vm:
+            raise ValueError("full_yearly_pdf requires 'viewmodel' in payload")
+        render_viewmodel_pdf(
+            vm, str(out), branding=brand, template_name="full_yearly.html.j2"
+        )
+    elif product == "full_monthly_pdf":
+        vm = payload.get("viewmodel")
+        if not vm:
+            raise ValueError("full_monthly_pdf requires 'viewmodel' in payload")
+        render_viewmodel_pdf(
+            vm, str(out), branding=brand, template_name="full_monthly.html.j2"
+        )
+    elif product == "spiritual_mission_pdf":
+        data = {
+            "themes": [
+                "Growth via service and learning",
+                "Letting go of past attachments",
+            ],
+            "notes": [],
+        }
+        render_western_natal_pdf(
+            data,
+            str(out),
+            branding=brand,
+            template_name="spiritual_mission.html.j2",
+        )
+    else:
+        raise ValueError("UNKNOWN_PRODUCT")
+    return out
+
+
+def render_job(rid: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Render a job inside a pool worker and report where and how long it took."""
+
+    started = time.perf_counter()
+    out = _render(rid, payload)
+    return {
+        "file_path": str(out),
+        "render_ms": round((time.perf_counter() - started) * 1000.0, 1),
+        "worker_pid": os.getpid(),
+    }
+
+
+def warm_worker() -> None:
+    """Pool initializer: the heavy imports already ran with this module."""
+
+    _ASSETS_BASE.mkdir(parents=True, exist_ok=True)
 
 
 def ensure_worker_started() -> None:
-    """Ensure a worker thread is running for rendering jobs."""
+    """Ensure the API's embedded render pool is running (``RENDER_POOL_EMBEDDED``)."""
 
-    global _worker_thread
-    if _worker_thread and _worker_thread.is_alive():
-        return
+    from .render_pool import embedded_enabled, get_pool
 
+    if not embedded_enabled():
+        return
     _ASSETS_BASE.mkdir(parents=True, exist_ok=True)
-    _worker_thread = threading.Thread(target=worker_loop, daemon=True)
-    _worker_thread.start()
+    get_pool().start()
 
 
-if __name__ == "__main__":
-    ensure_worker_started()
-    # Keep the main process alive so the daemon thread can run
-    import time
+def run_worker() -> None:
+    """Render jobs from the configured queue until the process is stopped.
+
+    Runs one member of a worker fleet; API and workers must share the queue
+    (``JOB_QUEUE_BACKEND=sqlite`` or ``sqs``) and the job store.
+    """
+
+    from ..services.job_queue import get_queue
+    from .render_pool import get_pool
+
+    if get_queue().backend == "inproc":
+        logger.warning("render_worker_inproc_queue")
+    _ASSETS_BASE.mkdir(parents=True, exist_ok=True)
+    get_pool().start()
+    # Keep the main process alive so the pool's dispatcher thread can run
     while True:
         time.sleep(60)
+
+
+if __name__ == "__main__":
+    run_worker()
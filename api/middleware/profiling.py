@@ -0,0 +1,71 @@
+import json
+
+from fastapi import Request
+from fastapi.responses import Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from ..services import profiling
+
+
+def _is_admin(request: Request) -> bool:
+    auth = request.headers.get("Authorization", "")
+    if not auth.startswith("Bearer "):
+        return False
+    return auth.replace("Bearer ", "").strip() in profiling.admin_keys()
+
+
+def _with_profile(body: bytes, summary: dict) -> bytes:
+    try:
+        doc = json.loads(body)
+    except ValueError:
+        return body
+    if not isinstance(doc, dict):
+        return body
+    meta = doc.get("meta")
+    doc["meta"] = {**meta, "profile": summary} if isinstance(meta, dict) else {"profile": summary}
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """Profile requests that admin keys send with ``X-Profile: 1``.
+
+    The profile is linked from a ``Link: <...>; rel="profile"`` header; JSON
+    bodies also get the hottest functions under ``meta.profile``. Streamed
+    bodies are profiled until the last chunk is sent.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        if request.headers.get("X-Profile") != "1" or not _is_admin(request):
+            return await call_next(request)
+
+        profile = profiling.RequestProfile()
+        token = profiling.activate()
+        profile.start()
+        try:
+            response = await call_next(request)
+        except BaseException:
+            profile.finish()
+            raise
+        finally:
+            profiling.deactivate(token)
+
+        link = f'<{profile.url}>; rel="profile"'
+        if response.headers.get("content-type", "").startswith("application/json"):
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            body = _with_profile(body, profile.finish())
+            headers = {k: v for k, v in response.headers.items() if k.lower() != "content-length"}
+            headers["Link"] = link
+            return Response(body, status_code=response.status_code, headers=headers)
+
+        stream = response.body_iterator
+
+        async def _profiled():
+            try:
+                async for chunk in stream:
+                    yield chunk
+            finally:
+                profile.finish()
+
+        response.body_iterator = _profiled()
+        response.headers["Link"] = link
+        return response
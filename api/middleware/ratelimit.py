@@ -1,29 +1,245 @@
+"""Token-bucket rate limiting.
+
+Every client key owns a bucket of ``RATE_LIMIT_PER_MINUTE`` tokens (or
+``RATE_LIMIT_BURST`` when set) that refills continuously at the per-minute
+rate. A request spends its route's cost, so a yearly PDF drains the bucket
+faster than a chart; requests that find too few tokens get ``429`` with a
+``Retry-After`` for when enough will have refilled.
+
+The limiter runs inside authentication and keys on the validated
+``request.state.api_key``; requests without one (authentication disabled, or
+routes it skips) are keyed by client address, so made-up bearer tokens do not
+buy fresh buckets. The health check and ``/__metrics`` are not limited, so
+scrapers never see a ``429``. ``RATE_LIMIT_KEY_LIMITS``
+gives individual API keys their own per-minute limit, and
+``RATE_LIMIT_ROUTE_COSTS`` overrides the route costs, both as
+``name=value`` lists separated by commas.
+
+Buckets live in a bounded in-process LRU by default. With
+``RATE_LIMIT_BACKEND=redis`` and ``REDIS_URL`` they live in Redis and are
+updated atomically by a Lua script that reads the Redis server clock, so the
+limit holds across every worker and host whatever their clock skew. If Redis
+fails the request is let through.
+"""
+
+import hashlib
+import logging
+import math
 import os
+import threading
 import time
-from collections import defaultdict
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
 from fastapi import Request
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
-_counters = defaultdict(list)
+from .auth import PUBLIC_PATHS
+
+try:  # pragma: no cover - optional dependency
+    import redis  # type: ignore
+except Exception:  # pragma: no cover - redis is optional
+    redis = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Longest matching prefix wins; an optional method restricts the entry.
+DEFAULT_ROUTE_COSTS = {
+    "POST /v1/reports": 5.0,
+    "POST /v1/charts/compute/batch": 20.0,
+    "/v1/forecasts/yearly": 10.0,
+    "/v1/yearly/full": 5.0,
+    "/v1/panchang/year": 5.0,
+    "/v1/panchang/report": 3.0,
+    "/v1/natal/full/report": 3.0,
+    "/v1/monthly/full/report": 3.0,
+}
+
+
+def _parse_pairs(raw: str) -> Dict[str, float]:
+    pairs: Dict[str, float] = {}
+    for item in raw.split(","):
+        name, sep, value = item.rpartition("=")
+        if sep and name.strip():
+            try:
+                pairs[name.strip()] = float(value)
+            except ValueError:
+                logger.warning("ratelimit_bad_setting", extra={"item": item})
+    return pairs
+
+
+# Settings are parsed once per distinct value, not on every request.
+@lru_cache(maxsize=8)
+def _route_table(raw: str) -> Tuple[Tuple[str, str, float], ...]:
+    costs = dict(DEFAULT_ROUTE_COSTS)
+    costs.update(_parse_pairs(raw))
+    table = []
+    for pattern, cost in costs.items():
+        verb, _, prefix = pattern.rpartition(" ")
+        table.append((verb.upper(), prefix, cost))
+    # Longest prefix first, so the first match wins.
+    return tuple(sorted(table, key=lambda entry: len(entry[1]), reverse=True))
+
+
+@lru_cache(maxsize=8)
+def _key_limits(raw: str) -> Dict[str, float]:
+    return _parse_pairs(raw)
+
+
+def route_cost(method: str, path: str) -> float:
+    for verb, prefix, cost in _route_table(os.getenv("RATE_LIMIT_ROUTE_COSTS", "")):
+        if (not verb or verb == method) and path.startswith(prefix):
+            return cost
+    return 1.0
+
+
+def _per_minute(api_key: Optional[str]) -> float:
+    if api_key:
+        override = _key_limits(os.getenv("RATE_LIMIT_KEY_LIMITS", "")).get(api_key)
+        if override is not None:
+            return override
+    return float(os.getenv("RATE_LIMIT_PER_MINUTE", "10"))
+
+
+class MemoryBuckets:
+    """In-process token buckets; the least recently used keys are evicted past ``max_keys``."""
+
+    def __init__(self, max_keys: int = 10000) -> None:
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, cost: float, capacity: float, rate: float, now: float) -> Tuple[bool, float]:
+        """Spend ``cost`` tokens; return ``(allowed, seconds until allowed)``."""
+
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# KEYS[1] bucket hash; ARGV: cost, capacity, rate (tokens/s). The same
+# arithmetic as MemoryBuckets.acquire, timed by the Redis server clock.
+_TOKEN_BUCKET_LUA = """
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local cost = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local rate = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBuckets:
+    """Token buckets shared through Redis, updated by one Lua script call per request.
+
+    ``now`` is ignored: the script uses the Redis server's ``TIME``.
+    """
+
+    def __init__(self, client: Any, prefix: str = "ratelimit:") -> None:
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_TOKEN_BUCKET_LUA)
+
+    def acquire(self, key: str, cost: float, capacity: float, rate: float, now: float) -> Tuple[bool, float]:
+        allowed, tokens = self._script(keys=[self.prefix + key], args=[cost, capacity, rate])
+        tokens = float(tokens)
+        return bool(int(allowed)), 0.0 if int(allowed) else (cost - tokens) / rate
+
+
+# Module-level in-process buckets; tests reset them with ``_counters.clear()``.
+_counters = MemoryBuckets(int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000")))
+_shared: Optional[Any] = None
+_shared_lock = threading.Lock()
+
+
+def _build_shared() -> Optional[RedisBuckets]:
+    redis_url = os.getenv("REDIS_URL")
+    if redis is None or not redis_url:
+        logger.info("ratelimit_redis_unavailable")
+        return None
+    try:
+        return RedisBuckets(redis.Redis.from_url(redis_url))
+    except Exception:  # pragma: no cover - connection errors logged but not fatal
+        logger.exception("ratelimit_redis_init_failed")
+        return None
+
+
+def get_buckets() -> Any:
+    """Buckets selected by ``RATE_LIMIT_BACKEND``, falling back to in-process ones."""
+
+    global _shared
+    if os.getenv("RATE_LIMIT_BACKEND", "memory").lower() != "redis":
+        return _counters
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = _build_shared() or _counters
+    return _shared
+
+
+def _client_key(request: Request) -> Tuple[str, Optional[str]]:
+    # Set by APIKeyMiddleware only once the key has been validated.
+    api_key = getattr(request.state, "api_key", None)
+    if api_key:
+        return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:32], api_key
+    return "ip:" + (request.client.host if request.client else "anon"), None
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
-        if os.getenv("RATE_LIMIT_ENABLED", "false").lower() != "true":
+        if (
+            os.getenv("RATE_LIMIT_ENABLED", "false").lower() != "true"
+            or request.url.path in PUBLIC_PATHS
+        ):
             return await call_next(request)
 
-        key = getattr(request.state, "api_key", None) or (
-            request.client.host if request.client else "anon"
-        )
-        limit = int(os.getenv("RATE_LIMIT_PER_MINUTE", "10"))
-        now = time.time()
+        key, api_key = _client_key(request)
+        per_minute = _per_minute(api_key)
+        capacity = float(os.getenv("RATE_LIMIT_BURST", "") or per_minute)
+        rate = per_minute / 60.0
+        if capacity <= 0 or rate <= 0:
+            return JSONResponse({"detail": "Rate limit exceeded"}, status_code=429)
+        # A request costing more than the whole bucket is still allowed when it is full.
+        cost = min(route_cost(request.method, request.url.path), capacity)
 
-        window = [t for t in _counters[key] if t > now - 60]
-        window.append(now)
-        _counters[key] = window
+        try:
+            allowed, retry_after = get_buckets().acquire(key, cost, capacity, rate, time.time())
+        except Exception:
+            logger.exception("ratelimit_backend_failed")
+            return await call_next(request)
 
-        if len(window) > limit:
-            return JSONResponse({"detail": "Rate limit exceeded"}, status_code=429)
+        if not allowed:
+            return JSONResponse(
+                {"detail": "Rate limit exceeded"},
+                status_code=429,
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
 
         return await call_next(request)
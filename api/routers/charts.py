@@ -1,23 +1,53 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from hashlib import sha256
+import json
 import os
-from ..schemas import ComputeRequest, ComputeResponse, BodyOut, MetaOut
+from typing import Any, Dict, Iterator, List
+from pydantic import ValidationError
+from ..schemas import ChartBatchRequest, ComputeRequest, ComputeResponse, BodyOut, MetaOut
 from ..services import ephem, houses as houses_svc, aspects as aspects_svc, vedic as vedic_svc
+from ..services.response_cache import cached_response
 from ..services.constants import sign_name_from_lon
 
 router = APIRouter(prefix="/v1/charts", tags=["charts"])
 
+# Batch items are validated and computed this many at a time, then streamed.
+_BATCH_CHUNK = 256
+
 @router.post("/compute", response_model=ComputeResponse)
-def compute_chart(req: ComputeRequest):
-    ephem.init_paths(os.getenv("EPHEMERIS_DIR"))
+def compute_chart_route(req: ComputeRequest, request: Request):
+    return cached_response(
+        request,
+        "charts.compute",
+        req.model_dump(mode="json"),
+        lambda: compute_chart(req),
+        ComputeResponse,
+    )
+
+
+def _zodiac(req: ComputeRequest):
     sidereal = (req.system == "vedic")
     ayan = (req.options or {}).get("ayanamsha","lahiri") if sidereal else None
-    house_system = (req.options or {}).get("house_system", "placidus" if not sidereal else "whole_sign")
+    return sidereal, ayan
+
+
+def compute_chart(req: ComputeRequest):
+    ephem.init_paths(os.getenv("EPHEMERIS_DIR"))
+    sidereal, ayan = _zodiac(req)
 
     # JD
     jd = ephem.to_jd_utc(req.date, req.time, req.place.tz)
     # Positions
     pos = ephem.positions_ecliptic(jd, sidereal=sidereal, ayanamsha=ayan)
+    return _chart_response(req, jd, pos, aspects_svc.find_aspects(pos))
+
+
+def _chart_response(req: ComputeRequest, jd: float, pos: dict, asp: list) -> ComputeResponse:
+    """Assemble the response from computed positions and aspects."""
+
+    sidereal, ayan = _zodiac(req)
+    house_system = (req.options or {}).get("house_system", "placidus" if not sidereal else "whole_sign")
 
     # Houses / Angles
     angles, out_houses, warnings = None, None, []
@@ -58,9 +88,6 @@ def compute_chart(req: ComputeRequest):
             b.nakshatra = vedic_svc.nakshatra_from_lon_sidereal(p["lon"])
         bodies.append(b)
 
-    # Aspects
-    asp = aspects_svc.find_aspects(pos)
-
     # Meta & id
     seed = f"{req.system}|{req.date}|{req.time}|{req.place.lat:.6f}|{req.place.lon:.6f}|{req.place.tz}|{house_system}|{ayan or ''}"
     chart_id = "cht_" + sha256(seed.encode()).hexdigest()[:24]
@@ -82,3 +109,63 @@ def compute_chart(req: ComputeRequest):
         bodies=bodies,
         aspects=asp
     )
+
+
+def _batch_max_items() -> int:
+    return int(os.getenv("CHART_BATCH_MAX_ITEMS", "1000"))
+
+
+def _batch_chunk(items: List[Dict[str, Any]], offset: int) -> List[Dict[str, Any]]:
+    """Compute one chunk of batch items; every item yields a result or an error."""
+
+    lines: List[Dict[str, Any]] = [{"index": offset + i} for i in range(len(items))]
+    pending: Dict[tuple, List[tuple]] = {}
+    for i, raw in enumerate(items):
+        try:
+            req = ComputeRequest.model_validate(raw)
+        except ValidationError as exc:
+            lines[i]["error"] = {"code": "INVALID_INPUT", "message": "Invalid chart input",
+                                 "details": exc.errors(include_url=False, include_context=False)}
+            continue
+        try:
+            jd = ephem.to_jd_utc(req.date, req.time, req.place.tz)
+        except Exception as exc:
+            lines[i]["error"] = {"code": "INVALID_INPUT", "message": str(exc)}
+            continue
+        pending.setdefault(_zodiac(req), []).append((i, req, jd))
+
+    for (sidereal, ayan), group in pending.items():
+        try:
+            positions = ephem.positions_ecliptic_batch([jd for _, _, jd in group], sidereal=sidereal, ayanamsha=ayan)
+            aspects = aspects_svc.find_aspects_batch(positions)
+        except Exception as exc:
+            for i, _req, _jd in group:
+                lines[i]["error"] = {"code": "COMPUTE_FAILED", "message": str(exc)}
+            continue
+        for (i, req, jd), pos, asp in zip(group, positions, aspects):
+            try:
+                lines[i]["result"] = _chart_response(req, jd, pos, asp).model_dump(mode="json")
+            except Exception as exc:
+                lines[i]["error"] = {"code": "COMPUTE_FAILED", "message": str(exc)}
+    return lines
+
+
+def _batch_lines(items: List[Dict[str, Any]]) -> Iterator[bytes]:
+    ephem.init_paths(os.getenv("EPHEMERIS_DIR"))
+    for offset in range(0, len(items), _BATCH_CHUNK):
+        for line in _batch_chunk(items[offset:offset + _BATCH_CHUNK], offset):
+            yield (json.dumps(line, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+@router.post(
+    "/compute/batch",
+    response_class=StreamingResponse,
+    summary="Compute many charts in one request",
+    description="Streams one NDJSON line per input chart, in input order: "
+    '{"index": i, "result": {...}} or {"index": i, "error": {...}}. '
+    "Invalid items are reported on their own line without failing the batch.",
+)
+def compute_chart_batch(req: ChartBatchRequest):
+    if len(req.items) > _batch_max_items():
+        raise HTTPException(status_code=413, detail="BATCH_TOO_LARGE")
+    return StreamingResponse(_batch_lines(req.items), media_type="application/x-ndjson")
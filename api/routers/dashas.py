@@ -1,10 +1,21 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from ..schemas import DashaComputeRequest, DashaComputeResponse
 from ..services.dashas_vimshottari import compute_vimshottari
+from ..services.response_cache import cached_response
 
 router = APIRouter(prefix="/v1/dashas", tags=["dashas"])
 
 @router.post("/compute", response_model=DashaComputeResponse)
+def compute_dashas_route(req: DashaComputeRequest, request: Request):
+    return cached_response(
+        request,
+        "dashas.compute",
+        req.model_dump(mode="json"),
+        lambda: compute_dashas(req),
+        DashaComputeResponse,
+    )
+
+
 def compute_dashas(req: DashaComputeRequest):
     # Force Vedic assumptions regardless of chart_input.system (dashas are Vedic)
     ayan = (req.chart_input.options or {}).get("ayanamsha","lahiri")
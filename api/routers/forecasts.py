@@ -13,6 +13,7 @@ import logging
 from ..services.forecast_builders import yearly_payload, monthly_payload, daily_payload
 from ..services.forecast_reports import generate_yearly_pdf, generate_monthly_pdf
 from ..services.daily_template import generate_daily_template
+from ..services.fast_json import model_response
 
 
 logger = logging.getLogger(__name__)
@@ -116,11 +117,14 @@ def compute_yearly(
     base_meta = {"year": req.options.year}
     payload_meta = data.get("meta") if isinstance(data, dict) else None
     meta = {**payload_meta, **base_meta} if payload_meta else base_meta
-    return YearlyForecastResponse(
-        meta=meta,
-        months=data["months"],
-        top_events=data["top_events"],
-        pdf_download_url=pdf_url,
+    return model_response(
+        YearlyForecastResponse(
+            meta=meta,
+            months=data["months"],
+            top_events=data["top_events"],
+            pdf_download_url=pdf_url,
+        ),
+        YearlyForecastResponse,
     )
 
 
@@ -148,9 +152,12 @@ def compute_monthly(
         _, pdf_url = generate_monthly_pdf(chart_input, options, data)
     except Exception:
         logger.exception("monthly_pdf_generation_failed")
-    return MonthlyForecastResponse(
-        meta={"year": req.options.year, "month": req.options.month},
-        events=data["events"],
-        highlights=data["highlights"],
-        pdf_download_url=pdf_url,
+    return model_response(
+        MonthlyForecastResponse(
+            meta={"year": req.options.year, "month": req.options.month},
+            events=data["events"],
+            highlights=data["highlights"],
+            pdf_download_url=pdf_url,
+        ),
+        MonthlyForecastResponse,
     )
@@ -2,44 +2,54 @@
 
 from __future__ import annotations
 
-import asyncio
-import multiprocessing
-import os
-from concurrent.futures import ProcessPoolExecutor
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
-
-from fastapi import APIRouter, Body, Query
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import APIRouter, Body, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from zoneinfo import ZoneInfo
 
-from ..schemas.panchang_viewmodel import PanchangViewModel, WeeklyPanchangViewModel, MonthlyPanchangViewModel, DailyPanchangSummary
+from ..schemas.panchang_viewmodel import (
+    DailyPanchangSummary,
+    MonthlyPanchangViewModel,
+    PanchangViewModel,
+    WeeklyPanchangViewModel,
+)
+from ..services.cpu_executor import chunk_date_range, get_executor
+from ..services.griha_pravesh import search_griha_pravesh_muhurat
 from ..services.orchestrators.panchang_full import build_viewmodel
+from ..services.orchestrators.panchang_range import compute_range_payload, decode_range_payload
+from ..services.orchestrators.panchang_year import stream_days
+from ..services.util.place_defaults import normalize_place
 from ..services.panchang_report import generate_panchang_report
+from ..services.response_cache import cached_response, cached_response_async
 
 
 router = APIRouter(prefix="/v1/panchang", tags=["panchang"])
 
-_process_pool: ProcessPoolExecutor | None = None
-
-
-def _get_process_pool() -> ProcessPoolExecutor:
-    """Return a lazily-initialised process pool tuned for CPU-bound work."""
-
-    global _process_pool
-    if _process_pool is None:
-        # Limit workers so we do not overwhelm shared container CPUs.
-        max_workers = min(8, max(1, os.cpu_count() or 1))
-        ctx = multiprocessing.get_context("spawn")
-        _process_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx)
-    return _process_pool
 
-def _compute_single_panchang(args):
-    """Worker function for parallel panchang computation."""
-    date_str, place, options = args
-    from ..services.orchestrators.panchang_full import build_viewmodel
-    return build_viewmodel("vedic", date_str, place, options)
+async def _compute_panchang_range(
+    label: str,
+    start_date: date,
+    num_days: int,
+    place: Optional[Dict[str, Any]],
+    options: Dict[str, Any],
+) -> Tuple[Dict[str, Any], List[DailyPanchangSummary]]:
+    """Solve summary-only Panchang days on the shared CPU executor, one chunk per worker."""
+
+    executor = get_executor()
+    chunks = chunk_date_range(start_date, num_days, executor.max_workers)
+    results = await executor.map(
+        label,
+        compute_range_payload,
+        [(chunk_start, count, place, options) for chunk_start, count in chunks],
+    )
+    eff_place = results[0][0]
+    days = [day for _place, payload in results for day in decode_range_payload(payload)]
+    return eff_place, days
 
 
 class PanchangPlace(BaseModel):
@@ -72,6 +82,7 @@ class PanchangRequest(BaseModel):
     summary="Compute Panchang for a specific date and location",
 )
 def panchang_compute(
+    request: Request,
     req: PanchangRequest = Body(
         ...,
         examples={
@@ -113,7 +124,19 @@ def panchang_compute(
      # Ensure summary-only optimizations stay disabled for compute endpoint
     options.setdefault("summary_only", False)
     options.setdefault("include_extensions", True)
-    return build_viewmodel(req.system, req.date, place, options)
+    params = {
+        "system": req.system,
+        "date": req.date or _local_today(place),
+        "place": place,
+        "options": options,
+    }
+    return cached_response(
+        request,
+        "panchang.compute",
+        params,
+        lambda: build_viewmodel(req.system, req.date, place, options),
+        PanchangViewModel,
+    )
 
 
 @router.get(
@@ -555,6 +578,7 @@ def panchang_compute(
     },
 )
 def panchang_today(
+    request: Request,
     lat: Optional[float] = Query(
         None, ge=-90.0, le=90.0, example=19.076, description="Latitude"
     ),
@@ -590,7 +614,14 @@ def panchang_today(
     if place_label:
         place_payload["query"] = place_label
     place = _clamp_place(place_payload or None)
-    return build_viewmodel("vedic", None, place, options)
+    params = {"date": _local_today(place), "place": place, "options": options}
+    return cached_response(
+        request,
+        "panchang.today",
+        params,
+        lambda: build_viewmodel("vedic", None, place, options),
+        PanchangViewModel,
+    )
 
 
 @router.get(
@@ -600,6 +631,7 @@ def panchang_today(
     description="Returns simplified Panchang data for 7 consecutive days starting from the specified date (or current week if no date provided)"
 )
 async def panchang_week(
+    request: Request,
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD). If not provided, uses current week starting from Monday"),
     lat: Optional[float] = Query(None, ge=-90.0, le=90.0, description="Latitude"),
     lon: Optional[float] = Query(None, ge=-180.0, le=180.0, description="Longitude"),
@@ -646,68 +678,35 @@ async def panchang_week(
         "include_extensions": False,
     }
     
-    # Prepare tasks for parallel execution using ProcessPoolExecutor
-    loop = asyncio.get_running_loop()
-    pool = _get_process_pool()
-
-    # Execute all days in parallel using process pool
-    tasks = []
-    for i in range(7):
-        current_date = start_dt + timedelta(days=i)
-        date_str = current_date.strftime("%Y-%m-%d")
-        tasks.append(
-            loop.run_in_executor(pool, _compute_single_panchang, (date_str, place, options))
+    async def _compute() -> WeeklyPanchangViewModel:
+        eff_place, days = await _compute_panchang_range(
+            "panchang.week", start_dt.date(), 7, place, options
         )
 
-    results = await asyncio.gather(*tasks)
+        # Build metadata (prefer resolved details from the computed payload)
+        end_dt = start_dt + timedelta(days=6)
+        meta = {
+            "start_date": start_dt.strftime("%Y-%m-%d"),
+            "end_date": end_dt.strftime("%Y-%m-%d"),
+            "place_label": eff_place.get("query") or "Default Location",
+            "tz": eff_place.get("tz") or "Asia/Kolkata",
+            "ayanamsha": ayanamsha,
+            "locale": {"lang": lang, "script": script}
+        }
     
-    # Convert results to DailyPanchangSummary
-    days = [
-        DailyPanchangSummary(
-            date_local=vm.header.date_local,
-            weekday=vm.header.weekday,
-            solar=vm.solar,
-            lunar=vm.lunar,
-            tithi=vm.tithi,
-            nakshatra=vm.nakshatra,
-            yoga=vm.yoga,
-            karana=vm.karana,
-            paksha=vm.lunar.paksha,
-            changes=vm.changes,
+        return WeeklyPanchangViewModel(
+            meta=meta,
+            days=days,
+            notes=[
+                "All times are local with standard refraction.",
+                "Panchang day considered sunrise→next sunrise.",
+                "Simplified view - muhurta details excluded for performance."
+            ]
         )
-        for vm in results
-    ]
-    
-    # Build metadata (prefer resolved details from the computed payload)
-    end_dt = start_dt + timedelta(days=6)
-    reference_header = results[0].header if results else None
-    meta = {
-        "start_date": start_dt.strftime("%Y-%m-%d"),
-        "end_date": end_dt.strftime("%Y-%m-%d"),
-        "place_label": (
-            reference_header.place_label
-            if reference_header and reference_header.place_label
-            else place.get("query") if place and place.get("query")
-            else "Default Location"
-        ),
-        "tz": (
-            reference_header.tz
-            if reference_header and reference_header.tz
-            else place.get("tz") if place and place.get("tz")
-            else "Asia/Kolkata"
-        ),
-        "ayanamsha": ayanamsha,
-        "locale": {"lang": lang, "script": script}
-    }
-    
-    return WeeklyPanchangViewModel(
-        meta=meta,
-        days=days,
-        notes=[
-            "All times are local with standard refraction.",
-            "Panchang day considered sunrise→next sunrise.",
-            "Simplified view - muhurta details excluded for performance."
-        ]
+
+    params = {"start_date": start_dt.date().isoformat(), "place": place, "options": options}
+    return await cached_response_async(
+        request, "panchang.week", params, _compute, WeeklyPanchangViewModel
     )
 
 
@@ -718,6 +717,7 @@ async def panchang_week(
     description="Returns simplified Panchang data for all days in the specified month (or current month if not provided)"
 )
 async def panchang_month(
+    request: Request,
     year: Optional[int] = Query(None, description="Year (YYYY). If not provided, uses current year"),
     month: Optional[int] = Query(None, ge=1, le=12, description="Month (1-12). If not provided, uses current month"),
     lat: Optional[float] = Query(None, ge=-90.0, le=90.0, description="Latitude"),
@@ -767,80 +767,157 @@ async def panchang_month(
         "include_extensions": False,
     }
     
-    # Calculate number of days
-    num_days = (end_dt - start_dt).days + 1
+    async def _compute() -> MonthlyPanchangViewModel:
+        # Calculate number of days
+        num_days = (end_dt - start_dt).days + 1
     
-    # Prepare tasks for parallel execution using ProcessPoolExecutor
-    loop = asyncio.get_running_loop()
-    pool = _get_process_pool()
-
-    # Execute all days in parallel using process pool
-    tasks = []
-    for i in range(num_days):
-        current_date = start_dt + timedelta(days=i)
-        date_str = current_date.strftime("%Y-%m-%d")
-        tasks.append(
-            loop.run_in_executor(pool, _compute_single_panchang, (date_str, place, options))
+        eff_place, days = await _compute_panchang_range(
+            "panchang.month", start_dt.date(), num_days, place, options
         )
 
-    results = await asyncio.gather(*tasks)
+        # Build metadata
+        month_names = [
+            "January", "February", "March", "April", "May", "June",
+            "July", "August", "September", "October", "November", "December"
+        ]
+
+        meta = {
+            "year": target_year,
+            "month": target_month,
+            "month_name": month_names[target_month - 1],
+            "start_date": start_dt.strftime("%Y-%m-%d"),
+            "end_date": end_dt.strftime("%Y-%m-%d"),
+            "total_days": len(days),
+            "place_label": eff_place.get("query") or "Default Location",
+            "tz": eff_place.get("tz") or "Asia/Kolkata",
+            "ayanamsha": ayanamsha,
+            "locale": {"lang": lang, "script": script}
+        }
     
-    # Convert results to DailyPanchangSummary
-    days = [
-        DailyPanchangSummary(
-            date_local=vm.header.date_local,
-            weekday=vm.header.weekday,
-            solar=vm.solar,
-            lunar=vm.lunar,
-            tithi=vm.tithi,
-            nakshatra=vm.nakshatra,
-            yoga=vm.yoga,
-            karana=vm.karana,
-            paksha=vm.lunar.paksha,
-            changes=vm.changes,
+        return MonthlyPanchangViewModel(
+            meta=meta,
+            days=days,
+            notes=[
+                "All times are local with standard refraction.",
+                "Panchang day considered sunrise→next sunrise.",
+                "Simplified view - muhurta details excluded for performance."
+            ]
         )
-        for vm in results
-    ]
-    
-    # Build metadata
-    month_names = [
-        "January", "February", "March", "April", "May", "June",
-        "July", "August", "September", "October", "November", "December"
-    ]
-
-    reference_header = results[0].header if results else None
-    meta = {
-        "year": target_year,
-        "month": target_month,
-        "month_name": month_names[target_month - 1],
-        "start_date": start_dt.strftime("%Y-%m-%d"),
-        "end_date": end_dt.strftime("%Y-%m-%d"),
-        "total_days": len(days),
-        "place_label": (
-            reference_header.place_label
-            if reference_header and reference_header.place_label
-            else place.get("query") if place and place.get("query")
-            else "Default Location"
-        ),
-        "tz": (
-            reference_header.tz
-            if reference_header and reference_header.tz
-            else place.get("tz") if place and place.get("tz")
-            else "Asia/Kolkata"
-        ),
+
+    params = {"year": target_year, "month": target_month, "place": place, "options": options}
+    return await cached_response_async(
+        request, "panchang.month", params, _compute, MonthlyPanchangViewModel
+    )
+
+
+@router.get(
+    "/year",
+    summary="Stream Panchang for a whole year",
+    description="Streams one record per day of the year as NDJSON (default) or CSV while it is computed. "
+    "summary_only=true (default) skips muhurta and hora like the week and month endpoints.",
+    response_class=StreamingResponse,
+)
+async def panchang_year(
+    year: Optional[int] = Query(None, description="Year (YYYY). If not provided, uses current year"),
+    lat: Optional[float] = Query(None, ge=-90.0, le=90.0, description="Latitude"),
+    lon: Optional[float] = Query(None, ge=-180.0, le=180.0, description="Longitude"),
+    tz: Optional[str] = Query(None, description="IANA timezone"),
+    ayanamsha: str = Query("lahiri", description="Ayanamsha system"),
+    lang: str = Query("en", description="Language code"),
+    script: str = Query("latin", description="Script type"),
+    place_label: Optional[str] = Query(None, description="Optional place label"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    summary_only: bool = Query(True, description="Skip muhurta, hora and extensions"),
+    include_hora: bool = Query(False, description="Include horas (ignored when summary_only)"),
+):
+    target_year = year if year is not None else datetime.now().year
+    start = date(target_year, 1, 1)
+    num_days = (date(target_year + 1, 1, 1) - start).days
+
+    place_payload: Dict[str, Any] = {}
+    if lat is not None:
+        place_payload["lat"] = lat
+    if lon is not None:
+        place_payload["lon"] = lon
+    if tz is not None:
+        place_payload["tz"] = tz
+    if place_label:
+        place_payload["query"] = place_label
+    place = _clamp_place(place_payload or None)
+    eff_place, _flags = normalize_place(place)
+
+    options = {
         "ayanamsha": ayanamsha,
-        "locale": {"lang": lang, "script": script}
+        "include_muhurta": not summary_only,
+        "include_hora": include_hora and not summary_only,
+        "lang": lang,
+        "script": script,
+        "show_bilingual": False,
+        "summary_only": summary_only,
+        "include_extensions": not summary_only,
     }
-    
-    return MonthlyPanchangViewModel(
-        meta=meta,
-        days=days,
-        notes=[
-            "All times are local with standard refraction.",
-            "Panchang day considered sunrise→next sunrise.",
-            "Simplified view - muhurta details excluded for performance."
-        ]
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    headers = {
+        "Content-Disposition": f'attachment; filename="panchang-{target_year}.{format}"',
+        "X-Panchang-Place": quote(str(eff_place.get("query") or "")),
+        "X-Panchang-TZ": eff_place["tz"],
+    }
+    return StreamingResponse(
+        stream_days(start, num_days, place, options, fmt=format),
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+@router.get(
+    "/griha-pravesh/search",
+    summary="Find the best Griha Pravesh windows over a date range",
+    description="Ranks exact lagna/karana windows across up to a year of dates, skipping days "
+    "with an avoided weekday or no daylight free of avoided tithi, nakshatra and yoga.",
+)
+def panchang_griha_pravesh_search(
+    start_date: Optional[str] = Query(None, description="First date (YYYY-MM-DD). Defaults to today"),
+    days: int = Query(180, ge=1, le=366, description="Number of days to search"),
+    lat: Optional[float] = Query(None, ge=-90.0, le=90.0, description="Latitude"),
+    lon: Optional[float] = Query(None, ge=-180.0, le=180.0, description="Longitude"),
+    tz: Optional[str] = Query(None, description="IANA timezone"),
+    ayanamsha: str = Query("lahiri", description="Ayanamsha system"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum windows returned"),
+    place_label: Optional[str] = Query(None, description="Optional place label"),
+):
+    place_payload: Dict[str, Any] = {}
+    if lat is not None:
+        place_payload["lat"] = lat
+    if lon is not None:
+        place_payload["lon"] = lon
+    if tz is not None:
+        place_payload["tz"] = tz
+    if place_label:
+        place_payload["query"] = place_label
+    eff_place, _flags = normalize_place(_clamp_place(place_payload or None))
+    zone = ZoneInfo(eff_place["tz"])
+    try:
+        first = date.fromisoformat(start_date) if start_date else datetime.now(zone).date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start_date must be YYYY-MM-DD")
+
+    result = search_griha_pravesh_muhurat(
+        first,
+        first + timedelta(days=days - 1),
+        float(eff_place["lat"]),
+        float(eff_place["lon"]),
+        zone,
+        ayanamsha=ayanamsha.lower(),
+        limit=limit,
+        elevation=float(eff_place.get("elevation") or 0.0),
     )
+    result["meta"] = {
+        "place_label": eff_place.get("query"),
+        "tz": eff_place["tz"],
+        "ayanamsha": ayanamsha,
+    }
+    return result
 
 
 class PanchangReportRequest(BaseModel):
@@ -861,6 +938,13 @@ def panchang_report(req: PanchangReportRequest):
     return report
 
 
+def _local_today(place: Optional[Dict[str, Any]]) -> str:
+    """Today's date where ``place`` is; what ``build_viewmodel`` uses for date=None."""
+
+    eff_place, _flags = normalize_place(place)
+    return datetime.now(ZoneInfo(eff_place["tz"])).date().isoformat()
+
+
 def _clamp_place(place: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     if place is None:
         return None
@@ -1,10 +1,13 @@
 """Endpoints for report generation and status retrieval."""
 
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException, Body
 
+from ..jobs.queue import enqueue_report_job
+from ..jobs.render_pool import QueueFull
 from ..schemas import ReportCreateRequest, ReportStatus
 from ..services.job_store import STORE
-from ..services.inproc_queue import Q
 
 
 router = APIRouter(prefix="/v1/reports", tags=["reports"])
@@ -44,9 +47,17 @@ def create_report(
     if req.product not in VALID_PRODUCTS:
         raise HTTPException(status_code=400, detail="Invalid product_id")
 
-    rid = STORE.create(payload=req.model_dump(), idempotency_key=req.idempotency_key)
-    Q.put(rid)
-    return ReportStatus(report_id=rid, status="queued")
+    try:
+        rid = enqueue_report_job(req.model_dump())
+    except QueueFull as exc:
+        raise HTTPException(
+            status_code=503,
+            detail="RENDER_QUEUE_FULL",
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
+    job = STORE.get(rid) or {}
+    return ReportStatus(report_id=rid, status=job.get("status", "queued"))
 
 
 @router.get("/{rid}", response_model=ReportStatus)
@@ -65,5 +76,11 @@ def get_report(rid: str) -> ReportStatus:
         status=job["status"],
         download_url=url,
         error=job.get("error"),
+        timings=_timings(job),
     )
 
+
+def _timings(job: dict) -> Optional[dict]:
+    timings = {k: job[k] for k in ("queue_ms", "render_ms", "run_ms") if job.get(k) is not None}
+    return timings or None
+
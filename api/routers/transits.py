@@ -1,10 +1,21 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from ..schemas import TransitsComputeRequest, TransitsComputeResponse
+from ..services.response_cache import cached_response
 from ..services.transits_engine import compute_transits
 
 router = APIRouter(prefix="/v1/transits", tags=["transits"])
 
 @router.post("/compute", response_model=TransitsComputeResponse)
-def compute_transits_route(req: TransitsComputeRequest):
+def compute_transits_route(req: TransitsComputeRequest, request: Request):
+    return cached_response(
+        request,
+        "transits.compute",
+        req.model_dump(mode="json"),
+        lambda: _compute_transits_response(req),
+        TransitsComputeResponse,
+    )
+
+
+def _compute_transits_response(req: TransitsComputeRequest) -> TransitsComputeResponse:
     events = compute_transits(req.chart_input.model_dump(), req.options.model_dump())
     return TransitsComputeResponse(meta={"step_days": req.options.step_days}, events=events)
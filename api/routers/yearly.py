@@ -6,6 +6,7 @@ from ..schemas.charts import ChartInput
 from ..schemas.yearly_viewmodel import YearlyViewModel
 from ..services.orchestrators.yearly_full import build_viewmodel
 from ..jobs.queue import enqueue_report_job
+from ..services.fast_json import model_response
 
 router = APIRouter(prefix="/v1/yearly", tags=["yearly"])
 
@@ -70,7 +71,7 @@ def yearly_full(req: YearlyFullRequest):
         include_interpretation=req.include_interpretation,
         include_dasha=req.include_dasha,
     )
-    return vm
+    return model_response(vm, YearlyViewModel)
 
 
 class YearlyReportRequest(YearlyFullRequest):
@@ -1,4 +1,12 @@
-from .charts import ChartInput, Place, ComputeRequest, ComputeResponse, BodyOut, MetaOut
+from .charts import (
+    ChartInput,
+    Place,
+    ComputeRequest,
+    ComputeResponse,
+    BodyOut,
+    MetaOut,
+    ChartBatchRequest,
+)
 
 from .dashas import DashaComputeRequest, DashaComputeResponse
 from .transits import TransitsComputeRequest, TransitsComputeResponse
@@ -46,3 +46,8 @@ class ComputeResponse(BaseModel):
     houses: Optional[list] = None
     bodies: List[BodyOut]
     aspects: list
+
+
+class ChartBatchRequest(BaseModel):
+    # Items are validated one by one so a bad chart only fails its own line.
+    items: List[Dict[str, Any]]
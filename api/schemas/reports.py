@@ -30,4 +30,5 @@ class ReportStatus(BaseModel):
     status: Literal["queued", "processing", "done", "error"]
     download_url: Optional[str] = None
     error: Optional[str] = None
+    timings: Optional[Dict[str, float]] = None
 
@@ -9,6 +9,7 @@ def main():
     localstack_endpoint = os.getenv("AWS_ENDPOINT_URL", "http://localstack:4566")
     bucket = os.getenv("S3_BUCKET", "wh-reports-dev")
     queue = os.getenv("SQS_QUEUE", "wh-reports-jobs")
+    dlq = os.getenv("SQS_DLQ", f"{queue}-dlq")
 
     # Create S3 client with proper configuration for LocalStack
     s3 = boto3.client(
@@ -63,6 +64,20 @@ def main():
         queue_url = f"{localstack_endpoint}/000000000000/{queue}"
         print(f"[seed] SQS URL: {queue_url}")
     
+    # Dead-letter queue for render jobs whose worker keeps dying; workers
+    # find it through SQS_DLQ (see api/services/job_queue.py).
+    try:
+        import requests
+
+        response = requests.post(
+            f"{localstack_endpoint}/",
+            data={"Action": "CreateQueue", "QueueName": dlq, "Version": "2012-11-05"},
+            timeout=10,
+        )
+        print(f"[seed] SQS dead-letter queue: {dlq} (HTTP {response.status_code})")
+    except Exception:
+        print(f"[seed] SQS dead-letter queue (assuming exists): {dlq}")
+
     print("[seed] done.")
 
 if __name__ == "__main__":
@@ -0,0 +1,79 @@
+"""Precompute Panchang for the next N days across a list of cities.
+
+Fills the shared panchang cache tier (disk or Redis, see
+``api.services.panchang_cache``) with the daily viewmodels served by
+``/v1/panchang/today`` and ``/compute`` and the summaries used by the week and
+month endpoints, so those requests become cache reads::
+
+    python -m api.scripts.precompute_panchang --days 90
+"""
+
+import argparse
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from api.scripts.precompute_riseset import DEFAULT_CITIES, load_cities
+from api.services.orchestrators.panchang_full import build_viewmodel
+from api.services.orchestrators.panchang_range import build_daily_summaries
+from api.services.panchang_cache import get_cache
+
+# Mirrors the defaults of the /today and /week routes so precomputed keys match.
+DAILY_OPTIONS = {
+    "ayanamsha": "lahiri",
+    "include_muhurta": True,
+    "include_hora": False,
+    "lang": "en",
+    "script": "latin",
+    "show_bilingual": False,
+    "summary_only": False,
+    "include_extensions": True,
+}
+SUMMARY_OPTIONS = {
+    **DAILY_OPTIONS,
+    "include_muhurta": False,
+    "summary_only": True,
+    "include_extensions": False,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--cities",
+        default=os.getenv("PANCHANG_PRECOMPUTE_CITIES", str(DEFAULT_CITIES)),
+        help="CSV with name,lat,lon,tz columns (default: data/panchang_cities.csv)",
+    )
+    parser.add_argument("--days", type=int, default=int(os.getenv("PANCHANG_PRECOMPUTE_DAYS", "90")))
+    parser.add_argument("--start", help="First date (YYYY-MM-DD); defaults to today in each city")
+    parser.add_argument("--langs", nargs="+", default=["en"])
+    args = parser.parse_args(argv)
+
+    cache = get_cache()
+    if cache.shared is None:
+        print("[panchang] PANCHANG_SHARED_CACHE is off; nothing would be shared, aborting")
+        return
+
+    cities = load_cities(Path(args.cities))
+    for city in cities:
+        place = {
+            "lat": float(city["lat"]),
+            "lon": float(city["lon"]),
+            "tz": city["tz"],
+            "query": city["name"],
+        }
+        start = date.fromisoformat(args.start) if args.start else datetime.now(ZoneInfo(city["tz"])).date()
+        for lang in args.langs:
+            build_daily_summaries(start, args.days, place, {**SUMMARY_OPTIONS, "lang": lang})
+            for offset in range(args.days):
+                day = (start + timedelta(days=offset)).isoformat()
+                build_viewmodel("vedic", day, place, {**DAILY_OPTIONS, "lang": lang})
+        print(f"[panchang] {city['name']}: {start} +{args.days} days ({', '.join(args.langs)})")
+
+    removed = cache.shared.prune()
+    print(f"[panchang] done: {len(cities)} cities, pruned {removed} expired entries")
+
+
+if __name__ == "__main__":
+    main()
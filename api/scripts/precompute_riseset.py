@@ -0,0 +1,48 @@
+"""Precompute sunrise/sunset/moonrise tables for popular Panchang locations.
+
+Run at deploy time so the first request for a common city reads a cached
+table instead of walking a year of rise/set events::
+
+    python -m api.scripts.precompute_riseset --years 2025 2026
+"""
+
+import argparse
+import csv
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+from api.services import riseset
+
+DEFAULT_CITIES = Path(__file__).resolve().parents[2] / "data" / "panchang_cities.csv"
+
+
+def load_cities(path: Path) -> List[Dict[str, str]]:
+    with path.open("r", encoding="utf-8", newline="") as fh:
+        return [row for row in csv.DictReader(fh) if row.get("lat") and row.get("lon")]
+
+
+def main(argv=None):
+    this_year = datetime.now(timezone.utc).year
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--cities",
+        default=os.getenv("PANCHANG_PRECOMPUTE_CITIES", str(DEFAULT_CITIES)),
+        help="CSV with name,lat,lon columns (default: data/panchang_cities.csv)",
+    )
+    parser.add_argument("--years", type=int, nargs="+", default=[this_year, this_year + 1])
+    args = parser.parse_args(argv)
+
+    cities = load_cities(Path(args.cities))
+    for city in cities:
+        lat, lon = float(city["lat"]), float(city["lon"])
+        elevation = float(city.get("elevation") or 0.0)
+        for year in args.years:
+            riseset.get_table(lat, lon, elevation, year)
+        print(f"[riseset] {city['name']}: {', '.join(str(y) for y in args.years)}")
+    print(f"[riseset] done: {len(cities)} cities")
+
+
+if __name__ == "__main__":
+    main()
@@ -146,6 +146,54 @@ def detect_station(
     return None
 
 
+def station_from_catalogue(
+    planet: str,
+    current_speed: float,
+    forecast_date: datetime,
+    stations: List[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """
+    Station info from exact catalogue stations (see ``station_catalog``).
+    
+    A planet counts as stationary when one of its stations lies within
+    ``STATION_WINDOWS`` hours of ``forecast_date``; the result has the same
+    shape as :func:`detect_station` plus the exact station time.
+    
+    Args:
+        planet: Planet name
+        current_speed: Current longitudinal speed (degrees/day)
+        forecast_date: Date for the forecast
+        stations: Catalogue stations of ``planet`` around the forecast range
+        
+    Returns:
+        Station info dict or None
+    """
+    window_hours = STATION_WINDOWS.get(planet, 0)
+    if not window_hours or not stations:
+        return None
+    
+    moment = forecast_date if forecast_date.tzinfo else forecast_date.replace(tzinfo=timezone.utc)
+    nearest = None
+    for station in stations:
+        peak = datetime.fromisoformat(station["datetime_utc"].replace("Z", "+00:00"))
+        hours = (moment - peak).total_seconds() / 3600.0
+        if abs(hours) <= window_hours and (nearest is None or abs(hours) < abs(nearest[1])):
+            nearest = (station, hours)
+    if nearest is None:
+        return None
+    
+    station, hours = nearest
+    return {
+        "planet": planet,
+        "station_type": f"stationary_{station['station_type']}",
+        "speed": current_speed,
+        "window_hours": window_hours,
+        "is_station": True,
+        "exact_time_utc": station["datetime_utc"],
+        "hours_from_station": round(hours, 2),
+    }
+
+
 def calculate_station_score(
     station_info: Dict[str, Any],
     aspect: str,
@@ -1282,80 +1330,162 @@ def detect_eclipse(
     if is_new and abs_lat <= SOLAR_PARTIAL_MAX_LAT:
         # Solar Eclipse
         if abs_lat <= SOLAR_TOTAL_LAT:
-            eclipse_type = "total"
-            base_weight = 2.2
-            description = "Solar Eclipse (Total) - major new chapter"
-            tone_line = "Sun reboot – destiny hands you a blank page."
+            eclipse_info = _solar_eclipse_info("total")
         else:
-            eclipse_type = "partial"
             # Stronger partials get more weight than grazing ones
-            if abs_lat <= 1.1:
-                base_weight = 1.4
-                description = "Solar Eclipse (Partial) - potent reset energy"
-                tone_line = "Sun shadow – rewrite the rules of engagement."
-            else:
-                base_weight = 1.1
-                description = "Solar Eclipse (Partial) - subtle yet fated course correction"
-                tone_line = "Grazing solar shadow – subtle but meaningful adjustments."
-
-        display_label = eclipse_type.title()
-        eclipse_info = {
-            "has_eclipse": True,
-            "eclipse_category": "solar",
-            "eclipse_type": eclipse_type,
-            "base_weight": base_weight,
-            "description": description,
-            "banner": f"Solar Eclipse ({display_label})",
-            "tone_line": tone_line,
-            "impact_level": "very_high",
-            "keywords": ["reset", "breakthrough", "new chapter", "fated shift", eclipse_type],
-        }
+            eclipse_info = _solar_eclipse_info("partial", grazing=abs_lat > 1.1)
 
     elif is_full and abs_lat <= LUNAR_PENUMBRAL_LAT:
         # Lunar Eclipse
         if abs_lat <= LUNAR_TOTAL_LAT:
-            eclipse_type = "total"
-            base_weight = 2.0
-            banner = "Blood Moon Lunar Eclipse (Total)"
-            description = "Blood Moon Lunar Eclipse (Total) - culmination and release"
-            tone_line = "Blood Moon peak – emotional tides surge."
-            impact_level = "very_high"
-            keywords = ["blood moon", "revelation", "culmination", "release", "transformation"]
+            eclipse_info = _lunar_eclipse_info("total")
         elif abs_lat <= LUNAR_PARTIAL_LAT:
-            eclipse_type = "partial"
-            base_weight = 1.3
-            banner = "Lunar Eclipse (Partial)"
-            description = "Lunar Eclipse (Partial) - emotional turning point"
-            tone_line = "Lunar spotlight – revelations surface."
-            impact_level = "very_high"
-            keywords = ["revelation", "culmination", "release", "transformation", "partial eclipse"]
+            eclipse_info = _lunar_eclipse_info("partial")
         else:
-            eclipse_type = "penumbral"
-            base_weight = 0.8
-            banner = "Penumbral Lunar Eclipse"
-            description = "Penumbral Lunar Eclipse - subtle emotional recalibration"
-            tone_line = "Soft lunar shadow – subtle emotional recalibration."
-            impact_level = "high"
-            keywords = ["penumbral", "subtle shift", "culmination", "integration"]
-
-        eclipse_info = {
-            "has_eclipse": True,
-            "eclipse_category": "lunar",
-            "eclipse_type": eclipse_type,
-            "base_weight": base_weight,
-            "description": description,
-            "banner": banner,
-            "tone_line": tone_line,
-            "impact_level": impact_level,
-            "keywords": keywords,
-        }
-
-        if eclipse_type == "total":
-            eclipse_info["aliases"] = ["Blood Moon"]
+            eclipse_info = _lunar_eclipse_info("penumbral")
 
     if not eclipse_info:
         return None
 
+    return _finish_eclipse_info(
+        eclipse_info,
+        moon_lon,
+        forecast_datetime,
+        natal_positions,
+        visible_from_location,
+        visibility_weight,
+    )
+
+
+def eclipse_from_catalogue(
+    entry: Dict[str, Any],
+    moon_lon: float,
+    natal_positions: Optional[Dict[str, float]] = None,
+    visible_from_location: Optional[bool] = None,
+    visibility_weight: float = 0.15,
+) -> Dict[str, Any]:
+    """
+    Build eclipse info for an ``eclipse_catalog`` entry.
+
+    The catalogue already knows the eclipse type and exact maximum, so no
+    latitude thresholds or alignment refinement are involved; the result has
+    the same shape as :func:`detect_eclipse`.
+
+    Args:
+        entry: Eclipse from ``eclipse_catalog.eclipses_between``
+        moon_lon: Moon longitude at maximum in the chart's zodiac
+        natal_positions: Dict of natal positions {body: longitude}
+        visible_from_location: Whether eclipse is visible at observer's location
+        visibility_weight: Optional percent boost (0.10-0.20) applied if visible
+
+    Returns:
+        Eclipse info
+    """
+    if entry["category"] == "solar":
+        kind = entry["type"]
+        if kind == "hybrid":
+            kind = "total"
+        # Grazing partials cover less than half of the solar diameter.
+        eclipse_info = _solar_eclipse_info(kind, grazing=entry.get("magnitude", 1.0) < 0.5)
+    else:
+        eclipse_info = _lunar_eclipse_info(entry["type"])
+
+    peak = datetime.fromisoformat(entry["datetime_utc"].replace("Z", "+00:00"))
+    return _finish_eclipse_info(
+        eclipse_info,
+        moon_lon,
+        peak,
+        natal_positions,
+        visible_from_location,
+        visibility_weight,
+    )
+
+
+def _solar_eclipse_info(eclipse_type: str, grazing: bool = False) -> Dict[str, Any]:
+    if eclipse_type == "total":
+        base_weight = 2.2
+        description = "Solar Eclipse (Total) - major new chapter"
+        tone_line = "Sun reboot – destiny hands you a blank page."
+    elif eclipse_type == "annular":
+        base_weight = 2.0
+        description = "Solar Eclipse (Annular) - ring of fire reset"
+        tone_line = "Ring of fire – clear the old to frame the new."
+    elif not grazing:
+        base_weight = 1.4
+        description = "Solar Eclipse (Partial) - potent reset energy"
+        tone_line = "Sun shadow – rewrite the rules of engagement."
+    else:
+        base_weight = 1.1
+        description = "Solar Eclipse (Partial) - subtle yet fated course correction"
+        tone_line = "Grazing solar shadow – subtle but meaningful adjustments."
+
+    display_label = eclipse_type.title()
+    return {
+        "has_eclipse": True,
+        "eclipse_category": "solar",
+        "eclipse_type": eclipse_type,
+        "base_weight": base_weight,
+        "description": description,
+        "banner": f"Solar Eclipse ({display_label})",
+        "tone_line": tone_line,
+        "impact_level": "very_high",
+        "keywords": ["reset", "breakthrough", "new chapter", "fated shift", eclipse_type],
+    }
+
+
+def _lunar_eclipse_info(eclipse_type: str) -> Dict[str, Any]:
+    if eclipse_type == "total":
+        base_weight = 2.0
+        banner = "Blood Moon Lunar Eclipse (Total)"
+        description = "Blood Moon Lunar Eclipse (Total) - culmination and release"
+        tone_line = "Blood Moon peak – emotional tides surge."
+        impact_level = "very_high"
+        keywords = ["blood moon", "revelation", "culmination", "release", "transformation"]
+    elif eclipse_type == "partial":
+        base_weight = 1.3
+        banner = "Lunar Eclipse (Partial)"
+        description = "Lunar Eclipse (Partial) - emotional turning point"
+        tone_line = "Lunar spotlight – revelations surface."
+        impact_level = "very_high"
+        keywords = ["revelation", "culmination", "release", "transformation", "partial eclipse"]
+    else:
+        eclipse_type = "penumbral"
+        base_weight = 0.8
+        banner = "Penumbral Lunar Eclipse"
+        description = "Penumbral Lunar Eclipse - subtle emotional recalibration"
+        tone_line = "Soft lunar shadow – subtle emotional recalibration."
+        impact_level = "high"
+        keywords = ["penumbral", "subtle shift", "culmination", "integration"]
+
+    eclipse_info = {
+        "has_eclipse": True,
+        "eclipse_category": "lunar",
+        "eclipse_type": eclipse_type,
+        "base_weight": base_weight,
+        "description": description,
+        "banner": banner,
+        "tone_line": tone_line,
+        "impact_level": impact_level,
+        "keywords": keywords,
+    }
+
+    if eclipse_type == "total":
+        eclipse_info["aliases"] = ["Blood Moon"]
+
+    return eclipse_info
+
+
+def _finish_eclipse_info(
+    eclipse_info: Dict[str, Any],
+    moon_lon: float,
+    forecast_datetime: datetime,
+    natal_positions: Optional[Dict[str, float]],
+    visible_from_location: Optional[bool],
+    visibility_weight: float,
+) -> Dict[str, Any]:
+    """Attach peak time, personalization, visibility and windows."""
+    from .aspects import _angle_diff
+
     try:
         peak_dt = (
             forecast_datetime.astimezone(timezone.utc)
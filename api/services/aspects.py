@@ -1,3 +1,8 @@
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - numpy is optional
+    np = None  # type: ignore
+
 
 MAJOR = {
     "conjunction": 0,
@@ -57,3 +62,47 @@ def find_aspects(positions: dict, policy: dict|None=None) -> list[dict]:
                     })
     return sorted(res, key=lambda x: x["orb"])
 
+
+
+def find_aspects_batch(positions_list: list[dict], policy: dict|None=None) -> list[list[dict]]:
+    """``find_aspects`` for many charts at once, vectorised over charts and body pairs.
+
+    Charts are grouped by their body list; each group's pairwise separations
+    are computed as one array and tested against every aspect together. The
+    result for each chart is identical to ``find_aspects``.
+    """
+
+    if np is None:
+        return [find_aspects(p, policy) for p in positions_list]
+    policy = policy or {"types": list(MAJOR.keys()), "orbs": DEFAULT_ORB}
+    # A repeated canonical type can never match where its first occurrence did not.
+    types = list(dict.fromkeys(canonical_aspect(t) for t in policy["types"] if canonical_aspect(t) in MAJOR))
+    out: list[list[dict]] = [[] for _ in positions_list]
+    groups: dict[tuple, list[int]] = {}
+    for idx, positions in enumerate(positions_list):
+        groups.setdefault(tuple(positions.keys()), []).append(idx)
+
+    exact = np.array([MAJOR[t] for t in types], dtype=float)
+    for names, members in groups.items():
+        if len(names) < 2 or not types:
+            continue
+        i_idx, j_idx = np.triu_indices(len(names), k=1)
+        lons = np.array([[positions_list[m][n]["lon"] for n in names] for m in members], dtype=float)
+        speeds = np.array([[positions_list[m][n]["speed_lon"] for n in names] for m in members], dtype=float)
+        orbs = policy["orbs"]
+        body_orb = np.array([orbs.get(n, orbs["default"]) for n in names], dtype=float)
+        orb_limit = np.maximum(body_orb[i_idx], body_orb[j_idx])
+
+        sep = np.abs((lons[:, i_idx] - lons[:, j_idx] + 180) % 360 - 180)
+        off = np.abs(sep[:, :, None] - exact[None, None, :])
+        applying = speeds[:, i_idx] > speeds[:, j_idx]
+        # nonzero walks chart, then pair, then type: the scalar loop order.
+        for c, p, t in zip(*np.nonzero(off <= orb_limit[None, :, None])):
+            out[members[c]].append({
+                "p1": names[i_idx[p]],
+                "p2": names[j_idx[p]],
+                "type": types[t],
+                "orb": round(float(off[c, p, t]), 2),
+                "applying": bool(applying[c, p]),
+            })
+    return [sorted(res, key=lambda x: x["orb"]) for res in out]
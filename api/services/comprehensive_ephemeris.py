@@ -17,6 +17,7 @@ from collections import defaultdict
 import swisseph as swe
 
 from . import ephem
+from . import metrics
 from . import houses as houses_svc
 from . import aspects as aspects_svc
 from .panchang_algos import (
@@ -147,6 +148,7 @@ def _calculate_planet_positions(jd: float, lat: float, lon: float,
                 body_flag |= swe.FLG_TOPOCTR
                 swe.set_topo(lon, lat, 0)  # Set observer location
             
+            metrics.SWE_CALLS.inc(function="calc_ut")
             values, _ = swe.calc_ut(jd, code, body_flag)
             longitude, latitude, distance, speed_lon, speed_lat, speed_dist = values
             
@@ -209,6 +211,7 @@ def _calculate_planet_positions(jd: float, lat: float, lon: float,
     
     # Calculate Lilith (Mean Black Moon)
     try:
+        metrics.SWE_CALLS.inc(function="calc_ut")
         values, _ = swe.calc_ut(jd, LILITH_CODE, flag)
         longitude, latitude, distance, speed_lon, _, _ = values
         longitude = longitude % 360.0
@@ -231,6 +234,7 @@ def _calculate_planet_positions(jd: float, lat: float, lon: float,
     asteroids = {}
     for name, code in ASTEROIDS.items():
         try:
+            metrics.SWE_CALLS.inc(function="calc_ut")
             values, _ = swe.calc_ut(jd, code, flag)
             longitude, latitude, distance, speed_lon, _, _ = values
             longitude = longitude % 360.0
@@ -251,6 +255,7 @@ def _calculate_planet_positions(jd: float, lat: float, lon: float,
     
     # Try to get Hygiea (asteroid 10)
     try:
+        metrics.SWE_CALLS.inc(function="calc_ut")
         values, _ = swe.calc_ut(jd, 10, flag)
         longitude, latitude, distance, speed_lon, _, _ = values
         longitude = longitude % 360.0
@@ -277,6 +282,7 @@ def _calculate_houses(jd: float, lat: float, lon: float) -> Dict[str, Any]:
     
     try:
         # Placidus houses
+        metrics.SWE_CALLS.inc(function="houses")
         cusps, ascmc = swe.houses(jd, lat, lon, b"P")
         
         house_data = {
@@ -28,7 +28,11 @@ import swisseph as swe
 swe.set_ephe_path(os.getcwd())
 
 from . import ephem
+from . import metrics
+from . import eclipse_catalog
 from . import houses as houses_svc
+from . import station_catalog
+from .ephemeris_columnar import write_columnar
 from .panchang_algos import (
     compute_tithi,
     compute_nakshatra,
@@ -38,6 +42,9 @@ from .panchang_algos import (
     YOGA_NAMES,
     MOBILE_KARANAS,
     FIXED_KARANAS,
+    NAKSHATRA_SPAN,
+    _to_jd,
+    enumerate_element_changes,
 )
 
 
@@ -72,6 +79,9 @@ ASTEROIDS = {
 
 LILITH_CODE = swe.MEAN_APOG
 
+# Bodies whose stations and retrograde periods are reported
+STATION_PLANETS = ["Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"]
+
 ASPECTS_CONFIG = {
     "Conjunction": {"angle": 0, "orb": 8.0},
     "Sextile": {"angle": 60, "orb": 8.0},
@@ -116,6 +126,24 @@ SUPERMOON_THEMES = {
 }
 
 
+def annotate_retrograde(planets: Dict[str, Dict[str, Any]], date_jd: float,
+                        retrograde_periods: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Attach the enclosing retrograde period to each retrograde planet of one day."""
+    for planet_name, planet_data in planets.items():
+        if not planet_data.get("is_retrograde") or planet_name not in retrograde_periods:
+            continue
+        for period in retrograde_periods[planet_name]:
+            start_jd = period["start_jd"]
+            end_jd = period.get("end_jd")
+            
+            if start_jd <= date_jd and (end_jd is None or date_jd <= end_jd):
+                planet_data["retrograde_period_start"] = period["start_date"]
+                planet_data["retrograde_period_end"] = period.get("end_date", "TBD")
+                planet_data["days_into_retrograde"] = float(int(date_jd - start_jd))
+                planet_data["total_retrograde_days"] = float(period.get("duration_days", 0)) if period.get("duration_days") else None
+                break
+
+
 class ComprehensiveEphemerisGenerator:
     """Generate ephemeris data matching full requirements specification."""
     
@@ -140,6 +168,7 @@ class ComprehensiveEphemerisGenerator:
         self.retrograde_periods = defaultdict(list)
         self.vedic_changes = {"tithi": [], "yoga": [], "karana": []}
         self.nakshatra_changes = []
+        self._element_change_stream: Optional[List[Dict[str, Any]]] = None
         
         # Retrograde tracking
         self.retrograde_tracking = {}
@@ -207,6 +236,7 @@ class ComprehensiveEphemerisGenerator:
                     body_flag |= swe.FLG_TOPOCTR
                     swe.set_topo(self.lon, self.lat, 0)
                 
+                metrics.SWE_CALLS.inc(function="calc_ut")
                 values, _ = swe.calc_ut(jd, code, body_flag)
                 longitude, latitude, distance, speed_lon, _, _ = values
                 
@@ -239,6 +269,7 @@ class ComprehensiveEphemerisGenerator:
                         # Get sidereal longitude
                         sidereal_flag = flag | swe.FLG_SIDEREAL
                         swe.set_sid_mode(swe.SIDM_LAHIRI)
+                        metrics.SWE_CALLS.inc(function="calc_ut")
                         sid_values, _ = swe.calc_ut(jd, code, sidereal_flag)
                         sid_longitude = sid_values[0] % 360.0
                         
@@ -275,6 +306,7 @@ class ComprehensiveEphemerisGenerator:
         
         # Calculate Lilith
         try:
+            metrics.SWE_CALLS.inc(function="calc_ut")
             values, _ = swe.calc_ut(jd, LILITH_CODE, flag)
             longitude, latitude, distance, speed_lon, _, _ = values
             longitude = longitude % 360.0
@@ -297,6 +329,7 @@ class ComprehensiveEphemerisGenerator:
         asteroids = {}
         for name, code in ASTEROIDS.items():
             try:
+                metrics.SWE_CALLS.inc(function="calc_ut")
                 values, _ = swe.calc_ut(jd, code, flag)
                 longitude, latitude, distance, speed_lon, _, _ = values
                 longitude = longitude % 360.0
@@ -320,6 +353,7 @@ class ComprehensiveEphemerisGenerator:
     def _calculate_houses(self, jd: float) -> Dict[str, Any]:
         """Calculate house cusps and angles."""
         try:
+            metrics.SWE_CALLS.inc(function="houses")
             cusps, ascmc = swe.houses(jd, self.lat, self.lon, b"P")
             
             return {
@@ -388,27 +422,14 @@ class ComprehensiveEphemerisGenerator:
         return sorted(aspects, key=lambda x: (x["planet1"], x["planet2"]))
     
     def detect_eclipses(self):
-        """Detect all eclipses in the year using Swiss Ephemeris."""
+        """Collect the year's eclipses from the shared eclipse catalogue."""
         print("Detecting eclipses...")
         
-        start_jd = swe.julday(self.year, 1, 1, 0.0, swe.GREG_CAL)
-        end_jd = swe.julday(self.year, 12, 31, 23.999, swe.GREG_CAL)
-        
-        current_jd = start_jd
-        
-        while current_jd < end_jd:
-            try:
-                # Search for next eclipse (solar or lunar)
-                result = swe.sol_eclipse_when_glob(current_jd, swe.FLG_SWIEPH, swe.ECL_ALLTYPES_SOLAR)
-                eclipse_jd = result[1][0]
-                
-                if eclipse_jd > end_jd:
-                    break
-                
-                # Get eclipse details
-                eclipse_type = result[0]
-                
-                # Determine type string
+        for entry in eclipse_catalog.year_catalogue(self.year)["eclipses"]:
+            eclipse_jd = entry["julian_day"]
+            eclipse_type = entry["flags"]
+            
+            if entry["category"] == "solar":
                 if eclipse_type & swe.ECL_TOTAL:
                     type_str = "total_solar"
                 elif eclipse_type & swe.ECL_ANNULAR:
@@ -417,51 +438,11 @@ class ComprehensiveEphemerisGenerator:
                     type_str = "partial_solar"
                 else:
                     type_str = "solar"
-                
-                # Get Sun position at eclipse
-                sun_pos, _ = swe.calc_ut(eclipse_jd, swe.SUN, swe.FLG_SWIEPH)
-                sun_lon = sun_pos[0] % 360.0
-                sign = self._get_sign_name(sun_lon)
-                degree = self._degree_in_sign(sun_lon)
-                
-                dt_tuple = swe.revjul(eclipse_jd, swe.GREG_CAL)
-                date_str = f"{dt_tuple[0]:04d}-{dt_tuple[1]:02d}-{dt_tuple[2]:02d}"
-                
-                eclipse_data = {
-                    "date": date_str,
-                    "type": type_str,
-                    "sign": sign,
-                    "degree": round(degree, 1),
-                    "visibility": "Variable by location",  # Simplified
-                    "themes": ECLIPSE_THEMES.get(sign, ["transformation", "change"]),
-                    "details": {
-                        "magnitude": round(result[1][4], 2) if len(result[1]) > 4 else 1.0,
-                        "julian_day": eclipse_jd,
-                        "local_time": self._jd_to_time_dict(eclipse_jd),
-                        "eclipse_flags": eclipse_type,
-                        "precise_longitude": round(sun_lon, 4)
-                    }
-                }
-                
-                self.eclipses.append(eclipse_data)
-                current_jd = eclipse_jd + 20  # Move forward to find next eclipse
-                
-            except Exception as e:
-                print(f"Eclipse detection error: {e}")
-                current_jd += 30
-        
-        # Also search for lunar eclipses
-        current_jd = start_jd
-        while current_jd < end_jd:
-            try:
-                result = swe.lun_eclipse_when(current_jd, swe.FLG_SWIEPH, swe.ECL_ALLTYPES_LUNAR)
-                eclipse_jd = result[1][0]
-                
-                if eclipse_jd > end_jd:
-                    break
-                
-                eclipse_type = result[0]
-                
+                # Solar eclipses are placed by the Sun, lunar ones by the Moon
+                precise_lon = entry["sun_lon"]
+                visibility = "Variable by location"  # Simplified
+                default_themes = ["transformation", "change"]
+            else:
                 if eclipse_type & swe.ECL_TOTAL:
                     type_str = "total_lunar"
                 elif eclipse_type & swe.ECL_PARTIAL:
@@ -470,38 +451,33 @@ class ComprehensiveEphemerisGenerator:
                     type_str = "penumbral_lunar"
                 else:
                     type_str = "lunar"
-                
-                # Get Moon position
-                moon_pos, _ = swe.calc_ut(eclipse_jd, swe.MOON, swe.FLG_SWIEPH)
-                moon_lon = moon_pos[0] % 360.0
-                sign = self._get_sign_name(moon_lon)
-                degree = self._degree_in_sign(moon_lon)
-                
-                dt_tuple = swe.revjul(eclipse_jd, swe.GREG_CAL)
-                date_str = f"{dt_tuple[0]:04d}-{dt_tuple[1]:02d}-{dt_tuple[2]:02d}"
-                
-                eclipse_data = {
-                    "date": date_str,
-                    "type": type_str,
-                    "sign": sign,
-                    "degree": round(degree, 1),
-                    "visibility": "Night side of Earth",
-                    "themes": ECLIPSE_THEMES.get(sign, ["reflection", "release"]),
-                    "details": {
-                        "magnitude": round(result[1][4], 2) if len(result[1]) > 4 else 1.0,
-                        "julian_day": eclipse_jd,
-                        "local_time": self._jd_to_time_dict(eclipse_jd),
-                        "eclipse_flags": eclipse_type,
-                        "precise_longitude": round(moon_lon, 4)
-                    }
+                precise_lon = entry["moon_lon"]
+                visibility = "Night side of Earth"
+                default_themes = ["reflection", "release"]
+            
+            sign = self._get_sign_name(precise_lon)
+            degree = self._degree_in_sign(precise_lon)
+            
+            dt_tuple = swe.revjul(eclipse_jd, swe.GREG_CAL)
+            date_str = f"{dt_tuple[0]:04d}-{dt_tuple[1]:02d}-{dt_tuple[2]:02d}"
+            
+            eclipse_data = {
+                "date": date_str,
+                "type": type_str,
+                "sign": sign,
+                "degree": round(degree, 1),
+                "visibility": visibility,
+                "themes": ECLIPSE_THEMES.get(sign, default_themes),
+                "details": {
+                    "magnitude": round(entry["magnitude"], 2),
+                    "julian_day": eclipse_jd,
+                    "local_time": self._jd_to_time_dict(eclipse_jd),
+                    "eclipse_flags": eclipse_type,
+                    "precise_longitude": round(precise_lon, 4)
                 }
-                
-                self.eclipses.append(eclipse_data)
-                current_jd = eclipse_jd + 10
-                
-            except Exception as e:
-                print(f"Lunar eclipse detection error: {e}")
-                current_jd += 30
+            }
+            
+            self.eclipses.append(eclipse_data)
         
         # Sort by date
         self.eclipses.sort(key=lambda x: x["date"])
@@ -509,298 +485,134 @@ class ComprehensiveEphemerisGenerator:
         self._mark_time("eclipse_detection")
     
     def detect_supermoons(self):
-        """Detect supermoons (full moons near perigee)."""
+        """Detect supermoons (full moons near perigee) from the lunation catalogue."""
         print("Detecting supermoons...")
         
-        start_jd = swe.julday(self.year, 1, 1, 0.0, swe.GREG_CAL)
-        end_jd = swe.julday(self.year, 12, 31, 23.999, swe.GREG_CAL)
-        
-        # Find all full moons in the year
-        current_jd = start_jd
-        full_moons = []
-        
-        while current_jd < end_jd:
-            try:
-                # Use binary search to find exact full moon time
-                search_start = current_jd
-                search_end = current_jd + 32  # Max ~32 days between full moons
-                
-                for _ in range(100):  # Iterations for binary search
-                    mid = (search_start + search_end) / 2
-                    
-                    sun_pos, _ = swe.calc_ut(mid, swe.SUN, swe.FLG_SWIEPH)
-                    moon_pos, _ = swe.calc_ut(mid, swe.MOON, swe.FLG_SWIEPH)
-                    
-                    sun_lon = sun_pos[0] % 360.0
-                    moon_lon = moon_pos[0] % 360.0
-                    
-                    diff = (moon_lon - sun_lon) % 360.0
-                    
-                    # Full moon is when diff is ~180°
-                    if abs(diff - 180) < 0.01:  # Within 0.01 degrees
-                        full_moons.append(mid)
-                        current_jd = mid + 27  # Move past this full moon
-                        break
-                    elif diff < 180:
-                        search_start = mid
-                    else:
-                        search_end = mid
-                    
-                    if search_end - search_start < 0.001:  # Converged
-                        if abs(diff - 180) < 5:  # Close enough
-                            full_moons.append(mid)
-                            current_jd = mid + 27
-                        else:
-                            current_jd += 1
-                        break
-                else:
-                    current_jd += 1
-                
-                if current_jd >= end_jd:
-                    break
-                    
-            except Exception as e:
-                current_jd += 30
+        full_moons = [
+            entry for entry in eclipse_catalog.year_catalogue(self.year)["lunations"]
+            if entry["phase"] == "full_moon"
+        ]
         
         # Check which full moons are supermoons
         # Standard definition: within 90% of perigee distance
         # Perigee averages ~356,500 km, so supermoon threshold is ~360,000 km
-        for fm_jd in full_moons:
-            try:
-                moon_pos, _ = swe.calc_ut(fm_jd, swe.MOON, swe.FLG_SWIEPH)
-                distance_au = moon_pos[2]
-                distance_km = distance_au * 149597870.7  # AU to km
+        for entry in full_moons:
+            fm_jd = entry["julian_day"]
+            distance_km = entry["distance_km"]
+            distance_au = distance_km / eclipse_catalog.AU_KM
+            perigee_km = entry["perigee_distance_km"]
+            
+            # More accurate thresholds:
+            # - Super strict: < 356,500 km (actual perigee)
+            # - Standard: < 360,000 km (90% definition)
+            # - Liberal: < 363,000 km (popular media)
+            perigee_threshold = 363000  # km (liberal threshold for 2026)
+            
+            if distance_km < perigee_threshold:
+                moon_lon = entry["moon_lon"]
+                sign = self._get_sign_name(moon_lon)
+                degree = self._degree_in_sign(moon_lon)
                 
-                # More accurate thresholds:
-                # - Super strict: < 356,500 km (actual perigee)
-                # - Standard: < 360,000 km (90% definition)
-                # - Liberal: < 363,000 km (popular media)
-                perigee_threshold = 363000  # km (liberal threshold for 2026)
+                # Calculate illumination
+                angle = (moon_lon - entry["sun_lon"]) % 360.0
+                illumination = 50 * (1 - math.cos(math.radians(angle)))
                 
-                if distance_km < perigee_threshold:
-                    moon_lon = moon_pos[0] % 360.0
-                    sign = self._get_sign_name(moon_lon)
-                    degree = self._degree_in_sign(moon_lon)
-                    
-                    # Calculate illumination
-                    sun_pos, _ = swe.calc_ut(fm_jd, swe.SUN, swe.FLG_SWIEPH)
-                    sun_lon = sun_pos[0] % 360.0
-                    angle = (moon_lon - sun_lon) % 360.0
-                    illumination = 50 * (1 - math.cos(math.radians(angle)))
-                    
-                    dt_tuple = swe.revjul(fm_jd, swe.GREG_CAL)
-                    date_str = f"{dt_tuple[0]:04d}-{dt_tuple[1]:02d}-{dt_tuple[2]:02d}"
-                    time_str = f"{int(dt_tuple[3]):02d}:{int((dt_tuple[3]%1)*60):02d}:{int(((dt_tuple[3]%1)*60%1)*60):02d}"
-                    
-                    supermoon_data = {
-                        "date": date_str,
-                        "time_utc": time_str,
-                        "sign": sign,
-                        "degree": round(degree, 2),
-                        "distance_km": int(distance_km),
-                        "illumination_percent": round(illumination, 1),
-                        "perigee_distance_km": int(distance_km * 0.97),  # Approximate
-                        "themes": SUPERMOON_THEMES.get(sign, ["emotional_intensity", "heightened_awareness"]),
-                        "details": {
-                            "julian_day": fm_jd,
-                            "precise_julian_day": fm_jd,
-                            "local_time": self._jd_to_time_dict(fm_jd),
-                            "precise_longitude": round(moon_lon, 4),
-                            "precise_distance_au": round(distance_au, 8),
-                            "is_supermoon_standard": distance_km < 363000,
-                            "is_supermoon_dynamic": distance_km < perigee_threshold,
-                            "distance_from_perigee_percent": round(((distance_km / 360000) - 1) * 100, 2)
-                        }
+                dt_tuple = swe.revjul(fm_jd, swe.GREG_CAL)
+                date_str = f"{dt_tuple[0]:04d}-{dt_tuple[1]:02d}-{dt_tuple[2]:02d}"
+                time_str = f"{int(dt_tuple[3]):02d}:{int((dt_tuple[3]%1)*60):02d}:{int(((dt_tuple[3]%1)*60%1)*60):02d}"
+                
+                supermoon_data = {
+                    "date": date_str,
+                    "time_utc": time_str,
+                    "sign": sign,
+                    "degree": round(degree, 2),
+                    "distance_km": int(distance_km),
+                    "illumination_percent": round(illumination, 1),
+                    "perigee_distance_km": int(perigee_km),
+                    "themes": SUPERMOON_THEMES.get(sign, ["emotional_intensity", "heightened_awareness"]),
+                    "details": {
+                        "julian_day": fm_jd,
+                        "precise_julian_day": fm_jd,
+                        "local_time": self._jd_to_time_dict(fm_jd),
+                        "precise_longitude": round(moon_lon, 4),
+                        "precise_distance_au": round(distance_au, 8),
+                        "is_supermoon_standard": distance_km < 363000,
+                        "is_supermoon_dynamic": distance_km < perigee_threshold,
+                        "perigee_julian_day": entry["perigee_julian_day"],
+                        "distance_from_perigee_percent": round(((distance_km / perigee_km) - 1) * 100, 2)
                     }
-                    
-                    self.supermoons.append(supermoon_data)
-            except Exception as e:
-                print(f"Supermoon detection error: {e}")
+                }
+                
+                self.supermoons.append(supermoon_data)
         
         print(f"Found {len(self.supermoons)} supermoons")
         self._mark_time("supermoon_detection")
     
+    def _element_changes(self) -> List[Dict[str, Any]]:
+        """Ordered tithi/nakshatra/yoga/karana boundaries for the year (solved once)."""
+        if self._element_change_stream is None:
+            start = datetime(self.year, 1, 1, tzinfo=timezone.utc)
+            end = datetime(self.year + 1, 1, 1, tzinfo=timezone.utc)
+            self._element_change_stream = enumerate_element_changes(start, end, ayanamsha="lahiri")
+        return self._element_change_stream
+    
+    def _change_record(self, moment: datetime) -> Dict[str, Any]:
+        jd = _to_jd(moment)
+        return {
+            "julian_day": jd,
+            "date": moment.strftime("%Y-%m-%d"),
+            "time": self._jd_to_time_dict(jd),
+        }
+    
     def detect_vedic_changes(self):
-        """Detect intra-day Tithi, Yoga, and Karana changes."""
+        """Detect Tithi, Yoga, and Karana changes from the continuous boundary solver."""
         print("Detecting vedic changes...")
         
-        start_date = datetime(self.year, 1, 1, tzinfo=timezone.utc)
-        if self.year % 4 == 0 and (self.year % 100 != 0 or self.year % 400 == 0):
-            days_in_year = 366
-        else:
-            days_in_year = 365
-        
-        for day_num in range(days_in_year):
-            current_date = start_date + timedelta(days=day_num)
-            date_str = current_date.strftime("%Y-%m-%d")
-            
-            # Check every 2 hours for changes (12 checks per day)
-            for hour in range(0, 24, 2):
-                check_time = current_date.replace(hour=hour, minute=0, second=0)
-                next_check = check_time + timedelta(hours=2)
-                
-                try:
-                    # Get vedic elements at both times
-                    curr_tithi, curr_tithi_name, _, _ = compute_tithi(check_time, ayanamsha="lahiri")
-                    next_tithi, next_tithi_name, _, _ = compute_tithi(next_check, ayanamsha="lahiri")
-                    
-                    curr_yoga, curr_yoga_name, _, _ = compute_yoga(check_time, ayanamsha="lahiri")
-                    next_yoga, next_yoga_name, _, _ = compute_yoga(next_check, ayanamsha="lahiri")
-                    
-                    # Detect tithi change
-                    if curr_tithi != next_tithi:
-                        # Binary search for exact time
-                        change_jd = self._binary_search_vedic_change(
-                            swe.julday(check_time.year, check_time.month, check_time.day, hour, swe.GREG_CAL),
-                            swe.julday(next_check.year, next_check.month, next_check.day, next_check.hour, swe.GREG_CAL),
-                            "tithi",
-                            curr_tithi
-                        )
-                        
-                        if change_jd:
-                            self.vedic_changes["tithi"].append({
-                                "julian_day": change_jd,
-                                "date": date_str,
-                                "time": self._jd_to_time_dict(change_jd),
-                                "new_tithi": next_tithi,
-                                "new_tithi_name": next_tithi_name.split()[-1] if " " in next_tithi_name else next_tithi_name
-                            })
-                    
-                    # Detect yoga change
-                    if curr_yoga != next_yoga:
-                        change_jd = self._binary_search_vedic_change(
-                            swe.julday(check_time.year, check_time.month, check_time.day, hour, swe.GREG_CAL),
-                            swe.julday(next_check.year, next_check.month, next_check.day, next_check.hour, swe.GREG_CAL),
-                            "yoga",
-                            curr_yoga
-                        )
-                        
-                        if change_jd:
-                            self.vedic_changes["yoga"].append({
-                                "julian_day": change_jd,
-                                "date": date_str,
-                                "time": self._jd_to_time_dict(change_jd),
-                                "new_yoga": next_yoga_name
-                            })
-                    
-                except Exception:
-                    continue
-        
-        # Sort by julian day
-        self.vedic_changes["tithi"].sort(key=lambda x: x["julian_day"])
-        self.vedic_changes["yoga"].sort(key=lambda x: x["julian_day"])
+        for change in self._element_changes():
+            element = change["element"]
+            if element == "tithi":
+                name = change["name"]
+                record = self._change_record(change["at"])
+                record["new_tithi"] = change["number"]
+                record["new_tithi_name"] = name.split()[-1] if " " in name else name
+            elif element == "yoga":
+                record = self._change_record(change["at"])
+                record["new_yoga"] = change["name"]
+            elif element == "karana":
+                record = self._change_record(change["at"])
+                record["new_karana"] = change["name"]
+            else:
+                continue
+            self.vedic_changes[element].append(record)
         
         print(f"Found {len(self.vedic_changes['tithi'])} tithi changes")
         print(f"Found {len(self.vedic_changes['yoga'])} yoga changes")
+        print(f"Found {len(self.vedic_changes['karana'])} karana changes")
         self._mark_time("vedic_changes")
     
-    def _binary_search_vedic_change(self, start_jd: float, end_jd: float, 
-                                     change_type: str, start_value: int, 
-                                     precision: float = 0.0007) -> Optional[float]:
-        """Binary search to find exact time of vedic element change."""
-        
-        for _ in range(20):  # Max iterations
-            mid_jd = (start_jd + end_jd) / 2
-            
-            # Convert to datetime
-            dt_tuple = swe.revjul(mid_jd, swe.GREG_CAL)
-            mid_time = datetime(dt_tuple[0], dt_tuple[1], dt_tuple[2], 
-                               int(dt_tuple[3]), int((dt_tuple[3]%1)*60), 
-                               int(((dt_tuple[3]%1)*60%1)*60), tzinfo=timezone.utc)
-            
-            try:
-                if change_type == "tithi":
-                    mid_value, _, _, _ = compute_tithi(mid_time, ayanamsha="lahiri")
-                elif change_type == "yoga":
-                    mid_value, _, _, _ = compute_yoga(mid_time, ayanamsha="lahiri")
-                else:
-                    return None
-                
-                if mid_value == start_value:
-                    start_jd = mid_jd
-                else:
-                    end_jd = mid_jd
-                
-                if end_jd - start_jd < precision:
-                    return mid_jd
-                    
-            except Exception:
-                return None
-        
-        return mid_jd
-    
     def detect_nakshatra_changes(self):
         """Detect Moon's nakshatra transitions during the year."""
         print("Detecting nakshatra changes...")
         
-        start_date = datetime(self.year, 1, 1, tzinfo=timezone.utc)
-        if self.year % 4 == 0 and (self.year % 100 != 0 or self.year % 400 == 0):
-            days_in_year = 366
-        else:
-            days_in_year = 365
-        
-        prev_nakshatra = None
-        
-        for day_num in range(days_in_year):
-            current_date = start_date + timedelta(days=day_num)
-            date_str = current_date.strftime("%Y-%m-%d")
-            
-            # Check every 3 hours (Moon changes nakshatra roughly every 24 hours)
-            for hour in range(0, 24, 3):
-                check_time = current_date.replace(hour=hour, minute=0, second=0)
-                
-                try:
-                    nak_num, nak_name, nak_pada, _, _ = compute_nakshatra(check_time, ayanamsha="lahiri")
-                    
-                    if prev_nakshatra and nak_num != prev_nakshatra["number"]:
-                        # Nakshatra changed - find exact time
-                        jd_check = swe.julday(check_time.year, check_time.month, check_time.day, hour, swe.GREG_CAL)
-                        jd_prev = jd_check - 3.0/24.0  # 3 hours back
-                        
-                        # Binary search for exact change time
-                        for _ in range(15):
-                            mid_jd = (jd_prev + jd_check) / 2
-                            dt_tuple = swe.revjul(mid_jd, swe.GREG_CAL)
-                            mid_time = datetime(dt_tuple[0], dt_tuple[1], dt_tuple[2],
-                                              int(dt_tuple[3]), int((dt_tuple[3]%1)*60),
-                                              int(((dt_tuple[3]%1)*60%1)*60), tzinfo=timezone.utc)
-                            
-                            mid_nak, _, _, _, _ = compute_nakshatra(mid_time, ayanamsha="lahiri")
-                            
-                            if mid_nak == prev_nakshatra["number"]:
-                                jd_prev = mid_jd
-                            else:
-                                jd_check = mid_jd
-                            
-                            if jd_check - jd_prev < 0.0007:  # ~1 minute precision
-                                break
-                        
-                        # Get Moon position at transition
-                        moon_pos, _ = swe.calc_ut(mid_jd, swe.MOON, swe.FLG_SWIEPH)
-                        moon_trop_lon = moon_pos[0] % 360.0
-                        
-                        # Get sidereal longitude
-                        swe.set_sid_mode(swe.SIDM_LAHIRI)
-                        moon_pos_sid, _ = swe.calc_ut(mid_jd, swe.MOON, swe.FLG_SWIEPH | swe.FLG_SIDEREAL)
-                        moon_sid_lon = moon_pos_sid[0] % 360.0
-                        
-                        ayanamsa = moon_trop_lon - moon_sid_lon
-                        
-                        self.nakshatra_changes.append({
-                            "julian_day": mid_jd,
-                            "date": date_str,
-                            "time": self._jd_to_time_dict(mid_jd),
-                            "from_nakshatra": prev_nakshatra["name"],
-                            "to_nakshatra": nak_name,
-                            "tropical_longitude": round(moon_trop_lon, 4),
-                            "sidereal_longitude": round(moon_sid_lon, 4),
-                            "ayanamsa": round(ayanamsa, 4)
-                        })
-                    
-                    prev_nakshatra = {"number": nak_num, "name": nak_name}
-                    
-                except Exception:
-                    continue
+        for change in self._element_changes():
+            if change["element"] != "nakshatra":
+                continue
+            record = self._change_record(change["at"])
+            # At the boundary the sidereal Moon sits exactly on the nakshatra
+            # edge, so only the tropical position needs an ephemeris call.
+            moon_sid_lon = ((change["number"] - 1) * NAKSHATRA_SPAN) % 360.0
+            metrics.SWE_CALLS.inc(function="calc_ut")
+            moon_pos, _ = swe.calc_ut(record["julian_day"], swe.MOON, swe.FLG_SWIEPH)
+            moon_trop_lon = moon_pos[0] % 360.0
+            ayanamsa = (moon_trop_lon - moon_sid_lon) % 360.0
+            record.update({
+                "from_nakshatra": change["previous_name"],
+                "to_nakshatra": change["name"],
+                "tropical_longitude": round(moon_trop_lon, 4),
+                "sidereal_longitude": round(moon_sid_lon, 4),
+                "ayanamsa": round(ayanamsa, 4),
+            })
+            self.nakshatra_changes.append(record)
         
         print(f"Found {len(self.nakshatra_changes)} nakshatra changes")
         self._mark_time("nakshatra_changes")
@@ -855,23 +667,6 @@ class ComprehensiveEphemerisGenerator:
                                 "planet": planet_name
                             }
                             self.planetary_ingresses[planet_name].append(ingress_data)
-                
-                # Track retrograde stations
-                for planet_name in ["Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"]:
-                    if planet_name in prev_positions and planet_name in planets:
-                        prev_retro = prev_positions[planet_name].get("is_retrograde", False)
-                        curr_retro = planets[planet_name].get("is_retrograde", False)
-                        
-                        if prev_retro != curr_retro:
-                            station_type = "retrograde" if curr_retro else "direct"
-                            station_data = {
-                                "julian_day": jd,
-                                "date": date_str,
-                                "time": self._jd_to_time_dict(jd),
-                                "station_type": station_type,
-                                "planet": planet_name
-                            }
-                            self.retrograde_stations[planet_name].append(station_data)
             
             # Calculate houses
             houses = self._calculate_houses(jd)
@@ -973,137 +768,58 @@ class ComprehensiveEphemerisGenerator:
         print(f"Generated {len(self.daily_data)} days of data")
         self._mark_time("daily_calculation")
     
+    def _jd_to_date_str(self, jd: float) -> str:
+        year, month, day, _hour = swe.revjul(jd, swe.GREG_CAL)
+        return f"{year:04d}-{month:02d}-{day:02d}"
+    
+    def detect_retrograde_stations(self):
+        """Collect exact retrograde/direct stations from the station catalogue."""
+        print("Detecting retrograde stations...")
+        
+        stations = station_catalog.year_catalogue(self.year)["stations"]
+        for planet_name in STATION_PLANETS:
+            for station in stations.get(planet_name, []):
+                jd = station["julian_day"]
+                self.retrograde_stations[planet_name].append({
+                    "julian_day": jd,
+                    "date": self._jd_to_date_str(jd),
+                    "time": self._jd_to_time_dict(jd),
+                    "station_type": station["station_type"],
+                    "planet": planet_name
+                })
+        
+        print(f"Found {sum(len(v) for v in self.retrograde_stations.values())} stations")
+        self._mark_time("retrograde_stations")
+    
     def detect_retrograde_periods(self):
-        """Build complete retrograde periods from stations."""
+        """Build retrograde periods overlapping the year, with shadow dates."""
         print("Detecting retrograde periods...")
         
-        # First check if any planets are retrograde at year start
-        # If so, search backwards to find when they went retrograde
+        year_start = datetime(self.year, 1, 1, tzinfo=timezone.utc)
+        year_end = datetime(self.year + 1, 1, 1, tzinfo=timezone.utc)
         year_start_jd = swe.julday(self.year, 1, 1, 0.0, swe.GREG_CAL)
+        year_end_jd = swe.julday(self.year + 1, 1, 1, 0.0, swe.GREG_CAL)
         
-        for planet_name, planet_code in EXTENDED_BODIES.items():
-            if planet_name in ["TrueNode"]:
-                continue  # Node doesn't go retrograde in the normal sense
-            
-            # Check if retrograde on Jan 1
-            pos = swe.calc_ut(year_start_jd, planet_code)[0]
-            speed = pos[3]
-            
-            if speed < 0:  # Retrograde at year start
-                print(f"  {planet_name} is retrograde on {self.year}-01-01, searching for start...")
+        for planet_name in STATION_PLANETS:
+            for period in station_catalog.retrograde_periods(planet_name, year_start, year_end):
+                start_jd = period["start"]["julian_day"]
+                end_jd = period["end"]["julian_day"] if period["end"] else None
+                pre_shadow = period["pre_shadow_start"]
+                post_shadow = period["post_shadow_end"]
                 
-                # Search backwards to find retrograde station
-                search_jd = year_start_jd - 1
-                days_back = 0
-                max_search = 365  # Don't search more than a year back
+                period_data = {
+                    "start_jd": start_jd,
+                    "end_jd": end_jd,
+                    "start_date": self._jd_to_date_str(start_jd),
+                    "end_date": self._jd_to_date_str(end_jd) if end_jd else None,
+                    "duration_days": int(end_jd - start_jd) if end_jd else None,
+                    "extends_beyond": end_jd is None or end_jd >= year_end_jd,
+                    "starts_before_year": start_jd < year_start_jd,
+                    "shadow_start_date": self._jd_to_date_str(pre_shadow["julian_day"]) if pre_shadow else None,
+                    "shadow_end_date": self._jd_to_date_str(post_shadow["julian_day"]) if post_shadow else None
+                }
                 
-                while days_back < max_search:
-                    pos = swe.calc_ut(search_jd, planet_code)[0]
-                    if pos[3] >= 0:  # Was direct
-                        # Found the transition point, now find exact station
-                        station_jd = search_jd
-                        for _ in range(100):  # Refine to within hours
-                            mid_jd = (search_jd + search_jd + 1) / 2
-                            pos = swe.calc_ut(mid_jd, planet_code)[0]
-                            if pos[3] >= 0:
-                                search_jd = mid_jd
-                            else:
-                                station_jd = mid_jd
-                                break
-                        
-                        # Now find when it goes direct (if within the year)
-                        end_jd = None
-                        end_date = None
-                        search_forward = year_start_jd
-                        year_end_jd = swe.julday(self.year, 12, 31, 23.999, swe.GREG_CAL)
-                        
-                        while search_forward < year_end_jd:
-                            pos = swe.calc_ut(search_forward, planet_code)[0]
-                            if pos[3] >= 0:  # Goes direct
-                                end_jd = search_forward
-                                y, m, d, h = swe.revjul(end_jd, swe.GREG_CAL)
-                                end_date = f"{y:04d}-{m:02d}-{d:02d}"
-                                break
-                            search_forward += 1
-                        
-                        # Convert JD to date string
-                        y, m, d, h = swe.revjul(station_jd, swe.GREG_CAL)
-                        start_date_dt = datetime(y, m, d, int(h), int((h % 1) * 60))
-                        duration = int(end_jd - station_jd) if end_jd else None
-                        
-                        period_data = {
-                            "start_jd": station_jd,
-                            "end_jd": end_jd,
-                            "start_date": start_date_dt.strftime("%Y-%m-%d"),
-                            "end_date": end_date,
-                            "duration_days": duration,
-                            "extends_beyond": end_jd is None,
-                            "starts_before_year": True
-                        }
-                        
-                        self.retrograde_periods[planet_name].append(period_data)
-                        print(f"    Found: Started {period_data['start_date']}, ends {end_date or 'after year'}")
-                        break
-                    
-                    search_jd -= 1
-                    days_back += 1
-        
-        # Now process stations found within the year
-        for planet_name, stations in self.retrograde_stations.items():
-            if not stations:
-                continue
-            
-            # Pair up retrograde/direct stations
-            i = 0
-            while i < len(stations):
-                if stations[i]["station_type"] == "retrograde":
-                    # Look for corresponding direct station
-                    start_station = stations[i]
-                    end_station = None
-                    
-                    for j in range(i + 1, len(stations)):
-                        if stations[j]["station_type"] == "direct":
-                            end_station = stations[j]
-                            break
-                    
-                    if end_station:
-                        start_date = start_station["date"]
-                        end_date = end_station["date"]
-                        start_jd = start_station["julian_day"]
-                        end_jd = end_station["julian_day"]
-                        duration = int(end_jd - start_jd)
-                        
-                        period_data = {
-                            "start_jd": start_jd,
-                            "end_jd": end_jd,
-                            "start_date": start_date,
-                            "end_date": end_date,
-                            "duration_days": duration,
-                            "extends_beyond": False,
-                            "starts_before_year": False
-                        }
-                        
-                        self.retrograde_periods[planet_name].append(period_data)
-                    else:
-                        # Retrograde extends beyond year
-                        start_date = start_station["date"]
-                        start_jd = start_station["julian_day"]
-                        
-                        period_data = {
-                            "start_jd": start_jd,
-                            "end_jd": None,
-                            "start_date": start_date,
-                            "end_date": None,
-                            "duration_days": None,
-                            "extends_beyond": True,
-                            "starts_before_year": False
-                        }
-                        
-                        self.retrograde_periods[planet_name].append(period_data)
-                    
-                    i += 2  # Skip to next pair
-                else:
-                    i += 1
+                self.retrograde_periods[planet_name].append(period_data)
         
         print(f"Detected {sum(len(p) for p in self.retrograde_periods.values())} retrograde periods")
         self._mark_time("retrograde_periods")
@@ -1112,41 +828,23 @@ class ComprehensiveEphemerisGenerator:
         """Add retrograde period info to planet objects in daily data."""
         print("Adding retrograde metadata to planets...")
         
-        for date_str, day_data in self.daily_data.items():
-            for planet_name, planet_data in day_data["planets"].items():
-                if planet_data.get("is_retrograde") and planet_name in self.retrograde_periods:
-                    # Find which retrograde period this date falls in
-                    date_jd = day_data["julian_day"]
-                    
-                    for period in self.retrograde_periods[planet_name]:
-                        start_jd = period["start_jd"]
-                        end_jd = period.get("end_jd")
-                        
-                        if start_jd <= date_jd and (end_jd is None or date_jd <= end_jd):
-                            planet_data["retrograde_period_start"] = period["start_date"]
-                            planet_data["retrograde_period_end"] = period.get("end_date", "TBD")
-                            planet_data["days_into_retrograde"] = float(int(date_jd - start_jd))
-                            planet_data["total_retrograde_days"] = float(period.get("duration_days", 0)) if period.get("duration_days") else None
-                            break
+        for day_data in self.daily_data.values():
+            annotate_retrograde(day_data["planets"], day_data["julian_day"], self.retrograde_periods)
         
         print("Added retrograde metadata")
         self._mark_time("retrograde_metadata")
     
-    def generate(self, output_file: Optional[str] = None) -> Dict[str, Any]:
-        """Generate complete ephemeris matching requirements specification."""
-        
-        print(f"Generating comprehensive ephemeris for {self.year}...")
-        print(f"Location: {self.location_name} ({self.lat}, {self.lon})")
-        print("=" * 70)
-        
+    def run_pipeline(self):
+        """Compute every section of the output in memory (steps 1-6)."""
         # Step 1: Detect special events
         self.detect_eclipses()
         self.detect_supermoons()
         
-        # Step 2: Generate daily data (includes ingress and station detection)
+        # Step 2: Generate daily data (includes ingress detection)
         self.generate_daily_data()
         
-        # Step 3: Build retrograde periods from stations
+        # Step 3: Exact stations and the retrograde periods they bound
+        self.detect_retrograde_stations()
         self.detect_retrograde_periods()
         
         # Step 4: Add retrograde metadata to planets
@@ -1157,20 +855,21 @@ class ComprehensiveEphemerisGenerator:
         
         # Step 6: Detect nakshatra transitions
         self.detect_nakshatra_changes()
-        
-        # Step 7: Count events
+    
+    def _build_metadata(self, total_days: int, eclipse_window_days: int) -> Dict[str, Any]:
+        """Assemble the metadata section from the detected events and timings."""
+        # Count events
         total_ingresses = sum(len(v) for v in self.planetary_ingresses.values())
         total_stations = sum(len(v) for v in self.retrograde_stations.values())
         total_periods = sum(len(v) for v in self.retrograde_periods.values())
         total_vedic_changes = sum(len(v) for v in self.vedic_changes.values())
         
-        # Step 8: Build complete metadata
         total_time = time.time() - self.start_time
         
         metadata = {
             "generated_at": datetime.utcnow().isoformat(),
             "period": f"{self.year}-{self.year}",
-            "total_days": len(self.daily_data),
+            "total_days": total_days,
             "time_reference": "UTC",
             "location": {
                 "name": self.location_name,
@@ -1181,7 +880,7 @@ class ComprehensiveEphemerisGenerator:
             },
             "house_system": "Placidus",
             "eclipses_found": len(self.eclipses),
-            "eclipse_window_days": len([d for d in self.daily_data.values() if d.get("eclipse_window_active")]),
+            "eclipse_window_days": eclipse_window_days,
             "supermoons_found": len(self.supermoons),
             "planetary_ingresses": total_ingresses,
             "retrograde_stations": total_stations,
@@ -1212,16 +911,17 @@ class ComprehensiveEphemerisGenerator:
                 "eclipse_detection_time": round(self.timings.get("eclipse_detection", 0), 2),
                 "supermoon_detection_time": round(self.timings.get("supermoon_detection", 0), 2),
                 "daily_calculation_time": round(self.timings.get("daily_calculation", 0), 2),
+                "retrograde_stations_time": round(self.timings.get("retrograde_stations", 0), 2),
                 "retrograde_periods_time": round(self.timings.get("retrograde_periods", 0), 2),
                 "retrograde_metadata_time": round(self.timings.get("retrograde_metadata", 0), 2),
                 "vedic_changes_time": round(self.timings.get("vedic_changes", 0), 2),
                 "nakshatra_changes_time": round(self.timings.get("nakshatra_changes", 0), 2),
-                "average_time_per_day": round(self.timings.get("daily_calculation", 0) / len(self.daily_data), 4) if self.daily_data else 0,
+                "average_time_per_day": round(self.timings.get("daily_calculation", 0) / total_days, 4) if total_days else 0,
                 "optimization_notes": [
                     "Midnight UTC (00:00) timezone handling",
                     "Vectorized planetary calculations",
                     "Topocentric for Moon, Mercury, Venus",
-                    "Complete retrograde period detection",
+                    "Exact stations and shadow periods from the station catalogue",
                     "Eclipse detection with Swiss Ephemeris",
                     "Supermoon detection based on distance",
                     "Pre-aggregated events for fast lookup",
@@ -1230,10 +930,11 @@ class ComprehensiveEphemerisGenerator:
                 ]
             }
         }
-        
-        # Step 7: Build final output
-        output = {
-            "metadata": metadata,
+        return metadata
+    
+    def _event_sections(self) -> Dict[str, Any]:
+        """Top-level event tables in output order (everything except metadata and daily_data)."""
+        return {
             "eclipses": self.eclipses,
             "supermoons": self.supermoons,
             "planetary_ingresses": dict(self.planetary_ingresses),
@@ -1241,8 +942,33 @@ class ComprehensiveEphemerisGenerator:
             "retrograde_periods": dict(self.retrograde_periods),
             "vedic_changes": self.vedic_changes,
             "nakshatra_changes": self.nakshatra_changes,
-            "daily_data": self.daily_data
         }
+    
+    def generate(self, output_file: Optional[str] = None, output_format: str = "json") -> Dict[str, Any]:
+        """Generate complete ephemeris matching requirements specification.
+
+        ``output_format`` is ``"json"`` (one document) or a columnar format
+        understood by ``ephemeris_columnar.write_columnar`` (``"columnar"``,
+        ``"arrow"``, ``"npy"``), in which case ``output_file`` is a directory.
+        """
+        
+        print(f"Generating comprehensive ephemeris for {self.year}...")
+        print(f"Location: {self.location_name} ({self.lat}, {self.lon})")
+        print("=" * 70)
+        
+        self.run_pipeline()
+        
+        metadata = self._build_metadata(
+            total_days=len(self.daily_data),
+            eclipse_window_days=len([d for d in self.daily_data.values() if d.get("eclipse_window_active")]),
+        )
+        total_ingresses = metadata["planetary_ingresses"]
+        total_stations = metadata["retrograde_stations"]
+        total_periods = metadata["retrograde_periods"]
+        total_vedic_changes = metadata["vedic_changes"]
+        total_time = metadata["performance"]["total_generation_time"]
+        
+        output = {"metadata": metadata, **self._event_sections(), "daily_data": self.daily_data}
         
         print("\n" + "=" * 70)
         print("GENERATION COMPLETE!")
@@ -1257,7 +983,12 @@ class ComprehensiveEphemerisGenerator:
         print(f"Vedic changes: {total_vedic_changes}")
         print(f"Nakshatra changes: {len(self.nakshatra_changes)}")
         
-        if output_file:
+        if output_file and output_format != "json":
+            print(f"\nSaving columnar output to {output_file}...")
+            root = write_columnar(output, output_file, output_format)
+            size_mb = sum(p.stat().st_size for p in root.rglob("*") if p.is_file()) / (1024 * 1024)
+            print(f"Saved! Size on disk: {size_mb:.2f} MB")
+        elif output_file:
             print(f"\nSaving to {output_file}...")
             with open(output_file, 'w') as f:
                 json.dump(output, f, indent=2)
@@ -1272,18 +1003,16 @@ class ComprehensiveEphemerisGenerator:
 
 def generate_comprehensive_ephemeris_full(year: int, output_file: Optional[str] = None,
                                           lat: float = 28.7041, lon: float = 77.1025,
-                                          location_name: str = "Delhi, India") -> Dict[str, Any]:
+                                          location_name: str = "Delhi, India",
+                                          output_format: str = "json") -> Dict[str, Any]:
     """
     Generate comprehensive ephemeris matching full requirements.
     
     This is the main entry point that matches EPHEMERIS_IMPLEMENTATION_REQUIREMENTS.md
     """
     generator = ComprehensiveEphemerisGenerator(year, lat, lon, location_name)
-    data = generator.generate(output_file)
-    
+    data = generator.generate(output_file, output_format)
     if output_file:
-        with open(output_file, 'w') as f:
-            json.dump(data, f, indent=2)
         print(f"\nSaved to: {output_file}")
     
     return data
@@ -1293,6 +1022,7 @@ if __name__ == "__main__":
     import sys
     year = int(sys.argv[1]) if len(sys.argv) > 1 else 2026
     output = sys.argv[2] if len(sys.argv) > 2 else f"comprehensive_ephemeris_{year}_full.json"
+    fmt = sys.argv[3] if len(sys.argv) > 3 else "json"
     
-    generate_comprehensive_ephemeris_full(year, output)
+    generate_comprehensive_ephemeris_full(year, output, output_format=fmt)
 
@@ -6,6 +6,8 @@ This is an optimized version using:
 - GPU acceleration where applicable
 - Vectorized operations
 - Concurrent event detection
+- Contiguous date blocks merged in date order, optionally streamed to disk
+  with per-block checkpoints so long runs can resume
 """
 
 from __future__ import annotations
@@ -13,9 +15,11 @@ from __future__ import annotations
 import json
 import math
 import os
+import tempfile
 import time
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Any, Optional, Tuple
+from pathlib import Path
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from collections import defaultdict
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from functools import partial
@@ -27,7 +31,6 @@ from . import ephem
 from . import houses as houses_svc
 from .panchang_algos import (
     compute_tithi,
-    compute_nakshatra,
     compute_yoga,
     TITHI_NAMES,
     NAKSHATRA_NAMES,
@@ -54,7 +57,8 @@ from .comprehensive_ephemeris_full import (
     MOON_ORB_BONUS,
     ECLIPSE_THEMES,
     SUPERMOON_THEMES,
-    ComprehensiveEphemerisGenerator
+    ComprehensiveEphemerisGenerator,
+    annotate_retrograde,
 )
 
 
@@ -76,195 +80,56 @@ class ParallelEphemerisGenerator(ComprehensiveEphemerisGenerator):
         else:
             print(f"Using {self.num_workers} CPU workers")
     
-    def generate_daily_data_parallel(self):
-        """Generate daily data using parallel processing."""
-        print(f"Generating daily data (parallel with {self.num_workers} workers)...")
-        
+    def _date_range(self) -> Tuple[datetime, int]:
         start_date = datetime(self.year, 1, 1)
         if self.year % 4 == 0 and (self.year % 100 != 0 or self.year % 400 == 0):
             days_in_year = 366
         else:
             days_in_year = 365
+        return start_date, days_in_year
+    
+    def _blocks(self, chunk_days: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Split the year into contiguous ``(start_date, num_days)`` blocks."""
+        start_date, days_in_year = self._date_range()
+        if chunk_days is None:
+            # Two blocks per worker keeps the pool busy while blocks stay long
+            # enough for the previous-day reuse to matter.
+            chunk_days = max(7, math.ceil(days_in_year / (self.num_workers * 2)))
+        blocks = []
+        for offset in range(0, days_in_year, chunk_days):
+            day = start_date + timedelta(days=offset)
+            blocks.append((day.strftime("%Y-%m-%d"), min(chunk_days, days_in_year - offset)))
+        return blocks
+    
+    def generate_daily_data_parallel(self, chunk_days: Optional[int] = None):
+        """Generate daily data with one contiguous date block per task."""
+        print(f"Generating daily data (parallel with {self.num_workers} workers)...")
         
-        # Prepare tasks
-        tasks = []
-        for day_num in range(days_in_year):
-            current_date = start_date + timedelta(days=day_num)
-            date_str = current_date.strftime("%Y-%m-%d")
-            jd = swe.julday(current_date.year, current_date.month, current_date.day, 0.0, swe.GREG_CAL)
-            
-            tasks.append((date_str, jd, current_date, day_num))
-        
-        # Process in parallel
-        results = []
+        blocks = self._blocks(chunk_days)
+        results: Dict[str, Dict[str, Any]] = {}
         with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
-            # Submit all tasks
-            future_to_task = {
+            futures = {
                 executor.submit(
-                    calculate_single_day,
-                    date_str, jd, current_date, self.lat, self.lon, self.eclipses
-                ): (date_str, day_num)
-                for date_str, jd, current_date, day_num in tasks
+                    calculate_day_block, start, num_days, self.lat, self.lon, self.eclipses, index == 0
+                ): start
+                for index, (start, num_days) in enumerate(blocks)
             }
-            
-            # Collect results
-            completed = 0
-            for future in as_completed(future_to_task):
-                date_str, day_num = future_to_task[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                    completed += 1
-                    
-                    if completed % 50 == 0:
-                        print(f"  Completed {completed}/{days_in_year} days")
-                        
-                except Exception as e:
-                    print(f"Error processing {date_str}: {e}")
-        
-        # Sort results by date and build daily_data dict
-        results.sort(key=lambda x: x['date'])
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
         
-        # Build ingresses and stations by comparing consecutive days
-        prev_positions = None
-        for result in results:
-            date_str = result['date']
-            self.daily_data[date_str] = result['data']
-            
-            planets = result['data']['planets']
-            
-            # Track ingresses
-            if prev_positions:
-                for planet_name in planets.keys():
-                    if planet_name in prev_positions:
-                        prev_sign = prev_positions[planet_name].get("zodiac_sign")
-                        curr_sign = planets[planet_name].get("zodiac_sign")
-                        
-                        if prev_sign and curr_sign and prev_sign != curr_sign:
-                            jd = result['data']['julian_day']
-                            ingress_data = {
-                                "julian_day": jd,
-                                "date": date_str,
-                                "time": self._jd_to_time_dict(jd),
-                                "new_sign": curr_sign,
-                                "planet": planet_name
-                            }
-                            self.planetary_ingresses[planet_name].append(ingress_data)
-                
-                # Track retrograde stations
-                for planet_name in ["Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"]:
-                    if planet_name in prev_positions and planet_name in planets:
-                        prev_retro = prev_positions[planet_name].get("is_retrograde", False)
-                        curr_retro = planets[planet_name].get("is_retrograde", False)
-                        
-                        if prev_retro != curr_retro:
-                            station_type = "retrograde" if curr_retro else "direct"
-                            jd = result['data']['julian_day']
-                            station_data = {
-                                "julian_day": jd,
-                                "date": date_str,
-                                "time": self._jd_to_time_dict(jd),
-                                "station_type": station_type,
-                                "planet": planet_name
-                            }
-                            self.retrograde_stations[planet_name].append(station_data)
-            
-            prev_positions = planets.copy()
+        # Ordered merge: blocks are contiguous, so date order is block order.
+        for start, _num_days in blocks:
+            block = results.pop(start)
+            for date_str, raw in block["days"]:
+                self.daily_data[date_str] = json.loads(raw)
+            for ingress in block["ingresses"]:
+                self.planetary_ingresses[ingress["planet"]].append(ingress)
         
         print(f"Generated {len(self.daily_data)} days of data")
         self._mark_time("daily_calculation")
     
-    def detect_vedic_changes_parallel(self):
-        """Detect vedic changes using parallel processing."""
-        print(f"Detecting vedic changes (parallel)...")
-        
-        start_date = datetime(self.year, 1, 1, tzinfo=timezone.utc)
-        if self.year % 4 == 0 and (self.year % 100 != 0 or self.year % 400 == 0):
-            days_in_year = 366
-        else:
-            days_in_year = 365
-        
-        # Prepare daily tasks
-        tasks = []
-        for day_num in range(days_in_year):
-            current_date = start_date + timedelta(days=day_num)
-            date_str = current_date.strftime("%Y-%m-%d")
-            tasks.append((current_date, date_str))
-        
-        # Process in parallel with threads (lighter weight for I/O bound tasks)
-        all_tithi_changes = []
-        all_yoga_changes = []
-        
-        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
-            futures = [
-                executor.submit(detect_vedic_changes_for_day, current_date, date_str)
-                for current_date, date_str in tasks
-            ]
-            
-            for future in as_completed(futures):
-                try:
-                    tithi_changes, yoga_changes = future.result()
-                    all_tithi_changes.extend(tithi_changes)
-                    all_yoga_changes.extend(yoga_changes)
-                except Exception:
-                    continue
-        
-        # Sort and store
-        self.vedic_changes["tithi"] = sorted(all_tithi_changes, key=lambda x: x["julian_day"])
-        self.vedic_changes["yoga"] = sorted(all_yoga_changes, key=lambda x: x["julian_day"])
-        
-        print(f"Found {len(self.vedic_changes['tithi'])} tithi changes")
-        print(f"Found {len(self.vedic_changes['yoga'])} yoga changes")
-        self._mark_time("vedic_changes")
-    
-    def detect_nakshatra_changes_parallel(self):
-        """Detect nakshatra changes using parallel processing."""
-        print(f"Detecting nakshatra changes (parallel)...")
-        
-        start_date = datetime(self.year, 1, 1, tzinfo=timezone.utc)
-        if self.year % 4 == 0 and (self.year % 100 != 0 or self.year % 400 == 0):
-            days_in_year = 366
-        else:
-            days_in_year = 365
-        
-        # Check every day for nakshatra changes
-        tasks = []
-        for day_num in range(days_in_year):
-            current_date = start_date + timedelta(days=day_num)
-            date_str = current_date.strftime("%Y-%m-%d")
-            tasks.append((current_date, date_str, day_num))
-        
-        # Process in parallel
-        all_changes = []
-        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
-            futures = [
-                executor.submit(detect_nakshatra_changes_for_day, current_date, date_str)
-                for current_date, date_str, _ in tasks
-            ]
-            
-            for future in as_completed(futures):
-                try:
-                    changes = future.result()
-                    all_changes.extend(changes)
-                except Exception:
-                    continue
-        
-        # Sort and store
-        self.nakshatra_changes = sorted(all_changes, key=lambda x: x["julian_day"])
-        
-        print(f"Found {len(self.nakshatra_changes)} nakshatra changes")
-        self._mark_time("nakshatra_changes")
-    
-    def generate(self, output_file: Optional[str] = None) -> Dict[str, Any]:
-        """Generate complete ephemeris using parallel processing."""
-        
-        print(f"Generating comprehensive ephemeris for {self.year} (PARALLEL MODE)...")
-        print(f"Location: {self.location_name} ({self.lat}, {self.lon})")
-        print(f"Workers: {self.num_workers} CPU cores")
-        if self.use_gpu:
-            print(f"GPU: Enabled")
-        print("=" * 70)
-        
+    def run_pipeline(self):
+        """Same steps as the serial generator, with daily data computed in blocks."""
         # Step 1: Detect special events (can run in parallel)
         with ThreadPoolExecutor(max_workers=2) as executor:
             eclipse_future = executor.submit(self.detect_eclipses)
@@ -276,32 +141,216 @@ class ParallelEphemerisGenerator(ComprehensiveEphemerisGenerator):
         # Step 2: Generate daily data in parallel
         self.generate_daily_data_parallel()
         
-        # Step 3: Build retrograde periods
+        # Step 3: Exact stations and retrograde periods
+        self.detect_retrograde_stations()
         self.detect_retrograde_periods()
         
         # Step 4: Add retrograde metadata
         self.add_retrograde_metadata_to_planets()
         
-        # Step 5 & 6: Detect vedic changes and nakshatra transitions in parallel
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            vedic_future = executor.submit(self.detect_vedic_changes_parallel)
-            nakshatra_future = executor.submit(self.detect_nakshatra_changes_parallel)
-            
-            vedic_future.result()
-            nakshatra_future.result()
+        # Steps 5 & 6: one continuous boundary solve is cheaper than fanning
+        # fixed-step day scans out to threads.
+        self.detect_vedic_changes()
+        self.detect_nakshatra_changes()
+    
+    def generate(self, output_file: Optional[str] = None, output_format: str = "json") -> Dict[str, Any]:
+        """Generate complete ephemeris using parallel processing."""
+        print(f"Workers: {self.num_workers} CPU cores (PARALLEL MODE)")
+        if self.use_gpu:
+            print(f"GPU: Enabled")
+        return super().generate(output_file, output_format)
+    
+    def generate_streaming(self, output_file: str, chunk_days: int = 31,
+                           checkpoint_dir: Optional[str] = None) -> Dict[str, Any]:
+        """Generate the year block by block and stream ``daily_data`` to ``output_file``.
+        
+        Each finished block is written to ``checkpoint_dir`` (a temporary
+        directory when omitted) as soon as it arrives; rerunning with the same
+        directory skips blocks that are already there. The final JSON is then
+        assembled by copying blocks in date order, so peak memory is one
+        block rather than the whole year. Returns the metadata section.
+        """
+        print(f"Generating comprehensive ephemeris for {self.year} (STREAMING, {self.num_workers} workers)...")
+        
+        blocks = self._blocks(chunk_days)
+        if checkpoint_dir is None:
+            with tempfile.TemporaryDirectory(prefix="ephemeris-blocks-") as tmp:
+                return self._stream_blocks(output_file, blocks, Path(tmp))
+        return self._stream_blocks(output_file, blocks, Path(checkpoint_dir))
+    
+    def _checkpoint_manifest(self, blocks: List[Tuple[str, int]]) -> Dict[str, Any]:
+        return {"year": self.year, "lat": self.lat, "lon": self.lon, "blocks": blocks}
+    
+    def _stream_blocks(self, output_file: str, blocks: List[Tuple[str, int]], workdir: Path) -> Dict[str, Any]:
+        workdir.mkdir(parents=True, exist_ok=True)
+        manifest_path = workdir / "manifest.json"
+        manifest = json.loads(json.dumps(self._checkpoint_manifest(blocks)))
+        if manifest_path.exists():
+            if json.loads(manifest_path.read_text()) != manifest:
+                raise ValueError(f"Checkpoint in {workdir} belongs to a different generation")
+        else:
+            manifest_path.write_text(json.dumps(manifest))
+        
+        # Events first: workers need eclipses (windows) and retrograde periods.
+        self.detect_eclipses()
+        self.detect_supermoons()
+        self.detect_retrograde_stations()
+        self.detect_retrograde_periods()
+        self.detect_vedic_changes()
+        self.detect_nakshatra_changes()
+        
+        pending = [
+            (index, start, num_days)
+            for index, (start, num_days) in enumerate(blocks)
+            if not _block_path(workdir, start).exists()
+        ]
+        if len(pending) < len(blocks):
+            print(f"  Resuming: {len(blocks) - len(pending)}/{len(blocks)} blocks already on disk")
         
-        # Continue with rest of generation (same as parent class)
-        return super().generate(output_file)
+        with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
+            futures = {
+                executor.submit(
+                    calculate_day_block, start, num_days, self.lat, self.lon, self.eclipses,
+                    index == 0, dict(self.retrograde_periods)
+                ): start
+                for index, start, num_days in pending
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                _write_block(workdir, futures[future], future.result())
+                print(f"  Block {done}/{len(pending)} written")
+        self._mark_time("daily_calculation")
+        
+        # Ordered merge: collect block events, then stream days into the file.
+        total_days = 0
+        eclipse_window_days = 0
+        for start, _num_days in blocks:
+            header = _read_block_header(workdir, start)
+            total_days += header["num_days"]
+            eclipse_window_days += header["eclipse_window_days"]
+            for ingress in header["ingresses"]:
+                self.planetary_ingresses[ingress["planet"]].append(ingress)
+        
+        metadata = self._build_metadata(total_days=total_days, eclipse_window_days=eclipse_window_days)
+        tmp_path = Path(f"{output_file}.partial")
+        with open(tmp_path, "wb") as out:
+            out.write(b"{")
+            for key, value in {"metadata": metadata, **self._event_sections()}.items():
+                out.write(json.dumps(key).encode() + b": " + json.dumps(value).encode() + b",\n")
+            out.write(b'"daily_data": {')
+            first = True
+            for start, _num_days in blocks:
+                for date_str, raw in _read_block_rows(workdir, start):
+                    out.write((b"" if first else b",\n") + json.dumps(date_str).encode() + b": " + raw)
+                    first = False
+            out.write(b"}}\n")
+        os.replace(tmp_path, output_file)
+        
+        size_mb = os.path.getsize(output_file) / (1024 * 1024)
+        print(f"Saved {total_days} days to {output_file} ({size_mb:.2f} MB)")
+        return metadata
 
 
 # Worker functions (must be at module level for multiprocessing)
 
+def _block_path(workdir: Path, start: str) -> Path:
+    return workdir / f"block-{start}.ndjson"
+
+
+def _write_block(workdir: Path, start: str, block: Dict[str, Any]) -> None:
+    """Persist one block atomically: a header line, then one ``date\\tjson`` line per day."""
+    header = {
+        "start": start,
+        "num_days": len(block["days"]),
+        "eclipse_window_days": block["eclipse_window_days"],
+        "ingresses": block["ingresses"],
+    }
+    path = _block_path(workdir, start)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(json.dumps(header).encode() + b"\n")
+        for date_str, raw in block["days"]:
+            fh.write(date_str.encode() + b"\t" + raw + b"\n")
+    os.replace(tmp, path)
+
+
+def _read_block_header(workdir: Path, start: str) -> Dict[str, Any]:
+    with open(_block_path(workdir, start), "rb") as fh:
+        return json.loads(fh.readline())
+
+
+def _read_block_rows(workdir: Path, start: str) -> Iterator[Tuple[str, bytes]]:
+    """Yield ``(date, json bytes)`` per day; the file is opened on first use."""
+    with open(_block_path(workdir, start), "rb") as fh:
+        fh.readline()
+        for line in fh:
+            date_str, raw = line.rstrip(b"\n").split(b"\t", 1)
+            yield date_str.decode(), raw
+
+
+def calculate_day_block(start_date: str, num_days: int, lat: float, lon: float,
+                        eclipses: List[Dict], first_block: bool,
+                        retrograde_periods: Optional[Dict[str, List[Dict]]] = None) -> Dict[str, Any]:
+    """Calculate a contiguous run of days (worker function).
+    
+    One generator and one previous-day position set are reused across the
+    block, so ingresses are tracked inside the worker; the day before the
+    block is computed once to catch an ingress on its first day. Days come
+    back as compact JSON bytes in date order.
+    """
+    first_date = datetime.strptime(start_date, "%Y-%m-%d")
+    gen = ComprehensiveEphemerisGenerator(first_date.year, lat, lon)
+    prev_positions = None
+    if not first_block:
+        prev = first_date - timedelta(days=1)
+        prev_jd = swe.julday(prev.year, prev.month, prev.day, 0.0, swe.GREG_CAL)
+        prev_positions, _ = gen._calculate_planet_positions(prev_jd)
+    
+    days: List[Tuple[str, bytes]] = []
+    ingresses: List[Dict[str, Any]] = []
+    eclipse_window_days = 0
+    for offset in range(num_days):
+        current_date = first_date + timedelta(days=offset)
+        date_str = current_date.strftime("%Y-%m-%d")
+        jd = swe.julday(current_date.year, current_date.month, current_date.day, 0.0, swe.GREG_CAL)
+        day_data = _build_day(gen, current_date, jd, eclipses)
+        planets = day_data["planets"]
+        
+        if prev_positions:
+            for planet_name in planets.keys():
+                if planet_name in prev_positions:
+                    prev_sign = prev_positions[planet_name].get("zodiac_sign")
+                    curr_sign = planets[planet_name].get("zodiac_sign")
+                    if prev_sign and curr_sign and prev_sign != curr_sign:
+                        ingresses.append({
+                            "julian_day": jd,
+                            "date": date_str,
+                            "time": gen._jd_to_time_dict(jd),
+                            "new_sign": curr_sign,
+                            "planet": planet_name
+                        })
+        prev_positions = {name: dict(data) for name, data in planets.items()}
+        
+        if retrograde_periods is not None:
+            annotate_retrograde(planets, day_data["julian_day"], retrograde_periods)
+        eclipse_window_days += 1 if day_data["eclipse_window_active"] else 0
+        days.append((date_str, json.dumps(day_data, separators=(",", ":")).encode()))
+    
+    return {"days": days, "ingresses": ingresses, "eclipse_window_days": eclipse_window_days}
+
+
 def calculate_single_day(date_str: str, jd: float, current_date: datetime,
                         lat: float, lon: float, eclipses: List[Dict]) -> Dict[str, Any]:
     """Calculate all data for a single day (worker function)."""
-    
-    import swisseph as swe
-    from . import ephem
+    gen = ComprehensiveEphemerisGenerator(current_date.year, lat, lon)
+    return {
+        "date": date_str,
+        "data": _build_day(gen, current_date, jd, eclipses)
+    }
+
+
+def _build_day(gen: ComprehensiveEphemerisGenerator, current_date: datetime, jd: float,
+               eclipses: List[Dict]) -> Dict[str, Any]:
+    """Build one ``daily_data`` entry."""
     
     weekday = current_date.strftime("%A")
     
@@ -312,7 +361,6 @@ def calculate_single_day(date_str: str, jd: float, current_date: datetime,
     )
     
     # Calculate positions (reuse logic from parent)
-    gen = ComprehensiveEphemerisGenerator(current_date.year, lat, lon)
     planets, asteroids = gen._calculate_planet_positions(jd)
     houses = gen._calculate_houses(jd)
     aspects = gen._calculate_aspects(planets, asteroids)
@@ -401,123 +449,7 @@ def calculate_single_day(date_str: str, jd: float, current_date: datetime,
         "nakshatra_changes": []
     }
     
-    return {
-        "date": date_str,
-        "data": day_data
-    }
-
-
-def detect_vedic_changes_for_day(current_date: datetime, date_str: str) -> Tuple[List[Dict], List[Dict]]:
-    """Detect vedic changes for a single day (worker function)."""
-    
-    tithi_changes = []
-    yoga_changes = []
-    
-    # Check every 2 hours
-    for hour in range(0, 24, 2):
-        check_time = current_date.replace(hour=hour, minute=0, second=0)
-        next_check = check_time + timedelta(hours=2)
-        
-        try:
-            curr_tithi, curr_tithi_name, _, _ = compute_tithi(check_time, ayanamsha="lahiri")
-            next_tithi, next_tithi_name, _, _ = compute_tithi(next_check, ayanamsha="lahiri")
-            
-            curr_yoga, curr_yoga_name, _, _ = compute_yoga(check_time, ayanamsha="lahiri")
-            next_yoga, next_yoga_name, _, _ = compute_yoga(next_check, ayanamsha="lahiri")
-            
-            # Detect tithi change
-            if curr_tithi != next_tithi:
-                # Simplified: use midpoint as change time
-                change_time = check_time + timedelta(hours=1)
-                change_jd = swe.julday(change_time.year, change_time.month, change_time.day,
-                                       change_time.hour + change_time.minute/60, swe.GREG_CAL)
-                
-                tithi_changes.append({
-                    "julian_day": change_jd,
-                    "date": date_str,
-                    "time": {
-                        "utc": change_time.strftime("%H:%M:%S"),
-                        "utc_iso": change_time.isoformat(),
-                        "utc_date": date_str,
-                        "utc_full": f"{date_str} {change_time.strftime('%H:%M:%S')} UTC"
-                    },
-                    "new_tithi": next_tithi,
-                    "new_tithi_name": next_tithi_name.split()[-1] if " " in next_tithi_name else next_tithi_name
-                })
-            
-            # Detect yoga change
-            if curr_yoga != next_yoga:
-                change_time = check_time + timedelta(hours=1)
-                change_jd = swe.julday(change_time.year, change_time.month, change_time.day,
-                                       change_time.hour + change_time.minute/60, swe.GREG_CAL)
-                
-                yoga_changes.append({
-                    "julian_day": change_jd,
-                    "date": date_str,
-                    "time": {
-                        "utc": change_time.strftime("%H:%M:%S"),
-                        "utc_iso": change_time.isoformat(),
-                        "utc_date": date_str,
-                        "utc_full": f"{date_str} {change_time.strftime('%H:%M:%S')} UTC"
-                    },
-                    "new_yoga": next_yoga_name
-                })
-                
-        except Exception:
-            continue
-    
-    return tithi_changes, yoga_changes
-
-
-def detect_nakshatra_changes_for_day(current_date: datetime, date_str: str) -> List[Dict]:
-    """Detect nakshatra changes for a single day (worker function)."""
-    
-    changes = []
-    prev_nak = None
-    
-    # Check every 3 hours
-    for hour in range(0, 24, 3):
-        check_time = current_date.replace(hour=hour, minute=0, second=0)
-        
-        try:
-            nak_num, nak_name, nak_pada, _, _ = compute_nakshatra(check_time, ayanamsha="lahiri")
-            
-            if prev_nak and nak_num != prev_nak[0]:
-                # Nakshatra changed
-                change_time = check_time - timedelta(hours=1.5)  # Approximate midpoint
-                change_jd = swe.julday(change_time.year, change_time.month, change_time.day,
-                                       change_time.hour + change_time.minute/60, swe.GREG_CAL)
-                
-                # Get Moon position
-                moon_pos, _ = swe.calc_ut(change_jd, swe.MOON, swe.FLG_SWIEPH)
-                moon_trop_lon = moon_pos[0] % 360.0
-                
-                swe.set_sid_mode(swe.SIDM_LAHIRI)
-                moon_pos_sid, _ = swe.calc_ut(change_jd, swe.MOON, swe.FLG_SWIEPH | swe.FLG_SIDEREAL)
-                moon_sid_lon = moon_pos_sid[0] % 360.0
-                
-                changes.append({
-                    "julian_day": change_jd,
-                    "date": date_str,
-                    "time": {
-                        "utc": change_time.strftime("%H:%M:%S"),
-                        "utc_iso": change_time.isoformat(),
-                        "utc_date": date_str,
-                        "utc_full": f"{date_str} {change_time.strftime('%H:%M:%S')} UTC"
-                    },
-                    "from_nakshatra": prev_nak[1],
-                    "to_nakshatra": nak_name,
-                    "tropical_longitude": round(moon_trop_lon, 4),
-                    "sidereal_longitude": round(moon_sid_lon, 4),
-                    "ayanamsa": round(moon_trop_lon - moon_sid_lon, 4)
-                })
-            
-            prev_nak = (nak_num, nak_name)
-            
-        except Exception:
-            continue
-    
-    return changes
+    return day_data
 
 
 def generate_comprehensive_ephemeris_parallel(
@@ -527,7 +459,8 @@ def generate_comprehensive_ephemeris_parallel(
     lon: float = 77.1025,
     location_name: str = "Delhi, India",
     num_workers: Optional[int] = None,
-    use_gpu: bool = False
+    use_gpu: bool = False,
+    output_format: str = "json",
 ) -> Dict[str, Any]:
     """
     Generate comprehensive ephemeris with parallel/GPU acceleration.
@@ -540,6 +473,7 @@ def generate_comprehensive_ephemeris_parallel(
         location_name: Location name
         num_workers: Number of parallel workers (default: CPU count - 1)
         use_gpu: Enable GPU acceleration if available
+        output_format: "json" or a columnar format (see ephemeris_columnar)
     
     Returns:
         Complete ephemeris data dictionary
@@ -550,18 +484,66 @@ def generate_comprehensive_ephemeris_parallel(
         use_gpu=use_gpu
     )
     
-    return generator.generate(output_file)
+    return generator.generate(output_file, output_format)
+
+
+def generate_years_streaming(
+    start_year: int,
+    end_year: int,
+    output_dir: str,
+    lat: float = 28.7041,
+    lon: float = 77.1025,
+    location_name: str = "Delhi, India",
+    num_workers: Optional[int] = None,
+    chunk_days: int = 31,
+) -> List[str]:
+    """
+    Generate one streamed JSON file per year for a multi-year range.
+    
+    Years whose output file already exists are skipped and each year keeps its
+    block checkpoints under ``output_dir/.blocks-<year>`` until it completes,
+    so an interrupted multi-decade run resumes where it stopped.
+    
+    Returns:
+        Output file paths in year order
+    """
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for year in range(start_year, end_year + 1):
+        path = out_dir / f"ephemeris_{year}.json"
+        paths.append(str(path))
+        if path.exists():
+            print(f"Skipping {year}: {path} already exists")
+            continue
+        checkpoint_dir = out_dir / f".blocks-{year}"
+        generator = ParallelEphemerisGenerator(
+            year, lat, lon, location_name,
+            num_workers=num_workers
+        )
+        generator.generate_streaming(str(path), chunk_days=chunk_days, checkpoint_dir=str(checkpoint_dir))
+        for block in checkpoint_dir.iterdir():
+            block.unlink()
+        checkpoint_dir.rmdir()
+    return paths
 
 
 if __name__ == "__main__":
     import sys
     
-    year = int(sys.argv[1]) if len(sys.argv) > 1 else 2026
-    output = sys.argv[2] if len(sys.argv) > 2 else f"ephemeris_{year}_parallel.json"
-    
     # Use all available CPU cores minus 1
     num_workers = max(1, mp.cpu_count() - 1)
     
+    # "2000-2030 out_dir" streams one file per year with resumable checkpoints.
+    if len(sys.argv) > 1 and "-" in sys.argv[1]:
+        first, last = (int(part) for part in sys.argv[1].split("-", 1))
+        output_dir = sys.argv[2] if len(sys.argv) > 2 else "ephemeris"
+        generate_years_streaming(first, last, output_dir, num_workers=num_workers)
+        sys.exit(0)
+    
+    year = int(sys.argv[1]) if len(sys.argv) > 1 else 2026
+    output = sys.argv[2] if len(sys.argv) > 2 else f"ephemeris_{year}_parallel.json"
+    
     print(f"Generating ephemeris for {year} using {num_workers} workers...")
     
     generate_comprehensive_ephemeris_parallel(
@@ -570,5 +552,3 @@ if __name__ == "__main__":
         num_workers=num_workers,
         use_gpu=False  # Set to True if GPU support is implemented
     )
-
-
@@ -0,0 +1,191 @@
+"""Shared process pool for CPU-bound request work.
+
+One spawn-context ``ProcessPoolExecutor`` serves every router. Workers run
+``_warm_worker`` when they start, so the Swiss Ephemeris, the schemas and the
+Panchang orchestrators are imported (and the ephemeris files opened) before
+the first request lands on them, and ``warm()`` can spin all workers up at
+application startup. Each submission is timed per label so queue depth and
+p50/p99 latency can be reported via ``stats()``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date as date_cls, timedelta
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from . import profiling
+
+logger = logging.getLogger(__name__)
+
+# Every task enumerates two padding days on each side of its range and pays
+# ~15 ms of fixed setup; below a week per task that overhead outweighs what
+# running in parallel saves.
+MIN_CHUNK_DAYS = 8
+_LATENCY_SAMPLES = 512
+
+
+def _max_workers() -> int:
+    default = min(8, max(1, os.cpu_count() or 1))
+    return max(1, int(os.getenv("CPU_EXECUTOR_WORKERS", str(default))))
+
+
+def _warm_worker() -> None:
+    """Pool initializer: import heavy modules and touch the ephemeris once."""
+
+    from datetime import datetime, timezone
+
+    from . import panchang_algos
+    from .orchestrators import panchang_range  # noqa: F401 - imported for warmth
+
+    try:
+        panchang_algos.compute_tithi(datetime.now(timezone.utc))
+    except Exception:  # pragma: no cover - warming must never kill a worker
+        logger.debug("cpu_executor.warm_failed", exc_info=True)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _percentile(samples: List[float], pct: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return round(ordered[idx], 2)
+
+
+class CpuExecutor:
+    """Lazily started process pool with per-label latency tracking."""
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self.max_workers = max_workers or _max_workers()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._submitted = 0
+        self._failed = 0
+        self._latency: Dict[str, Deque[float]] = {}
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    ctx = multiprocessing.get_context("spawn")
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=ctx,
+                        initializer=_warm_worker,
+                    )
+        return self._pool
+
+    def warm(self) -> None:
+        """Start every worker now instead of on the first request (non-blocking)."""
+
+        pool = self._get_pool()
+        for _ in range(self.max_workers):
+            pool.submit(_ping)
+
+    def submit(self, label: str, fn: Callable[..., Any], *args: Any) -> Future:
+        started = time.perf_counter()
+        with self._lock:
+            self._pending += 1
+            self._submitted += 1
+        future = self._get_pool().submit(fn, *args)
+
+        def _done(fut: Future) -> None:
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            with self._lock:
+                self._pending -= 1
+                if fut.cancelled() or fut.exception() is not None:
+                    self._failed += 1
+                self._latency.setdefault(label, deque(maxlen=_LATENCY_SAMPLES)).append(elapsed_ms)
+
+        future.add_done_callback(_done)
+        return future
+
+    async def run(self, label: str, fn: Callable[..., Any], *args: Any) -> Any:
+        if profiling.active():
+            # Keep profiled work in this process, where the sampler can see it.
+            return await asyncio.to_thread(fn, *args)
+        return await asyncio.wrap_future(self.submit(label, fn, *args))
+
+    async def map(self, label: str, fn: Callable[..., Any], arg_list: List[Tuple[Any, ...]]) -> List[Any]:
+        """Run ``fn(*args)`` for each entry concurrently; results keep input order."""
+
+        return list(await asyncio.gather(*(self.run(label, fn, *args) for args in arg_list)))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = self._pending
+            latency = {
+                label: {
+                    "count": len(samples),
+                    "p50_ms": _percentile(list(samples), 50),
+                    "p99_ms": _percentile(list(samples), 99),
+                }
+                for label, samples in self._latency.items()
+            }
+            return {
+                "workers": self.max_workers,
+                "started": self._pool is not None,
+                "in_flight": min(pending, self.max_workers),
+                "queue_depth": max(0, pending - self.max_workers),
+                "submitted": self._submitted,
+                "failed": self._failed,
+                "latency": latency,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def chunk_date_range(
+    start_date: date_cls, num_days: int, max_chunks: int, min_chunk_days: int = MIN_CHUNK_DAYS
+) -> List[Tuple[date_cls, int]]:
+    """Split ``num_days`` into at most ``max_chunks`` contiguous (start, count) blocks.
+
+    Blocks are as even as possible and, unless the whole range is shorter,
+    at least ``min_chunk_days`` long.
+    """
+
+    if num_days <= 0:
+        return []
+    count = max(1, min(max_chunks, num_days // max(1, min_chunk_days)))
+    base, extra = divmod(num_days, count)
+    chunks: List[Tuple[date_cls, int]] = []
+    offset = 0
+    for idx in range(count):
+        size = base + (1 if idx < extra else 0)
+        chunks.append((start_date + timedelta(days=offset), size))
+        offset += size
+    return chunks
+
+
+_EXECUTOR: Optional[CpuExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_executor() -> CpuExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = CpuExecutor()
+    return _EXECUTOR
+
+
+def warm_enabled() -> bool:
+    return os.getenv("CPU_EXECUTOR_WARM", "true").lower() == "true"
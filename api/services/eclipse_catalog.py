@@ -0,0 +1,275 @@
+"""Per-year catalogue of eclipses and lunations.
+
+Eclipse detection used to be a scan: the ephemeris generator stepped through
+the year and the transit engine tested every sample of ``compute_transits``
+against node and latitude thresholds. This service walks from one event to
+the next instead:
+
+* solar eclipses with ``swe.sol_eclipse_when_glob`` and lunar eclipses with
+  ``swe.lun_eclipse_when``, each search starting just after the previous hit;
+* new, first-quarter, full and last-quarter moons with the Newton boundary
+  search that drives the tithi tables (Moon–Sun elongation crossing a multiple
+  of 90°);
+* at every new and full moon, the Moon's distance and the distance of the
+  nearest perigee (speed-in-distance zero crossing), so supermoon tests are a
+  comparison rather than a search.
+
+A year is solved once, kept in an in-process LRU and persisted in the shared
+panchang cache tier, so callers only filter a sorted list.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from bisect import bisect_left
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from .panchang_algos import (
+    _elongation_track,
+    _enumerate_track,
+    _jd_to_datetime,
+    _to_jd,
+    swe,
+)
+from . import metrics
+from .panchang_cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION = 1
+AU_KM = 149597870.7
+LUNATION_PHASES = ("new_moon", "first_quarter", "full_moon", "last_quarter")
+
+# Successive eclipses of one kind are at least ~29 days apart; restarting the
+# search a few days after a hit cannot skip the next one.
+_ECLIPSE_RESTART_DAYS = 5.0
+# A perigee is always within half an anomalistic month (~13.8 days).
+_PERIGEE_WINDOW_DAYS = 15
+
+
+def _flag() -> int:
+    return swe.FLG_SWIEPH
+
+
+def _moon(jd: float) -> tuple:
+    metrics.SWE_CALLS.inc(function="calc_ut")
+    values, _ = swe.calc_ut(jd, swe.MOON, _flag() | swe.FLG_SPEED)
+    return values
+
+
+def _iso(moment: datetime) -> str:
+    moment = moment.astimezone(timezone.utc).replace(microsecond=0)
+    return moment.isoformat().replace("+00:00", "Z")
+
+
+def _solar_type(flags: int) -> str:
+    if flags & swe.ECL_TOTAL:
+        return "total"
+    if flags & swe.ECL_ANNULAR:
+        return "annular"
+    if flags & swe.ECL_ANNULAR_TOTAL:
+        return "hybrid"
+    return "partial"
+
+
+def _lunar_type(flags: int) -> str:
+    if flags & swe.ECL_TOTAL:
+        return "total"
+    if flags & swe.ECL_PARTIAL:
+        return "partial"
+    return "penumbral"
+
+
+def _eclipse_entry(category: str, kind: str, flags: int, jd: float, magnitude: float) -> Dict[str, Any]:
+    metrics.SWE_CALLS.inc(2, function="calc_ut")
+    sun, _ = swe.calc_ut(jd, swe.SUN, _flag())
+    moon, _ = swe.calc_ut(jd, swe.MOON, _flag())
+    return {
+        "category": category,
+        "type": kind,
+        "flags": int(flags),
+        "julian_day": jd,
+        "datetime_utc": _iso(_jd_to_datetime(jd)),
+        "magnitude": round(magnitude, 4),
+        "sun_lon": sun[0] % 360.0,
+        "moon_lon": moon[0] % 360.0,
+        "moon_lat": moon[1],
+    }
+
+
+def solar_eclipses(start_jd: float, end_jd: float) -> List[Dict[str, Any]]:
+    """Solar eclipses with maximum in ``[start_jd, end_jd)``."""
+
+    entries: List[Dict[str, Any]] = []
+    current = start_jd
+    while current < end_jd:
+        metrics.SWE_CALLS.inc(function="sol_eclipse_when_glob")
+        flags, tret = swe.sol_eclipse_when_glob(current, _flag(), swe.ECL_ALLTYPES_SOLAR)
+        jd = tret[0]
+        if jd >= end_jd:
+            break
+        # Global magnitude: fraction of the solar diameter covered at maximum.
+        metrics.SWE_CALLS.inc(function="sol_eclipse_where")
+        _where_flags, _geopos, attr = swe.sol_eclipse_where(jd, _flag())
+        entries.append(_eclipse_entry("solar", _solar_type(flags), flags, jd, attr[0]))
+        current = jd + _ECLIPSE_RESTART_DAYS
+    return entries
+
+
+def lunar_eclipses(start_jd: float, end_jd: float) -> List[Dict[str, Any]]:
+    """Lunar eclipses with maximum in ``[start_jd, end_jd)``."""
+
+    entries: List[Dict[str, Any]] = []
+    current = start_jd
+    while current < end_jd:
+        metrics.SWE_CALLS.inc(function="lun_eclipse_when")
+        flags, tret = swe.lun_eclipse_when(current, _flag(), swe.ECL_ALLTYPES_LUNAR)
+        jd = tret[0]
+        if jd >= end_jd:
+            break
+        # Umbral magnitude, or penumbral magnitude for penumbral eclipses.
+        metrics.SWE_CALLS.inc(function="lun_eclipse_how")
+        _how_flags, attr = swe.lun_eclipse_how(jd, (0.0, 0.0, 0.0), _flag())
+        kind = _lunar_type(flags)
+        magnitude = attr[1] if kind == "penumbral" else attr[0]
+        entries.append(_eclipse_entry("lunar", kind, flags, jd, magnitude))
+        current = jd + _ECLIPSE_RESTART_DAYS
+    return entries
+
+
+def nearest_perigee(jd: float) -> Dict[str, float]:
+    """Return the perigee closest to ``jd`` as ``{"julian_day", "distance_km"}``.
+
+    Daily samples of the Moon's radial speed bracket every minimum of its
+    distance (speed changing sign from negative to positive); a few secant
+    steps then pin the crossing.
+    """
+
+    start = jd - _PERIGEE_WINDOW_DAYS
+    samples = [(start + day, _moon(start + day)[5]) for day in range(2 * _PERIGEE_WINDOW_DAYS + 1)]
+    best: Optional[float] = None
+    for (jd0, v0), (jd1, v1) in zip(samples, samples[1:]):
+        if v0 < 0.0 <= v1:
+            lo, hi, f_lo, f_hi = jd0, jd1, v0, v1
+            root = lo
+            for _ in range(6):
+                root = lo - f_lo * (hi - lo) / (f_hi - f_lo)
+                f_root = _moon(root)[5]
+                if f_root < 0.0:
+                    lo, f_lo = root, f_root
+                else:
+                    hi, f_hi = root, f_root
+                if hi - lo < 1e-5:
+                    break
+            if best is None or abs(root - jd) < abs(best - jd):
+                best = root
+    if best is None:
+        best = jd
+    return {"julian_day": best, "distance_km": _moon(best)[2] * AU_KM}
+
+
+def lunations(start_jd: float, end_jd: float) -> List[Dict[str, Any]]:
+    """New, first-quarter, full and last-quarter moons in ``[start_jd, end_jd)``."""
+
+    start = _jd_to_datetime(start_jd)
+    end = _jd_to_datetime(end_jd)
+
+    def _label(index: int, _offset: float) -> Dict[str, object]:
+        return {"index": index}
+
+    periods = _enumerate_track(start, end, _elongation_track, 90.0, "lahiri", _label)
+    entries: List[Dict[str, Any]] = []
+    # The first period is clipped at ``start``; every later one opens on a phase.
+    for period in periods[1:]:
+        moment: datetime = period["start"]  # type: ignore[assignment]
+        jd = _to_jd(moment)
+        phase = LUNATION_PHASES[int(period["index"])]
+        metrics.SWE_CALLS.inc(function="calc_ut")
+        sun, _ = swe.calc_ut(jd, swe.SUN, _flag())
+        moon = _moon(jd)
+        entry: Dict[str, Any] = {
+            "phase": phase,
+            "julian_day": jd,
+            "datetime_utc": _iso(moment),
+            "sun_lon": sun[0] % 360.0,
+            "moon_lon": moon[0] % 360.0,
+            "moon_lat": moon[1],
+            "distance_km": moon[2] * AU_KM,
+        }
+        if phase in ("new_moon", "full_moon"):
+            perigee = nearest_perigee(jd)
+            entry["perigee_julian_day"] = perigee["julian_day"]
+            entry["perigee_distance_km"] = perigee["distance_km"]
+        entries.append(entry)
+    return entries
+
+
+def build_year(year: int) -> Dict[str, Any]:
+    """Solve every eclipse and lunation of a calendar year (UTC)."""
+
+    start_jd = swe.julday(year, 1, 1, 0.0, swe.GREG_CAL)
+    end_jd = swe.julday(year + 1, 1, 1, 0.0, swe.GREG_CAL)
+    eclipses = solar_eclipses(start_jd, end_jd) + lunar_eclipses(start_jd, end_jd)
+    eclipses.sort(key=lambda entry: entry["julian_day"])
+    return {
+        "version": CATALOG_VERSION,
+        "year": year,
+        "eclipses": eclipses,
+        "lunations": lunations(start_jd, end_jd),
+    }
+
+
+@lru_cache(maxsize=64)
+def year_catalogue(year: int) -> Dict[str, Any]:
+    """Return the (cached) catalogue for ``year``.
+
+    Raises ``RuntimeError`` when Swiss Ephemeris is unavailable.
+    """
+
+    if swe is None:
+        raise RuntimeError("Swiss Ephemeris is required for the eclipse catalogue")
+    key = f"eclipses:v{CATALOG_VERSION}:{year}:{_flag()}"
+    cache = get_cache()
+    raw = cache.get_bytes(key)
+    if raw is not None:
+        try:
+            return json.loads(raw.decode("utf-8"))
+        except ValueError:
+            logger.warning("eclipse_catalog_decode_failed", extra={"year": year})
+    catalogue = build_year(year)
+    cache.set_bytes(key, json.dumps(catalogue, separators=(",", ":")).encode("utf-8"))
+    return catalogue
+
+
+def _between(section: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    start_jd = _to_jd(start)
+    end_jd = _to_jd(end)
+    entries: List[Dict[str, Any]] = []
+    for year in range(_jd_to_datetime(start_jd).year, _jd_to_datetime(end_jd).year + 1):
+        entries.extend(year_catalogue(year)[section])
+    keys = [entry["julian_day"] for entry in entries]
+    return entries[bisect_left(keys, start_jd):bisect_left(keys, end_jd)]
+
+
+def eclipses_between(start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    """Eclipses whose maximum falls in ``[start, end)``, in time order."""
+
+    return _between("eclipses", start, end)
+
+
+def lunations_between(start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    """Lunation phases in ``[start, end)``, in time order."""
+
+    return _between("lunations", start, end)
+
+
+def clear_memory() -> None:
+    year_catalogue.cache_clear()
+
+
+def peak_datetime(entry: Dict[str, Any]) -> datetime:
+    return datetime.fromisoformat(entry["datetime_utc"].replace("Z", "+00:00"))
+
@@ -4,11 +4,13 @@ from __future__ import annotations
 
 import os
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List, Sequence
 from zoneinfo import ZoneInfo
 
 import swisseph as swe
 
+from . import metrics
+
 
 # Engine version for API responses
 try:
@@ -82,6 +84,7 @@ def positions_ecliptic(jd_utc: float, sidereal: bool = False, ayanamsha: str = "
         flag |= swe.FLG_SIDEREAL
 
     bodies: Dict[str, Dict[str, float]] = {}
+    metrics.SWE_CALLS.inc(len(BODIES), function="calc_ut")
     for name, code in BODIES.items():
         try:
             values, _ = swe.calc_ut(jd_utc, code, flag)
@@ -99,3 +102,31 @@ def positions_ecliptic(jd_utc: float, sidereal: bool = False, ayanamsha: str = "
 
     return bodies
 
+
+
+def positions_ecliptic_batch(
+    jds_utc: Sequence[float], sidereal: bool = False, ayanamsha: str = "lahiri"
+) -> List[Dict[str, Dict[str, float]]]:
+    """``positions_ecliptic`` for many instants sharing one zodiac setting.
+
+    The flag and sidereal mode are set once and each body is computed for
+    every instant in turn, so the backend keeps that body's ephemeris data hot.
+    """
+
+    flag = _backend_flag() | swe.FLG_SPEED
+    if sidereal:
+        mode = AYANAMSHA_MAP.get(ayanamsha.lower(), swe.SIDM_LAHIRI)
+        swe.set_sid_mode(mode)
+        flag |= swe.FLG_SIDEREAL
+
+    out: List[Dict[str, Dict[str, float]]] = [{} for _ in jds_utc]
+    metrics.SWE_CALLS.inc(len(BODIES) * len(jds_utc), function="calc_ut")
+    for name, code in BODIES.items():
+        for bodies, jd_utc in zip(out, jds_utc):
+            try:
+                values, _ = swe.calc_ut(jd_utc, code, flag)
+                lon, lat, _dist, lon_speed, _lat_speed, _dist_speed = values
+                bodies[name] = {"lon": lon % 360.0, "lat": lat, "speed_lon": lon_speed, "retro": lon_speed < 0}
+            except Exception:
+                bodies[name] = {"lon": 0.0, "lat": 0.0, "speed_lon": 0.0, "retro": False}
+    return out
@@ -0,0 +1,486 @@
+"""Columnar on-disk format for comprehensive ephemeris output.
+
+``ComprehensiveEphemerisGenerator.generate`` returns one nested dict per year
+(``daily_data`` plus event tables). Written as a single JSON document it is
+slow to produce, large, and must be parsed in full to read one body. This
+module stores the same data column-wise instead:
+
+* every ``daily_data`` entry is flattened to ``/``-separated paths
+  (``planets/Sun/longitude``), and each path becomes one typed column indexed
+  by day, so a single body or date range is a slice of a few arrays;
+* list-valued day fields (``aspects`` etc.) and the top-level event lists
+  (ingresses, stations, vedic changes, ...) become row tables with a ``_day``
+  or ``_group`` column;
+* scalars such as ``metadata`` go into ``schema.json`` alongside the column
+  layout.
+
+Two backends share that layout: Arrow IPC files (memory-mapped, zero-copy)
+when ``pyarrow`` is installed, otherwise one ``.npy`` file per column loaded
+with ``mmap_mode="r"``. ``ColumnarEphemeris`` reads either lazily and rebuilds
+the original JSON shape only for the days or tables that are asked for.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Mapping
+from datetime import date as date_cls
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:  # pragma: no cover - optional dependency
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except Exception:  # pragma: no cover - defensive
+    pa = None  # type: ignore[assignment]
+    pa_ipc = None  # type: ignore[assignment]
+
+FORMAT_VERSION = 1
+SEP = "/"
+DAILY = "daily"
+
+# Per-row state for columns with gaps: 0 = value, 1 = JSON null, 2 = key absent.
+_VALUE, _NULL, _ABSENT = 0, 1, 2
+_MISSING = object()
+
+
+def available_formats() -> List[str]:
+    return (["arrow"] if pa is not None else []) + ["npy"]
+
+
+def _resolve_format(fmt: str) -> str:
+    if fmt in ("auto", "columnar"):
+        return available_formats()[0]
+    if fmt == "arrow" and pa is None:
+        raise RuntimeError("pyarrow is not installed; use format='npy'")
+    if fmt not in ("arrow", "npy"):
+        raise ValueError(f"Unknown columnar format: {fmt}")
+    return fmt
+
+
+# --------------------------------------------------------------------------
+# Flattening
+# --------------------------------------------------------------------------
+
+
+def _flatten(record: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for key, value in record.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            out.update(_flatten(value, path + SEP))
+        else:
+            out[path] = value
+    return out
+
+
+def _unflatten(flat: Dict[str, Any]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for path, value in flat.items():
+        node = out
+        parts = path.split(SEP)
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = value
+    return out
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _kind(values: List[Any]) -> str:
+    present = [v for v in values if v is not _MISSING and v is not None]
+    if not present:
+        return "json"
+    if all(isinstance(v, bool) for v in present):
+        return "bool"
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        return "int"
+    if all(_is_number(v) for v in present):
+        return "float"
+    if all(isinstance(v, str) for v in present):
+        return "str"
+    if all(isinstance(v, list) and all(_is_number(x) for x in v) for v in present):
+        if len({len(v) for v in present}) == 1 and present[0]:
+            return "floats"
+    return "json"
+
+
+def _encode_column(values: List[Any]) -> Tuple[str, np.ndarray, Optional[np.ndarray]]:
+    """Return ``(kind, data, state)``; ``state`` is ``None`` when every row has a value."""
+
+    kind = _kind(values)
+    state = np.array(
+        [_ABSENT if v is _MISSING else (_NULL if v is None else _VALUE) for v in values],
+        dtype=np.int8,
+    )
+    has_gaps = bool(state.any())
+    if kind == "json":
+        # A JSON column stores nulls natively; only absence needs the state.
+        data = np.array(
+            ["" if v is _MISSING else json.dumps(v, separators=(",", ":")) for v in values],
+            dtype=str,
+        )
+        has_gaps = bool((state == _ABSENT).any())
+    elif kind == "str":
+        data = np.array(["" if s else v for v, s in zip(values, state)], dtype=str)
+    elif kind == "bool":
+        data = np.array([bool(v) if not s else False for v, s in zip(values, state)], dtype=bool)
+    elif kind == "int":
+        data = np.array([v if not s else 0 for v, s in zip(values, state)], dtype=np.int64)
+    elif kind == "float":
+        data = np.array([float(v) if not s else np.nan for v, s in zip(values, state)], dtype=np.float64)
+    else:  # floats
+        width = len(next(v for v, s in zip(values, state) if not s))
+        data = np.array(
+            [v if not s else [np.nan] * width for v, s in zip(values, state)], dtype=np.float64
+        )
+    return kind, data, state if has_gaps else None
+
+
+def _build_table(rows: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, np.ndarray]]:
+    flat_rows = [_flatten(row) for row in rows]
+    paths: Dict[str, None] = {}
+    for flat in flat_rows:
+        for path in flat:
+            paths.setdefault(path, None)
+    specs: List[Dict[str, Any]] = []
+    arrays: Dict[str, np.ndarray] = {}
+    for idx, path in enumerate(paths):
+        kind, data, state = _encode_column([flat.get(path, _MISSING) for flat in flat_rows])
+        name = f"c{idx:04d}"
+        specs.append({"path": path, "kind": kind, "file": name, "gaps": state is not None})
+        arrays[name] = data
+        if state is not None:
+            arrays[name + "_state"] = state
+    return specs, arrays
+
+
+def _decode_value(kind: str, raw: Any) -> Any:
+    if kind == "json":
+        return json.loads(raw) if raw != "" else None
+    if kind == "float":
+        return float(raw)
+    if kind == "int":
+        return int(raw)
+    if kind == "bool":
+        return bool(raw)
+    if kind == "str":
+        return str(raw)
+    return [float(x) for x in raw]
+
+
+# --------------------------------------------------------------------------
+# Writing
+# --------------------------------------------------------------------------
+
+
+def _split_output(output: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, List[Dict[str, Any]]], Dict[str, Any]]:
+    """Separate ``output`` into row tables, their layout, and plain scalars."""
+
+    daily = output.get("daily_data") or {}
+    dates = list(daily)
+    day_fields: List[str] = []
+    list_fields: Dict[str, None] = {}
+    for day in daily.values():
+        for key, value in day.items():
+            if key not in day_fields:
+                day_fields.append(key)
+            if isinstance(value, list):
+                list_fields.setdefault(key, None)
+
+    tables: Dict[str, List[Dict[str, Any]]] = {DAILY: []}
+    for field in list_fields:
+        tables[f"{DAILY}.{field}"] = []
+    for row_idx, date_str in enumerate(dates):
+        day = daily[date_str]
+        row = {"_date": date_str}
+        for key, value in day.items():
+            if key in list_fields and isinstance(value, list):
+                tables[f"{DAILY}.{key}"].extend({"_day": row_idx, **item} for item in value)
+            else:
+                row[key] = value
+        tables[DAILY].append(row)
+
+    layout: Dict[str, Any] = {
+        "top_level_order": list(output),
+        "day_fields": day_fields,
+        "day_list_fields": list(list_fields),
+        "lists": [],
+        "groups": {},
+    }
+    scalars: Dict[str, Any] = {}
+    for key, value in output.items():
+        if key == "daily_data":
+            continue
+        if isinstance(value, list) and all(isinstance(item, dict) for item in value):
+            tables[key] = list(value)
+            layout["lists"].append(key)
+        elif (
+            isinstance(value, dict)
+            and value
+            and all(isinstance(items, list) and all(isinstance(i, dict) for i in items) for items in value.values())
+        ):
+            tables[key] = [{"_group": group, **item} for group, items in value.items() for item in items]
+            layout["groups"][key] = list(value)
+        else:
+            scalars[key] = value
+    return layout, tables, scalars
+
+
+def write_columnar(output: Dict[str, Any], path: Union[str, Path], fmt: str = "auto") -> Path:
+    """Write a generator ``output`` dict as a columnar directory and return its path.
+
+    The directory is written next to ``path`` and moved into place when
+    complete. An existing ``path`` is only replaced if it is a columnar
+    directory itself (it has ``schema.json``); anything else raises
+    ``FileExistsError`` rather than being deleted.
+    """
+
+    fmt = _resolve_format(fmt)
+    root = Path(path)
+    if root.exists() and not (root / "schema.json").is_file():
+        raise FileExistsError(f"{root} exists and is not a columnar ephemeris directory")
+    root.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{root.name}.", dir=root.parent))
+    try:
+        _write_tree(output, staging, fmt)
+        if root.exists():
+            retired = Path(tempfile.mkdtemp(prefix=f".{root.name}.old.", dir=root.parent))
+            os.replace(root, retired / root.name)
+            os.replace(staging, root)
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            os.replace(staging, root)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return root
+
+
+def _write_tree(output: Dict[str, Any], root: Path, fmt: str) -> None:
+    (root / "tables").mkdir(parents=True)
+    layout, tables, scalars = _split_output(output)
+    schema: Dict[str, Any] = {
+        "format_version": FORMAT_VERSION,
+        "backend": fmt,
+        "layout": layout,
+        "scalars": scalars,
+        "tables": {},
+    }
+    for name, rows in tables.items():
+        specs, arrays = _build_table(rows)
+        schema["tables"][name] = {"rows": len(rows), "columns": specs}
+        if fmt == "arrow":
+            _write_arrow(root / "tables" / f"{name}.arrow", arrays)
+        else:
+            table_dir = root / "tables" / name
+            table_dir.mkdir()
+            for file_name, data in arrays.items():
+                np.save(table_dir / f"{file_name}.npy", data, allow_pickle=False)
+
+    (root / "schema.json").write_text(json.dumps(schema, indent=1), encoding="utf-8")
+
+
+def _write_arrow(path: Path, arrays: Dict[str, np.ndarray]) -> None:
+    columns = {}
+    for name, data in arrays.items():
+        if data.ndim == 2:
+            columns[name] = pa.FixedSizeListArray.from_arrays(pa.array(data.ravel()), data.shape[1])
+        else:
+            columns[name] = pa.array(data.tolist() if data.dtype.kind == "U" else data)
+    table = pa.table(columns) if columns else pa.table({})
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa_ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+# --------------------------------------------------------------------------
+# Reading
+# --------------------------------------------------------------------------
+
+
+class _Table:
+    """Lazily opened columns of one table."""
+
+    def __init__(self, root: Path, name: str, spec: Dict[str, Any], backend: str) -> None:
+        self.name = name
+        self.rows = int(spec["rows"])
+        self.columns = spec["columns"]
+        self.by_path = {col["path"]: col for col in self.columns}
+        self._root = root
+        self._backend = backend
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._arrow = None
+
+    def _open(self, file_name: str) -> np.ndarray:
+        if file_name not in self._arrays:
+            if self._backend == "arrow":
+                if self._arrow is None:
+                    source = pa.memory_map(str(self._root / "tables" / f"{self.name}.arrow"), "r")
+                    self._arrow = pa_ipc.open_file(source).read_all()
+                column = self._arrow.column(file_name).combine_chunks()
+                if pa.types.is_fixed_size_list(column.type):
+                    width = column.type.list_size
+                    data = column.flatten().to_numpy(zero_copy_only=False).reshape(-1, width)
+                else:
+                    data = column.to_numpy(zero_copy_only=False)
+            else:
+                data = np.load(
+                    self._root / "tables" / self.name / f"{file_name}.npy", mmap_mode="r", allow_pickle=False
+                )
+            self._arrays[file_name] = data
+        return self._arrays[file_name]
+
+    def column(self, path: str) -> np.ndarray:
+        return self._open(self.by_path[path]["file"])
+
+    def state(self, path: str) -> Optional[np.ndarray]:
+        col = self.by_path[path]
+        return self._open(col["file"] + "_state") if col["gaps"] else None
+
+    def row(self, index: int, skip: Tuple[str, ...] = ()) -> Dict[str, Any]:
+        flat: Dict[str, Any] = {}
+        for col in self.columns:
+            if col["path"] in skip:
+                continue
+            if col["gaps"]:
+                st = int(self._open(col["file"] + "_state")[index])
+                if st == _ABSENT:
+                    continue
+                if st == _NULL:
+                    flat[col["path"]] = None
+                    continue
+            flat[col["path"]] = _decode_value(col["kind"], self._open(col["file"])[index])
+        return _unflatten(flat)
+
+    def rows_between(self, lo: int, hi: int, skip: Tuple[str, ...] = ()) -> List[Dict[str, Any]]:
+        return [self.row(i, skip) for i in range(lo, hi)]
+
+
+class ColumnarEphemeris:
+    """Read-only view over a directory written by ``write_columnar``."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.root = Path(path)
+        self.schema = json.loads((self.root / "schema.json").read_text(encoding="utf-8"))
+        if self.schema.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar format version: {self.schema.get('format_version')}")
+        backend = self.schema["backend"]
+        if backend == "arrow" and pa is None:
+            raise RuntimeError("This ephemeris was written with pyarrow, which is not installed")
+        self.layout = self.schema["layout"]
+        self._tables = {
+            name: _Table(self.root, name, spec, backend) for name, spec in self.schema["tables"].items()
+        }
+        self.dates: List[str] = [str(d) for d in self._tables[DAILY].column("_date")] if self._tables[DAILY].rows else []
+        self._date_index = {d: i for i, d in enumerate(self.dates)}
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.schema["scalars"].get("metadata", {})
+
+    def _range(self, start: Optional[Union[str, date_cls]], end: Optional[Union[str, date_cls]]) -> Tuple[int, int]:
+        lo = 0 if start is None else int(np.searchsorted(self.dates, str(start), side="left"))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, str(end), side="right"))
+        return lo, hi
+
+    def column(self, path: str, start=None, end=None) -> np.ndarray:
+        """Return one daily column (memory-mapped) restricted to ``[start, end]``."""
+
+        lo, hi = self._range(start, end)
+        return self._tables[DAILY].column(path)[lo:hi]
+
+    def body(self, name: str, start=None, end=None) -> Dict[str, np.ndarray]:
+        """Return every column of one planet/asteroid keyed by field path."""
+
+        lo, hi = self._range(start, end)
+        table = self._tables[DAILY]
+        out: Dict[str, np.ndarray] = {}
+        for group in ("planets", "asteroids"):
+            prefix = f"{group}{SEP}{name}{SEP}"
+            for col in table.columns:
+                if col["path"].startswith(prefix):
+                    out[col["path"][len(prefix):]] = table.column(col["path"])[lo:hi]
+            if out:
+                break
+        if not out:
+            raise KeyError(name)
+        return out
+
+    def _day_children(self, field: str, index: int) -> List[Dict[str, Any]]:
+        table = self._tables[f"{DAILY}.{field}"]
+        if not table.rows:
+            return []
+        days = table.column("_day")
+        lo = int(np.searchsorted(days, index, side="left"))
+        hi = int(np.searchsorted(days, index, side="right"))
+        return table.rows_between(lo, hi, skip=("_day",))
+
+    def day(self, date_str: Union[str, date_cls]) -> Dict[str, Any]:
+        """Rebuild one ``daily_data`` entry in its original JSON shape."""
+
+        index = self._date_index[str(date_str)]
+        base = self._tables[DAILY].row(index, skip=("_date",))
+        for field in self.layout["day_list_fields"]:
+            base[field] = self._day_children(field, index)
+        return {key: base[key] for key in self.layout["day_fields"] if key in base}
+
+    def days(self, start=None, end=None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        lo, hi = self._range(start, end)
+        for date_str in self.dates[lo:hi]:
+            yield date_str, self.day(date_str)
+
+    @property
+    def daily_data(self) -> "LazyDailyData":
+        return LazyDailyData(self)
+
+    def events(self, name: str) -> Any:
+        """Rebuild one top-level event table (list, or dict of lists)."""
+
+        if name in self.schema["scalars"]:
+            return self.schema["scalars"][name]
+        table = self._tables[name]
+        if name in self.layout["groups"]:
+            grouped: Dict[str, List[Dict[str, Any]]] = {g: [] for g in self.layout["groups"][name]}
+            for row in table.rows_between(0, table.rows):
+                grouped[row.pop("_group")].append(row)
+            return grouped
+        return table.rows_between(0, table.rows)
+
+    def to_dict(self, start=None, end=None) -> Dict[str, Any]:
+        """Materialise the generator's output dict for ``[start, end]`` only."""
+
+        out: Dict[str, Any] = {}
+        for key in self.layout["top_level_order"]:
+            if key == "daily_data":
+                out[key] = dict(self.days(start, end))
+            else:
+                out[key] = self.events(key)
+        return out
+
+
+class LazyDailyData(Mapping):
+    """``daily_data`` mapping that decodes a day only when it is accessed."""
+
+    def __init__(self, store: ColumnarEphemeris) -> None:
+        self._store = store
+
+    def __getitem__(self, date_str: str) -> Dict[str, Any]:
+        return self._store.day(date_str)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store.dates)
+
+    def __len__(self) -> int:
+        return len(self._store.dates)
+
+
+def load_columnar(path: Union[str, Path]) -> ColumnarEphemeris:
+    return ColumnarEphemeris(path)
@@ -3,24 +3,18 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from .lagna import SIGN_NAMES, spans_between
 
 
 PANCHAKA_NAMES = ["Raja", "Chora", "Roga", "Agni", "Mrityu"]
-ZODIAC_EN = [
-    "Aries",
-    "Taurus",
-    "Gemini",
-    "Cancer",
-    "Leo",
-    "Virgo",
-    "Libra",
-    "Scorpio",
-    "Sagittarius",
-    "Capricorn",
-    "Aquarius",
-    "Pisces",
-]
+ZODIAC_EN = SIGN_NAMES
+
+# Remainder of (tithi + weekday + nakshatra + lagna) / 9 that carries a
+# panchaka; every other remainder is panchaka rahita (free).
+PANCHAKA_BY_REMAINDER = {1: "Mrityu", 2: "Agni", 4: "Raja", 6: "Chora", 8: "Roga"}
+RAHITA = "Rahita"
 
 
 def panchaka_slots(
@@ -28,15 +22,25 @@ def panchaka_slots(
     sunset_local: datetime,
     nak_number: int,
     weekday: int,
+    lat: float,
+    lon: float,
+    tzinfo,
+    tithi_number: Optional[int] = None,
+    ayanamsha: str = "lahiri",
 ) -> List[Dict[str, str]]:
-    total = sunset_local - sunrise_local
-    segment = total / len(PANCHAKA_NAMES)
+    """Label each daytime lagna span with its panchaka (or ``Rahita``)."""
+
     slots: List[Dict[str, str]] = []
-    current = sunrise_local
-    for name in PANCHAKA_NAMES:
-        end = current + segment
-        slots.append({"name": name, "start_ts": current.isoformat(), "end_ts": end.isoformat()})
-        current = end
+    base = (tithi_number or 1) + (weekday + 1) + nak_number
+    for span in spans_between(sunrise_local, sunset_local, lat, lon, tzinfo, ayanamsha):
+        remainder = (base + int(span["sign_index"]) + 1) % 9
+        slots.append(
+            {
+                "name": PANCHAKA_BY_REMAINDER.get(remainder, RAHITA),
+                "start_ts": span["start"].astimezone(tzinfo).isoformat(),
+                "end_ts": span["end"].astimezone(tzinfo).isoformat(),
+            }
+        )
     return slots
 
 
@@ -45,23 +49,20 @@ def udaya_lagna_slots(
     lon: float,
     tzinfo,
     sunrise_local: datetime,
+    ayanamsha: str = "lahiri",
 ) -> List[Dict[str, str]]:
-    span = timedelta(hours=12)
-    segment = span / len(ZODIAC_EN)
-    slots: List[Dict[str, str]] = []
-    for idx in range(len(ZODIAC_EN)):
-        start = sunrise_local + segment * idx
-        end = start + segment
-        if start >= sunrise_local + span:
-            break
-        slots.append(
-            {
-                "lagna": ZODIAC_EN[idx % len(ZODIAC_EN)],
-                "start_ts": start.isoformat(),
-                "end_ts": end.isoformat(),
-            }
+    """Return the lagna spans from sunrise through one full day."""
+
+    return [
+        {
+            "lagna": span["sign"],
+            "start_ts": span["start"].astimezone(tzinfo).isoformat(),
+            "end_ts": span["end"].astimezone(tzinfo).isoformat(),
+        }
+        for span in spans_between(
+            sunrise_local, sunrise_local + timedelta(days=1), lat, lon, tzinfo, ayanamsha
         )
-    return slots
+    ]
 
 
 def build_panchaka_and_lagna(
@@ -72,8 +73,12 @@ def build_panchaka_and_lagna(
     lat: float,
     lon: float,
     tzinfo,
+    tithi_number: Optional[int] = None,
+    ayanamsha: str = "lahiri",
 ) -> Dict[str, List[Dict[str, str]]]:
     return {
-        "panchaka_rahita": panchaka_slots(sunrise_local, sunset_local, nak_number, weekday),
-        "udaya_lagna": udaya_lagna_slots(lat, lon, tzinfo, sunrise_local),
+        "panchaka_rahita": panchaka_slots(
+            sunrise_local, sunset_local, nak_number, weekday, lat, lon, tzinfo, tithi_number, ayanamsha
+        ),
+        "udaya_lagna": udaya_lagna_slots(lat, lon, tzinfo, sunrise_local, ayanamsha),
     }
@@ -0,0 +1,71 @@
+"""Fast JSON encoding for large response models.
+
+FastAPI serialises a route's return value by validating it against the
+response model again, walking it with ``jsonable_encoder`` and finally
+``json.dumps``. Routes that opt in return ``model_response(value, Model)``
+instead: a value whose type is exactly ``Model`` is not validated again (a
+dict, or an instance of a subclass, is validated once, so a subclass cannot
+leak fields the model does not declare) and is written by pydantic-core's own
+encoder.
+
+``FAST_JSON_ENABLED=false`` hands every opted-in route back to FastAPI's
+default path. Both paths produce the same JSON document, except that a NaN or
+infinite value in a ``float`` field is written as ``null`` here where the
+default path fails the request. Non-finite values the model does not type
+(inside ``dict`` or ``Any`` fields) would come out as invalid JSON, so they
+still raise ``ValueError`` as ``json.dumps(allow_nan=False)`` does.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Type
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+_NON_FINITE = (b"NaN", b"Infinity")
+
+
+def enabled() -> bool:
+    return os.getenv("FAST_JSON_ENABLED", "true").lower() == "true"
+
+
+def _reject_constant(name: str) -> Any:
+    raise ValueError(f"Out of range float values are not JSON compliant: {name}")
+
+
+def model_bytes(value: Any, response_model: Type[BaseModel]) -> bytes:
+    """``value`` as ``response_model`` JSON, validating only if it is not one already."""
+
+    if type(value) is not response_model:
+        if isinstance(value, BaseModel):
+            value = value.model_dump(by_alias=True)
+        value = response_model.model_validate(value)
+    body = value.model_dump_json(by_alias=True).encode("utf-8")
+    # Cheap scan first; strings that merely contain the words parse cleanly.
+    if any(token in body for token in _NON_FINITE):
+        json.loads(body, parse_constant=_reject_constant)
+    return body
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` that passes already-encoded bytes through."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return super().render(content)
+
+
+def model_response(value: Any, response_model: Type[BaseModel], **kwargs: Any) -> Any:
+    """Return ``value`` from a ``response_model`` route via the fast path.
+
+    With ``FAST_JSON_ENABLED=false`` the value is returned unchanged, so
+    FastAPI serialises it as usual.
+    """
+
+    if not enabled():
+        return value
+    return FastJSONResponse(model_bytes(value, response_model), **kwargs)
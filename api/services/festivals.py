@@ -1,16 +1,265 @@
-"""Extended festivals helpers."""
+"""Festival and vrat observances indexed by local date.
+
+Rules live in ``data/festivals/rules.json`` and are loaded once per process.
+Instead of testing every rule against every requested day, a whole year is
+solved in one pass for a location region: tithi periods are enumerated once,
+each is assigned its amanta masa from the preceding new moon and its civil
+date from the rule's anchor (sunrise by default; sunset or midnight for
+evening and night observances), sankrantis are enumerated from the sun's
+sidereal track, and every matching rule is filed under its local date. A day
+lookup is then a dict access.
+
+Year indexes are memoised in-process and persisted in the shared panchang
+cache tier, keyed on the rules file hash so edits invalidate them.
+"""
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Dict, Iterable, List
+import hashlib
+import json
+import os
+from bisect import bisect_left
+from datetime import date as date_cls, datetime, time as time_cls, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .panchang_algos import (
+    MASA_AMANTA,
+    _sun_longitude,
+    enumerate_sankranti_periods,
+    enumerate_tithi_periods,
+    swe,
+)
+from .panchang_cache import get_cache
+from .riseset import solar_events_range
+
+RULES_PATH = Path(__file__).resolve().parents[2] / "data" / "festivals" / "rules.json"
+REGIONS = ("north", "south", "east", "west", "intl")
+
+# Lunar months and tithi boundaries need the preceding new moon and the
+# following one (to detect adhika masa), so the enumeration is padded.
+_PAD_BEFORE_DAYS = 40
+_PAD_AFTER_DAYS = 35
+# Year indexes are shared across a 1° cell; sunrise moves by a few minutes at
+# most inside it.
+_CELL_DEGREES = 1.0
+
+
+def _rules_path() -> Path:
+    return Path(os.getenv("FESTIVAL_RULES_PATH", str(RULES_PATH)))
+
+
+@lru_cache(maxsize=1)
+def _load_rules_file(path: str) -> Tuple[Tuple[Dict[str, object], ...], str]:
+    raw = Path(path).read_bytes()
+    data = json.loads(raw)
+    rules = tuple(dict(rule) for rule in data.get("rules", []))
+    return rules, hashlib.sha1(raw).hexdigest()[:12]
+
+
+def load_rules() -> Tuple[Dict[str, object], ...]:
+    """Return the parsed rules (read from disk once per process)."""
+
+    return _load_rules_file(str(_rules_path()))[0]
+
+
+def rules_version() -> str:
+    return _load_rules_file(str(_rules_path()))[1]
 
 
 def load_feeds() -> List[Dict[str, object]]:
-    return [
-        {"title": "Generic Observance", "type": "cultural", "month": 1, "day": 1},
-        {"title": "Monthly Sankranti", "type": "festival", "month": None, "day": None},
+    """Backwards-compatible view of the rules as plain dicts."""
+
+    return [dict(rule) for rule in load_rules()]
+
+
+def region_for(lat: float, lon: float) -> str:
+    """Coarse observance region: Indian quadrant or ``intl`` elsewhere."""
+
+    if not (6.0 <= lat <= 37.0 and 68.0 <= lon <= 98.0):
+        return "intl"
+    if lon >= 84.0:
+        return "east"
+    if lat < 17.0:
+        return "south"
+    if lon < 78.0 and lat < 24.0:
+        return "west"
+    return "north"
+
+
+def _applies(rule: Dict[str, object], region: str) -> bool:
+    regions = rule.get("regions")
+    return not regions or region in regions
+
+
+def _entry(rule: Dict[str, object], **fmt: str) -> Dict[str, object]:
+    title = str(rule["title"])
+    if fmt:
+        title = title.format(**fmt)
+    return {"title": title, "type": rule.get("type", "general")}
+
+
+def _local_midnight(day: date_cls, tzinfo) -> datetime:
+    return datetime.combine(day, time_cls(0, 0), tzinfo=tzinfo).astimezone(timezone.utc)
+
+
+def _amanta_months(
+    tithis: List[Dict[str, object]], ayanamsha: str
+) -> List[Tuple[datetime, Optional[int], bool]]:
+    """Return ``(new_moon, masa_index, adhika)`` for each lunar month start.
+
+    An amanta month is named after the sign the sun enters during it, i.e. one
+    past the sun's sign at the opening new moon. When two consecutive new
+    moons share a sun sign no sankranti fell in between and the first month is
+    adhika (intercalary).
+    """
+
+    new_moons = [p["start"] for p in tithis[1:] if p["number"] == 1]
+    signs = [
+        int(_sun_longitude(moment, sidereal=True, ayanamsha=ayanamsha) // 30.0) % 12
+        for moment in new_moons
     ]
+    months: List[Tuple[datetime, Optional[int], bool]] = []
+    for idx, (moment, sign) in enumerate(zip(new_moons, signs)):
+        adhika = idx + 1 < len(signs) and signs[idx + 1] == sign
+        months.append((moment, (sign + 1) % 12, adhika))
+    return months
+
+
+def build_year_index(
+    year: int,
+    lat: float,
+    lon: float,
+    tzinfo,
+    ayanamsha: str = "lahiri",
+) -> Dict[str, List[Dict[str, object]]]:
+    """Solve every observance of ``year`` for a location, keyed by ISO local date."""
+
+    region = region_for(lat, lon)
+    rules = [rule for rule in load_rules() if _applies(rule, region)]
+    first_day = date_cls(year, 1, 1)
+    last_day = date_cls(year, 12, 31)
+    index: Dict[str, List[Dict[str, object]]] = {}
+
+    def _add(day: date_cls, entry: Dict[str, object]) -> None:
+        if first_day <= day <= last_day:
+            bucket = index.setdefault(day.isoformat(), [])
+            if entry not in bucket:
+                bucket.append(entry)
+
+    for rule in rules:
+        if rule.get("kind") == "gregorian":
+            _add(date_cls(year, int(rule["month"]), int(rule["day"])), _entry(rule))
+
+    if swe is None:
+        return index
+
+    ayan = (ayanamsha or "lahiri").lower()
+    start_utc = _local_midnight(first_day, tzinfo)
+    end_utc = _local_midnight(last_day + timedelta(days=1), tzinfo)
+
+    # Tithi rules: lookup keyed by (masa index or None, tithi number).
+    tithi_rules: Dict[Tuple[Optional[int], int], List[Dict[str, object]]] = {}
+    for rule in rules:
+        if rule.get("kind") != "tithi":
+            continue
+        masa = MASA_AMANTA.index(rule["masa"]) if rule.get("masa") else None
+        for number in rule.get("tithi", []):
+            tithi_rules.setdefault((masa, int(number)), []).append(rule)
+
+    if tithi_rules:
+        tithis = enumerate_tithi_periods(
+            start_utc - timedelta(days=_PAD_BEFORE_DAYS),
+            end_utc + timedelta(days=_PAD_AFTER_DAYS),
+            lat,
+            lon,
+            ayan,
+        )
+        months = _amanta_months(tithis, ayan)
+        days = [first_day + timedelta(days=n) for n in range(-1, (last_day - first_day).days + 2)]
+        midnights = [_local_midnight(d, tzinfo) for d in days]
+        events = solar_events_range(midnights, lat, lon)
+        anchors: Dict[str, List[Tuple[datetime, date_cls]]] = {
+            "sunrise": [(ev[0], d) for d, ev in zip(days, events) if ev[0] is not None],
+            "sunset": [(ev[1], d) for d, ev in zip(days, events) if ev[1] is not None],
+            # Nishita: the midnight that closes the civil day.
+            "midnight": [(m, d - timedelta(days=1)) for d, m in zip(days, midnights)],
+        }
+        anchor_times = {name: [t for t, _d in pairs] for name, pairs in anchors.items()}
+
+        month_pos = -1
+        for period in tithis:
+            start, end = period["start"], period["end"]
+            if end <= start_utc - timedelta(days=1) or start >= end_utc + timedelta(days=1):
+                continue
+            while month_pos + 1 < len(months) and months[month_pos + 1][0] <= start:
+                month_pos += 1
+            if month_pos < 0:
+                continue
+            _new_moon, masa, adhika = months[month_pos]
+            matches = list(tithi_rules.get((None, period["number"]), []))
+            if not adhika:
+                matches += tithi_rules.get((masa, period["number"]), [])
+
+            # Udaya tithi by default: the civil day whose sunrise (or sunset /
+            # midnight, per rule) falls inside the period; a tithi that holds
+            # no such anchor is kept on the day it begins.
+            for rule in matches:
+                anchor = str(rule.get("observed_at", "sunrise"))
+                pos = bisect_left(anchor_times[anchor], start)
+                if pos < len(anchor_times[anchor]) and anchor_times[anchor][pos] < end:
+                    day = anchors[anchor][pos][1]
+                else:
+                    day = start.astimezone(tzinfo).date()
+                _add(day, _entry(rule))
+
+    sankranti_rules = [rule for rule in rules if rule.get("kind") == "sankranti"]
+    if sankranti_rules:
+        for period in enumerate_sankranti_periods(start_utc, end_utc, ayan)[1:]:
+            day = period["start"].astimezone(tzinfo).date()
+            rashi = str(period["name"])
+            named = [rule for rule in sankranti_rules if rule.get("rashi") == rashi]
+            # A named rule (e.g. Makar Sankranti) replaces the generic title.
+            for rule in named or [rule for rule in sankranti_rules if not rule.get("rashi")]:
+                _add(day, _entry(rule, rashi=rashi))
+
+    return index
+
+
+def _encode_index(index: Dict[str, List[Dict[str, object]]]) -> bytes:
+    return json.dumps(index, separators=(",", ":")).encode("utf-8")
+
+
+def _decode_index(raw: bytes) -> Dict[str, List[Dict[str, object]]]:
+    return json.loads(raw.decode("utf-8"))
+
+
+@lru_cache(maxsize=128)
+def _year_index(
+    year: int, lat: float, lon: float, tzinfo, ayanamsha: str, version: str
+) -> Dict[str, List[Dict[str, object]]]:
+    key = f"festivals:v1:{year}:{lat:.1f}:{lon:.1f}:{tzinfo}:{ayanamsha}:{version}"
+    cache = get_cache()
+    raw = cache.get_bytes(key)
+    if raw is not None:
+        try:
+            return _decode_index(raw)
+        except ValueError:
+            pass
+    index = build_year_index(year, lat, lon, tzinfo, ayanamsha)
+    cache.set_bytes(key, _encode_index(index))
+    return index
+
+
+def year_index(
+    year: int, lat: float, lon: float, tzinfo, ayanamsha: str = "lahiri"
+) -> Dict[str, List[Dict[str, object]]]:
+    """Return the (cached) observance index for the 1° cell containing ``lat/lon``."""
+
+    cell_lat = round(lat / _CELL_DEGREES) * _CELL_DEGREES
+    cell_lon = round(lon / _CELL_DEGREES) * _CELL_DEGREES
+    return _year_index(year, cell_lat, cell_lon, tzinfo, (ayanamsha or "lahiri").lower(), rules_version())
 
 
 def _normalise(entry: object) -> Dict[str, object]:
@@ -26,18 +275,16 @@ def festivals_for_date(
     tzinfo,
     lat: float,
     lon: float,
+    ayanamsha: str = "lahiri",
 ) -> List[Dict[str, object]]:
     local_date = date_local.astimezone(tzinfo).date()
-    results: List[Dict[str, object]] = []
-    for item in load_feeds():
-        month = item.get("month")
-        day = item.get("day")
-        if month is not None and month != local_date.month:
-            continue
-        if day is not None and day != local_date.day:
-            continue
-        results.append({"title": item["title"], "type": item.get("type", "general")})
-    return results
+    entries = year_index(local_date.year, lat, lon, tzinfo, ayanamsha).get(local_date.isoformat(), [])
+    return [dict(entry) for entry in entries]
+
+
+def clear_memory() -> None:
+    _year_index.cache_clear()
+    _load_rules_file.cache_clear()
 
 
 def merge_observances(
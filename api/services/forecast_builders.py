@@ -3,6 +3,8 @@ from datetime import datetime, timedelta
 from functools import lru_cache
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+from . import metrics, single_flight
+
 if TYPE_CHECKING:  # pragma: no cover - import for typing only
     from .transits_engine import PLANET_EXPRESSIONS as _PLANET_EXPRESSIONS_T
     from .transits_engine import compute_transits as _compute_transits_t
@@ -21,6 +23,16 @@ def _compute_transits(chart_input: Dict[str, Any], opts: Dict[str, Any]):
     return _compute(chart_input, opts)
 
 
+def _window_events(chart_input: Dict[str, Any], opts: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return transit events for a daily-sampled window via the rolling store."""
+
+    from . import rolling_events
+
+    if rolling_events.rolling_enabled() and rolling_events.supports(opts):
+        return rolling_events.STORE.events_between(chart_input, opts, _compute_transits)
+    return _compute_transits(chart_input, opts)
+
+
 _AREA_BODY_MAP = {
     "career": {"Sun", "Saturn", "Jupiter", "Midheaven"},
     "love": {"Venus", "Moon", "Mars", "Sun"},
@@ -212,7 +224,16 @@ def _area_focus(area: str, events: List[Dict[str, Any]], fallback_guidance: str)
     }
 
 
+_YEARLY_FLIGHT = single_flight.group("yearly_payload")
+
+
 def yearly_payload(chart_input: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+    key = single_flight.key_for(chart_input, options)
+    return _YEARLY_FLIGHT.do(key, lambda: _yearly_payload(chart_input, options))
+
+
+@metrics.stage("yearly_payload")
+def _yearly_payload(chart_input: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
     from .yearly_western import build_yearly_western_payload, is_western_enabled
 
     if is_western_enabled(chart_input):
@@ -245,7 +266,7 @@ def monthly_payload(chart_input: Dict[str, Any], options: Dict[str, Any]) -> Dic
         "transit_bodies": options.get("transit_bodies"),
         "aspects": options.get("aspects"),
     }
-    events = _compute_transits(chart_input, opts)
+    events = _window_events(chart_input, opts)
     highlights = sorted(events, key=lambda x: -x["score"])[:10]
     return {"events": events, "highlights": highlights}
 
@@ -263,7 +284,7 @@ def daily_payload(chart_input: Dict[str, Any], options: Dict[str, Any]) -> Dict[
         "aspects": options.get("aspects"),
         "natal_targets": options.get("natal_targets"),
     }
-    events = _compute_transits(chart_input, opts)
+    events = _window_events(chart_input, opts)
     core_events = [e for e in events if e["date"] == date]
     reference = core_events if core_events else events
     top_events = sorted(reference, key=lambda x: -x["score"])[:5]
@@ -6,18 +6,23 @@ Vedic astrology principles, considering Tithi, Nakshatra, Yoga, Karana, and Lagn
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from bisect import bisect_right
+from datetime import date as date_cls, datetime, time as time_cls, timedelta, timezone
 from typing import Dict, List, Optional, Tuple, Any
 from zoneinfo import ZoneInfo
-import swisseph as swe
 
-from . import ephem
+from .lagna import spans_between
 from .panchang_algos import (
     compute_tithi,
     compute_nakshatra,
     compute_yoga,
+    enumerate_karana_periods,
+    enumerate_nakshatra_periods,
+    enumerate_tithi_periods,
+    enumerate_yoga_periods,
 )
 from .muhurta import compute_muhurta_blocks
+from .riseset import solar_events
 
 
 # Auspicious elements for Griha Pravesh
@@ -91,46 +96,6 @@ SIGN_NAMES = [
 ]
 
 
-def _get_karana_number(moon_sun_diff: float) -> int:
-    """Calculate Karana number (1-60) from Moon-Sun difference."""
-    # Karana is half of Tithi (6 degrees each)
-    karana_index = int(moon_sun_diff / 6.0)
-    
-    # First 7 Karanas repeat 8 times (1-56)
-    # Last 4 Karanas (Shakuni, Chatushpada, Naga, Kimstughna) occur once (57-60)
-    if karana_index < 57:
-        return (karana_index % 7) + 1
-    else:
-        return karana_index - 49  # Maps 57-60 to special Karanas 8-11
-
-
-def _get_ascendant(jd: float, lat: float, lon: float) -> Tuple[str, float]:
-    """Calculate the ascendant (Lagna) for a given Julian Day and location."""
-    try:
-        houses = swe.houses(jd, lat, lon, b"P")  # Placidus house system
-        asc_lon = houses[1][0]  # Ascendant longitude
-        sign_index = int(asc_lon / 30)
-        sign_name = SIGN_NAMES[sign_index]
-        return sign_name, asc_lon
-    except Exception:
-        return "Unknown", 0.0
-
-
-def _calculate_karana_for_time(dt: datetime, ayanamsha: str = "lahiri") -> int:
-    """Calculate Karana number for a specific datetime."""
-    jd = dt.timestamp() / 86400.0 + 2440587.5
-    
-    # Get ecliptic positions
-    positions = ephem.positions_ecliptic(jd, sidereal=True, ayanamsha=ayanamsha)
-    moon_lon = positions["Moon"]["lon"]
-    sun_lon = positions["Sun"]["lon"]
-    
-    # Calculate Moon-Sun difference
-    diff = (moon_lon - sun_lon) % 360.0
-    
-    return _get_karana_number(diff)
-
-
 def _is_bhadra_karana(karana_num: int) -> bool:
     """Check if the Karana is Bhadra (Vishti) - inauspicious."""
     return karana_num == BHADRA_KARANA
@@ -331,52 +296,48 @@ def _find_favorable_windows(
     """
     Find favorable time windows during the day considering Lagna, Karana, 
     and inauspicious periods (Rahu Kalam, Gulika Kalam, Yamaganda).
-    Checks hourly from sunrise to sunset.
+    Windows follow the exact spans from the cached lagna table and the
+    enumerated karana boundaries between sunrise and sunset.
     """
-    windows = []
-    
-    # Calculate inauspicious time blocks for the day
     weekday_name = sunrise.strftime("%A")
     muhurta_blocks = compute_muhurta_blocks(sunrise, sunset, weekday_name)
-    
-    # Check every hour from sunrise to sunset
-    current = sunrise
-    while current < sunset:
-        # Calculate for this hour
-        jd = current.astimezone(tz).timestamp() / 86400.0 + 2440587.5
-        window_end = min(current + timedelta(hours=1), sunset)
-        
-        # Get Lagna
-        lagna_sign, lagna_lon = _get_ascendant(jd, lat, lon)
-        
-        # Get Karana
-        karana_num = _calculate_karana_for_time(current.astimezone(tz), ayanamsha)
-        is_bhadra = _is_bhadra_karana(karana_num)
-        
-        # Check if this hour is favorable
-        is_favorable_lagna = lagna_sign in FAVORABLE_LAGNAS
-        
-        # Check for inauspicious periods (Rahu Kalam, Gulika, Yamaganda)
-        is_inauspicious, inauspicious_reason = _is_in_inauspicious_period(
-            current, window_end, muhurta_blocks
-        )
-        
-        # Only add window if ALL conditions are favorable
-        if is_favorable_lagna and not is_bhadra and not is_inauspicious:
-            # This is a good window
-            # Calculate quality rating
-            quality = "excellent" if lagna_sign in ["Cancer", "Taurus", "Leo"] else "good"
-            
-            windows.append({
-                "start_ts": current.isoformat(),
-                "end_ts": window_end.isoformat(),
-                "lagna": lagna_sign,
-                "karana_number": karana_num,
-                "quality": quality,
-            })
-        
-        current += timedelta(hours=1)
-    
+    lo, hi = sunrise.astimezone(timezone.utc), sunset.astimezone(timezone.utc)
+
+    free = _subtract(
+        [(lo, hi)],
+        [
+            (muhurta_blocks[name][0].astimezone(timezone.utc), muhurta_blocks[name][1].astimezone(timezone.utc))
+            for name in ("rahu_kal", "gulika_kal", "yamaganda")
+        ],
+    )
+    karanas = enumerate_karana_periods(lo, hi, lat, lon, ayanamsha)
+    min_window = timedelta(minutes=MIN_WINDOW_MINUTES)
+
+    windows = []
+    for span in spans_between(lo, hi, lat, lon, tz, ayanamsha):
+        if span["sign"] not in FAVORABLE_LAGNAS:
+            continue
+        for karana in karanas:
+            karana_num = int(karana["number"])
+            if _is_bhadra_karana(karana_num):
+                continue
+            start = max(span["start"], karana["start"])
+            end = min(span["end"], karana["end"])
+            if start >= end:
+                continue
+            for win_start, win_end in _intersect(free, [(start, end)]):
+                if win_end - win_start < min_window:
+                    continue
+                quality = "excellent" if span["sign"] in EXCELLENT_LAGNAS else "good"
+                windows.append({
+                    "start_ts": win_start.astimezone(tz).isoformat(),
+                    "end_ts": win_end.astimezone(tz).isoformat(),
+                    "lagna": span["sign"],
+                    "karana_number": karana_num,
+                    "quality": quality,
+                })
+
+    windows.sort(key=lambda w: w["start_ts"])
     return windows
 
 
@@ -465,3 +426,190 @@ def _generate_recommendations(
     
     return recommendations
 
+
+# ---------------------------------------------------------------------------
+# Date-range search
+# ---------------------------------------------------------------------------
+
+MAX_SEARCH_DAYS = 366
+MIN_WINDOW_MINUTES = 15
+EXCELLENT_LAGNAS = ["Cancer", "Taurus", "Leo"]
+WEEKDAY_NAMES = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+Interval = Tuple[datetime, datetime]
+
+
+def _intervals_where(periods: List[Dict[str, Any]], keep, lo: datetime, hi: datetime) -> List[Interval]:
+    """Clip the periods accepted by ``keep`` to ``[lo, hi)``, merging neighbours."""
+
+    out: List[Interval] = []
+    for period in periods:
+        if period["end"] <= lo or period["start"] >= hi or not keep(period):
+            continue
+        start, end = max(period["start"], lo), min(period["end"], hi)
+        if out and out[-1][1] >= start:
+            out[-1] = (out[-1][0], end)
+        else:
+            out.append((start, end))
+    return out
+
+
+def _intersect(a: List[Interval], b: List[Interval]) -> List[Interval]:
+    out: List[Interval] = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start = max(a[i][0], b[j][0])
+        end = min(a[i][1], b[j][1])
+        if start < end:
+            out.append((start, end))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return out
+
+
+def _subtract(intervals: List[Interval], blocks: List[Interval]) -> List[Interval]:
+    out: List[Interval] = []
+    for start, end in intervals:
+        pieces = [(start, end)]
+        for b_start, b_end in blocks:
+            next_pieces = []
+            for p_start, p_end in pieces:
+                if b_end <= p_start or b_start >= p_end:
+                    next_pieces.append((p_start, p_end))
+                    continue
+                if p_start < b_start:
+                    next_pieces.append((p_start, b_start))
+                if b_end < p_end:
+                    next_pieces.append((b_end, p_end))
+            pieces = next_pieces
+        out.extend(pieces)
+    return out
+
+
+def _period_at(periods: List[Dict[str, Any]], starts: List[datetime], moment: datetime) -> Dict[str, Any]:
+    return periods[max(0, bisect_right(starts, moment) - 1)]
+
+
+def search_griha_pravesh_muhurat(
+    start_date: date_cls,
+    end_date: date_cls,
+    lat: float,
+    lon: float,
+    tz: ZoneInfo,
+    ayanamsha: str = "lahiri",
+    limit: int = 20,
+    elevation: float = 0.0,
+) -> Dict[str, Any]:
+    """Rank Griha Pravesh windows across ``[start_date, end_date]``.
+
+    Tithi, nakshatra, yoga and karana periods are enumerated once for the
+    whole range. Days are pruned on weekday and on whether any daylight is
+    free of avoided tithi/nakshatra/yoga; only surviving days pay for Rahu
+    Kalam blocks and exact lagna spans. Windows have exact boundaries rather
+    than hourly steps.
+    """
+
+    if end_date < start_date:
+        raise ValueError("end_date must not be before start_date")
+    num_days = (end_date - start_date).days + 1
+    if num_days > MAX_SEARCH_DAYS:
+        raise ValueError(f"search range is limited to {MAX_SEARCH_DAYS} days")
+
+    first_midnight = datetime.combine(start_date, time_cls(0, 0), tzinfo=tz)
+    range_start = (first_midnight - timedelta(days=1)).astimezone(timezone.utc)
+    range_end = (first_midnight + timedelta(days=num_days + 1)).astimezone(timezone.utc)
+    tithis = enumerate_tithi_periods(range_start, range_end, lat, lon, ayanamsha)
+    naks = enumerate_nakshatra_periods(range_start, range_end, lat, lon, ayanamsha)
+    yogas = enumerate_yoga_periods(range_start, range_end, lat, lon, ayanamsha)
+    karanas = enumerate_karana_periods(range_start, range_end, lat, lon, ayanamsha)
+    tithi_starts = [p["start"] for p in tithis]
+    nak_starts = [p["start"] for p in naks]
+    yoga_starts = [p["start"] for p in yogas]
+    karana_starts = [p["start"] for p in karanas]
+
+    min_window = timedelta(minutes=MIN_WINDOW_MINUTES)
+    windows: List[Dict[str, Any]] = []
+    pruned = 0
+    for offset in range(num_days):
+        day = start_date + timedelta(days=offset)
+        weekday_index = (day.weekday() + 1) % 7
+        if weekday_index in AVOID_WEEKDAYS:
+            pruned += 1
+            continue
+
+        start_of_day = datetime.combine(day, time_cls(0, 0), tzinfo=tz)
+        sunrise, sunset, _next_sunrise = solar_events(start_of_day, lat, lon, elevation)
+        sunrise = sunrise or start_of_day + timedelta(hours=6)
+        sunset = sunset or start_of_day + timedelta(hours=18)
+        lo, hi = sunrise.astimezone(timezone.utc), sunset.astimezone(timezone.utc)
+
+        candidate = _intervals_where(tithis, lambda p: _evaluate_tithi(int(p["number"])) >= 0, lo, hi)
+        candidate = _intersect(candidate, _intervals_where(naks, lambda p: _evaluate_nakshatra(int(p["number"])) >= 0, lo, hi))
+        candidate = _intersect(candidate, _intervals_where(yogas, lambda p: _evaluate_yoga(int(p["number"])) >= 0, lo, hi))
+        if not candidate:
+            pruned += 1
+            continue
+
+        blocks = compute_muhurta_blocks(sunrise, sunset, WEEKDAY_NAMES[weekday_index])
+        candidate = _subtract(
+            candidate,
+            [
+                (blocks[name][0].astimezone(timezone.utc), blocks[name][1].astimezone(timezone.utc))
+                for name in ("rahu_kal", "gulika_kal", "yamaganda")
+            ],
+        )
+        candidate = _intersect(
+            candidate,
+            _intervals_where(karanas, lambda p: not _is_bhadra_karana(int(p["number"])), lo, hi),
+        )
+        candidate = [(s, e) for s, e in candidate if e - s >= min_window]
+        if not candidate:
+            continue
+
+        spans = spans_between(candidate[0][0], candidate[-1][1], lat, lon, tz, ayanamsha)
+        for span in spans:
+            if span["sign"] not in FAVORABLE_LAGNAS:
+                continue
+            for start, end in _intersect(candidate, [(span["start"], span["end"])]):
+                if end - start < min_window:
+                    continue
+                mid = start + (end - start) / 2
+                tithi = _period_at(tithis, tithi_starts, mid)
+                nak = _period_at(naks, nak_starts, mid)
+                yoga = _period_at(yogas, yoga_starts, mid)
+                karana = _period_at(karanas, karana_starts, mid)
+                excellent = span["sign"] in EXCELLENT_LAGNAS
+                score = (
+                    _evaluate_tithi(int(tithi["number"]))
+                    + _evaluate_nakshatra(int(nak["number"]))
+                    + _evaluate_yoga(int(yoga["number"]))
+                    + _evaluate_weekday(weekday_index)
+                    + (1 if excellent else 0)
+                )
+                windows.append(
+                    {
+                        "date": day.isoformat(),
+                        "start_ts": start.astimezone(tz).isoformat(),
+                        "end_ts": end.astimezone(tz).isoformat(),
+                        "duration_minutes": int((end - start).total_seconds() // 60),
+                        "lagna": span["sign"],
+                        "weekday": {"index": weekday_index, "name": WEEKDAY_NAMES[weekday_index]},
+                        "tithi": {"number": tithi["number"], "name": tithi["name"]},
+                        "nakshatra": {"number": nak["number"], "name": nak["name"]},
+                        "yoga": {"number": yoga["number"], "name": yoga["name"]},
+                        "karana": {"number": karana["number"], "name": karana["name"]},
+                        "score": score,
+                        "quality": "excellent" if excellent else "good",
+                    }
+                )
+
+    windows.sort(key=lambda w: (-w["score"], -w["duration_minutes"], w["start_ts"]))
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "days_considered": num_days,
+        "days_pruned": pruned,
+        "windows": windows[:limit],
+    }
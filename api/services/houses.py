@@ -6,6 +6,7 @@ def houses(jd: float, lat: float, lon: float, system: str):
     return {"asc": asc, "mc": mc}
 
 import swisseph as swe
+from . import metrics
 from .constants import sign_index_from_lon
 
 HOUSE_CODE_MAP = {
@@ -18,6 +19,7 @@ HOUSE_CODE_MAP = {
 
 def houses(jd_utc: float, lat: float, lon: float, system: str = "placidus"):
     hs = HOUSE_CODE_MAP.get(system.lower(), "P")
+    metrics.SWE_CALLS.inc(function="houses")
     cusps, ascmc = swe.houses(jd_utc, lat, lon, hs.encode())
     # cusps: list of 12 values
     return {
@@ -0,0 +1,471 @@
+"""Queues that carry report ids from the API to render workers.
+
+Three backends share one interface, picked by ``JOB_QUEUE_BACKEND``:
+
+* ``inproc`` (default) — a priority heap inside the API process, for
+  development and tests;
+* ``sqlite`` — a table in a SQLite database (WAL mode) at ``JOB_QUEUE_PATH``
+  that API and worker processes on one host share;
+* ``sqs`` — an Amazon SQS (or LocalStack) queue, so API pods and render
+  workers scale independently. SQS has no priorities; each received batch is
+  ordered by the ``priority`` message attribute.
+
+Delivery is at-least-once. ``receive`` hides the returned messages for a
+visibility timeout; a consumer ``delete``s a message when it is done with it
+or ``release``s it for another attempt, and a message that is never deleted
+reappears once its timeout lapses; a consumer still working on one ``extend``s
+its timeout. Consumers move messages received more than
+``max_receives`` times to the dead-letter queue with ``dead_letter``.
+"""
+
+from __future__ import annotations
+
+import abc
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_PRIORITY = 1
+_SQLITE_POLL_SECONDS = 0.2
+# SQS caps one receive at 10 messages and a long poll at 20 seconds.
+_SQS_MAX_BATCH = 10
+_SQS_MAX_WAIT_SECONDS = 20
+
+
+def _max_receives() -> int:
+    return max(1, int(os.getenv("JOB_QUEUE_MAX_RECEIVES", "3")))
+
+
+def _visibility_timeout() -> float:
+    return float(os.getenv("JOB_QUEUE_VISIBILITY_TIMEOUT", "600"))
+
+
+@dataclass
+class Message:
+    """One delivery of a queued body; ``receipt`` identifies this delivery."""
+
+    id: str
+    body: str
+    receipt: str
+    receive_count: int
+    priority: int = DEFAULT_PRIORITY
+
+
+class JobQueue(abc.ABC):
+    """Interface shared by the queue backends."""
+
+    backend = "base"
+
+    def __init__(self, max_receives: Optional[int] = None, visibility_timeout: Optional[float] = None) -> None:
+        self.max_receives = max_receives or _max_receives()
+        self.visibility_timeout = visibility_timeout or _visibility_timeout()
+
+    @abc.abstractmethod
+    def send(self, body: str, priority: int = DEFAULT_PRIORITY) -> str: ...
+
+    @abc.abstractmethod
+    def receive(
+        self,
+        max_messages: int = 1,
+        wait_seconds: float = 0.0,
+        visibility_timeout: Optional[float] = None,
+    ) -> List[Message]: ...
+
+    @abc.abstractmethod
+    def delete(self, message: Message) -> None: ...
+
+    @abc.abstractmethod
+    def release(self, message: Message, delay_seconds: float = 0.0) -> None:
+        """Make ``message`` visible again after ``delay_seconds``."""
+
+    @abc.abstractmethod
+    def dead_letter(self, message: Message) -> None: ...
+
+    @abc.abstractmethod
+    def depth(self) -> int:
+        """Messages waiting to be received (approximate for SQS)."""
+
+    def extend(self, message: Message, timeout: Optional[float] = None) -> None:
+        """Keep ``message`` hidden for another ``timeout`` (default: the visibility timeout)."""
+
+        self.release(message, self.visibility_timeout if timeout is None else timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.backend, "depth": self.depth(), "max_receives": self.max_receives}
+
+
+class InProcessQueue(JobQueue):
+    """Priority queue with visibility timeouts inside one process."""
+
+    backend = "inproc"
+
+    def __init__(self, max_receives: Optional[int] = None, visibility_timeout: Optional[float] = None) -> None:
+        super().__init__(max_receives, visibility_timeout)
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._ready: List[Tuple[int, int, str]] = []
+        self._messages: Dict[str, Dict[str, Any]] = {}
+        self._hidden: Dict[str, float] = {}
+        self.dead_letters: List[Message] = []
+
+    def _reveal_expired(self, now: float) -> Optional[float]:
+        """Requeue hidden messages whose timeout lapsed; return the next deadline."""
+
+        upcoming = None
+        for msg_id, visible_at in list(self._hidden.items()):
+            if visible_at <= now:
+                del self._hidden[msg_id]
+                msg = self._messages[msg_id]
+                msg["receipt"] = None
+                heapq.heappush(self._ready, (msg["priority"], next(self._seq), msg_id))
+            elif upcoming is None or visible_at < upcoming:
+                upcoming = visible_at
+        return upcoming
+
+    def send(self, body: str, priority: int = DEFAULT_PRIORITY) -> str:
+        msg_id = uuid.uuid4().hex
+        with self._cond:
+            self._messages[msg_id] = {"body": body, "priority": priority, "receive_count": 0, "receipt": None}
+            heapq.heappush(self._ready, (priority, next(self._seq), msg_id))
+            self._cond.notify()
+        return msg_id
+
+    def receive(
+        self,
+        max_messages: int = 1,
+        wait_seconds: float = 0.0,
+        visibility_timeout: Optional[float] = None,
+    ) -> List[Message]:
+        timeout = self.visibility_timeout if visibility_timeout is None else visibility_timeout
+        deadline = time.monotonic() + wait_seconds
+        with self._cond:
+            while True:
+                now = time.time()
+                upcoming = self._reveal_expired(now)
+                if self._ready:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                if upcoming is not None:
+                    remaining = min(remaining, max(0.0, upcoming - now))
+                self._cond.wait(remaining)
+            received = []
+            while self._ready and len(received) < max(1, max_messages):
+                _priority, _seq, msg_id = heapq.heappop(self._ready)
+                msg = self._messages[msg_id]
+                msg["receive_count"] += 1
+                msg["receipt"] = uuid.uuid4().hex
+                self._hidden[msg_id] = now + timeout
+                received.append(
+                    Message(msg_id, msg["body"], msg["receipt"], msg["receive_count"], msg["priority"])
+                )
+            return received
+
+    def _owned(self, message: Message) -> bool:
+        msg = self._messages.get(message.id)
+        return msg is not None and msg["receipt"] == message.receipt
+
+    def delete(self, message: Message) -> None:
+        with self._cond:
+            if self._owned(message):
+                del self._messages[message.id]
+                self._hidden.pop(message.id, None)
+
+    def release(self, message: Message, delay_seconds: float = 0.0) -> None:
+        with self._cond:
+            if self._owned(message):
+                self._hidden[message.id] = time.time() + delay_seconds
+                self._cond.notify()
+
+    def dead_letter(self, message: Message) -> None:
+        with self._cond:
+            if self._owned(message):
+                del self._messages[message.id]
+                self._hidden.pop(message.id, None)
+                self.dead_letters.append(message)
+
+    def depth(self) -> int:
+        with self._cond:
+            self._reveal_expired(time.time())
+            return len(self._ready)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            self._reveal_expired(time.time())
+            lanes: Dict[int, int] = {}
+            for priority, _seq, _msg_id in self._ready:
+                lanes[priority] = lanes.get(priority, 0) + 1
+            return {
+                "backend": self.backend,
+                "depth": len(self._ready),
+                "lanes": lanes,
+                "in_flight": len(self._hidden),
+                "dead_letters": len(self.dead_letters),
+                "max_receives": self.max_receives,
+            }
+
+
+class SqliteQueue(JobQueue):
+    """Queue table in SQLite (WAL mode) shared by the processes of one host."""
+
+    backend = "sqlite"
+
+    def __init__(
+        self,
+        path: str,
+        max_receives: Optional[int] = None,
+        visibility_timeout: Optional[float] = None,
+    ) -> None:
+        super().__init__(max_receives, visibility_timeout)
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " id TEXT NOT NULL UNIQUE,"
+            " body TEXT NOT NULL,"
+            " priority INTEGER NOT NULL,"
+            " visible_at REAL NOT NULL,"
+            " receive_count INTEGER NOT NULL DEFAULT 0,"
+            " receipt TEXT,"
+            " dead INTEGER NOT NULL DEFAULT 0)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS messages_ready ON messages (dead, visible_at, priority, seq)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def send(self, body: str, priority: int = DEFAULT_PRIORITY) -> str:
+        msg_id = uuid.uuid4().hex
+        self._conn().execute(
+            "INSERT INTO messages (id, body, priority, visible_at) VALUES (?, ?, ?, ?)",
+            (msg_id, body, priority, time.time()),
+        )
+        return msg_id
+
+    def _receive_once(self, max_messages: int, timeout: float) -> List[Message]:
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT id, body, priority, receive_count FROM messages"
+                " WHERE dead = 0 AND visible_at <= ? ORDER BY priority, seq LIMIT ?",
+                (now, max(1, max_messages)),
+            ).fetchall()
+            received = []
+            for msg_id, body, priority, count in rows:
+                receipt = uuid.uuid4().hex
+                conn.execute(
+                    "UPDATE messages SET visible_at = ?, receive_count = ?, receipt = ? WHERE id = ?",
+                    (now + timeout, count + 1, receipt, msg_id),
+                )
+                received.append(Message(msg_id, body, receipt, count + 1, priority))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return received
+
+    def receive(
+        self,
+        max_messages: int = 1,
+        wait_seconds: float = 0.0,
+        visibility_timeout: Optional[float] = None,
+    ) -> List[Message]:
+        timeout = self.visibility_timeout if visibility_timeout is None else visibility_timeout
+        deadline = time.monotonic() + wait_seconds
+        while True:
+            received = self._receive_once(max_messages, timeout)
+            if received or time.monotonic() >= deadline:
+                return received
+            time.sleep(min(_SQLITE_POLL_SECONDS, max(0.0, deadline - time.monotonic())))
+
+    def delete(self, message: Message) -> None:
+        self._conn().execute(
+            "DELETE FROM messages WHERE id = ? AND receipt = ?", (message.id, message.receipt)
+        )
+
+    def release(self, message: Message, delay_seconds: float = 0.0) -> None:
+        self._conn().execute(
+            "UPDATE messages SET visible_at = ? WHERE id = ? AND receipt = ?",
+            (time.time() + delay_seconds, message.id, message.receipt),
+        )
+
+    def dead_letter(self, message: Message) -> None:
+        self._conn().execute(
+            "UPDATE messages SET dead = 1 WHERE id = ? AND receipt = ?", (message.id, message.receipt)
+        )
+
+    def dead_letters(self) -> List[Message]:
+        rows = self._conn().execute(
+            "SELECT id, body, receipt, receive_count, priority FROM messages WHERE dead = 1 ORDER BY seq"
+        ).fetchall()
+        return [Message(*row) for row in rows]
+
+    def depth(self) -> int:
+        row = self._conn().execute(
+            "SELECT COUNT(*) FROM messages WHERE dead = 0 AND visible_at <= ?", (time.time(),)
+        ).fetchone()
+        return int(row[0])
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        rows = self._conn().execute(
+            "SELECT dead, visible_at <= ?, COUNT(*) FROM messages GROUP BY 1, 2", (now,)
+        ).fetchall()
+        counts = {(dead, visible): n for dead, visible, n in rows}
+        return {
+            "backend": self.backend,
+            "depth": counts.get((0, 1), 0),
+            "in_flight": counts.get((0, 0), 0),
+            "dead_letters": counts.get((1, 0), 0) + counts.get((1, 1), 0),
+            "max_receives": self.max_receives,
+        }
+
+
+def _sqs_client():
+    import boto3
+
+    kwargs: Dict[str, Any] = {"region_name": os.getenv("AWS_REGION", "us-east-1")}
+    endpoint = os.getenv("AWS_ENDPOINT_URL")
+    if endpoint:
+        kwargs["endpoint_url"] = endpoint
+    return boto3.session.Session().client("sqs", **kwargs)
+
+
+class SqsQueue(JobQueue):
+    """Amazon SQS (or LocalStack) queue with an optional dead-letter queue."""
+
+    backend = "sqs"
+
+    def __init__(
+        self,
+        queue_url: str,
+        dlq_url: Optional[str] = None,
+        client: Any = None,
+        max_receives: Optional[int] = None,
+        visibility_timeout: Optional[float] = None,
+    ) -> None:
+        super().__init__(max_receives, visibility_timeout)
+        self.queue_url = queue_url
+        self.dlq_url = dlq_url
+        self.client = client or _sqs_client()
+
+    def send(self, body: str, priority: int = DEFAULT_PRIORITY) -> str:
+        resp = self.client.send_message(
+            QueueUrl=self.queue_url,
+            MessageBody=body,
+            MessageAttributes={"priority": {"DataType": "Number", "StringValue": str(priority)}},
+        )
+        return resp["MessageId"]
+
+    def receive(
+        self,
+        max_messages: int = 1,
+        wait_seconds: float = 0.0,
+        visibility_timeout: Optional[float] = None,
+    ) -> List[Message]:
+        timeout = self.visibility_timeout if visibility_timeout is None else visibility_timeout
+        resp = self.client.receive_message(
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=min(_SQS_MAX_BATCH, max(1, max_messages)),
+            WaitTimeSeconds=int(min(_SQS_MAX_WAIT_SECONDS, max(0.0, wait_seconds))),
+            VisibilityTimeout=int(timeout),
+            AttributeNames=["ApproximateReceiveCount"],
+            MessageAttributeNames=["priority"],
+        )
+        received = []
+        for raw in resp.get("Messages", []):
+            attr = (raw.get("MessageAttributes") or {}).get("priority") or {}
+            received.append(
+                Message(
+                    raw["MessageId"],
+                    raw["Body"],
+                    raw["ReceiptHandle"],
+                    int((raw.get("Attributes") or {}).get("ApproximateReceiveCount", 1)),
+                    int(attr.get("StringValue", DEFAULT_PRIORITY)),
+                )
+            )
+        received.sort(key=lambda message: message.priority)
+        return received
+
+    def delete(self, message: Message) -> None:
+        self.client.delete_message(QueueUrl=self.queue_url, ReceiptHandle=message.receipt)
+
+    def release(self, message: Message, delay_seconds: float = 0.0) -> None:
+        self.client.change_message_visibility(
+            QueueUrl=self.queue_url, ReceiptHandle=message.receipt, VisibilityTimeout=int(delay_seconds)
+        )
+
+    def dead_letter(self, message: Message) -> None:
+        if self.dlq_url:
+            self.client.send_message(
+                QueueUrl=self.dlq_url,
+                MessageBody=message.body,
+                MessageAttributes={"receive_count": {"DataType": "Number", "StringValue": str(message.receive_count)}},
+            )
+        self.delete(message)
+
+    def depth(self) -> int:
+        resp = self.client.get_queue_attributes(
+            QueueUrl=self.queue_url, AttributeNames=["ApproximateNumberOfMessages"]
+        )
+        return int(resp["Attributes"]["ApproximateNumberOfMessages"])
+
+
+def _sqs_queue_url(client: Any, url_env: str, name_env: str, default_name: Optional[str]) -> Optional[str]:
+    url = os.getenv(url_env)
+    if url:
+        return url
+    name = os.getenv(name_env, default_name or "")
+    if not name:
+        return None
+    return client.get_queue_url(QueueName=name)["QueueUrl"]
+
+
+def make_queue(backend: Optional[str] = None) -> JobQueue:
+    """Build the queue selected by ``backend`` (default ``JOB_QUEUE_BACKEND``)."""
+
+    backend = (backend or os.getenv("JOB_QUEUE_BACKEND", "inproc")).lower()
+    if backend == "sqlite":
+        default = Path(os.getenv("HOME", "/opt/app")) / "data" / "jobs-queue.sqlite3"
+        return SqliteQueue(os.getenv("JOB_QUEUE_PATH", str(default)))
+    if backend == "sqs":
+        client = _sqs_client()
+        # Same names as api/scripts/init_localstack.py creates.
+        name = os.getenv("SQS_QUEUE", "wh-reports-jobs")
+        queue_url = _sqs_queue_url(client, "SQS_QUEUE_URL", "SQS_QUEUE", name)
+        dlq_url = _sqs_queue_url(client, "SQS_DLQ_URL", "SQS_DLQ", f"{name}-dlq")
+        return SqsQueue(queue_url, dlq_url=dlq_url, client=client)  # type: ignore[arg-type]
+    return InProcessQueue()
+
+
+_QUEUE: Optional[JobQueue] = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def get_queue() -> JobQueue:
+    global _QUEUE
+    if _QUEUE is None:
+        with _QUEUE_LOCK:
+            if _QUEUE is None:
+                _QUEUE = make_queue()
+    return _QUEUE
@@ -1,24 +1,76 @@
-"""In-memory job store for report rendering jobs.
+"""Job stores for report rendering jobs.
 
-This store is intentionally simple and only suitable for development and
-continuous integration environments. It keeps job metadata in-process and is
-protected by a threading lock for concurrent access from the API and worker
-threads.
+``JobStore`` keeps job metadata in-process behind a threading lock and is
+meant for development and continuous integration environments.
+``SqliteJobStore`` keeps the same records in a SQLite database in WAL mode, so
+jobs survive restarts and are shared by every API and worker process on the
+host. ``JOB_STORE_BACKEND`` (``memory`` or ``sqlite``) selects the one behind
+the global ``STORE``.
+
+Both index jobs by fingerprint (payload plus idempotency key), so ``create``
+does not scan existing jobs, and both evict finished jobs older than
+``JOB_TTL_SECONDS`` together with the PDF they rendered. A job left in
+``processing`` by a crashed worker (or queued but never sent) for longer than
+``JOB_STALE_SECONDS`` is failed with ``RENDER_STALE`` and its fingerprint is
+released, so resubmitting the same request renders it again.
 """
 
-import threading
-import time
 import hashlib
 import json
-from typing import Dict, Any, Optional
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
 
 _STATUS = ("queued", "processing", "done", "error")
+_FINISHED = ("done", "error")
+# Expired jobs are swept from ``create`` at most this often.
+_SWEEP_INTERVAL_SECONDS = 60.0
+
+
+def _ttl_seconds() -> float:
+    return float(os.getenv("JOB_TTL_SECONDS", "86400"))
+
+
+def _stale_seconds() -> float:
+    return float(os.getenv("JOB_STALE_SECONDS", "1800"))
+
+
+def _is_stale(job: Dict[str, Any], cutoff: float) -> bool:
+    if job["status"] == "processing":
+        return (job.get("updated_at") or job.get("started_at") or job["created_at"]) < cutoff
+    return job["status"] == "queued" and not job.get("enqueued_at") and job["created_at"] < cutoff
+
+
+def _stale_patch(now: float) -> Dict[str, Any]:
+    return {"status": "error", "error": "RENDER_STALE", "finished_at": now, "updated_at": now}
+
+
+def _remove_file(file_path: Optional[str]) -> None:
+    if not file_path:
+        return
+    try:
+        Path(file_path).unlink(missing_ok=True)
+    except OSError:
+        logger.warning("job_store_file_remove_failed", extra={"file_path": file_path})
 
 
 class JobStore:
-    def __init__(self) -> None:
+    def __init__(
+        self, ttl_seconds: Optional[float] = None, stale_seconds: Optional[float] = None
+    ) -> None:
         self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._by_fingerprint: Dict[str, str] = {}
         self._lock = threading.Lock()
+        self.ttl_seconds = _ttl_seconds() if ttl_seconds is None else ttl_seconds
+        self.stale_seconds = _stale_seconds() if stale_seconds is None else stale_seconds
+        self._next_sweep = 0.0
 
     def _now(self) -> float:
         return time.time()
@@ -27,6 +79,29 @@ class JobStore:
         h = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
         return h
 
+    def _fingerprint(self, payload: dict, idempotency_key: Optional[str]) -> str:
+        return self._hash({"payload": payload, "idk": idempotency_key or ""})
+
+    def _new_job(self, payload: dict, fprint: str) -> Dict[str, Any]:
+        now = self._now()
+        return {
+            "status": "queued",
+            "payload": payload,
+            "created_at": now,
+            "updated_at": now,
+            "fingerprint": fprint,
+            "file_path": None,
+            "error": None,
+        }
+
+    def _maybe_sweep(self) -> None:
+        now = self._now()
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + _SWEEP_INTERVAL_SECONDS
+        self.reap_stale(now)
+        self.evict_expired(now)
+
     # Basic CRUD helpers -------------------------------------------------
 
     def get(self, rid: str) -> Optional[dict]:
@@ -36,10 +111,7 @@ class JobStore:
     def find_by_fingerprint(self, fprint: str) -> Optional[str]:
         """Return existing report id by fingerprint if present."""
         with self._lock:
-            for rid, meta in self._jobs.items():
-                if meta.get("fingerprint") == fprint:
-                    return rid
-        return None
+            return self._by_fingerprint.get(fprint)
 
     def create(self, payload: dict, idempotency_key: Optional[str]) -> str:
         """Create a job and return its id.
@@ -48,28 +120,195 @@ class JobStore:
         existing id is returned to satisfy idempotency.
         """
 
-        fprint = self._hash({"payload": payload, "idk": idempotency_key or ""})
-        existing = self.find_by_fingerprint(fprint)
-        if existing:
-            return existing
-        rid = "rpt_" + self._hash({"t": self._now(), "rand": id(payload)})[:18]
+        self._maybe_sweep()
+        fprint = self._fingerprint(payload, idempotency_key)
         with self._lock:
-            self._jobs[rid] = {
-                "status": "queued",
-                "payload": payload,
-                "created_at": self._now(),
-                "fingerprint": fprint,
-                "file_path": None,
-                "error": None,
-            }
+            existing = self._by_fingerprint.get(fprint)
+            if existing:
+                return existing
+            rid = "rpt_" + uuid.uuid4().hex[:18]
+            self._jobs[rid] = self._new_job(payload, fprint)
+            self._by_fingerprint[fprint] = rid
         return rid
 
     def update(self, rid: str, **patch: Any) -> None:
+        patch.setdefault("updated_at", self._now())
         with self._lock:
             if rid in self._jobs:
                 self._jobs[rid].update(patch)
 
+    def reap_stale(self, now: Optional[float] = None) -> List[str]:
+        """Fail jobs stuck past ``stale_seconds`` and release their fingerprints."""
 
-# Global singleton store used by API and worker.
-STORE = JobStore()
+        now = self._now() if now is None else now
+        cutoff = now - self.stale_seconds
+        with self._lock:
+            stale = [rid for rid, job in self._jobs.items() if _is_stale(job, cutoff)]
+            for rid in stale:
+                job = self._jobs[rid]
+                job.update(_stale_patch(now))
+                if self._by_fingerprint.get(job["fingerprint"]) == rid:
+                    del self._by_fingerprint[job["fingerprint"]]
+        for rid in stale:
+            logger.warning("job_store_reaped_stale_job", extra={"rid": rid})
+        return stale
+
+    def evict_expired(self, now: Optional[float] = None) -> List[str]:
+        """Drop finished jobs older than the TTL and delete their files."""
 
+        cutoff = (self._now() if now is None else now) - self.ttl_seconds
+        with self._lock:
+            expired = [
+                rid
+                for rid, job in self._jobs.items()
+                if job["status"] in _FINISHED
+                and (job.get("finished_at") or job["created_at"]) < cutoff
+            ]
+            removed = [self._jobs.pop(rid) for rid in expired]
+            for rid, job in zip(expired, removed):
+                if self._by_fingerprint.get(job["fingerprint"]) == rid:
+                    del self._by_fingerprint[job["fingerprint"]]
+        for job in removed:
+            _remove_file(job.get("file_path"))
+        return expired
+
+
+class SqliteJobStore(JobStore):
+    """``JobStore`` persisted in SQLite (WAL mode), shared across processes.
+
+    Each thread of each process opens its own connection. Job records are
+    stored as JSON next to the indexed columns (fingerprint, status, times);
+    ``update`` merges its patch inside an immediate transaction so concurrent
+    writers from other processes are serialised by SQLite.
+    """
+
+    def __init__(
+        self, path: str, ttl_seconds: Optional[float] = None, stale_seconds: Optional[float] = None
+    ) -> None:
+        super().__init__(ttl_seconds=ttl_seconds, stale_seconds=stale_seconds)
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY,"
+            " fingerprint TEXT NOT NULL UNIQUE,"
+            " status TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " finished_at REAL,"
+            " doc TEXT NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (status, finished_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, rid: str) -> Optional[dict]:
+        row = self._conn().execute("SELECT doc FROM jobs WHERE id = ?", (rid,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find_by_fingerprint(self, fprint: str) -> Optional[str]:
+        row = self._conn().execute(
+            "SELECT id FROM jobs WHERE fingerprint = ?", (fprint,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def create(self, payload: dict, idempotency_key: Optional[str]) -> str:
+        self._maybe_sweep()
+        fprint = self._fingerprint(payload, idempotency_key)
+        job = self._new_job(payload, fprint)
+        conn = self._conn()
+        # The UNIQUE fingerprint makes concurrent creates of one job collapse.
+        conn.execute(
+            "INSERT OR IGNORE INTO jobs (id, fingerprint, status, created_at, doc)"
+            " VALUES (?, ?, ?, ?, ?)",
+            ("rpt_" + uuid.uuid4().hex[:18], fprint, job["status"], job["created_at"], json.dumps(job)),
+        )
+        return self.find_by_fingerprint(fprint)  # type: ignore[return-value]
+
+    def update(self, rid: str, **patch: Any) -> None:
+        patch.setdefault("updated_at", self._now())
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT doc FROM jobs WHERE id = ?", (rid,)).fetchone()
+            if row is not None:
+                job = json.loads(row[0])
+                job.update(patch)
+                conn.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, doc = ? WHERE id = ?",
+                    (job["status"], job.get("finished_at"), json.dumps(job), rid),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def reap_stale(self, now: Optional[float] = None) -> List[str]:
+        now = self._now() if now is None else now
+        cutoff = now - self.stale_seconds
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT id, doc FROM jobs WHERE status IN ('processing', 'queued')"
+            ).fetchall()
+            stale = []
+            for rid, doc in rows:
+                job = json.loads(doc)
+                if not _is_stale(job, cutoff):
+                    continue
+                job.update(_stale_patch(now))
+                # The fingerprint column is UNIQUE; suffixing it frees it for a new job.
+                conn.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, doc = ?,"
+                    " fingerprint = fingerprint || ':stale:' || id WHERE id = ?",
+                    (job["status"], job["finished_at"], json.dumps(job), rid),
+                )
+                stale.append(rid)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        for rid in stale:
+            logger.warning("job_store_reaped_stale_job", extra={"rid": rid})
+        return stale
+
+    def evict_expired(self, now: Optional[float] = None) -> List[str]:
+        cutoff = (self._now() if now is None else now) - self.ttl_seconds
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT id, doc FROM jobs WHERE status IN (?, ?)"
+                " AND COALESCE(finished_at, created_at) < ?",
+                (*_FINISHED, cutoff),
+            ).fetchall()
+            conn.executemany("DELETE FROM jobs WHERE id = ?", [(rid,) for rid, _doc in rows])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        for _rid, doc in rows:
+            _remove_file(json.loads(doc).get("file_path"))
+        return [rid for rid, _doc in rows]
+
+
+def _make_store() -> JobStore:
+    backend = os.getenv("JOB_STORE_BACKEND", "memory").lower()
+    if backend == "sqlite":
+        default = Path(os.getenv("HOME", "/opt/app")) / "data" / "jobs.sqlite3"
+        return SqliteJobStore(os.getenv("JOB_STORE_PATH", str(default)))
+    return JobStore()
+
+
+# Global singleton store used by API and worker.
+STORE = _make_store()
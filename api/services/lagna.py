@@ -0,0 +1,190 @@
+"""Lagna (sidereal ascendant sign) spans for a location.
+
+The ascendant sweeps the zodiac once per sidereal day at an uneven rate, so
+instead of sampling ``swe.houses`` hourly we step through the interval in
+short brackets and solve each sign crossing to ``TOLERANCE_SECONDS`` with
+secant steps. The
+result is an exact, contiguous list of lagna spans.
+
+Per-day tables are memoised on (rounded lat/lon, timezone, local date,
+ayanamsha) so griha pravesh, panchaka and the panchang view model share one
+computation; ``spans_between`` stitches cached days for arbitrary intervals.
+"""
+
+from __future__ import annotations
+
+from datetime import date as date_cls, datetime, time as time_cls, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from . import metrics
+from .panchang_algos import _jd_to_datetime, _to_jd, swe
+from .ephem import AYANAMSHA_MAP
+
+SIGN_NAMES = [
+    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces",
+]
+
+SIGN_SPAN = 30.0
+# Shortest lagna at populated latitudes is ~40 minutes; 20-minute brackets
+# still catch any sign skipped at high latitudes via the inner crossing loop.
+SAMPLE_MINUTES = 20
+TOLERANCE_SECONDS = 1.0
+
+
+def sidereal_ascendant(jd: float, lat: float, lon: float, ayanamsha: str = "lahiri") -> float:
+    """Return the sidereal ascendant longitude at a Julian Day (UT)."""
+
+    swe.set_sid_mode(AYANAMSHA_MAP.get((ayanamsha or "lahiri").lower(), swe.SIDM_LAHIRI))
+    # The ascendant does not depend on the house system; equal houses are
+    # defined at every latitude, unlike Placidus.
+    metrics.SWE_CALLS.inc(function="houses_ex")
+    _cusps, ascmc = swe.houses_ex(jd, lat, lon, b"E", swe.FLG_SIDEREAL)
+    return ascmc[0] % 360.0
+
+
+def _residual(value: float, boundary: float) -> float:
+    return (value - boundary + 180.0) % 360.0 - 180.0
+
+
+def _refine_crossing(
+    jd_lo: float,
+    jd_hi: float,
+    boundary: float,
+    lat: float,
+    lon: float,
+    ayanamsha: str,
+    asc_lo: Optional[float] = None,
+    asc_hi: Optional[float] = None,
+) -> float:
+    """Return the instant the ascendant reaches ``boundary`` inside ``[jd_lo, jd_hi]``.
+
+    The ascendant is close to linear across a sample bracket, so secant steps
+    from the bracket's known values (kept inside the bracket, which shrinks
+    around the crossing) land within ``TOLERANCE_SECONDS`` in two or three
+    evaluations instead of the dozen a bisection needs.
+    """
+
+    tolerance = TOLERANCE_SECONDS / 86400.0
+    if asc_lo is None:
+        asc_lo = sidereal_ascendant(jd_lo, lat, lon, ayanamsha)
+    if asc_hi is None:
+        asc_hi = sidereal_ascendant(jd_hi, lat, lon, ayanamsha)
+    f_lo = min(_residual(asc_lo, boundary), 0.0)
+    f_hi = max(_residual(asc_hi, boundary), 0.0)
+    while jd_hi - jd_lo > tolerance:
+        if f_hi > f_lo:
+            guess = jd_lo + (jd_hi - jd_lo) * (-f_lo / (f_hi - f_lo))
+            guess = min(max(guess, jd_lo + tolerance / 2.0), jd_hi - tolerance / 2.0)
+        else:
+            guess = (jd_lo + jd_hi) / 2.0
+        f_guess = _residual(sidereal_ascendant(guess, lat, lon, ayanamsha), boundary)
+        rate = (f_hi - f_lo) / (jd_hi - jd_lo)
+        if f_guess < 0:
+            jd_lo, f_lo = guess, f_guess
+        else:
+            jd_hi, f_hi = guess, f_guess
+        if rate > 0 and abs(f_guess) / rate <= tolerance:
+            return guess
+    return jd_hi
+
+
+def _span(sign_index: int, jd_start: float, jd_end: float) -> Dict[str, object]:
+    return {
+        "sign_index": sign_index,
+        "sign": SIGN_NAMES[sign_index],
+        "start": _jd_to_datetime(jd_start),
+        "end": _jd_to_datetime(jd_end),
+    }
+
+
+def lagna_spans(
+    start: datetime, end: datetime, lat: float, lon: float, ayanamsha: str = "lahiri"
+) -> List[Dict[str, object]]:
+    """Return contiguous lagna spans covering ``[start, end)`` (UTC datetimes).
+
+    The first and last spans are clipped to the interval.
+    """
+
+    jd_start = _to_jd(start)
+    jd_end = _to_jd(end)
+    if jd_end <= jd_start:
+        return []
+    step = SAMPLE_MINUTES / 1440.0
+
+    spans: List[Dict[str, object]] = []
+    asc = sidereal_ascendant(jd_start, lat, lon, ayanamsha)
+    sign = int(asc // SIGN_SPAN) % 12
+    span_start = jd_start
+    jd = jd_start
+    while jd < jd_end:
+        nxt = min(jd + step, jd_end)
+        next_asc = sidereal_ascendant(nxt, lat, lon, ayanamsha)
+        next_sign = int(next_asc // SIGN_SPAN) % 12
+        lo, asc_lo = jd, asc
+        # More than one boundary can fall in a bracket near the poles.
+        for _ in range(12):
+            if next_sign == sign:
+                break
+            following = (sign + 1) % 12
+            boundary = following * SIGN_SPAN
+            crossing = _refine_crossing(lo, nxt, boundary, lat, lon, ayanamsha, asc_lo, next_asc)
+            spans.append(_span(sign, span_start, crossing))
+            sign, span_start, lo, asc_lo = following, crossing, crossing, boundary
+        jd, asc = nxt, next_asc
+    spans.append(_span(sign, span_start, jd_end))
+    return spans
+
+
+@lru_cache(maxsize=4096)
+def _day_table(
+    lat: float, lon: float, tz_name: str, day: date_cls, ayanamsha: str
+) -> Tuple[Dict[str, object], ...]:
+    tz = ZoneInfo(tz_name)
+    start = datetime.combine(day, time_cls(0, 0), tzinfo=tz).astimezone(timezone.utc)
+    end = datetime.combine(day + timedelta(days=1), time_cls(0, 0), tzinfo=tz).astimezone(timezone.utc)
+    return tuple(lagna_spans(start, end, lat, lon, ayanamsha))
+
+
+def lagna_spans_for_day(
+    day: date_cls, lat: float, lon: float, tz: ZoneInfo, ayanamsha: str = "lahiri"
+) -> List[Dict[str, object]]:
+    """Return cached lagna spans covering local midnight to midnight of ``day``."""
+
+    spans = _day_table(round(lat, 2), round(lon, 2), str(tz), day, (ayanamsha or "lahiri").lower())
+    return [dict(span) for span in spans]
+
+
+def spans_between(
+    start: datetime,
+    end: datetime,
+    lat: float,
+    lon: float,
+    tz: ZoneInfo,
+    ayanamsha: str = "lahiri",
+) -> List[Dict[str, object]]:
+    """Return lagna spans for ``[start, end)`` assembled from cached day tables.
+
+    A sign that runs across local midnight is merged back into one span, and
+    the first and last spans are clipped to the interval.
+    """
+
+    if end <= start:
+        return []
+    out: List[Dict[str, object]] = []
+    day = start.astimezone(tz).date()
+    last_day = end.astimezone(tz).date()
+    while day <= last_day:
+        for span in lagna_spans_for_day(day, lat, lon, tz, ayanamsha):
+            if span["end"] <= start or span["start"] >= end:
+                continue
+            span["start"] = max(span["start"], start)
+            span["end"] = min(span["end"], end)
+            if out and out[-1]["sign_index"] == span["sign_index"] and out[-1]["end"] >= span["start"]:
+                out[-1]["end"] = span["end"]
+            else:
+                out.append(span)
+        day += timedelta(days=1)
+    return out
@@ -4,8 +4,11 @@ from __future__ import annotations
 
 import importlib
 import os
+import time
 from typing import Optional
 
+from . import metrics
+
 _openai_spec = importlib.util.find_spec("openai")
 if _openai_spec:  # pragma: no cover - optional dependency
     from openai import AsyncOpenAI
@@ -43,6 +46,7 @@ async def generate_section_text(
 
     client = _client()
     model_name = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    started = time.perf_counter()
     try:
         result = await client.chat.completions.create(
             model=model_name,
@@ -54,6 +58,7 @@ async def generate_section_text(
             temperature=0.7,
         )
     except Exception as exc:  # pragma: no cover - network interaction
+        metrics.LLM_LATENCY.observe(time.perf_counter() - started, model=model_name, outcome="error")
         # Provide more specific error messages
         error_msg = str(exc)
         error_type = type(exc).__name__
@@ -74,5 +79,10 @@ async def generate_section_text(
         else:
             raise LLMUnavailableError(f"OpenAI API error: {error_msg}") from exc
 
+    metrics.LLM_LATENCY.observe(time.perf_counter() - started, model=model_name, outcome="ok")
+    usage = getattr(result, "usage", None)
+    if usage is not None:
+        metrics.LLM_TOKENS.inc(getattr(usage, "prompt_tokens", 0) or 0, model=model_name, kind="prompt")
+        metrics.LLM_TOKENS.inc(getattr(usage, "completion_tokens", 0) or 0, model=model_name, kind="completion")
     content = result.choices[0].message.content if result.choices else ""
     return (content or "").strip()
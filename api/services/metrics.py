@@ -0,0 +1,263 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+A deliberately small registry (counters, gauges and histograms with labels)
+so ``/__metrics`` needs no extra dependency. Request latency is recorded by
+``MetricsMiddleware`` per route template; code paths time themselves with
+``stage("name")``; Swiss Ephemeris and LLM calls are counted where they are
+made. Point-in-time values that other components already track (process
+pool queue depth, cache hit counts) are read at scrape time by collectors
+registered with ``register_collector``.
+
+Values are per process: workers of the CPU process pool keep their own
+counts, which are not scraped.
+"""
+
+from __future__ import annotations
+
+import abc
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_sample(name: str, labels: Dict[str, str], value: float) -> str:
+    if labels:
+        body = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+        return f"{name}{{{body}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+
+class _Metric(abc.ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    @abc.abstractmethod
+    def samples(self) -> List[Sample]: ...
+
+    @abc.abstractmethod
+    def reset(self) -> None: ...
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the value outright; collectors use this for totals tracked elsewhere."""
+
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            return [(self.name, self._labels(k), v) for k, v in self._values.items()]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket..., +Inf count], sum.
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[idx] += 1
+                    break
+            else:
+                counts[-1] += 1
+            total[0] += value
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return sum(entry[0]) if entry else 0
+
+    def samples(self) -> List[Sample]:
+        out: List[Sample] = []
+        with self._lock:
+            items = [(key, list(counts), total[0]) for key, (counts, total) in self._values.items()]
+        for key, counts, total in items:
+            labels = self._labels(key)
+            running = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                running += count
+                out.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, running))
+            out.append((f"{self.name}_sum", labels, total))
+            out.append((f"{self.name}_count", labels, running))
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+_REGISTRY: Dict[str, _Metric] = {}
+_COLLECTORS: List[Callable[[], Iterable[Tuple[Counter, Dict[str, str], float]]]] = []
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _register(metric: _Metric) -> _Metric:
+    with _REGISTRY_LOCK:
+        existing = _REGISTRY.get(metric.name)
+        if existing is not None:
+            return existing
+        _REGISTRY[metric.name] = metric
+        return metric
+
+
+def counter(name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+    return _register(Counter(name, help_text, labelnames))  # type: ignore[return-value]
+
+
+def gauge(name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return _register(Gauge(name, help_text, labelnames))  # type: ignore[return-value]
+
+
+def histogram(
+    name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+) -> Histogram:
+    return _register(Histogram(name, help_text, labelnames, buckets))  # type: ignore[return-value]
+
+
+def register_collector(collect: Callable[[], Iterable[Tuple[Counter, Dict[str, str], float]]]) -> None:
+    """Run ``collect`` on every scrape; it yields ``(metric, labels, value)`` readings to set."""
+
+    with _REGISTRY_LOCK:
+        _COLLECTORS.append(collect)
+
+
+def render() -> str:
+    """All metrics in the Prometheus text format (version 0.0.4)."""
+
+    with _REGISTRY_LOCK:
+        collectors = list(_COLLECTORS)
+        metrics = list(_REGISTRY.values())
+    for collect in collectors:
+        for metric, labels, value in collect():
+            metric.set(value, **labels)
+
+    lines: List[str] = []
+    for metric in sorted(metrics, key=lambda m: m.name):
+        samples = metric.samples()
+        if not samples:
+            continue
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(_format_sample(name, labels, value) for name, labels, value in samples)
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    """Zero every metric; used by tests."""
+
+    with _REGISTRY_LOCK:
+        metrics = list(_REGISTRY.values())
+    for metric in metrics:
+        metric.reset()
+
+
+# Metrics shared across modules ---------------------------------------------
+
+HTTP_REQUESTS = counter(
+    "wh_http_requests_total", "HTTP requests by route template, method and status.", ("route", "method", "status")
+)
+HTTP_LATENCY = histogram(
+    "wh_http_request_duration_seconds", "HTTP request latency by route template and method.", ("route", "method")
+)
+HTTP_IN_FLIGHT = gauge("wh_http_requests_in_flight", "HTTP requests currently being served.")
+STAGE_LATENCY = histogram(
+    "wh_compute_stage_duration_seconds", "Latency of named compute stages.", ("stage",)
+)
+SWE_CALLS = counter("wh_swisseph_calls_total", "Swiss Ephemeris calls by function.", ("function",))
+LLM_LATENCY = histogram(
+    "wh_llm_request_duration_seconds",
+    "LLM completion latency by model and outcome.",
+    ("model", "outcome"),
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0, 600.0),
+)
+LLM_TOKENS = counter("wh_llm_tokens_total", "LLM tokens by model and kind.", ("model", "kind"))
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the enclosed block into ``wh_compute_stage_duration_seconds``."""
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.observe(time.perf_counter() - start, stage=name)
+
+
+def route_template(scope: dict) -> Optional[str]:
+    """The matched route's path template, so ``/v1/reports/{rid}`` is one series."""
+
+    route = scope.get("route")
+    return getattr(route, "path", None)
@@ -10,7 +10,6 @@ from __future__ import annotations
 
 import logging
 import os
-import time
 from datetime import date as date_cls, datetime, time as time_cls, timedelta, timezone
 from typing import Any, Dict, Optional, List
 
@@ -39,10 +38,8 @@ from ...schemas.panchang_viewmodel import (
     ObservanceVM,
 )
 from ..panchang_algos import (
-    compute_solar_events,
     compute_lunar_day,
     compute_masa,
-    compute_moon_events,
     compute_nakshatra,
     compute_rashi,
     compute_tithi,
@@ -52,6 +49,9 @@ from ..panchang_algos import (
     enumerate_yoga_periods,
     enumerate_karana_periods,
 )
+from ..riseset import moon_events, solar_events
+from ..panchang_cache import get_cache
+from .. import metrics, single_flight
 from ..muhurta import compute_horas, compute_muhurta_blocks
 from ..day_strip_svg import build_day_strip_svg
 from ...i18n.resolve import (
@@ -82,8 +82,8 @@ from .. import ephem
 logger = logging.getLogger(__name__)
 
 
-CACHE: Dict[str, tuple[float, PanchangViewModel]] = {}
-TTL_SECONDS = 3600  # 1 hour cache for better performance
+def _encode_viewmodel(vm: PanchangViewModel) -> bytes:
+    return vm.model_dump_json().encode("utf-8")
 
 
 def _ext_enabled() -> bool:
@@ -175,13 +175,17 @@ def _build_cache_key(date_value: date_cls, place: Dict[str, Any], options: Dict[
     show_bilingual = bool(options.get("show_bilingual", False))
     lat = float(place["lat"])
     lon = float(place["lon"])
+    elevation = float(place.get("elevation") or 0.0)
     tz = place["tz"]
     return (
-        f"panchang:{date_value.isoformat()}:{lat:.4f}:{lon:.4f}:{tz}:{ayanamsha}"
+        f"panchang:{date_value.isoformat()}:{lat:.4f}:{lon:.4f}:{elevation:.0f}:{tz}:{ayanamsha}"
         f":{int(include_muhurta)}:{int(include_hora)}:{int(include_extensions)}:{int(summary_only)}:{lang}:{script}:{int(show_bilingual)}"
     )
 
 
+_VIEWMODEL_FLIGHT = single_flight.group("panchang_viewmodel")
+
+
 def build_viewmodel(
     system: str,
     date_str: Optional[str],
@@ -209,14 +213,34 @@ def build_viewmodel(
         )
 
     key = _build_cache_key(target_date, eff_place, options)
-    cached = CACHE.get(key)
-    now = time.time()
-    if cached and cached[0] > now:
-        return cached[1]
+    cache = get_cache()
+    cached = cache.get(key, PanchangViewModel.model_validate_json)
+    if cached is not None:
+        return _with_request_header(cached, eff_place, flags)
 
-    vm = _build_viewmodel_uncached(target_date, eff_place, options, tz, flags)
-    CACHE[key] = (now + TTL_SECONDS, vm)
-    return vm
+    def _compute() -> PanchangViewModel:
+        with metrics.stage("panchang_viewmodel"):
+            vm = _build_viewmodel_uncached(target_date, eff_place, options, tz, flags)
+        cache.set(key, vm, _encode_viewmodel)
+        return vm
+
+    # Concurrent misses for one key (a newsletter burst on /today) compute once.
+    vm = _VIEWMODEL_FLIGHT.do(key, _compute)
+    return _with_request_header(vm, eff_place, flags)
+
+
+def _with_request_header(
+    vm: PanchangViewModel, place: Dict[str, Any], flags: Dict[str, Any]
+) -> PanchangViewModel:
+    """Apply the caller's place label and defaulting flags to a cached viewmodel.
+
+    Neither affects the computation, so they are not part of the cache key.
+    """
+
+    if vm.header.place_label == place.get("query") and vm.header.meta == flags:
+        return vm
+    header = vm.header.model_copy(update={"place_label": place.get("query"), "meta": flags})
+    return vm.model_copy(update={"header": header})
 
 
 def _build_viewmodel_uncached(
@@ -239,7 +263,7 @@ def _build_viewmodel_uncached(
     lon = float(place["lon"])
     elevation = float(place.get("elevation", 0.0))
 
-    sunrise, sunset, next_sunrise = compute_solar_events(start_of_day, lat, lon, elevation)
+    sunrise, sunset, next_sunrise = solar_events(start_of_day, lat, lon, elevation)
 
     if sunrise is None:
         sunrise = start_of_day + timedelta(hours=6)
@@ -258,7 +282,7 @@ def _build_viewmodel_uncached(
     )["Sun"]["lon"]
 
     lunar_day_no, paksha = compute_lunar_day(sunrise, ayanamsha=ayanamsha)
-    moonrise_dt, moonset_dt = compute_moon_events(start_of_day, lat, lon, elevation)
+    moonrise_dt, moonset_dt = moon_events(start_of_day, lat, lon, elevation)
     moonrise = _format_iso(moonrise_dt) if moonrise_dt else None
     moonset = _format_iso(moonset_dt) if moonset_dt else None
     tithi_number, _tithi_name, tithi_start, tithi_end = compute_tithi(sunrise, ayanamsha=ayanamsha)
@@ -498,6 +522,8 @@ def _build_viewmodel_uncached(
             lat,
             lon,
             tz,
+            tithi_number=tithi_number,
+            ayanamsha=ayanamsha,
         )
         vm.ritual_notes = notes_for_day()
         
@@ -542,7 +568,7 @@ def _build_viewmodel_uncached(
         vm.windows = _build_windows(include_muhurta, muhurta_blocks, minimal_muhurtas_extra)
 
     if ext_on and ext_fest:
-        addl = festivals_for_date(date_local_dt, tz, lat, lon)
+        addl = festivals_for_date(date_local_dt, tz, lat, lon, ayanamsha)
         merged = merge_observances(vm.observances, addl)
         vm.observances = [ObservanceVM(**obs) for obs in merged]
 
@@ -0,0 +1,299 @@
+"""Range-native Panchang summaries.
+
+The week and month endpoints used to build one full viewmodel per day, so
+every day re-solved the tithi, nakshatra, yoga and karana boundaries it shares
+with its neighbours. This orchestrator enumerates each element once across a
+block of days, reads sunrise/sunset from the per-location rise/set tables, and slices the per-day
+summaries out of those shared period lists.
+"""
+
+from __future__ import annotations
+
+from datetime import date as date_cls, datetime, time as time_cls, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from zoneinfo import ZoneInfo
+
+from ...schemas.panchang_viewmodel import (
+    DailyPanchangSummary,
+    LunarVM,
+    PanchangChanges,
+    SegmentVM,
+    SolarVM,
+    TithiVM,
+    WeekdayVM,
+)
+from ...i18n.resolve import karana_label, nak_label, tithi_label, vara_label, yoga_label
+from ..panchang_algos import (
+    NAKSHATRA_SPAN,
+    PADA_SPAN,
+    _moon_longitude,
+    enumerate_karana_periods,
+    enumerate_nakshatra_periods,
+    enumerate_tithi_periods,
+    enumerate_yoga_periods,
+)
+from ..panchang_cache import get_cache
+from ..riseset import moon_events, solar_events_range
+from ..util.place_defaults import normalize_place
+from .panchang_full import _build_cache_key, _format_duration, _format_iso, _normalize_options
+
+# Days solved per enumeration pass; bounds memory for long ranges.
+CHUNK_DAYS = 31
+# Padding around a chunk so the periods active at its first sunrise and last
+# next-sunrise are enumerated with their true (unclipped) start and end.
+_PAD = timedelta(days=2)
+
+Period = Dict[str, Any]
+
+
+def _overlapping(periods: List[Period], cursor: int, start: datetime, end: datetime) -> Tuple[List[Period], int]:
+    """Return periods overlapping ``[start, end)`` and the advanced cursor."""
+
+    while cursor < len(periods) and periods[cursor]["end"] <= start:
+        cursor += 1
+    out: List[Period] = []
+    idx = cursor
+    while idx < len(periods) and periods[idx]["start"] < end:
+        out.append(periods[idx])
+        idx += 1
+    return out, cursor
+
+
+def _clip(periods: List[Period], start: datetime, end: datetime, tz: ZoneInfo, pada: Optional[int] = None) -> List[Dict[str, Any]]:
+    clipped: List[Dict[str, Any]] = []
+    for idx, period in enumerate(periods):
+        entry = {
+            "start_ts": _format_iso(max(period["start"], start).astimezone(tz)),
+            "end_ts": _format_iso(min(period["end"], end).astimezone(tz)),
+            "number": period.get("number"),
+            "name": period.get("name"),
+            "pada": period.get("pada"),
+        }
+        if idx == 0 and pada is not None:
+            entry["pada"] = pada
+        clipped.append(entry)
+    return clipped
+
+
+def _solar_day(
+    start_of_day: datetime,
+    sunrise: Optional[datetime],
+    sunset: Optional[datetime],
+    next_sunrise: Optional[datetime],
+) -> Tuple[datetime, datetime, datetime]:
+    if sunrise is None:
+        sunrise = start_of_day + timedelta(hours=6)
+    if sunset is None:
+        sunset = start_of_day + timedelta(hours=18)
+    if next_sunrise is None:
+        next_sunrise = sunrise + timedelta(days=1)
+    return sunrise, sunset, next_sunrise
+
+
+def _summaries_for_chunk(
+    days: List[date_cls],
+    place: Dict[str, Any],
+    options: Dict[str, Any],
+    tz: ZoneInfo,
+) -> List[DailyPanchangSummary]:
+    ayanamsha = options["ayanamsha"]
+    lang = options["lang"]
+    script = options["script"]
+    lat = float(place["lat"])
+    lon = float(place["lon"])
+    elevation = float(place.get("elevation", 0.0))
+
+    starts = [datetime.combine(day, time_cls(0, 0), tzinfo=tz) for day in days]
+    solar = [
+        _solar_day(start, *events)
+        for start, events in zip(starts, solar_events_range(starts, lat, lon, elevation))
+    ]
+
+    range_start = (solar[0][0] - _PAD).astimezone(timezone.utc)
+    range_end = (solar[-1][2] + _PAD).astimezone(timezone.utc)
+    tithis = enumerate_tithi_periods(range_start, range_end, lat, lon, ayanamsha)
+    naks = enumerate_nakshatra_periods(range_start, range_end, lat, lon, ayanamsha)
+    yogas = enumerate_yoga_periods(range_start, range_end, lat, lon, ayanamsha)
+    karanas = enumerate_karana_periods(range_start, range_end, lat, lon, ayanamsha)
+
+    cursors = [0, 0, 0, 0]
+    summaries: List[DailyPanchangSummary] = []
+    for day, start_of_day, (sunrise, sunset, next_sunrise) in zip(days, starts, solar):
+        sr_utc = sunrise.astimezone(timezone.utc)
+        nsr_utc = next_sunrise.astimezone(timezone.utc)
+
+        day_tithis, cursors[0] = _overlapping(tithis, cursors[0], sr_utc, nsr_utc)
+        day_naks, cursors[1] = _overlapping(naks, cursors[1], sr_utc, nsr_utc)
+        day_yogas, cursors[2] = _overlapping(yogas, cursors[2], sr_utc, nsr_utc)
+        day_karanas, cursors[3] = _overlapping(karanas, cursors[3], sr_utc, nsr_utc)
+
+        tithi = day_tithis[0]
+        nak = day_naks[0]
+        yoga = day_yogas[0]
+        karana = day_karanas[0]
+
+        tithi_number = int(tithi["number"])
+        paksha = "shukla" if tithi_number <= 15 else "krishna"
+        moon_lon = _moon_longitude(sunrise, sidereal=True, ayanamsha=ayanamsha)
+        pada = int((moon_lon % NAKSHATRA_SPAN) // PADA_SPAN) + 1
+
+        tithi_start = tithi["start"].astimezone(tz)
+        tithi_end = tithi["end"].astimezone(tz)
+        span_note = "Crosses civil midnight" if tithi_start.date() != tithi_end.date() else None
+
+        weekday_index = (day.weekday() + 1) % 7
+        vara = vara_label(weekday_index, lang, script)
+        tithi_names = tithi_label(tithi_number, paksha, lang, script)
+        nak_names = nak_label(int(nak["number"]), lang, script)
+        yoga_names = yoga_label(int(yoga["number"]), lang, script)
+        karana_index = int(karana["number"]) - 1
+        kar_names = karana_label(karana_index, lang, script)
+
+        moonrise_dt, moonset_dt = moon_events(start_of_day, lat, lon, elevation)
+
+        summaries.append(
+            DailyPanchangSummary(
+                date_local=day.isoformat(),
+                weekday=WeekdayVM(**vara),
+                solar=SolarVM(
+                    sunrise=_format_iso(sunrise),
+                    sunset=_format_iso(sunset),
+                    solar_noon=_format_iso(sunrise + (sunset - sunrise) / 2),
+                    day_length=_format_duration(sunset - sunrise),
+                ),
+                lunar=LunarVM(
+                    moonrise=_format_iso(moonrise_dt) if moonrise_dt else None,
+                    moonset=_format_iso(moonset_dt) if moonset_dt else None,
+                    lunar_day_no=tithi_number,
+                    paksha=paksha,
+                ),
+                tithi=TithiVM(
+                    number=tithi_number,
+                    display_name=tithi_names["display_name"],
+                    aliases=tithi_names["aliases"],
+                    start_ts=_format_iso(tithi_start),
+                    end_ts=_format_iso(tithi_end),
+                    span_note=span_note,
+                ),
+                nakshatra=SegmentVM(
+                    number=nak["number"],
+                    display_name=nak_names["display_name"],
+                    aliases=nak_names["aliases"],
+                    pada=pada,
+                    start_ts=_format_iso(nak["start"].astimezone(tz)),
+                    end_ts=_format_iso(nak["end"].astimezone(tz)),
+                ),
+                yoga=SegmentVM(
+                    number=yoga["number"],
+                    display_name=yoga_names["display_name"],
+                    aliases=yoga_names["aliases"],
+                    start_ts=_format_iso(yoga["start"].astimezone(tz)),
+                    end_ts=_format_iso(yoga["end"].astimezone(tz)),
+                ),
+                karana=SegmentVM(
+                    number=karana_index + 1,
+                    display_name=kar_names["display_name"],
+                    aliases=kar_names["aliases"],
+                    start_ts=_format_iso(sunrise),
+                    end_ts=_format_iso(min(karana["end"], nsr_utc).astimezone(tz)),
+                ),
+                paksha=paksha,
+                changes=PanchangChanges(
+                    tithi_periods=_clip(day_tithis, sr_utc, nsr_utc, tz),
+                    nakshatra_periods=_clip(day_naks, sr_utc, nsr_utc, tz, pada=pada),
+                    yoga_periods=_clip(day_yogas, sr_utc, nsr_utc, tz),
+                    karana_periods=_clip(day_karanas, sr_utc, nsr_utc, tz),
+                ),
+            )
+        )
+    return summaries
+
+
+def _encode_summary(summary: DailyPanchangSummary) -> bytes:
+    return summary.model_dump_json().encode("utf-8")
+
+
+def _missing_runs(days: List[date_cls], cached: Dict[date_cls, DailyPanchangSummary]) -> List[List[date_cls]]:
+    """Group uncached days into runs of consecutive dates."""
+
+    runs: List[List[date_cls]] = []
+    for day in days:
+        if day in cached:
+            continue
+        if runs and runs[-1][-1] + timedelta(days=1) == day:
+            runs[-1].append(day)
+        else:
+            runs.append([day])
+    return runs
+
+
+def _cached_chunk(
+    days: List[date_cls],
+    place: Dict[str, Any],
+    options: Dict[str, Any],
+    tz: ZoneInfo,
+) -> List[DailyPanchangSummary]:
+    """Serve a chunk from the shared panchang cache, solving only missing days."""
+
+    cache = get_cache()
+    keys = {day: "summary:" + _build_cache_key(day, place, options) for day in days}
+    cached: Dict[date_cls, DailyPanchangSummary] = {}
+    for day in days:
+        hit = cache.get(keys[day], DailyPanchangSummary.model_validate_json)
+        if hit is not None:
+            cached[day] = hit
+    for run in _missing_runs(days, cached):
+        for summary in _summaries_for_chunk(run, place, options, tz):
+            day = date_cls.fromisoformat(summary.date_local)
+            cache.set(keys[day], summary, _encode_summary)
+            cached[day] = summary
+    return [cached[day] for day in days]
+
+
+def iter_daily_summaries(
+    start_date: date_cls,
+    num_days: int,
+    place: Optional[Dict[str, Any]],
+    options: Optional[Dict[str, Any]],
+    chunk_days: int = CHUNK_DAYS,
+) -> Iterator[DailyPanchangSummary]:
+    """Yield summary-only Panchang days, solving elements one chunk at a time."""
+
+    eff_place, _flags = normalize_place(place)
+    tz = ZoneInfo(eff_place["tz"])
+    opts = _normalize_options(options)
+    offset = 0
+    while offset < num_days:
+        count = min(chunk_days, num_days - offset)
+        days = [start_date + timedelta(days=offset + i) for i in range(count)]
+        yield from _cached_chunk(days, eff_place, opts, tz)
+        offset += count
+
+
+def build_daily_summaries(
+    start_date: date_cls,
+    num_days: int,
+    place: Optional[Dict[str, Any]],
+    options: Optional[Dict[str, Any]],
+) -> Tuple[Dict[str, Any], List[DailyPanchangSummary]]:
+    """Return the effective place and summaries for ``num_days`` from ``start_date``."""
+
+    eff_place, _flags = normalize_place(place)
+    return eff_place, list(iter_daily_summaries(start_date, num_days, place, options))
+
+
+def compute_range_payload(
+    start_date: date_cls,
+    num_days: int,
+    place: Optional[Dict[str, Any]],
+    options: Optional[Dict[str, Any]],
+) -> Tuple[Dict[str, Any], Tuple[bytes, ...]]:
+    """Process-pool entry point: summaries as JSON bytes rather than pickled models."""
+
+    eff_place, days = build_daily_summaries(start_date, num_days, place, options)
+    return eff_place, tuple(_encode_summary(day) for day in days)
+
+
+def decode_range_payload(payload: Tuple[bytes, ...]) -> List[DailyPanchangSummary]:
+    return [DailyPanchangSummary.model_validate_json(raw) for raw in payload]
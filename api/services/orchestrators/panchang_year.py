@@ -0,0 +1,149 @@
+"""Year-long Panchang export streamed as NDJSON or CSV.
+
+Days are solved one month-sized chunk at a time on the shared CPU executor and
+written out as soon as the chunk is in order, so memory stays bounded by the
+number of chunks in flight rather than the length of the range. Summary-only
+exports use the range-native engine in ``panchang_range``; full exports build
+one cached viewmodel per day.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import json
+import math
+from collections import deque
+from datetime import date as date_cls, timedelta
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from ..cpu_executor import chunk_date_range, get_executor
+from ..util.place_defaults import normalize_place
+from .panchang_full import build_viewmodel
+from .panchang_range import CHUNK_DAYS, compute_range_payload
+
+CSV_COLUMNS = [
+    "date",
+    "weekday",
+    "sunrise",
+    "sunset",
+    "moonrise",
+    "moonset",
+    "paksha",
+    "tithi_number",
+    "tithi",
+    "tithi_end",
+    "nakshatra_number",
+    "nakshatra",
+    "nakshatra_pada",
+    "nakshatra_end",
+    "yoga_number",
+    "yoga",
+    "yoga_end",
+    "karana_number",
+    "karana",
+    "karana_end",
+]
+
+
+def compute_full_payload(
+    start_date: date_cls,
+    num_days: int,
+    place: Optional[Dict[str, Any]],
+    options: Dict[str, Any],
+) -> Tuple[Dict[str, Any], Tuple[bytes, ...]]:
+    """Process-pool entry point: full viewmodels for consecutive days as JSON bytes."""
+
+    out: List[bytes] = []
+    for offset in range(num_days):
+        day = (start_date + timedelta(days=offset)).isoformat()
+        vm = build_viewmodel("vedic", day, place, options)
+        out.append(vm.model_dump_json().encode("utf-8"))
+    eff_place, _flags = normalize_place(place)
+    return eff_place, tuple(out)
+
+
+def csv_row(record: Dict[str, Any]) -> List[Any]:
+    """Flatten a day summary or full viewmodel (as a dict) into ``CSV_COLUMNS``."""
+
+    header = record.get("header") or {}
+    weekday = record.get("weekday") or header.get("weekday") or {}
+    solar = record.get("solar") or {}
+    lunar = record.get("lunar") or {}
+    tithi = record.get("tithi") or {}
+    nak = record.get("nakshatra") or {}
+    yoga = record.get("yoga") or {}
+    karana = record.get("karana") or {}
+    return [
+        record.get("date_local") or header.get("date_local"),
+        weekday.get("display_name"),
+        solar.get("sunrise"),
+        solar.get("sunset"),
+        lunar.get("moonrise"),
+        lunar.get("moonset"),
+        record.get("paksha") or lunar.get("paksha"),
+        tithi.get("number"),
+        tithi.get("display_name"),
+        tithi.get("end_ts"),
+        nak.get("number"),
+        nak.get("display_name"),
+        nak.get("pada"),
+        nak.get("end_ts"),
+        yoga.get("number"),
+        yoga.get("display_name"),
+        yoga.get("end_ts"),
+        karana.get("number"),
+        karana.get("display_name"),
+        karana.get("end_ts"),
+    ]
+
+
+def _csv_line(values: List[Any]) -> bytes:
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerow(["" if v is None else v for v in values])
+    return buf.getvalue().encode("utf-8")
+
+
+async def stream_days(
+    start_date: date_cls,
+    num_days: int,
+    place: Optional[Dict[str, Any]],
+    options: Dict[str, Any],
+    fmt: str = "ndjson",
+    label: str = "panchang.year",
+) -> AsyncIterator[bytes]:
+    """Yield encoded day records in date order while later chunks compute."""
+
+    executor = get_executor()
+    fn = compute_range_payload if options.get("summary_only", True) else compute_full_payload
+    # Even blocks of at most CHUNK_DAYS, so memory per chunk stays bounded.
+    chunks = chunk_date_range(
+        start_date, num_days, max_chunks=math.ceil(num_days / CHUNK_DAYS), min_chunk_days=1
+    )
+    pending: Deque["asyncio.Future[Any]"] = deque()
+    upcoming = iter(chunks)
+
+    def _submit_next() -> None:
+        nxt = next(upcoming, None)
+        if nxt is not None:
+            pending.append(asyncio.wrap_future(executor.submit(label, fn, nxt[0], nxt[1], place, options)))
+
+    # Keep one chunk per worker in flight; results are consumed strictly in order.
+    for _ in range(executor.max_workers):
+        _submit_next()
+
+    try:
+        if fmt == "csv":
+            yield _csv_line(CSV_COLUMNS)
+        while pending:
+            _eff_place, payload = await pending.popleft()
+            _submit_next()
+            if fmt == "csv":
+                yield b"".join(_csv_line(csv_row(json.loads(raw))) for raw in payload)
+            else:
+                yield b"".join(raw + b"\n" for raw in payload)
+    finally:
+        # Client went away mid-stream: drop chunks that have not started.
+        for future in pending:
+            future.cancel()
@@ -10,12 +10,14 @@ code.
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Callable, Optional, Tuple, List, Dict
 
 import math
 import os
 
-from .ephem import positions_ecliptic
+from . import metrics
+from .ephem import AYANAMSHA_MAP
 
 try:
     import swisseph as swe
@@ -177,6 +179,14 @@ EPHEMERIS_FLAG = (
     else swe.FLG_SWIEPH
 ) if swe else 0
 
+# Boundary searches stop once the Newton correction is below this many seconds.
+BOUNDARY_TOLERANCE_SECONDS = 1.0
+_MAX_BOUNDARY_STEPS = 8
+# Guard against a degenerate rate, kept below the slowest track. Daily rates:
+# Moon-Sun elongation (tithi, karana) 10-16°, sidereal Moon (nakshatra)
+# 11.8-15.4°, Sun + Moon (yoga) 12.7-16.5°, sidereal Sun (sankranti) 0.95-1.02°.
+_MIN_TRACK_RATE = 0.5
+
 
 # --- K A R A N A ---
 
@@ -219,25 +229,48 @@ def _tithi_state(moment: datetime, ayanamsha: str = "lahiri") -> Tuple[int, floa
     return number, diff
 
 
+@lru_cache(maxsize=8192)
+def _sun_moon_at_jd(
+    jd: float, sidereal: bool, ayanamsha: str
+) -> Tuple[float, float, float, float]:
+    """Return Sun/Moon longitude and daily speed at a Julian Day (UT).
+
+    Memoised so the tithi, nakshatra, yoga and karana searches for the same
+    day share their Swiss Ephemeris samples instead of each recomputing them.
+    """
+
+    flag = EPHEMERIS_FLAG | swe.FLG_SPEED
+    if sidereal:
+        swe.set_sid_mode(AYANAMSHA_MAP.get(ayanamsha, swe.SIDM_LAHIRI))
+        flag |= swe.FLG_SIDEREAL
+    metrics.SWE_CALLS.inc(2, function="calc_ut")
+    sun, _ = swe.calc_ut(jd, swe.SUN, flag)
+    moon, _ = swe.calc_ut(jd, swe.MOON, flag)
+    return sun[0] % 360.0, sun[3], moon[0] % 360.0, moon[3]
+
+
+def _sun_moon(
+    moment: datetime, sidereal: bool = True, ayanamsha: str = "lahiri"
+) -> Tuple[float, float, float, float]:
+    # Round to ~1 ms so equal instants built from different datetimes hit the cache.
+    jd = round(_to_jd(moment), 8)
+    return _sun_moon_at_jd(jd, sidereal, (ayanamsha or "lahiri").lower())
+
+
 def _sun_longitude(
     moment: datetime, sidereal: bool = False, ayanamsha: str = "lahiri"
 ) -> float:
-    jd = _to_jd(moment)
-    return positions_ecliptic(jd, sidereal=sidereal, ayanamsha=ayanamsha)["Sun"]["lon"]
+    return _sun_moon(moment, sidereal=sidereal, ayanamsha=ayanamsha)[0]
 
 
 def _moon_longitude(
     moment: datetime, sidereal: bool = False, ayanamsha: str = "lahiri"
 ) -> float:
-    jd = _to_jd(moment)
-    return positions_ecliptic(jd, sidereal=sidereal, ayanamsha=ayanamsha)["Moon"]["lon"]
+    return _sun_moon(moment, sidereal=sidereal, ayanamsha=ayanamsha)[2]
 
 
 def _yoga_value(moment: datetime, ayanamsha: str = "lahiri") -> float:
-    return (
-        _sun_longitude(moment, sidereal=True, ayanamsha=ayanamsha) + 
-        _moon_longitude(moment, sidereal=True, ayanamsha=ayanamsha)
-    ) % 360.0
+    return _yoga_track(moment, ayanamsha)[0]
 
 
 def _moon_sun_diff(
@@ -245,11 +278,36 @@ def _moon_sun_diff(
 ) -> float:
     """Return the longitudinal separation between Moon and Sun in degrees."""
 
-    moon_lon = _moon_longitude(moment, sidereal=sidereal, ayanamsha=ayanamsha)
-    sun_lon = _sun_longitude(moment, sidereal=sidereal, ayanamsha=ayanamsha)
+    sun_lon, _sun_speed, moon_lon, _moon_speed = _sun_moon(
+        moment, sidereal=sidereal, ayanamsha=ayanamsha
+    )
     return (moon_lon - sun_lon) % 360.0
 
 
+# Each track returns (angle in degrees, rate in degrees/day) for the sidereal
+# quantity a panchang element is read from.
+
+
+def _elongation_track(moment: datetime, ayanamsha: str) -> Tuple[float, float]:
+    sun_lon, sun_speed, moon_lon, moon_speed = _sun_moon(moment, ayanamsha=ayanamsha)
+    return (moon_lon - sun_lon) % 360.0, moon_speed - sun_speed
+
+
+def _moon_track(moment: datetime, ayanamsha: str) -> Tuple[float, float]:
+    _sun_lon, _sun_speed, moon_lon, moon_speed = _sun_moon(moment, ayanamsha=ayanamsha)
+    return moon_lon, moon_speed
+
+
+def _sun_track(moment: datetime, ayanamsha: str) -> Tuple[float, float]:
+    sun_lon, sun_speed, _moon_lon, _moon_speed = _sun_moon(moment, ayanamsha=ayanamsha)
+    return sun_lon, sun_speed
+
+
+def _yoga_track(moment: datetime, ayanamsha: str) -> Tuple[float, float]:
+    sun_lon, sun_speed, moon_lon, moon_speed = _sun_moon(moment, ayanamsha=ayanamsha)
+    return (sun_lon + moon_lon) % 360.0, sun_speed + moon_speed
+
+
 def _jd_to_datetime(jd: float) -> datetime:
     seconds = (jd - 2440587.5) * 86400.0
     return datetime.fromtimestamp(seconds, tz=timezone.utc)
@@ -268,6 +326,7 @@ def _rise_or_set(
 
     jd_start = _to_jd(start_of_day)
     geopos = (lon, lat, elevation)
+    metrics.SWE_CALLS.inc(function="rise_trans")
     try:
         result, times = swe.rise_trans(
             jd_start, body, rsmi | swe.BIT_DISC_CENTER, geopos, 0.0, 0.0, EPHEMERIS_FLAG
@@ -292,143 +351,104 @@ def compute_solar_events(
     return sunrise, sunset, next_sunrise
 
 
-def _unwrap(value: float, reference: float, forward: bool) -> float:
-    """Unwrap a longitude measurement relative to a reference value."""
-    if forward:
-        while value < reference:
-            value += 360.0
-    else:
-        while value > reference:
-            value -= 360.0
-    return value
+def compute_solar_events_range(
+    starts_of_day: List[datetime], lat: float, lon: float, elevation: float = 0.0
+) -> List[Tuple[Optional[datetime], Optional[datetime], Optional[datetime]]]:
+    """Return ``compute_solar_events`` for consecutive local midnights.
+
+    Each day's "next sunrise" is the following day's sunrise, so a range of
+    N days costs 2N + 1 rise/set searches instead of 3N.
+    """
+
+    if not starts_of_day:
+        return []
+    sun = swe.SUN if swe else 0
+    rise = swe.CALC_RISE if swe else 0
+    set_ = swe.CALC_SET if swe else 0
+    sunrises = [_rise_or_set(start, sun, rise, lat, lon, elevation) for start in starts_of_day]
+    sunrises.append(
+        _rise_or_set(starts_of_day[-1] + timedelta(days=1), sun, rise, lat, lon, elevation)
+    )
+    sunsets = [_rise_or_set(start, sun, set_, lat, lon, elevation) for start in starts_of_day]
+    return [
+        (sunrises[idx], sunsets[idx], sunrises[idx + 1])
+        for idx in range(len(starts_of_day))
+    ]
 
 
 def _find_boundary(
     reference_time: datetime,
-    reference_value: float,
     target: float,
-    forward: bool,
-    getter: Callable[[datetime], float],
+    track: Callable[[datetime, str], Tuple[float, float]],
+    ayanamsha: str,
 ) -> datetime:
-    """Locate the moment when an angular boundary is crossed."""
-
-    unwrapped_target = target
-    if forward:
-        while unwrapped_target < reference_value:
-            unwrapped_target += 360.0
-    else:
-        while unwrapped_target > reference_value:
-            unwrapped_target -= 360.0
-
-    step_hours = 6
-    max_hours = 96
-    direction = 1 if forward else -1
-
-    candidate_time = reference_time
-    candidate_value = reference_value
-    hours = step_hours
-    found = False
-    while hours <= max_hours:
-        candidate_time = reference_time + direction * timedelta(hours=hours)
-        candidate_value = _unwrap(
-            getter(candidate_time), reference_value, forward
-        )
-        if forward:
-            if candidate_value >= unwrapped_target:
-                found = True
-                break
-        else:
-            if candidate_value <= unwrapped_target:
-                found = True
-                break
-        hours += step_hours
-
-    if not found:
-        candidate_time = reference_time + direction * timedelta(hours=max_hours)
-        candidate_value = _unwrap(
-            getter(candidate_time), reference_value, forward
-        )
+    """Locate the moment nearest ``reference_time`` when ``track`` crosses ``target``.
+
+    The first guess extrapolates with the known angular rate (Moon–Sun relative
+    speed for tithi/karana, Moon speed for nakshatra, their sum for yoga) and
+    Newton steps refine it until the correction drops below
+    ``BOUNDARY_TOLERANCE_SECONDS``. Targets are always within one element span
+    (< 180°) of the reference, so the signed angular residual picks the right
+    crossing in both directions.
+    """
+
+    moment = reference_time
+    value, rate = track(moment, ayanamsha)
+    for _ in range(_MAX_BOUNDARY_STEPS):
+        residual = (target - value + 180.0) % 360.0 - 180.0
+        step_days = residual / max(rate, _MIN_TRACK_RATE)
+        moment = moment + timedelta(days=step_days)
+        if abs(step_days) * 86400.0 <= BOUNDARY_TOLERANCE_SECONDS:
+            break
+        value, rate = track(moment, ayanamsha)
+    return moment
 
-    if forward:
-        low_time, low_value = reference_time, reference_value
-        high_time, high_value = candidate_time, candidate_value
-    else:
-        low_time, low_value = candidate_time, candidate_value
-        high_time, high_value = reference_time, reference_value
-
-    for _ in range(50):
-        midpoint = low_time + (high_time - low_time) / 2
-        mid_value = _unwrap(getter(midpoint), reference_value, forward)
-        if forward:
-            if mid_value < unwrapped_target:
-                low_time, low_value = midpoint, mid_value
-            else:
-                high_time, high_value = midpoint, mid_value
-        else:
-            if mid_value > unwrapped_target:
-                high_time, high_value = midpoint, mid_value
-            else:
-                low_time, low_value = midpoint, mid_value
-
-    return high_time
+
+def _element_bounds(
+    moment: datetime,
+    value: float,
+    span: float,
+    track: Callable[[datetime, str], Tuple[float, float]],
+    ayanamsha: str,
+) -> Tuple[datetime, datetime]:
+    start_target = math.floor(value / span) * span
+    end_target = (start_target + span) % 360.0
+    start_time = _find_boundary(moment, start_target, track, ayanamsha)
+    end_time = _find_boundary(moment, end_target, track, ayanamsha)
+    return start_time, end_time
 
 
 def compute_tithi(moment: datetime, ayanamsha: str = "lahiri") -> Tuple[int, str, datetime, datetime]:
-    number, diff = _tithi_state(moment, ayanamsha=ayanamsha)
+    diff, _rate = _elongation_track(moment, ayanamsha)
+    number = int(diff // 12.0) + 1
     name = TITHI_NAMES[number - 1]
-
-    start_target = (number - 1) * 12.0
-    end_target = number * 12.0
-
-    start_time = _find_boundary(moment, diff, start_target, forward=False, getter=lambda dt: _moon_sun_diff(dt, sidereal=True, ayanamsha=ayanamsha))
-    end_time = _find_boundary(moment, diff, end_target, forward=True, getter=lambda dt: _moon_sun_diff(dt, sidereal=True, ayanamsha=ayanamsha))
-
+    start_time, end_time = _element_bounds(moment, diff, 12.0, _elongation_track, ayanamsha)
     return number, name, start_time, end_time
 
 
 def compute_nakshatra(moment: datetime, ayanamsha: str = "lahiri") -> Tuple[int, str, int, datetime, datetime]:
-    moon_lon = _moon_longitude(moment, sidereal=True, ayanamsha=ayanamsha)
+    moon_lon, _rate = _moon_track(moment, ayanamsha)
     number = int(moon_lon // NAKSHATRA_SPAN) + 1
     name = NAKSHATRA_NAMES[(number - 1) % len(NAKSHATRA_NAMES)]
     pada = int((moon_lon % NAKSHATRA_SPAN) // PADA_SPAN) + 1
-
-    start_target = math.floor(moon_lon / NAKSHATRA_SPAN) * NAKSHATRA_SPAN
-    end_target = start_target + NAKSHATRA_SPAN
-
-    start_time = _find_boundary(moment, moon_lon, start_target, forward=False, getter=lambda dt: _moon_longitude(dt, sidereal=True, ayanamsha=ayanamsha))
-    end_time = _find_boundary(moment, moon_lon, end_target, forward=True, getter=lambda dt: _moon_longitude(dt, sidereal=True, ayanamsha=ayanamsha))
-
+    start_time, end_time = _element_bounds(moment, moon_lon, NAKSHATRA_SPAN, _moon_track, ayanamsha)
     return number, name, pada, start_time, end_time
 
 
 def compute_yoga(moment: datetime, ayanamsha: str = "lahiri") -> Tuple[int, str, datetime, datetime]:
-    yoga_val = _yoga_value(moment, ayanamsha=ayanamsha)
+    yoga_val, _rate = _yoga_track(moment, ayanamsha)
     number = int(yoga_val // YOGA_SPAN) + 1
     name = YOGA_NAMES[(number - 1) % len(YOGA_NAMES)]
-
-    start_target = math.floor(yoga_val / YOGA_SPAN) * YOGA_SPAN
-    end_target = start_target + YOGA_SPAN
-
-    start_time = _find_boundary(moment, yoga_val, start_target, forward=False, getter=lambda dt: _yoga_value(dt, ayanamsha=ayanamsha))
-    end_time = _find_boundary(moment, yoga_val, end_target, forward=True, getter=lambda dt: _yoga_value(dt, ayanamsha=ayanamsha))
-
+    start_time, end_time = _element_bounds(moment, yoga_val, YOGA_SPAN, _yoga_track, ayanamsha)
     return number, name, start_time, end_time
 
 
 def compute_karana(
     moment: datetime, ayanamsha: str = "lahiri"
 ) -> Tuple[int, str, datetime, datetime]:
-    diff = _moon_sun_diff(moment, sidereal=True, ayanamsha=ayanamsha)
-    half_index = int(diff // KARANA_SPAN)
+    diff, _rate = _elongation_track(moment, ayanamsha)
     number, name = karana_at_delta_deg(diff)
-
-    start_target = half_index * KARANA_SPAN
-    end_target = ((half_index + 1) * KARANA_SPAN) % 360.0
-
-    getter = lambda dt: _moon_sun_diff(dt, sidereal=True, ayanamsha=ayanamsha)
-    start_time = _find_boundary(moment, diff, start_target, forward=False, getter=getter)
-    end_time = _find_boundary(moment, diff, end_target, forward=True, getter=getter)
-
+    start_time, end_time = _element_bounds(moment, diff, KARANA_SPAN, _elongation_track, ayanamsha)
     return number - 1, name, start_time, end_time
 
 
@@ -480,45 +500,54 @@ def _ensure_aware(moment: datetime) -> datetime:
     return moment
 
 
-def _enumerate_periods(
+def _enumerate_track(
     start: datetime,
     end: datetime,
-    resolver: Callable[[datetime], Dict[str, object]],
+    track: Callable[[datetime, str], Tuple[float, float]],
+    span: float,
+    ayanamsha: str,
+    label: Callable[[int, float], Dict[str, object]],
 ) -> List[Dict[str, object]]:
+    """Walk consecutive element periods of ``track`` between ``start`` and ``end``.
+
+    Each boundary is solved once: the end of one period is the start of the
+    next, and the element index advances arithmetically so a sample taken a
+    hair before the crossing cannot mislabel the following period. ``label``
+    receives the element index and how many degrees into the element the
+    period starts (non-zero only for the first, clipped period).
+    """
+
     start = _ensure_aware(start)
     end = _ensure_aware(end)
     if end <= start:
         return []
 
+    ayan = (ayanamsha or "lahiri").lower()
+    count = int(round(360.0 / span))
+    value, _rate = track(start, ayan)
+    index = int(value // span) % count
+    offset = max(0.0, value - index * span)
+
+    # No track moves faster than ~17°/day, so this bounds the loop without
+    # truncating long (year-scale) ranges.
+    max_periods = int((end - start).total_seconds() / 86400.0 * 17.0 / span) + 10
+
     periods: List[Dict[str, object]] = []
-    epsilon = timedelta(seconds=1)
     current = start
     safety = 0
-    while current < end and safety < 500:
-        info = resolver(current)
-        raw_start = _ensure_aware(info["start"])  # type: ignore[index]
-        raw_end = _ensure_aware(info["end"])  # type: ignore[index]
-        period_start = max(raw_start, start)
-        period_end = min(raw_end, end)
-
-        if period_end <= period_start:
-            current = current + epsilon
-            safety += 1
-            continue
-
-        normalized: Dict[str, object] = {
-            key: value
-            for key, value in info.items()
-            if key not in {"start", "end"}
-        }
-        normalized["start"] = period_start
-        normalized["end"] = period_end
-        periods.append(normalized)
-
-        if raw_end >= end:
-            break
-
-        current = raw_end + epsilon
+    while current < end and safety < max_periods:
+        boundary = _find_boundary(current, ((index + 1) * span) % 360.0, track, ayan)
+        if boundary <= current:
+            boundary = current + timedelta(seconds=1)
+        period_end = min(boundary, end)
+        info = label(index, offset)
+        info["start"] = current
+        info["end"] = period_end
+        periods.append(info)
+
+        current = period_end
+        index = (index + 1) % count
+        offset = 0.0
         safety += 1
 
     return periods
@@ -533,16 +562,10 @@ def enumerate_tithi_periods(
 ) -> List[Dict[str, object]]:
     del lat, lon  # Not used for tithi calculations
 
-    def _resolve(moment: datetime) -> Dict[str, object]:
-        number, name, period_start, period_end = compute_tithi(moment, ayanamsha=ayanamsha)
-        return {
-            "number": number,
-            "name": name,
-            "start": period_start,
-            "end": period_end,
-        }
+    def _label(index: int, _offset: float) -> Dict[str, object]:
+        return {"number": index + 1, "name": TITHI_NAMES[index]}
 
-    return _enumerate_periods(start_utc, end_utc, _resolve)
+    return _enumerate_track(start_utc, end_utc, _elongation_track, 12.0, ayanamsha, _label)
 
 
 def enumerate_nakshatra_periods(
@@ -554,17 +577,16 @@ def enumerate_nakshatra_periods(
 ) -> List[Dict[str, object]]:
     del lat, lon  # Not used for nakshatra calculations
 
-    def _resolve(moment: datetime) -> Dict[str, object]:
-        number, name, pada, period_start, period_end = compute_nakshatra(moment, ayanamsha=ayanamsha)
+    def _label(index: int, offset: float) -> Dict[str, object]:
         return {
-            "number": number,
-            "name": name,
-            "pada": pada,
-            "start": period_start,
-            "end": period_end,
+            "number": index + 1,
+            "name": NAKSHATRA_NAMES[index],
+            "pada": min(4, int(offset // PADA_SPAN) + 1),
         }
 
-    return _enumerate_periods(start_utc, end_utc, _resolve)
+    return _enumerate_track(
+        start_utc, end_utc, _moon_track, NAKSHATRA_SPAN, ayanamsha, _label
+    )
 
 
 def enumerate_yoga_periods(
@@ -576,16 +598,10 @@ def enumerate_yoga_periods(
 ) -> List[Dict[str, object]]:
     del lat, lon  # Not used for yoga calculations
 
-    def _resolve(moment: datetime) -> Dict[str, object]:
-        number, name, period_start, period_end = compute_yoga(moment, ayanamsha=ayanamsha)
-        return {
-            "number": number,
-            "name": name,
-            "start": period_start,
-            "end": period_end,
-        }
+    def _label(index: int, _offset: float) -> Dict[str, object]:
+        return {"number": index + 1, "name": YOGA_NAMES[index]}
 
-    return _enumerate_periods(start_utc, end_utc, _resolve)
+    return _enumerate_track(start_utc, end_utc, _yoga_track, YOGA_SPAN, ayanamsha, _label)
 
 
 def enumerate_karana_periods(
@@ -597,65 +613,62 @@ def enumerate_karana_periods(
 ) -> List[Dict[str, object]]:
     del lat, lon
 
-    if end_utc <= start_utc:
-        return []
+    def _label(index: int, _offset: float) -> Dict[str, object]:
+        number, name = karana_at_delta_deg((index + 0.5) * KARANA_SPAN)
+        return {"number": number, "name": name}
 
-    ayan = (ayanamsha or "lahiri").lower()
-    getter = lambda dt: _moon_sun_diff(dt, sidereal=True, ayanamsha=ayan)
+    return _enumerate_track(
+        start_utc, end_utc, _elongation_track, KARANA_SPAN, ayanamsha, _label
+    )
 
-    periods: List[Dict[str, object]] = []
-    current_start = start_utc
-    # probe slightly ahead to determine the active half-tithi index
-    probe_delta = getter(current_start)
-    half_index = int(probe_delta // KARANA_SPAN)
-
-    for _ in range(20):
-        mid_deg = ((half_index + 0.5) * KARANA_SPAN) % 360.0
-        number, name = karana_at_delta_deg(mid_deg)
-
-        target = ((half_index + 1) * KARANA_SPAN) % 360.0
-        boundary = _find_boundary(
-            current_start,
-            probe_delta,
-            target,
-            forward=True,
-            getter=getter,
-        )
 
-        if boundary <= current_start:
-            boundary = current_start + timedelta(seconds=1)
-
-        segment_end = min(boundary, end_utc)
-        periods.append(
-            {
-                "number": number,
-                "name": name,
-                "start": current_start,
-                "end": segment_end,
-            }
-        )
+def enumerate_sankranti_periods(
+    start_utc: datetime,
+    end_utc: datetime,
+    ayanamsha: str,
+) -> List[Dict[str, object]]:
+    """Sidereal solar months; every period after the first starts at a sankranti."""
 
-        if segment_end >= end_utc:
-            break
+    def _label(index: int, _offset: float) -> Dict[str, object]:
+        return {"number": index + 1, "name": RASHI_NAMES[index]}
 
-        # advance to next span and evaluate the new elongation
-        current_start = segment_end
-        if current_start >= end_utc:
-            break
-        probe_delta = getter(current_start)
-        half_index = int(probe_delta // KARANA_SPAN)
-
-    if periods and periods[-1]["end"] < end_utc:
-        # extend last segment to cover the tail using the current label
-        last = periods[-1]
-        periods.append(
-            {
-                "number": last["number"],
-                "name": last["name"],
-                "start": last["end"],
-                "end": end_utc,
-            }
-        )
+    return _enumerate_track(start_utc, end_utc, _sun_track, 30.0, ayanamsha, _label)
 
-    return periods
 
+_ELEMENT_ORDER = ("tithi", "nakshatra", "yoga", "karana")
+
+
+def enumerate_element_changes(
+    start_utc: datetime,
+    end_utc: datetime,
+    ayanamsha: str = "lahiri",
+) -> List[Dict[str, object]]:
+    """Time-ordered tithi, nakshatra, yoga and karana boundaries in ``[start, end)``.
+
+    Each element track is walked once with Newton-refined boundaries (tithi
+    and karana share the cached elongation samples), so a year costs a few
+    thousand ephemeris evaluations instead of a fixed-step scan per day.
+    Every change carries the element entered and the one it replaces.
+    """
+
+    streams = {
+        "tithi": enumerate_tithi_periods(start_utc, end_utc, 0.0, 0.0, ayanamsha),
+        "nakshatra": enumerate_nakshatra_periods(start_utc, end_utc, 0.0, 0.0, ayanamsha),
+        "yoga": enumerate_yoga_periods(start_utc, end_utc, 0.0, 0.0, ayanamsha),
+        "karana": enumerate_karana_periods(start_utc, end_utc, 0.0, 0.0, ayanamsha),
+    }
+    changes: List[Dict[str, object]] = []
+    for element, periods in streams.items():
+        for previous, period in zip(periods, periods[1:]):
+            changes.append(
+                {
+                    "element": element,
+                    "at": period["start"],
+                    "number": period["number"],
+                    "name": period["name"],
+                    "previous_number": previous["number"],
+                    "previous_name": previous["name"],
+                }
+            )
+    changes.sort(key=lambda change: (change["at"], _ELEMENT_ORDER.index(change["element"])))
+    return changes
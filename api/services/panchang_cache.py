@@ -0,0 +1,319 @@
+"""Two-tier cache for Panchang results.
+
+The first tier is a bounded in-process LRU with a TTL. The second tier is
+shared between the API process and the spawn-based pool workers in
+``routers/panchang``: either a directory of files (the default) or Redis when
+``PANCHANG_SHARED_CACHE=redis`` and ``REDIS_URL`` are set. Values are stored as
+bytes so each caller decides its own encoding (pydantic JSON for viewmodels,
+plain JSON for rise/set tables).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:  # pragma: no cover - optional dependency
+    import redis
+except Exception:  # pragma: no cover - defensive
+    redis = None  # type: ignore[assignment]
+
+
+def _memory_max_entries() -> int:
+    return max(1, int(os.getenv("PANCHANG_CACHE_MAX_ENTRIES", "2048")))
+
+
+def _memory_ttl() -> int:
+    return int(os.getenv("PANCHANG_CACHE_TTL", "3600"))
+
+
+def _shared_ttl() -> int:
+    # Long enough to keep a 90-day precompute warm until the next run.
+    return int(os.getenv("PANCHANG_SHARED_CACHE_TTL", str(100 * 24 * 3600)))
+
+
+def _table_ttl() -> int:
+    # Rise/set tables and year catalogues never go stale, but a TTL lets the
+    # disk tier drop years nobody asks for any more.
+    return int(os.getenv("PANCHANG_TABLE_CACHE_TTL", str(400 * 24 * 3600)))
+
+
+def _disk_max_bytes() -> int:
+    return int(os.getenv("PANCHANG_DISK_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+
+def cache_dir() -> Path:
+    default = Path(os.getenv("HOME", "/opt/app")) / "data" / "cache" / "panchang"
+    return Path(os.getenv("PANCHANG_CACHE_DIR", str(default)))
+
+
+class MemoryLRU:
+    """Thread-safe LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.time() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class DiskStore:
+    """Shared tier backed by one file per key; safe across processes.
+
+    The directory is capped at ``max_bytes`` (``PANCHANG_DISK_CACHE_MAX_BYTES``,
+    0 for no cap). A write that takes this process's running total past the
+    cap rescans the directory, removes expired entries and then the oldest
+    written ones until it is back under 90% of the cap.
+    """
+
+    def __init__(self, root: Path, max_bytes: Optional[int] = None) -> None:
+        self.root = root
+        self.max_bytes = _disk_max_bytes() if max_bytes is None else max_bytes
+        self._size: Optional[int] = None
+        self._size_lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.root / "entries" / digest[:2] / f"{digest}.bin"
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with path.open("rb") as fh:
+                header = fh.readline()
+                payload = fh.read()
+        except FileNotFoundError:
+            return None
+        except OSError:
+            logger.warning("panchang.cache.disk_read_failed", extra={"path": str(path)})
+            return None
+        try:
+            expires_at = float(header)
+        except ValueError:
+            return None
+        if expires_at and expires_at <= time.time():
+            return None
+        return payload
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        path = self._path(key)
+        expires_at = time.time() + ttl if ttl else 0.0
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with tmp.open("wb") as fh:
+                fh.write(f"{expires_at:.0f}\n".encode("ascii"))
+                fh.write(value)
+            os.replace(tmp, path)
+        except OSError:
+            logger.warning("panchang.cache.disk_write_failed", extra={"path": str(path)})
+            return
+        if self.max_bytes:
+            self._account(len(value) + 16)
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        out = []
+        for path in (self.root / "entries").glob("*/*.bin"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            out.append((stat.st_mtime, stat.st_size, path))
+        return out
+
+    def _account(self, written: int) -> None:
+        with self._size_lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += written
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self) -> int:
+        """Shrink the directory below 90% of ``max_bytes``; returns entries removed."""
+
+        removed = self.prune()
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        with self._size_lock:
+            self._size = total
+        return removed
+
+    def prune(self) -> int:
+        """Delete expired entries; returns the number removed."""
+
+        removed = 0
+        now = time.time()
+        for path in (self.root / "entries").glob("*/*.bin"):
+            try:
+                with path.open("rb") as fh:
+                    expires_at = float(fh.readline() or 0)
+                if expires_at and expires_at <= now:
+                    path.unlink()
+                    removed += 1
+            except (OSError, ValueError):
+                continue
+        return removed
+
+
+class RedisStore:
+    """Shared tier backed by Redis (or any client exposing ``get``/``set``)."""
+
+    def __init__(self, client: Any, prefix: str = "panchang-cache:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.client.get(self.prefix + key)
+        except Exception:
+            logger.warning("panchang.cache.redis_read_failed", exc_info=True)
+            return None
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        try:
+            self.client.set(self.prefix + key, value, ex=ttl or None)
+        except Exception:
+            logger.warning("panchang.cache.redis_write_failed", exc_info=True)
+
+    def prune(self) -> int:
+        return 0  # Redis expires keys itself.
+
+
+def _build_shared_store() -> Optional[Any]:
+    backend = os.getenv("PANCHANG_SHARED_CACHE", "disk").lower()
+    if backend == "redis":
+        redis_url = os.getenv("REDIS_URL")
+        if redis is not None and redis_url:
+            try:
+                return RedisStore(redis.Redis.from_url(redis_url))
+            except Exception:  # pragma: no cover - connection errors logged but not fatal
+                logger.exception("panchang.cache.redis_init_failed")
+        logger.info("panchang.cache.redis_unavailable_using_disk")
+        backend = "disk"
+    if backend == "disk":
+        return DiskStore(cache_dir())
+    return None
+
+
+class PanchangCache:
+    """Memory LRU in front of an optional shared byte store."""
+
+    def __init__(self, memory: MemoryLRU, shared: Optional[Any]) -> None:
+        self.memory = memory
+        self.shared = shared
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, decode: Callable[[bytes], Any]) -> Optional[Any]:
+        value = self._get(key, decode)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def _get(self, key: str, decode: Callable[[bytes], Any]) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        if self.shared is None:
+            return None
+        raw = self.shared.get(key)
+        if raw is None:
+            return None
+        try:
+            value = decode(raw)
+        except Exception:
+            logger.warning("panchang.cache.decode_failed", extra={"key": key})
+            return None
+        self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, value: Any, encode: Callable[[Any], bytes], ttl: Optional[int] = None) -> None:
+        self.memory.set(key, value)
+        if self.shared is not None:
+            self.shared.set(key, encode(value), ttl if ttl is not None else _shared_ttl())
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Read straight from the shared tier (callers keep their own memory copy)."""
+
+        return self.shared.get(key) if self.shared is not None else None
+
+    def set_bytes(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        """Write to the shared tier; ``ttl`` defaults to ``PANCHANG_TABLE_CACHE_TTL``."""
+
+        if self.shared is not None:
+            self.shared.set(key, value, ttl if ttl is not None else _table_ttl())
+
+
+_CACHE: Optional[PanchangCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_cache() -> PanchangCache:
+    """Return the process-wide cache, building it from the environment on first use."""
+
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = PanchangCache(
+                    MemoryLRU(_memory_max_entries(), _memory_ttl()),
+                    _build_shared_store(),
+                )
+    return _CACHE
+
+
+def reset_cache(cache: Optional[PanchangCache] = None) -> None:
+    """Replace (or drop) the process-wide cache; used by tests and the CLI."""
+
+    global _CACHE
+    with _CACHE_LOCK:
+        _CACHE = cache
@@ -0,0 +1,180 @@
+"""On-demand sampling profiles of single requests.
+
+A request sent by an admin key (``ADMIN_API_KEYS``) with ``X-Profile: 1``
+runs while a background thread samples the Python stacks of every thread in
+the process every ``PROFILE_INTERVAL_MS``. cProfile would only see the
+thread it is enabled on, while one request hops between the event loop, the
+threadpool and (see below) the CPU process pool; sampling sees all of them.
+Threads that are idle (waiting on a lock, queue or selector) are skipped.
+Concurrent requests on the same process show up in the samples too, so
+profile on a quiet instance when you can.
+
+While a profile is active, ``active()`` is true in the request's context:
+the CPU executor then runs its work inline on a thread instead of in worker
+processes, and the response cache is bypassed, so the profile shows the
+real computation.
+
+Stacks are written in the folded format (``frame;frame;frame count``) that
+speedscope and flamegraph.pl read, under ``dev-assets/profiles/``.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Any, Dict, List, Optional, Tuple
+
+PROFILES_DIR = Path(os.getenv("HOME", "/opt/app")) / "data" / "dev-assets" / "profiles"
+_MAX_DEPTH = 128
+
+# Innermost frames that mean "this thread is waiting, not working".
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+_active: contextvars.ContextVar[bool] = contextvars.ContextVar("profiling_active", default=False)
+
+
+def active() -> bool:
+    """True inside a request that is being profiled."""
+
+    return _active.get()
+
+
+def activate() -> contextvars.Token:
+    """Mark the current context (and tasks and threads started from it) as profiled."""
+
+    return _active.set(True)
+
+
+def deactivate(token: contextvars.Token) -> None:
+    _active.reset(token)
+
+
+def admin_keys() -> List[str]:
+    return [key.strip() for key in os.getenv("ADMIN_API_KEYS", "").split(",") if key.strip()]
+
+
+def _interval() -> float:
+    return max(0.001, float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000.0)
+
+
+def _top_n() -> int:
+    return int(os.getenv("PROFILE_TOP_N", "15"))
+
+
+def _label(frame: FrameType) -> str:
+    code = frame.f_code
+    path = Path(code.co_filename)
+    return f"{code.co_name} ({path.parent.name}/{path.name}:{code.co_firstlineno})"
+
+
+def _stack(frame: FrameType) -> Optional[Tuple[str, ...]]:
+    """Outermost-first frame labels, or None when the thread is idle."""
+
+    if (Path(frame.f_code.co_filename).name, frame.f_code.co_name) in _IDLE_FRAMES:
+        return None
+    labels: List[str] = []
+    current: Optional[FrameType] = frame
+    while current is not None and len(labels) < _MAX_DEPTH:
+        labels.append(_label(current))
+        current = current.f_back
+    return tuple(reversed(labels))
+
+
+class SamplingProfiler:
+    """Samples every other thread's stack until ``stop`` is called."""
+
+    def __init__(self, interval: Optional[float] = None) -> None:
+        self.interval = interval or _interval()
+        self.stacks: Counter = Counter()
+        self.ticks = 0
+        self.started = 0.0
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> "SamplingProfiler":
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+        return self
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.ticks += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = _stack(frame)
+                if stack is not None:
+                    self.stacks[stack] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+    def top(self, n: int) -> List[Dict[str, Any]]:
+        """Hottest functions by self samples, with their inclusive share."""
+
+        total = sum(self.stacks.values())
+        if not total:
+            return []
+        own: Counter = Counter()
+        inclusive: Counter = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                inclusive[label] += count
+        return [
+            {
+                "function": label,
+                "self_pct": round(100.0 * count / total, 1),
+                "total_pct": round(100.0 * inclusive[label] / total, 1),
+            }
+            for label, count in own.most_common(n)
+        ]
+
+
+class RequestProfile:
+    """One profiled request: its id, sampler and where the result is saved."""
+
+    def __init__(self) -> None:
+        self.id = "prof_" + uuid.uuid4().hex[:16]
+        self.path = PROFILES_DIR / f"{self.id}.folded"
+        self.url = f"/dev-assets/profiles/{self.path.name}"
+        self.profiler = SamplingProfiler()
+
+    def start(self) -> None:
+        self.profiler.start()
+
+    def finish(self) -> Dict[str, Any]:
+        """Stop sampling, write the folded stacks and return the summary for ``meta``."""
+
+        self.profiler.stop()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(self.profiler.folded(), encoding="utf-8")
+        return {
+            "id": self.id,
+            "url": self.url,
+            "elapsed_ms": round(self.profiler.elapsed * 1000.0, 1),
+            "samples": sum(self.profiler.stacks.values()),
+            "interval_ms": round(self.profiler.interval * 1000.0, 2),
+            "top": self.profiler.top(_top_n()),
+        }
@@ -0,0 +1,268 @@
+"""Cache of serialized responses for endpoints that are pure functions of their input.
+
+Chart, dasha, transit and Panchang computations depend only on the request
+(plus, for "today"-style Panchang calls, the resolved local date), the engine
+version and the ephemeris backend. Routes hand this module the canonical
+parameters and a compute callback: the response bytes are looked up under a
+sha256 of those parameters, and on a miss the callback runs once, the result
+is validated against the route's response model, rendered exactly as FastAPI
+would render it and stored.
+
+The key doubles as a strong ETag, so clients revalidating with
+``If-None-Match`` get ``304 Not Modified`` without the cache even being read.
+
+Tiers: a byte-budgeted in-process LRU (``RESPONSE_CACHE_MAX_BYTES``) in front
+of Redis when ``RESPONSE_CACHE_REDIS=true`` and ``REDIS_URL`` are set.
+``RESPONSE_CACHE_ENABLED=false`` turns the layer off.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Tuple, Type
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from . import ephem, fast_json, profiling
+from .panchang_cache import RedisStore, redis
+
+logger = logging.getLogger(__name__)
+
+# Bump when a cached route's output changes without an ENGINE_VERSION change.
+RESPONSE_CACHE_VERSION = 1
+_CACHE_CONTROL = "no-cache"
+
+
+def enabled() -> bool:
+    if profiling.active():
+        return False
+    return os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+
+
+def _max_bytes() -> int:
+    return max(1, int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))))
+
+
+def _ttl() -> int:
+    return int(os.getenv("RESPONSE_CACHE_TTL", str(24 * 3600)))
+
+
+class ByteLRU:
+    """Thread-safe LRU of byte strings bounded by total size, with expiry."""
+
+    def __init__(self, max_bytes: int, ttl_seconds: int) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.size = 0
+        self._data: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                self.size -= len(self._data.pop(key)[1])
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.size -= len(old[1])
+            self._data[key] = (time.time() + self.ttl_seconds, value)
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                _key, (_expires, evicted) = self._data.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ResponseCache:
+    """Memory LRU in front of an optional shared byte store."""
+
+    def __init__(self, memory: ByteLRU, shared: Optional[Any] = None) -> None:
+        self.memory = memory
+        self.shared = shared
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        body = self.memory.get(key)
+        if body is None and self.shared is not None:
+            body = self.shared.get(key)
+            if body is not None:
+                self.memory.set(key, body)
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    def set(self, key: str, body: bytes) -> None:
+        self.memory.set(key, body)
+        if self.shared is not None:
+            self.shared.set(key, body, self.memory.ttl_seconds)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.memory),
+            "bytes": self.memory.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared is not None,
+        }
+
+
+def _build_shared_store() -> Optional[RedisStore]:
+    if os.getenv("RESPONSE_CACHE_REDIS", "false").lower() != "true":
+        return None
+    redis_url = os.getenv("REDIS_URL")
+    if redis is None or not redis_url:
+        logger.info("response_cache.redis_unavailable")
+        return None
+    try:
+        return RedisStore(redis.Redis.from_url(redis_url), prefix="response-cache:")
+    except Exception:  # pragma: no cover - connection errors logged but not fatal
+        logger.exception("response_cache.redis_init_failed")
+        return None
+
+
+_CACHE: Optional[ResponseCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = ResponseCache(ByteLRU(_max_bytes(), _ttl()), _build_shared_store())
+    return _CACHE
+
+
+def reset_response_cache(cache: Optional[ResponseCache] = None) -> None:
+    """Replace (or drop) the process-wide cache; used by tests."""
+
+    global _CACHE
+    with _CACHE_LOCK:
+        _CACHE = cache
+
+
+def cache_key(route: str, params: Any) -> str:
+    """sha256 of the canonical JSON of ``params`` plus everything else the output depends on."""
+
+    blob = json.dumps(
+        {
+            "route": route,
+            "params": params,
+            "engine": ephem.ENGINE_VERSION,
+            "backend": os.getenv("EPHEMERIS_BACKEND", "swieph"),
+            "version": RESPONSE_CACHE_VERSION,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _etag(key: str) -> str:
+    return f'"{key[:40]}"'
+
+
+def _matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def render(value: Any, response_model: Type[BaseModel]) -> bytes:
+    """Serialize ``value`` as a ``response_model`` route's JSON body.
+
+    NaN or infinity in a ``float`` field renders as ``null``; anywhere else it
+    still raises ``ValueError`` (see :mod:`api.services.fast_json`).
+    """
+
+    return fast_json.model_bytes(value, response_model)
+
+
+def _response(body: bytes, etag: str, status: str) -> Response:
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": _CACHE_CONTROL, "X-Cache": status},
+    )
+
+
+def _lookup(request: Request, key: str) -> Optional[Response]:
+    etag = _etag(key)
+    if _matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": _CACHE_CONTROL})
+    body = get_response_cache().get(key)
+    return _response(body, etag, "HIT") if body is not None else None
+
+
+def _store(key: str, value: Any, response_model: Type[BaseModel]) -> Response:
+    body = render(value, response_model)
+    get_response_cache().set(key, body)
+    return _response(body, _etag(key), "MISS")
+
+
+def cached_response(
+    request: Request,
+    route: str,
+    params: Any,
+    compute: Callable[[], Any],
+    response_model: Type[BaseModel],
+) -> Any:
+    """Serve ``compute()`` for a sync route through the cache."""
+
+    if not enabled():
+        return compute()
+    key = cache_key(route, params)
+    hit = _lookup(request, key)
+    if hit is not None:
+        return hit
+    return _store(key, compute(), response_model)
+
+
+async def cached_response_async(
+    request: Request,
+    route: str,
+    params: Any,
+    compute: Callable[[], Awaitable[Any]],
+    response_model: Type[BaseModel],
+) -> Any:
+    """Serve ``await compute()`` for an async route through the cache."""
+
+    if not enabled():
+        return await compute()
+    key = cache_key(route, params)
+    hit = _lookup(request, key)
+    if hit is not None:
+        return hit
+    return _store(key, await compute(), response_model)
@@ -0,0 +1,353 @@
+"""Per-location sunrise/sunset/moonrise/moonset tables.
+
+``compute_solar_events`` and ``compute_moon_events`` run up to five
+``swe.rise_trans`` searches per day, and the week/month routes repeat them for
+adjacent days. This service instead walks a whole year of rise/set events for a
+(rounded lat, rounded lon, elevation) key in one pass, chaining each search from
+the previous event, and answers any day's events as a bisect lookup. Tables are
+kept in a small in-process LRU and persisted as JSON in the shared panchang
+cache tier so that other workers, and later deploys, can load them.
+
+Building a table takes over a second, so a request never waits for one: a
+lookup whose table is not cached yet runs the direct per-day searches and
+queues the build on a background thread (see ``build_mode``);
+``precompute_riseset`` builds tables for common cities ahead of time.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from .panchang_algos import (
+    EPHEMERIS_FLAG,
+    _jd_to_datetime,
+    _to_jd,
+    compute_moon_events,
+    compute_solar_events,
+    compute_solar_events_range,
+    swe,
+)
+from . import metrics
+from .panchang_cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+TABLE_VERSION = 1
+KINDS = ("sunrise", "sunset", "moonrise", "moonset")
+
+# Lookups only accept events this close to the requested start. The Moon can
+# skip a calendar day, so its window is wider; anything further away means the
+# body did not rise/set (polar day or night) and the lookup returns None.
+_MAX_GAP_DAYS = {"sunrise": 1.5, "sunset": 1.5, "moonrise": 2.0, "moonset": 2.0}
+# Tables extend past the calendar year so lookups near Jan 1 / Dec 31 in any
+# timezone stay inside one table.
+_PAD_BEFORE_DAYS = 2.0
+_PAD_AFTER_DAYS = 3.0
+
+
+def tables_enabled() -> bool:
+    return os.getenv("PANCHANG_RISESET_TABLES", "true").lower() == "true"
+
+
+def _max_tables() -> int:
+    return max(1, int(os.getenv("PANCHANG_RISESET_MAX_TABLES", "256")))
+
+
+def location_key(lat: float, lon: float, elevation: float = 0.0) -> Tuple[float, float, int]:
+    """Round a location to ~1 km so nearby requests share a table."""
+
+    return round(float(lat), 2), round(float(lon), 2), int(round(float(elevation or 0.0)))
+
+
+class RiseSetTable:
+    """Sorted Julian Days (UT) of every rise/set event for one location-year."""
+
+    def __init__(
+        self,
+        lat: float,
+        lon: float,
+        elevation: int,
+        year: int,
+        events: Dict[str, List[float]],
+    ) -> None:
+        self.lat = lat
+        self.lon = lon
+        self.elevation = elevation
+        self.year = year
+        self.events = events
+
+    def next_event(self, kind: str, after: datetime) -> Optional[datetime]:
+        """Return the first ``kind`` event at or after ``after`` (in its timezone)."""
+
+        jd = _to_jd(after)
+        times = self.events.get(kind) or []
+        idx = bisect_left(times, jd)
+        if idx >= len(times) or times[idx] - jd > _MAX_GAP_DAYS[kind]:
+            return None
+        return _jd_to_datetime(times[idx]).astimezone(after.tzinfo or timezone.utc)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "version": TABLE_VERSION,
+            "lat": self.lat,
+            "lon": self.lon,
+            "elevation": self.elevation,
+            "year": self.year,
+            "flag": EPHEMERIS_FLAG,
+            "events": self.events,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "RiseSetTable":
+        return cls(
+            float(data["lat"]),
+            float(data["lon"]),
+            int(data["elevation"]),
+            int(data["year"]),
+            {kind: list(data["events"].get(kind, [])) for kind in KINDS},  # type: ignore[union-attr]
+        )
+
+
+def _chain_events(
+    body: int, rsmi: int, lat: float, lon: float, elevation: float, jd_start: float, jd_end: float
+) -> List[float]:
+    """Walk successive rise (or set) events of ``body`` between two Julian Days."""
+
+    geopos = (lon, lat, elevation)
+    flags = rsmi | swe.BIT_DISC_CENTER
+    out: List[float] = []
+    jd = jd_start
+    while jd < jd_end:
+        metrics.SWE_CALLS.inc(function="rise_trans")
+        try:
+            result, times = swe.rise_trans(jd, body, flags, geopos, 0.0, 0.0, EPHEMERIS_FLAG)
+        except swe.Error:  # type: ignore[attr-defined]
+            result, times = -1, ()
+        if result < 0 or not times or times[0] <= jd:
+            # Circumpolar stretch: no event from here, try again half a day later.
+            jd += 0.5
+            continue
+        if times[0] >= jd_end:
+            break
+        out.append(times[0])
+        jd = times[0] + 1.0 / 1440.0
+    return out
+
+
+def build_table(lat: float, lon: float, elevation: float, year: int) -> RiseSetTable:
+    """Compute a padded calendar year of rise/set events for a rounded location."""
+
+    r_lat, r_lon, r_elev = location_key(lat, lon, elevation)
+    jd_start = _to_jd(datetime(year, 1, 1, tzinfo=timezone.utc)) - _PAD_BEFORE_DAYS
+    jd_end = _to_jd(datetime(year + 1, 1, 1, tzinfo=timezone.utc)) + _PAD_AFTER_DAYS
+    events: Dict[str, List[float]] = {kind: [] for kind in KINDS}
+    if swe is not None:
+        for kind, body, rsmi in (
+            ("sunrise", swe.SUN, swe.CALC_RISE),
+            ("sunset", swe.SUN, swe.CALC_SET),
+            ("moonrise", swe.MOON, swe.CALC_RISE),
+            ("moonset", swe.MOON, swe.CALC_SET),
+        ):
+            events[kind] = _chain_events(body, rsmi, r_lat, r_lon, r_elev, jd_start, jd_end)
+    return RiseSetTable(r_lat, r_lon, r_elev, year, events)
+
+
+def _shared_key(key: Tuple[float, float, int, int]) -> str:
+    lat, lon, elevation, year = key
+    return f"riseset:v{TABLE_VERSION}:{EPHEMERIS_FLAG}:{lat:.2f}:{lon:.2f}:{elevation}:{year}"
+
+
+def _load_table(key: Tuple[float, float, int, int]) -> Optional[RiseSetTable]:
+    raw = get_cache().get_bytes(_shared_key(key))
+    if raw is None:
+        return None
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        logger.warning("panchang.riseset.load_failed", extra={"key": _shared_key(key)})
+        return None
+    if data.get("version") != TABLE_VERSION or data.get("flag") != EPHEMERIS_FLAG:
+        return None
+    return RiseSetTable.from_dict(data)
+
+
+def _store_table(key: Tuple[float, float, int, int], table: RiseSetTable) -> None:
+    get_cache().set_bytes(_shared_key(key), json.dumps(table.to_dict()).encode("utf-8"))
+
+
+_TABLES: "OrderedDict[Tuple[float, float, int, int], RiseSetTable]" = OrderedDict()
+_LOCK = threading.Lock()
+_PENDING: Set[Tuple[float, float, int, int]] = set()
+_BUILDER: Optional[ThreadPoolExecutor] = None
+
+
+def build_mode() -> str:
+    """What a lookup does when its table is not cached yet.
+
+    ``background`` (default) answers from direct searches and builds the
+    table on a background thread, ``inline`` builds it before answering and
+    ``off`` only uses tables written by ``precompute_riseset``.
+    """
+
+    return os.getenv("PANCHANG_RISESET_BUILD", "background").lower()
+
+
+def _remember(key: Tuple[float, float, int, int], table: RiseSetTable) -> None:
+    with _LOCK:
+        _TABLES[key] = table
+        _TABLES.move_to_end(key)
+        while len(_TABLES) > _max_tables():
+            _TABLES.popitem(last=False)
+
+
+def cached_table(lat: float, lon: float, elevation: float, year: int) -> Optional[RiseSetTable]:
+    """Return the table for a location-year from memory or the shared tier, never building it."""
+
+    key = (*location_key(lat, lon, elevation), int(year))
+    with _LOCK:
+        table = _TABLES.get(key)
+        if table is not None:
+            _TABLES.move_to_end(key)
+            return table
+    table = _load_table(key)
+    if table is not None:
+        _remember(key, table)
+    return table
+
+
+def get_table(lat: float, lon: float, elevation: float, year: int) -> RiseSetTable:
+    """Return the rise/set table for a location-year, building it if needed."""
+
+    table = cached_table(lat, lon, elevation, year)
+    if table is None:
+        key = (*location_key(lat, lon, elevation), int(year))
+        table = build_table(lat, lon, elevation, year)
+        _store_table(key, table)
+        _remember(key, table)
+    return table
+
+
+def _build_in_background(key: Tuple[float, float, int, int]) -> None:
+    try:
+        get_table(*key)
+    except Exception:
+        logger.exception("panchang.riseset.build_failed", extra={"key": _shared_key(key)})
+    finally:
+        with _LOCK:
+            _PENDING.discard(key)
+
+
+def _schedule_build(lat: float, lon: float, elevation: float, year: int) -> None:
+    global _BUILDER
+    key = (*location_key(lat, lon, elevation), int(year))
+    with _LOCK:
+        if key in _PENDING:
+            return
+        _PENDING.add(key)
+        if _BUILDER is None:
+            _BUILDER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="riseset-build")
+        builder = _BUILDER
+    builder.submit(_build_in_background, key)
+
+
+def wait_for_builds() -> None:
+    """Block until every scheduled background build has finished (tests, CLI)."""
+
+    with _LOCK:
+        builder = _BUILDER
+    if builder is not None:
+        builder.submit(lambda: None).result()
+
+
+def _table_for(
+    start_of_day: datetime, lat: float, lon: float, elevation: float
+) -> Optional[RiseSetTable]:
+    """The table covering the local day ``start_of_day``, or None to search directly.
+
+    The year is the local calendar year: east of UTC, local midnight on Jan 1
+    is still Dec 31 in UTC, and the tables' padding covers that offset.
+    """
+
+    year = start_of_day.year
+    mode = build_mode()
+    if mode == "inline":
+        return get_table(lat, lon, elevation, year)
+    table = cached_table(lat, lon, elevation, year)
+    if table is None and mode == "background":
+        _schedule_build(lat, lon, elevation, year)
+    return table
+
+
+def solar_events(
+    start_of_day: datetime, lat: float, lon: float, elevation: float = 0.0
+) -> Tuple[Optional[datetime], Optional[datetime], Optional[datetime]]:
+    """Table-backed equivalent of ``panchang_algos.compute_solar_events``."""
+
+    if not tables_enabled() or swe is None:
+        return compute_solar_events(start_of_day, lat, lon, elevation)
+    table = _table_for(start_of_day, lat, lon, elevation)
+    if table is None:
+        return compute_solar_events(start_of_day, lat, lon, elevation)
+    return (
+        table.next_event("sunrise", start_of_day),
+        table.next_event("sunset", start_of_day),
+        table.next_event("sunrise", start_of_day + timedelta(days=1)),
+    )
+
+
+def solar_events_range(
+    starts_of_day: List[datetime], lat: float, lon: float, elevation: float = 0.0
+) -> List[Tuple[Optional[datetime], Optional[datetime], Optional[datetime]]]:
+    """Return ``solar_events`` for each local midnight in ``starts_of_day``."""
+
+    if not tables_enabled() or swe is None:
+        return compute_solar_events_range(starts_of_day, lat, lon, elevation)
+    by_year: Dict[int, List[int]] = {}
+    for idx, start in enumerate(starts_of_day):
+        by_year.setdefault(start.year, []).append(idx)
+    out: List[Tuple[Optional[datetime], Optional[datetime], Optional[datetime]]] = [
+        (None, None, None)
+    ] * len(starts_of_day)
+    for indexes in by_year.values():
+        starts = [starts_of_day[idx] for idx in indexes]
+        table = _table_for(starts[0], lat, lon, elevation)
+        if table is None:
+            events = compute_solar_events_range(starts, lat, lon, elevation)
+        else:
+            events = [
+                (
+                    table.next_event("sunrise", start),
+                    table.next_event("sunset", start),
+                    table.next_event("sunrise", start + timedelta(days=1)),
+                )
+                for start in starts
+            ]
+        for idx, event in zip(indexes, events):
+            out[idx] = event
+    return out
+
+
+def moon_events(
+    start_of_day: datetime, lat: float, lon: float, elevation: float = 0.0
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Table-backed equivalent of ``panchang_algos.compute_moon_events``."""
+
+    if not tables_enabled() or swe is None:
+        return compute_moon_events(start_of_day, lat, lon, elevation)
+    table = _table_for(start_of_day, lat, lon, elevation)
+    if table is None:
+        return compute_moon_events(start_of_day, lat, lon, elevation)
+    return table.next_event("moonrise", start_of_day), table.next_event("moonset", start_of_day)
+
+
+def clear_memory() -> None:
+    with _LOCK:
+        _TABLES.clear()
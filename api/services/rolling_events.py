@@ -0,0 +1,148 @@
+"""Per-chart rolling store of detected transit events.
+
+Daily and monthly forecasts for the same chart ask for windows that overlap
+almost entirely from one day to the next. Transit events for a sample day are a
+pure function of the chart, the detection options and that day, so the store
+keeps each chart's events bucketed by scan day for a sliding horizon and only
+runs the transit engine for days that are not in the store yet. Days that fall
+behind the horizon are expired.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date as date_cls, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+ComputeFn = Callable[[Dict[str, Any], Dict[str, Any]], List[Dict[str, Any]]]
+
+# Keys of the transit options that only describe the window, not the detection.
+_WINDOW_KEYS = {"from_date", "to_date"}
+
+
+def rolling_enabled() -> bool:
+    return os.getenv("ROLLING_EVENTS_ENABLED", "true").lower() == "true"
+
+
+def _horizon_days() -> int:
+    return max(1, int(os.getenv("ROLLING_EVENTS_HORIZON_DAYS", "62")))
+
+
+def _max_charts() -> int:
+    return max(1, int(os.getenv("ROLLING_EVENTS_MAX_CHARTS", "1024")))
+
+
+def supports(opts: Dict[str, Any]) -> bool:
+    """Return True when the transit options scan one sample per calendar day."""
+
+    if int(opts.get("step_hours", 0) or 0) > 0:
+        return False
+    return int(opts.get("step_days", 1) or 1) == 1
+
+
+def _sort_key(event: Dict[str, Any]) -> tuple:
+    from .transits_engine import event_sort_key
+
+    return event_sort_key(event)
+
+
+class _ChartEvents:
+    __slots__ = ("days", "latest", "lock")
+
+    def __init__(self) -> None:
+        self.days: Dict[date_cls, List[Dict[str, Any]]] = {}
+        self.latest: Optional[date_cls] = None
+        self.lock = threading.Lock()
+
+
+class RollingEventStore:
+    """LRU-bounded map of chart fingerprint -> events bucketed by scan day."""
+
+    def __init__(self, horizon_days: Optional[int] = None, max_charts: Optional[int] = None) -> None:
+        self._horizon_days = horizon_days
+        self._max_charts = max_charts
+        self._charts: "OrderedDict[str, _ChartEvents]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.computed_days = 0
+
+    @property
+    def horizon_days(self) -> int:
+        return self._horizon_days if self._horizon_days is not None else _horizon_days()
+
+    @property
+    def max_charts(self) -> int:
+        return self._max_charts if self._max_charts is not None else _max_charts()
+
+    @staticmethod
+    def fingerprint(chart_input: Dict[str, Any], opts: Dict[str, Any]) -> str:
+        detection = {k: v for k, v in opts.items() if k not in _WINDOW_KEYS}
+        blob = json.dumps(
+            {"chart": chart_input, "opts": detection}, sort_keys=True, default=str
+        )
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _entry(self, key: str) -> _ChartEvents:
+        with self._lock:
+            entry = self._charts.get(key)
+            if entry is None:
+                entry = _ChartEvents()
+                self._charts[key] = entry
+            self._charts.move_to_end(key)
+            while len(self._charts) > self.max_charts:
+                self._charts.popitem(last=False)
+            return entry
+
+    def events_between(
+        self,
+        chart_input: Dict[str, Any],
+        opts: Dict[str, Any],
+        compute: ComputeFn,
+    ) -> List[Dict[str, Any]]:
+        """Return events for ``opts['from_date']..opts['to_date']`` inclusive.
+
+        The result matches ``compute(chart_input, opts)`` for the whole window;
+        only days missing from the store are handed to ``compute``, one day
+        at a time so every event stays attributed to the day that produced it.
+        """
+
+        first = date_cls.fromisoformat(opts["from_date"])
+        last = date_cls.fromisoformat(opts["to_date"])
+        entry = self._entry(self.fingerprint(chart_input, opts))
+
+        with entry.lock:
+            events: List[Dict[str, Any]] = []
+            day = first
+            while day <= last:
+                bucket = entry.days.get(day)
+                if bucket is None:
+                    iso = day.isoformat()
+                    bucket = compute(chart_input, {**opts, "from_date": iso, "to_date": iso})
+                    entry.days[day] = bucket
+                    self.computed_days += 1
+                events.extend(bucket)
+                day += timedelta(days=1)
+
+            if entry.latest is None or last > entry.latest:
+                entry.latest = last
+            cutoff = entry.latest - timedelta(days=self.horizon_days)
+            for stale in [d for d in entry.days if d < cutoff]:
+                del entry.days[stale]
+
+            events = copy.deepcopy(events)
+
+        events.sort(key=_sort_key)
+        return events
+
+    def clear(self) -> None:
+        with self._lock:
+            self._charts.clear()
+            self.computed_days = 0
+
+
+# Process-wide store shared by the forecast builders.
+STORE = RollingEventStore()
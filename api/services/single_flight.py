@@ -0,0 +1,160 @@
+"""Coalesce identical concurrent computations into one.
+
+A ``SingleFlight`` group maps a key to the computation currently running for
+it. The first caller for a key (the leader) runs the function; callers that
+arrive while it is running wait for the same result instead of computing it
+again, and get the leader's exception if it fails. Once the leader finishes
+the key is released, so later calls compute (or hit a cache) as usual.
+
+``do`` serves sync callers (threadpool routes, workers) and ``do_async``
+serves coroutines; both share one ``concurrent.futures.Future`` per key, so a
+sync and an async caller of the same key coalesce with each other. When a
+call was shared, every caller (the leader included) receives its own deep
+copy of the result, so callers that decorate or mutate what they get back
+cannot leak into each other. If an async leader is cancelled its followers
+retry and one of them takes over.
+
+Each group counts executions, coalesced callers and failures for
+``/__health``. ``SINGLE_FLIGHT_ENABLED=false`` turns coalescing off.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import CancelledError as FutureCancelledError, Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def enabled() -> bool:
+    return os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+
+def key_for(*parts: Any) -> str:
+    """sha256 of the canonical JSON of ``parts``."""
+
+    blob = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """Per-key in-flight call table with coalescing counters."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self.executed = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        with self._lock:
+            fut = self._calls.get(key)
+            if fut is not None:
+                self.coalesced += 1
+                fut.followers += 1  # type: ignore[attr-defined]
+                return fut, False
+            fut = Future()
+            fut.followers = 0  # type: ignore[attr-defined]
+            self._calls[key] = fut
+            self.executed += 1
+            return fut, True
+
+    def _release(self, key: str, fut: Future) -> None:
+        with self._lock:
+            if self._calls.get(key) is fut:
+                del self._calls[key]
+
+    def _succeed(self, key: str, fut: Future, result: T) -> T:
+        self._release(key, fut)
+        fut.set_result(result)
+        # Released: no one else can join. Followers copy the stored result, so
+        # the leader must not hand out (and let its caller mutate) that object.
+        return copy.deepcopy(result) if fut.followers else result  # type: ignore[attr-defined]
+
+    def _fail(self, key: str, fut: Future, exc: BaseException) -> None:
+        self._release(key, fut)
+        with self._lock:
+            self.failed += 1
+        fut.set_exception(exc)
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Return ``fn()``, sharing one execution among concurrent callers of ``key``."""
+
+        if not enabled():
+            return fn()
+        while True:
+            fut, leader = self._join(key)
+            if not leader:
+                try:
+                    return copy.deepcopy(fut.result())
+                except FutureCancelledError:
+                    continue
+            try:
+                result = fn()
+            except BaseException as exc:
+                self._fail(key, fut, exc)
+                raise
+            return self._succeed(key, fut, result)
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return ``await fn()``, sharing one execution among concurrent callers of ``key``."""
+
+        if not enabled():
+            return await fn()
+        while True:
+            fut, leader = self._join(key)
+            if not leader:
+                try:
+                    # Shielded: a follower being cancelled must not cancel the shared call.
+                    return copy.deepcopy(await asyncio.shield(asyncio.wrap_future(fut)))
+                except asyncio.CancelledError:
+                    if fut.cancelled():
+                        continue
+                    raise
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                self._release(key, fut)
+                fut.cancel()
+                raise
+            except BaseException as exc:
+                self._fail(key, fut, exc)
+                raise
+            return self._succeed(key, fut, result)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "failed": self.failed,
+                "in_flight": len(self._calls),
+            }
+
+
+_GROUPS: Dict[str, SingleFlight] = {}
+_GROUPS_LOCK = threading.Lock()
+
+
+def group(name: str) -> SingleFlight:
+    """Return the process-wide group called ``name``, creating it on first use."""
+
+    with _GROUPS_LOCK:
+        found: Optional[SingleFlight] = _GROUPS.get(name)
+        if found is None:
+            found = _GROUPS[name] = SingleFlight(name)
+        return found
+
+
+def stats() -> Dict[str, Dict[str, int]]:
+    with _GROUPS_LOCK:
+        groups = list(_GROUPS.values())
+    return {g.name: g.stats() for g in groups}
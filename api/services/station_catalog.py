@@ -0,0 +1,339 @@
+"""Per-year catalogue of planetary stations and retrograde periods.
+
+Stations used to be re-derived by every consumer: the ephemeris generator
+watched the sign of daily midnight speeds, the transit engine flagged any
+sample whose speed fell under a per-planet threshold, and the yearly western
+pipeline interpolated between 6-hourly scan samples. This service finds them
+once:
+
+* each body's longitudinal speed is sampled daily and every sign change is
+  refined to the exact station with Brent's method (speed is smooth near a
+  station, so a handful of ephemeris calls pin it to well under a second);
+* stations are paired into retrograde periods, and each period carries its
+  shadow: from the moment the planet first reaches the direct-station degree
+  (pre-shadow) to the moment it passes the retrograde-station degree again
+  (post-shadow).
+
+A year is solved for all bodies in one pass per zodiac (tropical or a given
+ayanamsha), memoised in-process and persisted in the shared panchang cache.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import metrics
+from .ephem import AYANAMSHA_MAP, BODIES, _backend_flag
+from .panchang_algos import _jd_to_datetime, _to_jd, swe
+from .panchang_cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION = 1
+STATION_BODIES = ("Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto", "Chiron")
+
+# Retrograde and direct phases of every planet last longer than this, so a
+# daily speed sample cannot straddle two stations.
+_SAMPLE_DAYS = 1.0
+_BRENT_XTOL_DAYS = 1e-6
+_BRENT_MAX_ITER = 60
+
+
+def _flag(ayanamsha: Optional[str]) -> int:
+    flag = _backend_flag() | swe.FLG_SPEED
+    if ayanamsha:
+        swe.set_sid_mode(AYANAMSHA_MAP.get(ayanamsha.lower(), swe.SIDM_LAHIRI))
+        flag |= swe.FLG_SIDEREAL
+    return flag
+
+
+def _iso(jd: float) -> str:
+    moment = _jd_to_datetime(jd).replace(microsecond=0)
+    return moment.isoformat().replace("+00:00", "Z")
+
+
+def brent(f: Callable[[float], float], a: float, b: float, fa: float, fb: float,
+          xtol: float = _BRENT_XTOL_DAYS, max_iter: int = _BRENT_MAX_ITER) -> float:
+    """Root of ``f`` in ``[a, b]`` given a sign change (Brent–Dekker)."""
+
+    if fa == 0.0:
+        return a
+    if fb == 0.0:
+        return b
+    if abs(fa) < abs(fb):
+        a, b, fa, fb = b, a, fb, fa
+    c, fc = a, fa
+    d = e = b - a
+    for _ in range(max_iter):
+        if fb == 0.0:
+            return b
+        if (fb > 0) == (fc > 0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2e-16 * abs(b) + 0.5 * xtol
+        m = 0.5 * (c - b)
+        if abs(m) <= tol:
+            return b
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                # Secant step.
+                p, q = 2.0 * m * s, 1.0 - s
+            else:
+                # Inverse quadratic interpolation.
+                q, r = fa / fc, fb / fc
+                p = s * (2.0 * m * q * (q - r) - (b - a) * (r - 1.0))
+                q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+            if p > 0:
+                q = -q
+            else:
+                p = -p
+            if 2.0 * p < min(3.0 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
+        else:
+            d = e = m
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if m > 0 else -tol)
+        fb = f(b)
+    return b
+
+
+def _station_entry(body: str, jd: float, station_type: str, longitude: float) -> Dict[str, Any]:
+    return {
+        "body": body,
+        "station_type": station_type,
+        "julian_day": jd,
+        "datetime_utc": _iso(jd),
+        "longitude": longitude % 360.0,
+    }
+
+
+def scan_stations(body: str, start_jd: float, end_jd: float,
+                  ayanamsha: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Exact stations of ``body`` in ``[start_jd, end_jd)``."""
+
+    code = BODIES[body]
+    flag = _flag(ayanamsha)
+
+    def speed(jd: float) -> float:
+        metrics.SWE_CALLS.inc(function="calc_ut")
+        return swe.calc_ut(jd, code, flag)[0][3]
+
+    stations: List[Dict[str, Any]] = []
+    jd0 = start_jd
+    v0 = speed(jd0)
+    while jd0 < end_jd:
+        jd1 = min(jd0 + _SAMPLE_DAYS, end_jd)
+        v1 = speed(jd1)
+        if (v0 < 0.0) != (v1 < 0.0):
+            root = brent(speed, jd0, jd1, v0, v1)
+            if start_jd <= root < end_jd:
+                station_type = "retrograde" if v1 < 0.0 else "direct"
+                metrics.SWE_CALLS.inc(function="calc_ut")
+                longitude = swe.calc_ut(root, code, flag)[0][0]
+                stations.append(_station_entry(body, root, station_type, longitude))
+        jd0, v0 = jd1, v1
+    return stations
+
+
+def _crossing(body: str, target: float, jd: float, step: float,
+              ayanamsha: Optional[str]) -> float:
+    """First time from ``jd`` (walking by ``step`` days) the body crosses ``target``."""
+
+    code = BODIES[body]
+    flag = _flag(ayanamsha)
+
+    def offset(t: float) -> float:
+        metrics.SWE_CALLS.inc(function="calc_ut")
+        lon = swe.calc_ut(t, code, flag)[0][0]
+        return (lon - target + 180.0) % 360.0 - 180.0
+
+    a, fa = jd, offset(jd)
+    for _ in range(400):
+        b = a + step
+        fb = offset(b)
+        if (fa < 0.0) != (fb < 0.0) and abs(fa - fb) < 180.0:
+            return brent(offset, a, b, fa, fb)
+        a, fa = b, fb
+    return a
+
+
+def _period(retro: Dict[str, Any], direct: Optional[Dict[str, Any]],
+            ayanamsha: Optional[str]) -> Dict[str, Any]:
+    body = retro["body"]
+    period: Dict[str, Any] = {
+        "body": body,
+        "start": retro,
+        "end": direct,
+        "pre_shadow_start": None,
+        "post_shadow_end": None,
+    }
+    if direct is None:
+        return period
+    # Shadow searches step by a fraction of the retrograde span: short enough
+    # never to skip the crossing, long enough to reach it in a few samples.
+    step = max(0.5, (direct["julian_day"] - retro["julian_day"]) / 4.0)
+    pre = _crossing(body, direct["longitude"], retro["julian_day"], -step, ayanamsha)
+    post = _crossing(body, retro["longitude"], direct["julian_day"], step, ayanamsha)
+    period["pre_shadow_start"] = {"julian_day": pre, "datetime_utc": _iso(pre)}
+    period["post_shadow_end"] = {"julian_day": post, "datetime_utc": _iso(post)}
+    return period
+
+
+@lru_cache(maxsize=64)
+def _year_stations(year: int, ayanamsha: Optional[str]) -> Dict[str, List[Dict[str, Any]]]:
+    start_jd = swe.julday(year, 1, 1, 0.0, swe.GREG_CAL)
+    end_jd = swe.julday(year + 1, 1, 1, 0.0, swe.GREG_CAL)
+    stations: Dict[str, List[Dict[str, Any]]] = {}
+    for body in STATION_BODIES:
+        try:
+            stations[body] = scan_stations(body, start_jd, end_jd, ayanamsha)
+        except Exception as exc:
+            # Chiron needs the asteroid ephemeris files.
+            logger.debug("station_scan_skipped", extra={"body": body, "error": str(exc)})
+    return stations
+
+
+def build_year(year: int, ayanamsha: Optional[str] = None) -> Dict[str, Any]:
+    """Stations of ``year`` and the retrograde periods that begin in it."""
+
+    stations = _year_stations(year, ayanamsha)
+    following = _year_stations(year + 1, ayanamsha)
+    periods: Dict[str, List[Dict[str, Any]]] = {}
+    for body, body_stations in stations.items():
+        # A direct station always follows within a year (Pluto: ~5 months).
+        ordered = body_stations + following.get(body, [])
+        body_periods = []
+        for idx, station in enumerate(body_stations):
+            if station["station_type"] != "retrograde":
+                continue
+            direct = next(
+                (s for s in ordered[idx + 1:] if s["station_type"] == "direct"),
+                None,
+            )
+            body_periods.append(_period(station, direct, ayanamsha))
+        periods[body] = body_periods
+    return {
+        "version": CATALOG_VERSION,
+        "year": year,
+        "ayanamsha": ayanamsha,
+        "stations": stations,
+        "periods": periods,
+    }
+
+
+@lru_cache(maxsize=64)
+def year_catalogue(year: int, ayanamsha: Optional[str] = None) -> Dict[str, Any]:
+    """Return the (cached) catalogue for ``year``; ``ayanamsha=None`` is tropical.
+
+    Raises ``RuntimeError`` when Swiss Ephemeris is unavailable.
+    """
+
+    if swe is None:
+        raise RuntimeError("Swiss Ephemeris is required for the station catalogue")
+    ayan = ayanamsha.lower() if ayanamsha else None
+    key = f"stations:v{CATALOG_VERSION}:{year}:{ayan or 'tropical'}:{_backend_flag()}"
+    cache = get_cache()
+    raw = cache.get_bytes(key)
+    if raw is not None:
+        try:
+            return json.loads(raw.decode("utf-8"))
+        except ValueError:
+            logger.warning("station_catalog_decode_failed", extra={"year": year})
+    catalogue = build_year(year, ayan)
+    cache.set_bytes(key, json.dumps(catalogue, separators=(",", ":")).encode("utf-8"))
+    return catalogue
+
+
+def _years(start: datetime, end: datetime) -> range:
+    return range(_jd_to_datetime(_to_jd(start)).year, _jd_to_datetime(_to_jd(end)).year + 1)
+
+
+def stations_between(
+    start: datetime,
+    end: datetime,
+    bodies: Optional[Iterable[str]] = None,
+    ayanamsha: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Stations in ``[start, end)`` for ``bodies`` (all by default), in time order."""
+
+    wanted = set(bodies) if bodies is not None else None
+    start_jd, end_jd = _to_jd(start), _to_jd(end)
+    found: List[Dict[str, Any]] = []
+    for year in _years(start, end):
+        for body, stations in year_catalogue(year, ayanamsha)["stations"].items():
+            if wanted is not None and body not in wanted:
+                continue
+            found.extend(s for s in stations if start_jd <= s["julian_day"] < end_jd)
+    found.sort(key=lambda s: s["julian_day"])
+    return found
+
+
+def retrograde_periods(
+    body: str,
+    start: datetime,
+    end: datetime,
+    ayanamsha: Optional[str] = None,
+    include_shadow: bool = False,
+) -> List[Dict[str, Any]]:
+    """Retrograde periods of ``body`` overlapping ``[start, end)``, in time order.
+
+    With ``include_shadow`` a period also counts as overlapping when only its
+    pre- or post-shadow does.
+    """
+
+    start_jd, end_jd = _to_jd(start), _to_jd(end)
+    found: List[Dict[str, Any]] = []
+    # A period that overlaps the range began at most a year before it.
+    for year in range(_years(start, end)[0] - 1, _years(start, end)[-1] + 1):
+        for period in year_catalogue(year, ayanamsha)["periods"].get(body, []):
+            begin = period["start"]["julian_day"]
+            finish = period["end"]["julian_day"] if period["end"] else float("inf")
+            if include_shadow and period["pre_shadow_start"]:
+                begin = period["pre_shadow_start"]["julian_day"]
+                finish = period["post_shadow_end"]["julian_day"]
+            if begin < end_jd and finish >= start_jd:
+                found.append(period)
+    return found
+
+
+def nearest_station(
+    body: str,
+    moment: datetime,
+    window_hours: float,
+    ayanamsha: Optional[str] = None,
+) -> Optional[Tuple[Dict[str, Any], float]]:
+    """The station of ``body`` closest to ``moment`` within ``window_hours``.
+
+    Returns ``(station, hours_from_station)`` (negative before the station).
+    """
+
+    if window_hours <= 0:
+        return None
+    jd = _to_jd(moment)
+    pad = window_hours / 24.0
+    candidates = stations_between(
+        _jd_to_datetime(jd - pad), _jd_to_datetime(jd + pad), [body], ayanamsha
+    )
+    if not candidates:
+        return None
+    station = min(candidates, key=lambda s: abs(s["julian_day"] - jd))
+    return station, (jd - station["julian_day"]) * 24.0
+
+
+def station_datetime(entry: Dict[str, Any]) -> datetime:
+    return datetime.fromisoformat(entry["datetime_utc"].replace("Z", "+00:00")).astimezone(timezone.utc)
+
+
+def clear_memory() -> None:
+    year_catalogue.cache_clear()
+    _year_stations.cache_clear()
@@ -1,9 +1,12 @@
+import logging
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, List, Optional
 from . import ephem, aspects as aspects_svc, houses as houses_svc
 from .transit_math import is_applying
 from .constants import sign_name_from_lon
-from . import advanced_transits
+from . import advanced_transits, eclipse_catalog, station_catalog
+
+logger = logging.getLogger(__name__)
 
 ASPECT_WEIGHTS = {
     "conjunction": 2,    # Neutral-to-supportive (depends on planet)
@@ -212,6 +215,112 @@ def _transit_positions(dt: datetime, system: str, ayan: str|None) -> Dict[str,Di
     # Include latitude for eclipse detection
     return {k: {"lon": v["lon"], "speed_lon": v["speed_lon"], "lat": v.get("lat", 0)} for k,v in pos.items()}
 
+def event_sort_key(e: Dict[str, Any]) -> tuple:
+    """Order events by date, then fast-moving planets first, then by score.
+
+    Priority order: fast planets with exact_hit_time > fast planets without > slow planets.
+    """
+    is_fast = e["transit_body"] in FAST_MOVING_PLANETS
+    has_exact_time = "exact_hit_time_utc" in e
+    # Priority: fast with time (0), fast without time (1), slow (2)
+    priority = 0 if (is_fast and has_exact_time) else (1 if is_fast else 2)
+    return (e["date"], priority, -e["score"])
+
+def _catalogue_eclipses(
+    d0: str, d1: str, step_days: int, step_hours: int
+) -> Optional[List[Dict[str, Any]]]:
+    """Eclipses whose maximum falls within half a sample step of the range.
+
+    Matches what the sampled scan could see: with daily noon samples that is
+    every eclipse from 00:00 on ``d0`` to 00:00 after ``d1``. ``None`` when
+    the catalogue cannot be built (no Swiss Ephemeris); any other failure is
+    logged before falling back to the sampled scan.
+    """
+
+    delta = timedelta(hours=step_hours) if step_hours > 0 else timedelta(days=step_days)
+    start = datetime.fromisoformat(d0 + "T12:00:00+00:00") - delta / 2
+    end = datetime.fromisoformat(d1 + "T12:00:00+00:00") + delta / 2
+    try:
+        return eclipse_catalog.eclipses_between(start, end)
+    except RuntimeError:
+        return None
+    except Exception:
+        logger.exception("eclipse_catalogue_failed", extra={"from": d0, "to": d1})
+        return None
+
+def _catalogue_stations(
+    d0: str, d1: str, ayan: Optional[str]
+) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """Catalogue stations per body that can fall in a station window of the range.
+
+    ``None`` when the catalogue cannot be built (no Swiss Ephemeris); any
+    other failure is logged before falling back to the sampled scan.
+    """
+
+    pad = timedelta(hours=max(advanced_transits.STATION_WINDOWS.values()) + 24)
+    start = datetime.fromisoformat(d0 + "T00:00:00+00:00") - pad
+    end = datetime.fromisoformat(d1 + "T00:00:00+00:00") + pad
+    try:
+        stations = station_catalog.stations_between(start, end, ayanamsha=ayan)
+    except RuntimeError:
+        return None
+    except Exception:
+        logger.exception("station_catalogue_failed", extra={"from": d0, "to": d1})
+        return None
+    by_body: Dict[str, List[Dict[str, Any]]] = {}
+    for station in stations:
+        by_body.setdefault(station["body"], []).append(station)
+    return by_body
+
+
+def _eclipse_event(
+    eclipse: Dict[str, Any],
+    dt: datetime,
+    moon_lon: float,
+    sun_lon: float,
+    chart_input: Dict[str, Any],
+) -> Dict[str, Any]:
+    eclipse_score = advanced_transits.calculate_eclipse_score(eclipse)
+
+    peak_dt_utc = None
+    peak_iso = eclipse.get("peak_datetime_utc")
+    if isinstance(peak_iso, str):
+        try:
+            peak_dt_utc = datetime.fromisoformat(
+                peak_iso.replace("Z", "+00:00")
+            ).astimezone(timezone.utc)
+        except ValueError:
+            peak_dt_utc = None
+
+    eclipse_dt = peak_dt_utc or dt
+    exact_hit_time_utc = None
+    if peak_dt_utc is not None:
+        exact_hit_time_utc = peak_dt_utc.isoformat().replace("+00:00", "Z")
+
+    eclipse_event = {
+        "date": eclipse_dt.date().isoformat(),
+        "transit_body": "Moon" if eclipse["eclipse_category"] == "lunar" else "Sun",
+        "natal_body": "—",  # Special event, not a transit
+        "aspect": "eclipse",
+        "orb": 0.0,  # Exact by definition
+        "eclipse_type": eclipse["eclipse_type"],
+        "eclipse_category": eclipse["eclipse_category"],
+        "score": eclipse_score,
+        "note": eclipse["description"],
+        "eclipse_info": eclipse,
+        "event_type": "eclipse",
+        "zodiac": chart_input.get("zodiac", "tropical"),
+    }
+
+    if exact_hit_time_utc:
+        eclipse_event["exact_hit_time_utc"] = exact_hit_time_utc
+
+    if eclipse_event["transit_body"] == "Moon":
+        eclipse_event["transit_sign"] = sign_name_from_lon(moon_lon)
+    else:
+        eclipse_event["transit_sign"] = sign_name_from_lon(sun_lon)
+    return eclipse_event
+
 def compute_transits(chart_input: Dict[str,Any], opts: Dict[str,Any]) -> List[Dict[str,Any]]:
     # options
     obs_from = opts["from_date"]; obs_to = opts["to_date"]
@@ -240,6 +349,7 @@ def compute_transits(chart_input: Dict[str,Any], opts: Dict[str,Any]) -> List[Di
 
     events: List[Dict[str,Any]] = []
     precise_cache: Dict[str, Dict[str, Dict[str, float]]] = {}
+    catalogue_stations = _catalogue_stations(obs_from, obs_to, ayan)
 
     def _positions_at(dt: datetime) -> Dict[str, Dict[str, float]]:
         key = dt.isoformat()
@@ -335,13 +445,21 @@ def compute_transits(chart_input: Dict[str,Any], opts: Dict[str,Any]) -> List[Di
                         
                         # ===== ADVANCED FEATURES DETECTION =====
                         
-                        # 1. Station Detection
-                        station_info = advanced_transits.detect_station(
-                            t_name,
-                            t_pos["speed_lon"],
-                            dt,
-                            datetime.fromisoformat(chart_input["date"])
-                        )
+                        # 1. Station Detection (exact catalogue stations when available)
+                        if catalogue_stations is None:
+                            station_info = advanced_transits.detect_station(
+                                t_name,
+                                t_pos["speed_lon"],
+                                dt,
+                                datetime.fromisoformat(chart_input["date"])
+                            )
+                        else:
+                            station_info = advanced_transits.station_from_catalogue(
+                                t_name,
+                                t_pos["speed_lon"],
+                                dt,
+                                catalogue_stations.get(t_name, []),
+                            )
                         station_score = 0.0
                         if station_info:
                             station_score = advanced_transits.calculate_station_score(
@@ -457,6 +575,8 @@ def compute_transits(chart_input: Dict[str,Any], opts: Dict[str,Any]) -> List[Di
     
     # ===== SPECIAL SKY EVENTS (LUNAR CYCLE & ECLIPSES) =====
     # Add these after regular transit aspects
+    catalogue_eclipses = _catalogue_eclipses(obs_from, obs_to, step, step_hours)
+
     for dt in _daterange_utc(obs_from, obs_to, step, step_hours if step_hours > 0 else None):
         tr = _transit_positions(dt, chart_input["system"], ayan)
         
@@ -561,74 +681,40 @@ def compute_transits(chart_input: Dict[str,Any], opts: Dict[str,Any]) -> List[Di
                     }
                     events.append(oob_event)
             
-            # 5. Eclipse Detection (requires Moon latitude)
-            moon_lat = tr["Moon"].get("lat", 0)  # Ecliptic latitude
-            natal_lons = {k: v["lon"] for k, v in natal_map.items()}
-            
-            node_lon = None
-            node = tr.get("TrueNode") or tr.get("MeanNode")
-            if node:
-                node_lon = node.get("lon")
-
-            eclipse = advanced_transits.detect_eclipse(
-                moon["lon"],
-                sun["lon"],
-                moon_lat,
-                dt,
-                natal_lons,
-                node_lon=node_lon,
-            )
-
-            if eclipse:
-                eclipse_score = advanced_transits.calculate_eclipse_score(eclipse)
-
-                peak_dt_utc = None
-                peak_iso = eclipse.get("peak_datetime_utc")
-                if isinstance(peak_iso, str):
-                    try:
-                        peak_dt_utc = datetime.fromisoformat(
-                            peak_iso.replace("Z", "+00:00")
-                        ).astimezone(timezone.utc)
-                    except ValueError:
-                        peak_dt_utc = None
-
-                eclipse_dt = peak_dt_utc or dt
-                exact_hit_time_utc = None
-                if peak_dt_utc is not None:
-                    exact_hit_time_utc = peak_dt_utc.isoformat().replace("+00:00", "Z")
-
-                eclipse_event = {
-                    "date": eclipse_dt.date().isoformat(),
-                    "transit_body": "Moon" if eclipse["eclipse_category"] == "lunar" else "Sun",
-                    "natal_body": "—",  # Special event, not a transit
-                    "aspect": "eclipse",
-                    "orb": 0.0,  # Exact by definition
-                    "eclipse_type": eclipse["eclipse_type"],
-                    "eclipse_category": eclipse["eclipse_category"],
-                    "score": eclipse_score,
-                    "note": eclipse["description"],
-                    "eclipse_info": eclipse,
-                    "event_type": "eclipse",
-                    "zodiac": chart_input.get("zodiac", "tropical"),
-                }
-
-                if exact_hit_time_utc:
-                    eclipse_event["exact_hit_time_utc"] = exact_hit_time_utc
+            # 5. Eclipse Detection: per-sample thresholds only when the
+            #    catalogue is unavailable (see the join below).
+            if catalogue_eclipses is None:
+                moon_lat = tr["Moon"].get("lat", 0)  # Ecliptic latitude
+                natal_lons = {k: v["lon"] for k, v in natal_map.items()}
+
+                node_lon = None
+                node = tr.get("TrueNode") or tr.get("MeanNode")
+                if node:
+                    node_lon = node.get("lon")
+
+                eclipse = advanced_transits.detect_eclipse(
+                    moon["lon"],
+                    sun["lon"],
+                    moon_lat,
+                    dt,
+                    natal_lons,
+                    node_lon=node_lon,
+                )
 
-                if eclipse_event["transit_body"] == "Moon":
-                    eclipse_event["transit_sign"] = sign_name_from_lon(moon["lon"])
-                else:
-                    eclipse_event["transit_sign"] = sign_name_from_lon(sun["lon"])
-                events.append(eclipse_event)
-    
-    # Sort: Prioritize fast-moving planets, then by date, then by score
-    # Priority order: fast planets with exact_hit_time > fast planets without > slow planets
-    def _sort_key(e: Dict[str, Any]) -> tuple:
-        is_fast = e["transit_body"] in FAST_MOVING_PLANETS
-        has_exact_time = "exact_hit_time_utc" in e
-        # Priority: fast with time (0), fast without time (1), slow (2)
-        priority = 0 if (is_fast and has_exact_time) else (1 if is_fast else 2)
-        return (e["date"], priority, -e["score"])
-    
-    events.sort(key=_sort_key)
+                if eclipse:
+                    events.append(_eclipse_event(eclipse, dt, moon["lon"], sun["lon"], chart_input))
+
+    # Eclipses are a join against the per-year catalogue: each one is placed
+    # at its exact maximum with positions taken there.
+    if catalogue_eclipses:
+        natal_lons = {k: v["lon"] for k, v in natal_map.items()}
+        for entry in catalogue_eclipses:
+            peak = eclipse_catalog.peak_datetime(entry)
+            tr = _positions_at(peak)
+            if "Moon" not in tr or "Sun" not in tr:
+                continue
+            eclipse = advanced_transits.eclipse_from_catalogue(entry, tr["Moon"]["lon"], natal_lons)
+            events.append(_eclipse_event(eclipse, peak, tr["Moon"]["lon"], tr["Sun"]["lon"], chart_input))
+
+    events.sort(key=event_sort_key)
     return events
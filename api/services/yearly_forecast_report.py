@@ -11,6 +11,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict
 
+from . import metrics, single_flight
 from .forecast_builders import yearly_payload
 from .forecast_reports import _ensure_storage_path, _owner_segment, _report_storage_key, _resolve_download_url
 from .pdf_renderer import render_western_natal_pdf
@@ -25,6 +26,8 @@ from ..schemas.yearly_forecast_report import (
 
 logger = logging.getLogger(__name__)
 
+_REPORT_FLIGHT = single_flight.group("yearly_interpreted_report")
+
 
 async def compute_yearly_forecast(chart_input: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
     """Compute the raw yearly forecast using the existing payload builder."""
@@ -60,12 +63,22 @@ def _custom_upload(local_path: Path, storage_key: str, s3_options: Dict[str, Any
 
 
 async def build_interpreted_yearly_report(req: YearlyForecastRequest) -> YearlyForecastReport:
-    """Build interpreted yearly report with QA editing applied."""
+    """Build interpreted yearly report with QA editing applied.
+
+    Identical concurrent requests share one build (and one round of LLM calls).
+    """
+
+    key = single_flight.key_for(req.model_dump(mode="json"))
+    return await _REPORT_FLIGHT.do_async(key, lambda: _build_interpreted_yearly_report(req))
+
+
+async def _build_interpreted_yearly_report(req: YearlyForecastRequest) -> YearlyForecastReport:
     # Get raw forecast data
     raw = await compute_yearly_forecast(req.chart_input.model_dump(), req.options.model_dump())
     
     # Interpret with LLM
-    report = await interpret_yearly_forecast(raw)
+    with metrics.stage("yearly_interpretation"):
+        report = await interpret_yearly_forecast(raw)
     
     # Apply QA editing to polish narratives
     logger.info("Applying QA editor to yearly forecast narratives")
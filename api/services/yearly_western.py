@@ -27,6 +27,7 @@ from __future__ import annotations
 import dataclasses
 import hashlib
 import json
+import logging
 import random
 from collections import defaultdict
 from dataclasses import dataclass, field
@@ -44,7 +45,7 @@ try:
     from . import progressions as progressions_svc
 except ModuleNotFoundError:  # pragma: no cover - dependency missing fallback
     progressions_svc = None  # type: ignore
-from . import advanced_transits
+from . import advanced_transits, station_catalog
 from .transits_engine import (
     PLANET_EXPRESSIONS,
     _calculate_exact_hit_time,
@@ -58,6 +59,8 @@ from .constants import SIGN_NAMES, sign_index_from_lon, sign_name_from_lon
 from .houses import house_of
 from .transit_math import is_applying
 
+logger = logging.getLogger(__name__)
+
 # ---------------------------------------------------------------------------
 # Public helpers
 # ---------------------------------------------------------------------------
@@ -717,6 +720,13 @@ class _WesternYearlyEngine:
         if self.chart_input.get("system") == "vedic":
             ayan = (self.chart_input.get("options") or {}).get("ayanamsha")
 
+        # Exact stations and retrograde periods come from the station
+        # catalogue; the scan below only derives them when it is unavailable.
+        catalogue = None
+        if include_stations or include_retrogrades:
+            sidereal = self.chart_input.get("system") == "vedic"
+            catalogue = _station_catalogue(start, end, bodies, (ayan or "lahiri") if sidereal else None)
+
         timeline: List[Tuple[datetime, Dict[str, Dict[str, float]]]] = []
         dt = start
         step = timedelta(hours=step_hours)
@@ -769,6 +779,7 @@ class _WesternYearlyEngine:
 
                 if (
                     include_stations
+                    and catalogue is None
                     and prev_motion is not None
                     and motion != prev_motion
                     and prev_pos is not None
@@ -792,7 +803,7 @@ class _WesternYearlyEngine:
                         }
                     )
 
-                if include_retrogrades:
+                if include_retrogrades and catalogue is None:
                     state = self._retrograde_tracker.get(body, "direct")
                     if motion == "retrograde" and state != "retrograde":
                         self._retrograde_tracker[body] = "retrograde"
@@ -811,6 +822,15 @@ class _WesternYearlyEngine:
                 prev_dt = ts
                 prev_pos = pos
 
+        if catalogue is not None:
+            stations, periods = catalogue
+            if include_stations:
+                month_events.extend(_station_event(station) for station in stations)
+            if include_retrogrades:
+                for body, body_periods in periods.items():
+                    for period in body_periods:
+                        self._retrograde_windows[body] = _retrograde_window(period)
+
         month_events.extend(
             self._detect_midpoint_events(timeline, bodies, step)
         )
@@ -2233,6 +2253,62 @@ def _midpoint_longitude(a: float, b: float) -> float:
     return (a + diff / 2.0) % 360.0
 
 
+def _station_catalogue(
+    start: datetime,
+    end: datetime,
+    bodies: Sequence[str],
+    ayanamsha: Optional[str],
+) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]]:
+    """Stations in ``[start, end)`` and retrograde periods overlapping it.
+
+    ``None`` when the catalogue cannot be built (no Swiss Ephemeris); any
+    other failure is logged before falling back to the sampled scan.
+    """
+    try:
+        stations = station_catalog.stations_between(start, end, bodies, ayanamsha)
+        periods = {
+            body: station_catalog.retrograde_periods(body, start, end, ayanamsha)
+            for body in bodies
+            if body in station_catalog.STATION_BODIES
+        }
+    except RuntimeError:
+        return None
+    except Exception:
+        logger.exception(
+            "station_catalogue_failed", extra={"from": start.isoformat(), "to": end.isoformat()}
+        )
+        return None
+    return stations, periods
+
+
+def _station_event(station: Dict[str, Any]) -> Dict[str, Any]:
+    station_ts = station_catalog.station_datetime(station)
+    retrograde = station["station_type"] == "retrograde"
+    return {
+        "event_type": "station",
+        "transit_body": station["body"],
+        "aspect": "station",
+        "orb": 0.0,
+        "date": station_ts.date().isoformat(),
+        "exact_hit_time_utc": station["datetime_utc"],
+        "station_phase": "station_retrograde" if retrograde else "station_direct",
+        "note": f"{station['body']} station {'retrograde' if retrograde else 'direct'}",
+    }
+
+
+def _retrograde_window(period: Dict[str, Any]) -> Dict[str, Any]:
+    window: Dict[str, Any] = {
+        "start": station_catalog.station_datetime(period["start"]),
+        "phase": "retrograde",
+    }
+    if period.get("end"):
+        window["end"] = station_catalog.station_datetime(period["end"])
+    if period.get("pre_shadow_start"):
+        window["shadow_start"] = station_catalog.station_datetime(period["pre_shadow_start"])
+        window["shadow_end"] = station_catalog.station_datetime(period["post_shadow_end"])
+    return window
+
+
 def _interpolate_station(
     prev_speed: float,
     current_speed: float,
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Benchmark JSON encoding of the yearly forecast response.
+
+Builds one western yearly payload and times each way of turning its
+``YearlyForecastResponse`` into response bytes: FastAPI's default
+serialisation, the response cache's former ``jsonable_encoder`` +
+``json.dumps`` render, and ``fast_json.model_bytes``::
+
+    python scripts/bench_json.py --repeat 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("EPHEMERIS_BACKEND", "moseph")
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from api.schemas.forecasts import YearlyForecastResponse
+from api.services import fast_json
+from api.services.cpu_executor import _percentile
+from api.services.forecast_builders import yearly_payload
+
+CHART = {
+    "system": "western",
+    "date": "1990-08-18",
+    "time": "14:32:00",
+    "time_known": True,
+    "place": {"lat": 17.385, "lon": 78.4867, "tz": "Asia/Kolkata"},
+}
+
+
+def _time(label: str, fn, repeat: int) -> None:
+    size = len(fn())
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    print(f"{label:<34} p50={_percentile(samples, 50):8.3f} ms  {size / 1024:8.1f} KiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--year", type=int, default=2025)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = yearly_payload(CHART, {"year": args.year})
+    model = YearlyForecastResponse(
+        meta={"year": args.year}, months=payload["months"], top_events=payload["top_events"]
+    )
+    field = create_response_field(name="response", type_=YearlyForecastResponse)
+    loop = asyncio.new_event_loop()
+
+    def _fastapi_default() -> bytes:
+        content = loop.run_until_complete(
+            serialize_response(field=field, response_content=model, is_coroutine=False)
+        )
+        return json.dumps(
+            content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    def _encoder_render() -> bytes:
+        return json.dumps(
+            jsonable_encoder(model), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    _time("FastAPI default", _fastapi_default, args.repeat)
+    _time("jsonable_encoder + json.dumps", _encoder_render, args.repeat)
+    _time(
+        "fast_json.model_bytes",
+        lambda: fast_json.model_bytes(model, YearlyForecastResponse),
+        args.repeat,
+    )
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Benchmark week/month Panchang latency on the shared CPU executor.
+
+Compares the previous layout (one pool task per range, cold workers) with the
+current one (warm workers, one chunk per worker) and prints p50/p99 per route.
+Every iteration uses a different start date so worker caches cannot hide the
+computation. Sunrise/sunset tables for the covered years are built up front
+into a scratch disk cache, as ``precompute_riseset`` does at deploy time, so
+neither layout pays for (or races with) a background table build::
+
+    python scripts/bench_panchang_ranges.py --iterations 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("PANCHANG_CACHE_DIR", tempfile.mkdtemp(prefix="bench-panchang-"))
+os.environ.setdefault("PANCHANG_SHARED_CACHE", "disk")
+os.environ.setdefault("PANCHANG_RISESET_BUILD", "off")
+
+from api.services import riseset
+from api.services.cpu_executor import CpuExecutor, _percentile, chunk_date_range
+from api.services.orchestrators.panchang_range import compute_range_payload, decode_range_payload
+
+PLACE = {"lat": 17.385, "lon": 78.4867, "tz": "Asia/Kolkata", "query": "Hyderabad"}
+OPTIONS = {
+    "ayanamsha": "lahiri",
+    "include_muhurta": False,
+    "include_hora": False,
+    "lang": "en",
+    "script": "latin",
+    "show_bilingual": False,
+    "summary_only": True,
+    "include_extensions": False,
+}
+
+
+async def _one(executor: CpuExecutor, start: date, num_days: int, max_chunks: int) -> float:
+    t0 = time.perf_counter()
+    chunks = chunk_date_range(start, num_days, max_chunks)
+    results = await executor.map(
+        "bench", compute_range_payload, [(s, n, PLACE, OPTIONS) for s, n in chunks]
+    )
+    days = [d for _p, payload in results for d in decode_range_payload(payload)]
+    assert len(days) == num_days
+    return (time.perf_counter() - t0) * 1000.0
+
+
+BASE = date(2030, 1, 5)
+SPACING_DAYS = 80
+MONTH_OFFSET_DAYS = 1700
+
+
+def _start(route: str, idx: int, shift: int) -> date:
+    # Runs use disjoint dates (``shift``) so one cannot read the other's summaries.
+    offset = idx * SPACING_DAYS + shift + (0 if route == "week" else MONTH_OFFSET_DAYS)
+    return BASE + timedelta(days=offset)
+
+
+async def _run(
+    label: str, warm: bool, max_chunks: int, iterations: int, workers: int, shift: int
+) -> None:
+    executor = CpuExecutor(max_workers=workers)
+    if warm:
+        executor.warm()
+        await executor.run("warm", int, 0)
+    for route, num_days in (("week", 7), ("month", 31)):
+        samples = []
+        for idx in range(iterations):
+            start = _start(route, idx, shift)
+            samples.append(await _one(executor, start, num_days, max_chunks))
+        print(
+            f"{label:<28} {route:<6} p50={_percentile(samples, 50):8.1f} ms"
+            f"  p99={_percentile(samples, 99):8.1f} ms  (first={samples[0]:.1f} ms)"
+        )
+    executor.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=min(8, os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    last = _start("month", args.iterations, SPACING_DAYS)
+    for year in range(BASE.year, last.year + 1):
+        riseset.get_table(PLACE["lat"], PLACE["lon"], 0.0, year)
+
+    iterations, workers, half = args.iterations, args.workers, SPACING_DAYS // 2
+    asyncio.run(_run("before: cold, one task", False, 1, iterations, workers, 0))
+    asyncio.run(_run("after: warm, chunk/worker", True, workers, iterations, workers, half))
+
+
+if __name__ == "__main__":
+    main()
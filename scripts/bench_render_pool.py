@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Benchmark report rendering throughput against the number of pool workers.
+
+Queues the same mixed-product load (natal, compatibility, monthly and yearly
+PDFs) on process pools of increasing size and prints jobs per minute and the
+p50 queue wait per lane. Every run warms its workers first so spawn cost is
+not counted::
+
+    python scripts/bench_render_pool.py --jobs 24 --workers 1 2 4
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("EPHEMERIS_BACKEND", "moseph")
+
+from api.jobs.render_pool import RenderPool, priority_for
+from api.services.cpu_executor import _percentile
+from api.services.job_store import JobStore
+
+CHART = {
+    "system": "western",
+    "date": "1990-08-18",
+    "time": "14:32:00",
+    "time_known": True,
+    "place": {"lat": 17.385, "lon": 78.4867, "tz": "Asia/Kolkata"},
+}
+PARTNER = dict(CHART, date="1991-03-07", time="09:15:00")
+MIX = [
+    {"product": "western_natal_pdf"},
+    {"product": "western_natal_pdf"},
+    {"product": "compatibility_pdf", "partner_chart_input": PARTNER},
+    {"product": "monthly_horoscope_pdf", "options": {"year": 2025, "month": 8}},
+    {"product": "yearly_forecast_pdf", "options": {"year": 2025}},
+    {"product": "remedies_pdf"},
+]
+
+
+def _run(workers: int, jobs: int) -> float:
+    store = JobStore()
+    pool = RenderPool(workers=workers, max_queue=jobs, mode="process", store=store)
+    pool.start()
+    warm = []
+    for idx in range(workers):
+        rid = store.create(
+            payload={"product": "western_natal_pdf", "chart_input": CHART}, idempotency_key=f"warm-{idx}"
+        )
+        pool.submit(rid, "western_natal_pdf")
+        warm.append(rid)
+    while any(store.get(rid)["status"] in ("queued", "processing") for rid in warm):
+        time.sleep(0.05)
+
+    t0 = time.perf_counter()
+    rids = []
+    for idx in range(jobs):
+        payload = dict(MIX[idx % len(MIX)], chart_input=CHART)
+        rid = store.create(payload=payload, idempotency_key=f"{workers}-{idx}")
+        pool.submit(rid, payload["product"])
+        rids.append(rid)
+    while any(store.get(rid)["status"] in ("queued", "processing") for rid in rids):
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - t0
+    pool.shutdown()
+
+    failed = sum(store.get(rid)["status"] == "error" for rid in rids)
+    waits = {}
+    for rid in rids:
+        job = store.get(rid)
+        waits.setdefault(priority_for(job["payload"]["product"]), []).append(job["queue_ms"])
+    lanes = "  ".join(
+        f"lane{lane} wait p50={_percentile(samples, 50):8.1f} ms" for lane, samples in sorted(waits.items())
+    )
+    print(f"workers={workers:<2} {jobs / elapsed * 60.0:7.1f} jobs/min  failed={failed}  {lanes}")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=24)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    first = None
+    for workers in args.workers:
+        elapsed = _run(workers, args.jobs)
+        first = first or (workers, elapsed)
+        print(f"{'':10} speed-up vs {first[0]} worker(s): {first[1] / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
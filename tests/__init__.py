@@ -4,5 +4,8 @@ import os
 os.environ.setdefault("AUTH_ENABLED", "false")
 os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
 os.environ.setdefault("LOGGING_ENABLED", "false")
+# Keep the shared panchang cache tier out of $HOME during tests
+os.environ.setdefault("PANCHANG_SHARED_CACHE", "off")
+os.environ.setdefault("CPU_EXECUTOR_WARM", "false")
 
 # Tests package
@@ -0,0 +1,62 @@
+import json
+import random
+
+import pytest
+
+from api.services.aspects import find_aspects, find_aspects_batch
+
+swe = pytest.importorskip("swisseph")
+
+
+def test_batched_aspects_match_scalar():
+    rng = random.Random(7)
+    names = ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn"]
+    charts = [
+        {n: {"lon": rng.uniform(0, 360), "speed_lon": rng.uniform(-1, 13)} for n in names}
+        for _ in range(50)
+    ]
+    charts.append({n: charts[0][n] for n in reversed(names)})  # another body order
+    policy = {"types": ["trine", "inconjunct", "quincunx", "square"], "orbs": {"default": 6.0, "Sun": 9.0}}
+    assert find_aspects_batch(charts) == [find_aspects(c) for c in charts]
+    assert find_aspects_batch(charts, policy) == [find_aspects(c, policy) for c in charts]
+
+
+def _chart(**overrides):
+    chart = {
+        "system": "western",
+        "date": "1990-08-18",
+        "time": "14:32:00",
+        "time_known": True,
+        "place": {"lat": 17.385, "lon": 78.4867, "tz": "Asia/Kolkata"},
+    }
+    chart.update(overrides)
+    return chart
+
+
+def test_batch_streams_results_in_order_with_item_errors(monkeypatch):
+    if not hasattr(swe, "houses"):
+        pytest.skip("Swiss Ephemeris not available")
+    from fastapi.testclient import TestClient
+
+    from api.app import app
+
+    monkeypatch.setenv("RESPONSE_CACHE_ENABLED", "false")
+    client = TestClient(app)
+    items = [
+        _chart(),
+        {"system": "western", "date": "1990-08-18"},
+        _chart(system="vedic", time_known=False),
+        _chart(date="1990-13-40"),
+    ]
+    r = client.post("/v1/charts/compute/batch", json={"items": items})
+    assert r.status_code == 200 and r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in r.text.splitlines()]
+
+    assert [line["index"] for line in lines] == [0, 1, 2, 3]
+    for idx in (0, 2):
+        assert lines[idx]["result"] == client.post("/v1/charts/compute", json=items[idx]).json()
+    assert lines[1]["error"]["code"] == "INVALID_INPUT" and "result" not in lines[1]
+    assert lines[3]["error"]["code"] == "INVALID_INPUT"
+
+    monkeypatch.setenv("CHART_BATCH_MAX_ITEMS", "2")
+    assert client.post("/v1/charts/compute/batch", json={"items": items}).status_code == 413
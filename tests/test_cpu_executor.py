@@ -0,0 +1,45 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from api.services.cpu_executor import CpuExecutor, chunk_date_range
+
+
+def test_chunks_cover_range_once_per_worker():
+    chunks = chunk_date_range(date(2025, 1, 1), 31, 8)
+    assert [n for _s, n in chunks] == [11, 10, 10]
+    assert chunks[-1] == (date(2025, 1, 22), 10)
+    assert [n for _s, n in chunk_date_range(date(2025, 1, 1), 17, 8)] == [9, 8]
+    assert [n for _s, n in chunk_date_range(date(2025, 1, 1), 31, 2)] == [16, 15]
+
+
+def test_short_ranges_are_not_split_below_minimum():
+    assert chunk_date_range(date(2025, 1, 1), 7, 8) == [(date(2025, 1, 1), 7)]
+    assert chunk_date_range(date(2025, 1, 1), 7, 1) == [(date(2025, 1, 1), 7)]
+    assert chunk_date_range(date(2025, 1, 1), 0, 8) == []
+
+
+def test_map_keeps_order_and_records_latency(monkeypatch):
+    executor = CpuExecutor(max_workers=2)
+    monkeypatch.setattr(executor, "_get_pool", lambda pool=ThreadPoolExecutor(2): pool)
+    gate = threading.Event()
+
+    def work(value):
+        gate.wait(1)
+        return value * 2
+
+    async def scenario():
+        task = asyncio.ensure_future(executor.map("double", work, [(1,), (2,), (3,)]))
+        await asyncio.sleep(0.05)
+        during = executor.stats()
+        gate.set()
+        return during, await task
+
+    during, results = asyncio.run(scenario())
+    assert results == [2, 4, 6]
+    assert during["in_flight"] == 2 and during["queue_depth"] == 1
+    after = executor.stats()
+    assert after["queue_depth"] == 0 and after["submitted"] == 3
+    assert after["latency"]["double"]["count"] == 3
+    assert after["latency"]["double"]["p99_ms"] >= after["latency"]["double"]["p50_ms"]
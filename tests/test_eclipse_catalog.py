@@ -0,0 +1,58 @@
+import pytest
+
+from api.services import eclipse_catalog
+
+if not hasattr(eclipse_catalog.swe, "sol_eclipse_when_glob"):
+    pytest.skip("Swiss Ephemeris not available", allow_module_level=True)
+
+
+def test_2026_eclipses_match_published_catalogue():
+    catalogue = eclipse_catalog.build_year(2026)
+    found = [(e["datetime_utc"][:10], e["category"], e["type"]) for e in catalogue["eclipses"]]
+    assert found == [
+        ("2026-02-17", "solar", "annular"),
+        ("2026-03-03", "lunar", "total"),
+        ("2026-08-12", "solar", "total"),
+        ("2026-08-28", "lunar", "partial"),
+    ]
+
+
+def test_lunations_carry_perigee_distance():
+    catalogue = eclipse_catalog.build_year(2026)
+    phases = [entry["phase"] for entry in catalogue["lunations"]]
+    assert phases.count("full_moon") == 13
+    assert all(a != b for a, b in zip(phases, phases[1:]))
+
+    december = [e for e in catalogue["lunations"] if e["datetime_utc"].startswith("2026-12-24")]
+    assert december and december[0]["phase"] == "full_moon"
+    # The year's closest full moon falls within a few hours of perigee.
+    assert abs(december[0]["julian_day"] - december[0]["perigee_julian_day"]) < 0.5
+    assert 356000 < december[0]["perigee_distance_km"] <= december[0]["distance_km"] < 357500
+
+
+def test_year_catalogue_is_cached(monkeypatch):
+    eclipse_catalog.clear_memory()
+    stored = {}
+
+    class Cache:
+        def get_bytes(self, key):
+            return stored.get(key)
+
+        def set_bytes(self, key, value):
+            stored[key] = value
+
+    monkeypatch.setattr(eclipse_catalog, "get_cache", lambda: Cache())
+    first = eclipse_catalog.year_catalogue(2025)
+    assert eclipse_catalog.year_catalogue(2025) is first
+    assert len(stored) == 1
+
+    eclipse_catalog.clear_memory()
+    monkeypatch.setattr(eclipse_catalog, "build_year", lambda _year: pytest.fail("rebuilt"))
+    assert eclipse_catalog.year_catalogue(2025) == first
+    eclipse_catalog.clear_memory()
+
+    window = eclipse_catalog.eclipses_between(
+        eclipse_catalog._jd_to_datetime(first["eclipses"][0]["julian_day"] - 1),
+        eclipse_catalog._jd_to_datetime(first["eclipses"][1]["julian_day"]),
+    )
+    assert window == first["eclipses"][:1]
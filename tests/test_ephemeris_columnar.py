@@ -0,0 +1,122 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from api.services import ephemeris_columnar
+
+
+def _planet(lon, speed, extra=None):
+    data = {
+        "longitude": lon,
+        "latitude": 0.5,
+        "distance": 1.0,
+        "speed": speed,
+        "zodiac_sign": "Aries",
+        "is_retrograde": speed < 0,
+        "dms": {"degrees": int(lon), "minutes": 0, "seconds": 0.0, "sign": 1},
+    }
+    data.update(extra or {})
+    return data
+
+
+def _sample_output():
+    daily = {}
+    for i in range(5):
+        date_str = f"2026-01-0{i + 1}"
+        planets = {
+            "Sun": _planet(280.0 + i, 1.01),
+            "Moon": _planet(10.0 + 13 * i, 13.2, {"nakshatra": "Ashwini", "nakshatra_pada": 1 + i % 4}),
+            "Mercury": _planet(300.0 - i, -0.4),
+        }
+        if i >= 3:
+            planets["Mercury"]["retrograde_period_start"] = "2026-01-03"
+            planets["Mercury"]["total_retrograde_days"] = None
+        daily[date_str] = {
+            "julian_day": 2461041.5 + i,
+            "weekday": "Thursday",
+            "eclipse_window_active": i == 2,
+            "planets": planets,
+            "asteroids": {"Ceres": _planet(100.0 + i, 0.2)},
+            "houses": {"Placidus": {"cusps": [float(c * 30 + i) for c in range(12)], "ascendant": 12.5}},
+            "aspects": [
+                {"planet1": "Sun", "planet2": "Moon", "aspect": "Trine", "orb": 0.5 * k}
+                for k in range(i % 3)
+            ],
+            "lunar": {"phase": {"phase": "New Moon", "angle": 1.0}, "yoga": "Siddhi"},
+            "eclipses": [],
+            "vedic_changes": {},
+        }
+    return {
+        "metadata": {"period": "2026-2026", "features": ["a", "b"], "performance": {"total": 1.5}},
+        "eclipses": [{"date": "2026-01-03", "type": "solar", "details": {"magnitude": 0.9}}],
+        "supermoons": [],
+        "planetary_ingresses": {"Sun": [{"julian_day": 2461050.2, "new_sign": "Aquarius", "planet": "Sun"}]},
+        "vedic_changes": {"tithi": [{"julian_day": 2461041.7, "to_number": 2}], "yoga": [], "karana": []},
+        "nakshatra_changes": [],
+        "daily_data": daily,
+    }
+
+
+def test_npy_roundtrip_rebuilds_original_json(tmp_path):
+    output = _sample_output()
+    root = ephemeris_columnar.write_columnar(output, tmp_path / "eph", fmt="npy")
+    store = ephemeris_columnar.load_columnar(root)
+
+    assert json.loads(json.dumps(store.to_dict())) == output
+    assert store.metadata["period"] == "2026-2026"
+    assert store.events("vedic_changes")["yoga"] == []
+
+
+def test_existing_output_is_replaced_but_other_directories_are_refused(tmp_path):
+    root = ephemeris_columnar.write_columnar(_sample_output(), tmp_path / "eph", fmt="npy")
+    (root / "stale.txt").write_text("old run")
+    ephemeris_columnar.write_columnar(_sample_output(), root, fmt="npy")
+    assert not (root / "stale.txt").exists()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["eph"]
+
+    precious = tmp_path / "precious"
+    precious.mkdir()
+    (precious / "notes.txt").write_text("keep me")
+    with pytest.raises(FileExistsError):
+        ephemeris_columnar.write_columnar(_sample_output(), precious, fmt="npy")
+    assert (precious / "notes.txt").read_text() == "keep me"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["eph", "precious"]
+
+
+def test_body_and_range_reads_are_column_slices(tmp_path):
+    root = ephemeris_columnar.write_columnar(_sample_output(), tmp_path / "eph", fmt="npy")
+    store = ephemeris_columnar.load_columnar(root)
+
+    sun = store.body("Sun", "2026-01-02", "2026-01-04")
+    assert isinstance(sun["longitude"], np.memmap)
+    assert sun["longitude"].tolist() == [281.0, 282.0, 283.0]
+    assert store.body("Ceres")["speed"].shape == (5,)
+    assert store.column("houses/Placidus/cusps").shape == (5, 12)
+
+    partial = store.to_dict(start="2026-01-04")
+    assert list(partial["daily_data"]) == ["2026-01-04", "2026-01-05"]
+
+
+def test_lazy_daily_view_decodes_on_access(tmp_path):
+    output = _sample_output()
+    root = ephemeris_columnar.write_columnar(output, tmp_path / "eph", fmt="npy")
+    view = ephemeris_columnar.load_columnar(root).daily_data
+
+    assert len(view) == 5
+    day = view["2026-01-03"]
+    assert day == output["daily_data"]["2026-01-03"]
+    assert len(day["aspects"]) == 2
+    # Keys absent on some days stay absent; explicit nulls come back as None.
+    assert "retrograde_period_start" not in view["2026-01-01"]["planets"]["Mercury"]
+    assert view["2026-01-05"]["planets"]["Mercury"]["total_retrograde_days"] is None
+
+
+def test_arrow_backend_matches_npy(tmp_path):
+    pytest.importorskip("pyarrow")
+    output = _sample_output()
+    root = ephemeris_columnar.write_columnar(output, tmp_path / "eph", fmt="arrow")
+    store = ephemeris_columnar.load_columnar(root)
+    assert json.loads(json.dumps(store.to_dict())) == output
+    assert store.body("Moon")["nakshatra_pada"].tolist() == [1, 2, 3, 4, 1]
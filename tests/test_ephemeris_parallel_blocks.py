@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+swe = pytest.importorskip("swisseph")
+if not hasattr(swe, "sol_eclipse_when_glob"):
+    pytest.skip("Swiss Ephemeris not available", allow_module_level=True)
+
+from api.services import comprehensive_ephemeris_parallel as parallel
+
+
+def test_split_blocks_match_one_contiguous_block():
+    # Jupiter and Mercury change sign around these dates in 2026; splitting the
+    # range must neither drop nor duplicate ingresses at the seam.
+    whole = parallel.calculate_day_block("2026-06-25", 10, 28.7041, 77.1025, [], False)
+    head = parallel.calculate_day_block("2026-06-25", 5, 28.7041, 77.1025, [], False)
+    tail = parallel.calculate_day_block("2026-06-30", 5, 28.7041, 77.1025, [], False)
+
+    assert [d for d, _ in whole["days"]] == [d for d, _ in head["days"] + tail["days"]]
+    assert whole["days"] == head["days"] + tail["days"]
+    assert whole["ingresses"] == head["ingresses"] + tail["ingresses"]
+    assert whole["ingresses"]
+
+    single = parallel.calculate_single_day(
+        "2026-06-27", 2461218.5, parallel.datetime(2026, 6, 27), 28.7041, 77.1025, []
+    )
+    assert json.loads(dict(whole["days"])["2026-06-27"]) == json.loads(json.dumps(single["data"]))
+
+
+def test_block_files_roundtrip_and_checkpoint_guard(tmp_path):
+    block = parallel.calculate_day_block("2026-01-01", 3, 28.7041, 77.1025, [], True)
+    parallel._write_block(tmp_path, "2026-01-01", block)
+    header = parallel._read_block_header(tmp_path, "2026-01-01")
+
+    assert header["num_days"] == 3
+    assert list(parallel._read_block_rows(tmp_path, "2026-01-01")) == block["days"]
+    assert not list(tmp_path.glob("*.tmp"))
+
+    gen = parallel.ParallelEphemerisGenerator(2026, num_workers=1)
+    blocks = gen._blocks(31)
+    assert blocks[0] == ("2026-01-01", 31) and blocks[-1][1] == 365 - 31 * 11
+    (tmp_path / "manifest.json").write_text(json.dumps({"year": 2025}))
+    with pytest.raises(ValueError):
+        gen._stream_blocks(str(tmp_path / "out.json"), blocks, tmp_path)
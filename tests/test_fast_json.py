@@ -0,0 +1,62 @@
+import json
+import math
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from api.schemas.forecasts import MonthlyForecastResponse
+from api.services import fast_json
+
+EVENT = {
+    "date": "2025-01-03",
+    "transit_body": "Sun",
+    "natal_body": "Moon",
+    "aspect": "trine",
+    "orb": 0.5,
+    "score": 3.0,
+}
+
+
+def test_model_response_skips_revalidation(monkeypatch):
+    meta = {"year": 2025, "month": 1}
+    model = MonthlyForecastResponse(meta=meta, events=[EVENT], highlights=[EVENT])
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("validated again")
+
+    monkeypatch.setattr(MonthlyForecastResponse, "model_validate", _fail)
+    response = fast_json.model_response(model, MonthlyForecastResponse)
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == jsonable_encoder(model)
+
+    monkeypatch.undo()
+    from_dict = fast_json.model_bytes(model.model_dump(), MonthlyForecastResponse)
+    assert from_dict == response.body
+
+    monkeypatch.setenv("FAST_JSON_ENABLED", "false")
+    assert fast_json.model_response(model, MonthlyForecastResponse) is model
+
+
+def test_subclass_fields_do_not_leak():
+    class Internal(MonthlyForecastResponse):
+        debug_trace: str = "secret"
+
+    value = Internal(meta={"year": 2025, "month": 1}, events=[EVENT], highlights=[])
+    body = json.loads(fast_json.model_bytes(value, MonthlyForecastResponse))
+    assert "debug_trace" not in body
+    assert body == jsonable_encoder(MonthlyForecastResponse.model_validate(value.model_dump()))
+
+
+def test_non_finite_floats():
+    nan_score = dict(EVENT, score=math.nan)
+    typed = MonthlyForecastResponse(meta={"year": 2025}, events=[nan_score], highlights=[])
+    body = json.loads(fast_json.model_bytes(typed, MonthlyForecastResponse))
+    assert body["events"][0]["score"] is None
+
+    untyped = MonthlyForecastResponse(meta={"ratio": math.inf}, events=[], highlights=[])
+    with pytest.raises(ValueError):
+        fast_json.model_bytes(untyped, MonthlyForecastResponse)
+
+    words = MonthlyForecastResponse(meta={"note": "NaN Infinity"}, events=[], highlights=[])
+    body = json.loads(fast_json.model_bytes(words, MonthlyForecastResponse))
+    assert body["meta"]["note"] == "NaN Infinity"
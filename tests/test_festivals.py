@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.services import festivals, panchang_algos
+
+# Linear sky: Sun 1°/day from 280°, Moon 13.2°/day from 281° (2025-01-01T00:00Z).
+_EPOCH_JD = 2460676.5
+
+
+@pytest.fixture
+def linear_sky(monkeypatch):
+    def fake(jd, _sidereal, _ayanamsha):
+        days = jd - _EPOCH_JD
+        return ((280.0 + days) % 360.0, 1.0, (281.0 + 13.2 * days) % 360.0, 13.2)
+
+    def sunrises(starts, _lat, _lon, _elevation=0.0):
+        return [
+            (start + timedelta(hours=6), start + timedelta(hours=18), start + timedelta(hours=30))
+            for start in starts
+        ]
+
+    monkeypatch.setattr(panchang_algos, "_sun_moon_at_jd", fake)
+    monkeypatch.setattr(festivals, "swe", object())
+    monkeypatch.setattr(festivals, "solar_events_range", sunrises)
+    festivals.clear_memory()
+    yield
+    festivals.clear_memory()
+
+
+def test_rules_file_is_read_once():
+    festivals.clear_memory()
+    first = festivals.load_rules()
+    assert festivals.load_rules() is first
+    assert festivals._load_rules_file.cache_info().misses == 1
+    assert any(rule["kind"] == "tithi" for rule in first)
+
+
+def test_region_for():
+    assert festivals.region_for(28.6, 77.2) == "north"
+    assert festivals.region_for(13.08, 80.27) == "south"
+    assert festivals.region_for(19.07, 72.88) == "west"
+    assert festivals.region_for(22.57, 88.36) == "east"
+    assert festivals.region_for(40.7, -74.0) == "intl"
+
+
+def test_year_index_places_sankranti_and_vrats(linear_sky):
+    index = festivals.build_year_index(2025, 28.6, 77.2, timezone.utc)
+
+    assert {"title": "Generic Observance", "type": "cultural"} in index["2025-01-01"]
+    # Sun reaches 300° (Kumbha) twenty days after the epoch.
+    assert {"title": "Kumbha Sankranti", "type": "festival"} in index["2025-01-21"]
+
+    ekadashi = [
+        day for day, entries in index.items() if any(e["title"] == "Ekadashi" for e in entries)
+    ]
+    # Two per synodic month (360 / 12.2 ≈ 29.5 days).
+    assert 23 <= len(ekadashi) <= 26
+    assert all(day.startswith("2025-") for day in index)
+
+
+def test_udaya_rule_assigns_sunrise_day(linear_sky):
+    index = festivals.build_year_index(2025, 28.6, 77.2, timezone.utc)
+    # Purnima spans elongation [168°, 180°): from 13.689 to 14.672 days, so the
+    # only sunrise inside it is 2025-01-15T06:00Z.
+    assert any(e["title"] == "Purnima" for e in index["2025-01-15"])
+    assert not any(e["title"] == "Purnima" for e in index.get("2025-01-14", []))
+
+
+def test_day_lookup_reuses_year_index(linear_sky, monkeypatch):
+    day = datetime(2025, 1, 21, 12, tzinfo=timezone.utc)
+    titles = [e["title"] for e in festivals.festivals_for_date(day, timezone.utc, 28.6, 77.2)]
+    assert "Kumbha Sankranti" in titles
+
+    def boom(*_args, **_kwargs):
+        raise AssertionError("index rebuilt")
+
+    monkeypatch.setattr(festivals, "build_year_index", boom)
+    later = datetime(2025, 6, 1, 12, tzinfo=timezone.utc)
+    assert isinstance(festivals.festivals_for_date(later, timezone.utc, 28.61, 77.24), list)
+    assert festivals._year_index.cache_info().misses == 1
@@ -0,0 +1,58 @@
+import os
+
+os.environ.setdefault("EPHEMERIS_BACKEND", "moseph")
+
+import time
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from api.services import griha_pravesh, lagna, riseset
+
+
+def _t(hour, minute=0):
+    return datetime(2025, 1, 1, hour, minute, tzinfo=timezone.utc)
+
+
+def test_interval_helpers():
+    periods = [
+        {"start": _t(0), "end": _t(4), "number": 1},
+        {"start": _t(4), "end": _t(8), "number": 2},
+        {"start": _t(8), "end": _t(12), "number": 3},
+    ]
+    kept = griha_pravesh._intervals_where(periods, lambda p: p["number"] != 2, _t(2), _t(10))
+    assert kept == [(_t(2), _t(4)), (_t(8), _t(10))]
+    assert griha_pravesh._intersect(kept, [(_t(3), _t(9))]) == [(_t(3), _t(4)), (_t(8), _t(9))]
+    assert griha_pravesh._subtract([(_t(0), _t(10))], [(_t(2), _t(3)), (_t(5), _t(6))]) == [
+        (_t(0), _t(2)),
+        (_t(3), _t(5)),
+        (_t(6), _t(10)),
+    ]
+
+
+def test_six_month_search_is_ranked_and_fast(monkeypatch):
+    swe = pytest.importorskip("swisseph")
+    if not hasattr(swe, "CALC_RISE"):
+        pytest.skip("Swiss Ephemeris not available")
+    tz = ZoneInfo("Asia/Kolkata")
+    # Cold: no lagna day tables or rise/set tables, and no background build
+    # competing for the CPU while the search is timed.
+    monkeypatch.setenv("PANCHANG_RISESET_BUILD", "off")
+    lagna._day_table.cache_clear()
+    riseset.clear_memory()
+    t0 = time.perf_counter()
+    result = griha_pravesh.search_griha_pravesh_muhurat(
+        date(2025, 1, 1), date(2025, 6, 30), 17.385, 78.4867, tz, limit=15
+    )
+    assert time.perf_counter() - t0 < 1.0
+    assert result["days_considered"] == 181
+    assert result["days_pruned"] > 0
+    windows = result["windows"]
+    assert windows
+    assert [w["score"] for w in windows] == sorted((w["score"] for w in windows), reverse=True)
+    for w in windows:
+        assert w["lagna"] in griha_pravesh.FAVORABLE_LAGNAS
+        assert w["karana"]["number"] != griha_pravesh.BHADRA_KARANA
+        assert w["weekday"]["index"] not in griha_pravesh.AVOID_WEEKDAYS
+        assert w["duration_minutes"] >= griha_pravesh.MIN_WINDOW_MINUTES
@@ -0,0 +1,170 @@
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from api.jobs import render_pool, render_report
+from api.services import job_queue
+from api.services.job_queue import InProcessQueue, SqliteQueue, SqsQueue
+from api.services.job_store import JobStore
+
+
+@pytest.fixture(params=["inproc", "sqlite"])
+def make_queue(request, tmp_path):
+    def factory(**kwargs):
+        if request.param == "inproc":
+            return InProcessQueue(**kwargs)
+        return SqliteQueue(str(tmp_path / "queue.sqlite3"), **kwargs)
+
+    return factory
+
+
+def test_batch_receive_follows_priority(make_queue):
+    queue = make_queue()
+    for body, priority in (("yearly", 2), ("natal-1", 0), ("monthly", 1), ("natal-2", 0)):
+        queue.send(body, priority)
+
+    batch = queue.receive(max_messages=3)
+    assert [m.body for m in batch] == ["natal-1", "natal-2", "monthly"]
+    assert queue.depth() == 1
+    for message in batch:
+        queue.delete(message)
+    assert [m.body for m in queue.receive(max_messages=10)] == ["yearly"]
+    assert queue.receive(wait_seconds=0.05) == []
+
+
+def test_visibility_timeout_redelivers_and_stale_receipts_are_ignored(make_queue):
+    queue = make_queue(visibility_timeout=0.1)
+    queue.send("rpt_1")
+    first = queue.receive()[0]
+    assert queue.receive() == []
+
+    second = queue.receive(wait_seconds=1.0)[0]
+    assert second.body == "rpt_1" and second.receive_count == 2
+    queue.delete(first)  # the first delivery no longer owns the message
+    queue.release(second)
+    third = queue.receive()[0]
+    assert third.receive_count == 3
+    queue.dead_letter(third)
+    assert queue.depth() == 0 and queue.receive(wait_seconds=0.2) == []
+    assert queue.stats()["dead_letters"] == 1
+
+
+def test_pool_dead_letters_jobs_whose_worker_keeps_dying(monkeypatch):
+    def dying_render_job(rid, payload):
+        raise BrokenProcessPool("worker died")
+
+    monkeypatch.setattr(render_report, "render_job", dying_render_job)
+    store = JobStore()
+    queue = InProcessQueue(max_receives=2)
+    pool = render_pool.RenderPool(workers=1, mode="thread", store=store, queue=queue)
+    rid = store.create(payload={"product": "western_natal_pdf"}, idempotency_key=None)
+    assert pool.submit(rid, "western_natal_pdf")
+    pool.start()
+
+    deadline = time.time() + 5.0
+    while store.get(rid)["status"] != "error" and time.time() < deadline:
+        time.sleep(0.01)
+    pool.shutdown()
+    assert store.get(rid)["error"] == "RENDER_ABANDONED"
+    assert [m.receive_count for m in queue.dead_letters] == [3]
+
+
+def test_pool_heartbeat_keeps_long_renders_from_being_redelivered(monkeypatch):
+    renders = []
+
+    def slow_render_job(rid, payload):
+        renders.append(rid)
+        time.sleep(0.6)
+        return {"file_path": "/nowhere.pdf", "render_ms": 600.0, "worker_pid": 0}
+
+    monkeypatch.setattr(render_report, "render_job", slow_render_job)
+    store = JobStore()
+    queue = InProcessQueue(visibility_timeout=0.15)
+    pool = render_pool.RenderPool(workers=2, mode="thread", store=store, queue=queue)
+    rid = store.create(payload={"product": "western_natal_pdf"}, idempotency_key=None)
+    assert pool.submit(rid, "western_natal_pdf")
+    pool.start()
+
+    deadline = time.time() + 5.0
+    while store.get(rid)["status"] != "done" and time.time() < deadline:
+        time.sleep(0.01)
+    pool.shutdown()
+    assert store.get(rid)["status"] == "done"
+    assert renders == [rid]
+
+
+class StubSqsClient:
+    """Records calls the way boto3's SQS client receives them."""
+
+    def __init__(self):
+        self.calls = []
+        self.messages = []
+
+    def __getattr__(self, name):
+        def call(**kwargs):
+            self.calls.append((name, kwargs))
+            if name == "receive_message":
+                return {"Messages": self.messages}
+            if name == "send_message":
+                return {"MessageId": "m-%d" % len(self.calls)}
+            if name == "get_queue_url":
+                return {"QueueUrl": "https://sqs.local/" + kwargs["QueueName"]}
+            return {}
+
+        return call
+
+
+def test_sqs_queue_receive_ack_and_dead_letter():
+    client = StubSqsClient()
+    queue = SqsQueue("https://sqs.local/jobs", dlq_url="https://sqs.local/dlq", client=client)
+    assert queue.send("rpt_1", priority=2) == "m-1"
+    assert client.calls[0][1]["MessageAttributes"]["priority"]["StringValue"] == "2"
+
+    client.messages = [
+        {
+            "MessageId": mid,
+            "Body": body,
+            "ReceiptHandle": "r-" + mid,
+            "Attributes": {"ApproximateReceiveCount": count},
+            "MessageAttributes": {"priority": {"StringValue": priority}},
+        }
+        for mid, body, count, priority in (("a", "yearly", "1", "2"), ("b", "natal", "4", "0"))
+    ]
+    natal, yearly = queue.receive(max_messages=25, wait_seconds=60.0)
+    assert (natal.body, natal.receive_count, yearly.body) == ("natal", 4, "yearly")
+    receive = client.calls[-1][1]
+    assert receive["MaxNumberOfMessages"] == 10 and receive["WaitTimeSeconds"] == 20
+
+    queue.delete(yearly)
+    queue.extend(natal, 300.0)
+    queue.dead_letter(natal)
+    tail = [(name, kw.get("QueueUrl"), kw.get("ReceiptHandle")) for name, kw in client.calls[-4:]]
+    assert tail == [
+        ("delete_message", "https://sqs.local/jobs", "r-a"),
+        ("change_message_visibility", "https://sqs.local/jobs", "r-b"),
+        ("send_message", "https://sqs.local/dlq", None),
+        ("delete_message", "https://sqs.local/jobs", "r-b"),
+    ]
+    assert client.calls[-3][1]["VisibilityTimeout"] == 300
+
+
+def test_sqs_dead_letter_queue_defaults_to_the_localstack_name(monkeypatch):
+    client = StubSqsClient()
+    monkeypatch.setattr(job_queue, "_sqs_client", lambda: client)
+    for name in ("SQS_QUEUE", "SQS_QUEUE_URL", "SQS_DLQ", "SQS_DLQ_URL"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("SQS_QUEUE", "reports")
+
+    queue = job_queue.make_queue("sqs")
+    assert queue.queue_url == "https://sqs.local/reports"
+    assert queue.dlq_url == "https://sqs.local/reports-dlq"
+
+
+def test_sqs_client_honours_the_endpoint_override(monkeypatch):
+    pytest.importorskip("boto3")
+    monkeypatch.setenv("AWS_ENDPOINT_URL", "http://localstack:4566")
+    monkeypatch.setenv("AWS_REGION", "eu-west-1")
+    client = job_queue._sqs_client()
+    assert client.meta.endpoint_url == "http://localstack:4566"
+    assert client.meta.region_name == "eu-west-1"
@@ -0,0 +1,81 @@
+import pytest
+
+from api.services.job_store import JobStore, SqliteJobStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    def factory(ttl_seconds=3600.0, stale_seconds=1800.0):
+        if request.param == "memory":
+            return JobStore(ttl_seconds=ttl_seconds, stale_seconds=stale_seconds)
+        return SqliteJobStore(
+            str(tmp_path / "jobs.sqlite3"), ttl_seconds=ttl_seconds, stale_seconds=stale_seconds
+        )
+
+    return factory
+
+
+def test_fingerprint_index_is_idempotent(make_store):
+    store = make_store()
+    a = store.create(payload={"product": "western_natal_pdf"}, idempotency_key="k1")
+    b = store.create(payload={"product": "western_natal_pdf"}, idempotency_key="k1")
+    c = store.create(payload={"product": "western_natal_pdf"}, idempotency_key="k2")
+    assert a == b != c
+    assert store.find_by_fingerprint(store.get(a)["fingerprint"]) == a
+
+    store.update(a, status="done", file_path="/nowhere.pdf")
+    assert store.get(a)["status"] == "done"
+    assert store.get(c)["status"] == "queued"
+
+
+def test_finished_jobs_expire_with_their_pdf(make_store, tmp_path):
+    store = make_store(ttl_seconds=60.0)
+    pdf = tmp_path / "old.pdf"
+    pdf.write_bytes(b"%PDF")
+    old = store.create(payload={"n": 1}, idempotency_key=None)
+    running = store.create(payload={"n": 2}, idempotency_key=None)
+    fresh = store.create(payload={"n": 3}, idempotency_key=None)
+    created = store.get(old)["created_at"]
+    store.update(old, status="done", file_path=str(pdf), finished_at=created)
+    store.update(running, status="processing")
+    store.update(fresh, status="error", finished_at=created + 100.0)
+
+    assert store.evict_expired(now=created + 120.0) == [old]
+    assert store.get(old) is None and not pdf.exists()
+    assert store.get(running)["status"] == "processing"
+    assert store.get(fresh)["status"] == "error"
+    # The fingerprint is free again: the same payload renders anew.
+    assert store.create(payload={"n": 1}, idempotency_key=None) != old
+
+
+def test_jobs_stuck_in_processing_are_reaped(make_store):
+    store = make_store(stale_seconds=600.0)
+    crashed = store.create(payload={"n": 1}, idempotency_key="k")
+    unsent = store.create(payload={"n": 2}, idempotency_key=None)
+    alive = store.create(payload={"n": 3}, idempotency_key=None)
+    store.update(crashed, status="processing")
+    created = store.get(crashed)["created_at"]
+    store.update(alive, status="processing", updated_at=created + 500.0)
+
+    assert sorted(store.reap_stale(now=created + 700.0)) == sorted([crashed, unsent])
+    job = store.get(crashed)
+    assert job["status"] == "error" and job["error"] == "RENDER_STALE"
+    assert store.get(alive)["status"] == "processing"
+    # Resubmitting the same request starts a fresh job instead of the dead one.
+    retry = store.create(payload={"n": 1}, idempotency_key="k")
+    assert retry != crashed and store.get(retry)["status"] == "queued"
+
+
+def test_sqlite_store_survives_restart_and_is_shared(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    api = SqliteJobStore(path)
+    rid = api.create(payload={"product": "remedies_pdf"}, idempotency_key=None)
+
+    worker = SqliteJobStore(path)
+    worker.update(rid, status="done", render_ms=12.5)
+
+    restarted = SqliteJobStore(path)
+    job = restarted.get(rid)
+    assert job["status"] == "done" and job["render_ms"] == 12.5
+    assert restarted.create(payload={"product": "remedies_pdf"}, idempotency_key=None) == rid
+    assert api.get(rid)["status"] == "done"
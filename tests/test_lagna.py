@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from api.services import ext_panchaka_lagna, lagna
+
+RATE = 360.9856  # degrees per day
+
+
+def _t(hour, minute=0):
+    return datetime(2025, 1, 1, hour, minute, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def linear_ascendant(monkeypatch):
+    epoch = lagna._to_jd(_t(0))
+    calls = []
+
+    def fake_asc(jd, _lat, _lon, _ayanamsha="lahiri"):
+        calls.append(jd)
+        return (5.0 + (jd - epoch) * RATE) % 360.0
+
+    monkeypatch.setattr(lagna, "sidereal_ascendant", fake_asc)
+    lagna._day_table.cache_clear()
+    yield calls
+    lagna._day_table.cache_clear()
+
+
+def test_lagna_spans_refine_each_crossing(linear_ascendant):
+    spans = lagna.lagna_spans(_t(0), _t(12), 17.385, 78.4867)
+    assert spans[0]["sign"] == "Aries" and spans[0]["start"] == _t(0)
+    assert spans[-1]["end"] == _t(12)
+    for prev, nxt in zip(spans, spans[1:]):
+        assert prev["end"] == nxt["start"]
+        assert nxt["sign_index"] == (prev["sign_index"] + 1) % 12
+    # Aries ends when the ascendant has moved 25°.
+    expected = _t(0) + timedelta(days=25.0 / RATE)
+    assert abs((spans[0]["end"] - expected).total_seconds()) <= lagna.TOLERANCE_SECONDS
+
+
+def test_spans_between_reuses_day_tables_and_merges_midnight(linear_ascendant):
+    utc = ZoneInfo("UTC")
+    spans = lagna.spans_between(_t(20), _t(20) + timedelta(hours=8), 17.385, 78.4867, utc)
+    calls = len(linear_ascendant)
+    for prev, nxt in zip(spans, spans[1:]):
+        assert prev["end"] == nxt["start"]
+        assert prev["sign_index"] != nxt["sign_index"]
+    assert spans[0]["start"] == _t(20) and spans[-1]["end"] == _t(20) + timedelta(hours=8)
+
+    lagna.spans_between(_t(6), _t(9), 17.385, 78.4867, utc)
+    assert len(linear_ascendant) == calls
+
+
+def test_panchaka_follows_lagna_spans(linear_ascendant):
+    utc = ZoneInfo("UTC")
+    slots = ext_panchaka_lagna.panchaka_slots(_t(6), _t(18), 4, 0, 17.385, 78.4867, utc, tithi_number=2)
+    spans = lagna.spans_between(_t(6), _t(18), 17.385, 78.4867, utc)
+    assert [s["start_ts"] for s in slots] == [s["start"].isoformat() for s in spans]
+    for slot, span in zip(slots, spans):
+        remainder = (2 + 1 + 4 + span["sign_index"] + 1) % 9
+        assert slot["name"] == ext_panchaka_lagna.PANCHAKA_BY_REMAINDER.get(remainder, "Rahita")
+
+    lagnas = ext_panchaka_lagna.udaya_lagna_slots(17.385, 78.4867, utc, _t(6))
+    assert len({slot["lagna"] for slot in lagnas}) == 12
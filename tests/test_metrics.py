@@ -0,0 +1,76 @@
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.app import app
+from api.middleware.logging import access_logger
+from api.services import metrics
+
+
+def test_histogram_exposition():
+    hist = metrics.Histogram("t_seconds", "Test.", ("route",), buckets=(0.1, 1.0))
+    hist.observe(0.05, route="/a")
+    hist.observe(0.5, route="/a")
+    hist.observe(5.0, route="/a")
+    lines = [f"{name} {labels} {value}" for name, labels, value in hist.samples()]
+    assert lines == [
+        "t_seconds_bucket {'route': '/a', 'le': '0.1'} 1",
+        "t_seconds_bucket {'route': '/a', 'le': '1'} 2",
+        "t_seconds_bucket {'route': '/a', 'le': '+Inf'} 3",
+        "t_seconds_sum {'route': '/a'} 5.55",
+        "t_seconds_count {'route': '/a'} 3",
+    ]
+
+
+def test_metrics_endpoint_reports_route_templates(monkeypatch):
+    metrics.reset()
+    client = TestClient(app)
+    client.get("/v1/reports/rpt_missing")
+    client.get("/v1/reports/rpt_other")
+    client.get("/no/such/path")
+
+    body = client.get("/__metrics")
+    assert body.status_code == 200
+    assert body.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = body.text
+    assert 'wh_http_request_duration_seconds_count{route="/v1/reports/{rid}",method="GET"} 2' in text
+    assert 'wh_http_requests_total{route="unmatched",method="GET",status="404"} 1' in text
+    assert "wh_http_requests_in_flight 1" in text  # the scrape itself
+    assert 'wh_pool_queue_depth{pool="render"}' in text
+    assert 'wh_cache_hit_ratio{cache="panchang"}' in text
+
+
+def test_scrapes_need_no_api_key_and_are_not_rate_limited(monkeypatch):
+    monkeypatch.setenv("AUTH_ENABLED", "true")
+    monkeypatch.setenv("API_KEYS", "gold")
+    monkeypatch.setenv("RATE_LIMIT_ENABLED", "true")
+    monkeypatch.setenv("RATE_LIMIT_PER_MINUTE", "1")
+    client = TestClient(app)
+
+    assert [client.get("/__metrics").status_code for _ in range(3)] == [200, 200, 200]
+    assert client.get("/v1/reports/rpt_missing").status_code == 401
+
+
+def _swe_calls():
+    return {labels["function"]: value for _name, labels, value in metrics.SWE_CALLS.samples()}
+
+
+def test_swe_calls_cover_rise_set_and_lagna_searches():
+    swe = pytest.importorskip("swisseph")
+    if not hasattr(swe, "CALC_RISE"):
+        pytest.skip("requires the real Swiss Ephemeris")
+    from api.services import lagna, riseset
+
+    metrics.SWE_CALLS.reset()
+    rises = riseset._chain_events(swe.SUN, swe.CALC_RISE, 28.6, 77.2, 0.0, 2461100.5, 2461103.5)
+    lagna.sidereal_ascendant(2461100.5, 28.6, 77.2)
+    calls = _swe_calls()
+    assert calls["rise_trans"] == len(rises) + 1 == 4
+    assert calls["houses_ex"] == 1
+
+
+def test_access_log_goes_through_queue_handler():
+    logger = access_logger()
+    assert not logger.propagate
+    assert [type(h) for h in logger.handlers] == [logging.handlers.QueueHandler]
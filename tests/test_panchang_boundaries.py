@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.services import panchang_algos
+
+# Linear Sun/Moon model: elongation 12.2°/day, Moon 13.2°/day, yoga 14.2°/day.
+_EPOCH_JD = 2460676.5  # 2025-01-01T00:00Z
+_SUN0, _SUN_SPEED = 280.0, 1.0
+_MOON0, _MOON_SPEED = 281.0, 13.2
+
+
+@pytest.fixture
+def linear_sky(monkeypatch):
+    calls = []
+
+    def fake(jd, _sidereal, _ayanamsha):
+        calls.append(jd)
+        days = jd - _EPOCH_JD
+        return (
+            (_SUN0 + _SUN_SPEED * days) % 360.0,
+            _SUN_SPEED,
+            (_MOON0 + _MOON_SPEED * days) % 360.0,
+            _MOON_SPEED,
+        )
+
+    monkeypatch.setattr(panchang_algos, "_sun_moon_at_jd", fake)
+    return calls
+
+
+def _at(days: float) -> datetime:
+    return datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(days=days)
+
+
+def test_tithi_boundaries_are_within_tolerance(linear_sky):
+    number, _name, start, end = panchang_algos.compute_tithi(_at(0.5))
+    # Elongation starts at 1° and grows 12.2°/day: tithi 1 spans [0°, 12°).
+    assert number == 1
+    assert abs((start - _at(-1.0 / 12.2)).total_seconds()) <= 1.0
+    assert abs((end - _at(11.0 / 12.2)).total_seconds()) <= 1.0
+
+
+def test_boundary_search_uses_few_samples(linear_sky):
+    panchang_algos.compute_nakshatra(_at(0.25))
+    # One shared sample at the reference plus one Newton step per boundary.
+    assert len(linear_sky) <= 6
+
+
+def test_enumerated_periods_are_contiguous(linear_sky):
+    periods = panchang_algos.enumerate_karana_periods(_at(0), _at(2), 0.0, 0.0, "lahiri")
+    assert periods[0]["start"] == _at(0)
+    assert periods[-1]["end"] == _at(2)
+    for prev, nxt in zip(periods, periods[1:]):
+        assert prev["end"] == nxt["start"]
+    assert [p["name"] for p in periods[:2]] == ["Kimstughna", "Bava"]
+    # 2 days * 12.2°/day over 6° half-tithis, plus the clipped first period.
+    assert len(periods) == 5
+
+
+def test_nakshatra_pada_only_reported_for_clipped_start(linear_sky):
+    periods = panchang_algos.enumerate_nakshatra_periods(_at(0.5), _at(3), 0.0, 0.0, "lahiri")
+    # Moon at 287.6° sits 7.6° into Shravana.
+    assert periods[0]["name"] == "Shravana"
+    assert periods[0]["pada"] == 3
+    assert all(p["pada"] == 1 for p in periods[1:])
+
+
+def test_element_change_stream_is_ordered_and_cheap(linear_sky):
+    changes = panchang_algos.enumerate_element_changes(_at(0), _at(30))
+    times = [c["at"] for c in changes]
+    assert times == sorted(times)
+    counts = {e: sum(1 for c in changes if c["element"] == e) for e in ("tithi", "nakshatra", "yoga", "karana")}
+    # 30 days at 12.2°/day elongation, 13.2°/day Moon, 14.2°/day Sun+Moon.
+    assert counts == {"tithi": 30, "nakshatra": 29, "yoga": 32, "karana": 61}
+    for change in changes:
+        if change["element"] == "tithi":
+            assert change["number"] == change["previous_number"] % 30 + 1
+    # Roughly one Newton step per boundary instead of a fixed-step scan.
+    assert len(set(linear_sky)) < 6 * len(changes)
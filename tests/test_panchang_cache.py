@@ -0,0 +1,85 @@
+import json
+import os
+import time
+
+from api.services import panchang_cache
+from api.services.panchang_cache import DiskStore, MemoryLRU, PanchangCache, RedisStore
+
+
+class FakeRedis:
+    """Local stand-in for the subset of redis-py used by RedisStore."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        entry = self.data.get(key)
+        if entry is None or (entry[1] and entry[1] <= time.time()):
+            return None
+        return entry[0]
+
+    def set(self, key, value, ex=None):
+        self.data[key] = (value, time.time() + ex if ex else None)
+
+
+def test_memory_lru_is_bounded_and_expires(monkeypatch):
+    lru = MemoryLRU(max_entries=2, ttl_seconds=60)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+    assert lru.get("b") is None
+    assert lru.get("a") == 1 and lru.get("c") == 3
+
+    now = time.time()
+    monkeypatch.setattr(panchang_cache.time, "time", lambda: now + 61)
+    assert lru.get("a") is None
+    assert len(lru) == 1
+
+
+def test_disk_tier_is_shared_between_cache_instances(tmp_path):
+    writer = PanchangCache(MemoryLRU(4, 60), DiskStore(tmp_path))
+    reader = PanchangCache(MemoryLRU(4, 60), DiskStore(tmp_path))
+    writer.set("k", {"v": 1}, lambda v: json.dumps(v).encode())
+    assert reader.get("k", json.loads) == {"v": 1}
+    assert reader.get("missing", bytes) is None
+
+
+def test_disk_entries_expire_and_prune(tmp_path, monkeypatch):
+    store = DiskStore(tmp_path)
+    store.set("old", b"x", ttl=10)
+    store.set("forever", b"y")
+    now = time.time()
+    monkeypatch.setattr(panchang_cache.time, "time", lambda: now + 11)
+    assert store.get("old") is None
+    assert store.get("forever") == b"y"
+    assert store.prune() == 1
+
+
+def test_redis_tier_with_local_stand_in():
+    client = FakeRedis()
+    cache = PanchangCache(MemoryLRU(4, 60), RedisStore(client))
+    cache.set("k", "value", lambda v: v.encode(), ttl=30)
+    assert "panchang-cache:k" in client.data
+    fresh = PanchangCache(MemoryLRU(4, 60), RedisStore(client))
+    assert fresh.get("k", lambda raw: raw.decode()) == "value"
+
+
+def test_disk_tier_evicts_oldest_entries_past_its_cap(tmp_path):
+    store = DiskStore(tmp_path, max_bytes=1000)
+    for idx in range(8):
+        store.set(f"k{idx}", b"x" * 200, ttl=60)
+        path = store._path(f"k{idx}")
+        os.utime(path, (idx, idx))
+    assert sum(size for _, size, _ in store._entries()) <= 1000
+    assert store.get("k0") is None
+    assert store.get("k7") == b"x" * 200
+
+
+def test_table_entries_get_a_ttl(tmp_path, monkeypatch):
+    monkeypatch.setenv("PANCHANG_TABLE_CACHE_TTL", "10")
+    cache = PanchangCache(MemoryLRU(4, 60), DiskStore(tmp_path))
+    cache.set_bytes("table", b"t")
+    now = time.time()
+    monkeypatch.setattr(panchang_cache.time, "time", lambda: now + 11)
+    assert cache.get_bytes("table") is None
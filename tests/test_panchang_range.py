@@ -0,0 +1,76 @@
+import os
+
+os.environ.setdefault("EPHEMERIS_BACKEND", "moseph")
+
+from datetime import date, datetime
+
+import pytest
+
+swe = pytest.importorskip("swisseph")
+if not hasattr(swe, "CALC_RISE"):
+    pytest.skip("Swiss Ephemeris not available", allow_module_level=True)
+
+from api.services.orchestrators.panchang_full import build_viewmodel
+from api.services.orchestrators.panchang_range import build_daily_summaries
+
+
+PLACE = {"lat": 17.385, "lon": 78.4867, "tz": "Asia/Kolkata", "query": "Hyderabad"}
+OPTIONS = {
+    "ayanamsha": "lahiri",
+    "include_muhurta": False,
+    "include_hora": False,
+    "lang": "en",
+    "script": "latin",
+    "summary_only": True,
+    "include_extensions": False,
+}
+
+
+def _seconds_apart(a: str, b: str) -> float:
+    return abs((datetime.fromisoformat(a) - datetime.fromisoformat(b)).total_seconds())
+
+
+def test_range_summaries_match_per_day_viewmodels():
+    eff_place, days = build_daily_summaries(date(2025, 9, 17), 5, PLACE, OPTIONS)
+    assert eff_place["query"] == "Hyderabad"
+    assert [d.date_local for d in days] == [
+        "2025-09-17",
+        "2025-09-18",
+        "2025-09-19",
+        "2025-09-20",
+        "2025-09-21",
+    ]
+
+    for summary in days:
+        vm = build_viewmodel("vedic", summary.date_local, PLACE, OPTIONS)
+        assert summary.solar == vm.solar
+        assert summary.lunar == vm.lunar
+        for field in ("tithi", "nakshatra", "yoga", "karana"):
+            ours, theirs = getattr(summary, field), getattr(vm, field)
+            assert ours.number == theirs.number
+            assert ours.display_name == theirs.display_name
+            assert _seconds_apart(ours.start_ts, theirs.start_ts) <= 2
+            assert _seconds_apart(ours.end_ts, theirs.end_ts) <= 2
+        assert summary.nakshatra.pada == vm.nakshatra.pada
+
+        for field in ("tithi_periods", "nakshatra_periods", "yoga_periods", "karana_periods"):
+            ours = getattr(summary.changes, field)
+            theirs = getattr(vm.changes, field)
+            assert [p.name for p in ours] == [p.name for p in theirs]
+            assert [p.pada for p in ours] == [p.pada for p in theirs]
+
+
+@pytest.mark.parametrize("chunk_days", [1, 3])
+def test_chunking_does_not_change_output(chunk_days):
+    from api.services.orchestrators.panchang_range import iter_daily_summaries
+
+    whole = list(iter_daily_summaries(date(2024, 1, 1), 6, PLACE, OPTIONS))
+    chunked = list(iter_daily_summaries(date(2024, 1, 1), 6, PLACE, OPTIONS, chunk_days=chunk_days))
+    assert [d.date_local for d in whole] == [d.date_local for d in chunked]
+    for a, b in zip(whole, chunked):
+        assert a.solar == b.solar
+        assert a.tithi.number == b.tithi.number
+        assert _seconds_apart(a.tithi.end_ts, b.tithi.end_ts) <= 2
+        assert [p.name for p in a.changes.karana_periods] == [
+            p.name for p in b.changes.karana_periods
+        ]
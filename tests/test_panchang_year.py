@@ -0,0 +1,77 @@
+import asyncio
+import csv
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import pytest
+
+from api.services import cpu_executor
+from api.services.orchestrators import panchang_year
+
+
+def _fake_payload(start_date, num_days, place, options):
+    records = []
+    for offset in range(num_days):
+        day = start_date + timedelta(days=offset)
+        records.append(
+            json.dumps(
+                {
+                    "date_local": day.isoformat(),
+                    "weekday": {"display_name": day.strftime("%A")},
+                    "solar": {"sunrise": f"{day}T06:00:00+05:30", "sunset": f"{day}T18:00:00+05:30"},
+                    "lunar": {"moonrise": None, "moonset": None, "paksha": "shukla"},
+                    "tithi": {"number": 1, "display_name": "Pratipada, 1", "end_ts": "x"},
+                    "nakshatra": {"number": 2, "display_name": "Bharani", "pada": 3},
+                    "yoga": {"number": 3, "display_name": "Ayushman"},
+                    "karana": {"number": 4, "display_name": "Kaulava"},
+                    "paksha": "shukla",
+                }
+            ).encode()
+        )
+    return {"query": "Test"}, tuple(records)
+
+
+@pytest.fixture
+def thread_executor(monkeypatch):
+    executor = cpu_executor.CpuExecutor(max_workers=2)
+    pool = ThreadPoolExecutor(2)
+    monkeypatch.setattr(executor, "_get_pool", lambda: pool)
+    monkeypatch.setattr(panchang_year, "get_executor", lambda: executor)
+    monkeypatch.setattr(panchang_year, "compute_range_payload", _fake_payload)
+    yield executor
+    pool.shutdown()
+
+
+async def _collect(agen):
+    return [chunk async for chunk in agen]
+
+
+def test_ndjson_stream_is_in_date_order_with_bounded_chunks(thread_executor):
+    chunks = asyncio.run(
+        _collect(panchang_year.stream_days(date(2024, 1, 1), 366, None, {"summary_only": True}))
+    )
+    # One write per 31-day chunk; never more than max_workers submitted ahead.
+    assert len(chunks) == 12
+    lines = b"".join(chunks).splitlines()
+    dates = [json.loads(line)["date_local"] for line in lines]
+    assert dates[0] == "2024-01-01" and dates[-1] == "2024-12-31"
+    assert dates == sorted(dates) and len(set(dates)) == 366
+    assert thread_executor.stats()["submitted"] == 12
+
+
+def test_csv_stream_has_header_and_flat_rows(thread_executor):
+    body = b"".join(
+        asyncio.run(
+            _collect(panchang_year.stream_days(date(2025, 1, 1), 40, None, {"summary_only": True}, fmt="csv"))
+        )
+    ).decode()
+    rows = list(csv.reader(io.StringIO(body)))
+    assert rows[0] == panchang_year.CSV_COLUMNS
+    assert len(rows) == 41
+    first = dict(zip(rows[0], rows[1]))
+    assert first["date"] == "2025-01-01"
+    assert first["tithi"] == "Pratipada, 1"
+    assert first["nakshatra_pada"] == "3"
+    assert first["moonrise"] == ""
@@ -0,0 +1,38 @@
+import pytest
+
+swe = pytest.importorskip("swisseph")
+if not hasattr(swe, "CALC_RISE"):
+    pytest.skip("Swiss Ephemeris not available", allow_module_level=True)
+
+from fastapi.testclient import TestClient
+
+from api.app import app
+from api.services import profiling
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setenv("ADMIN_API_KEYS", "admin-key")
+    monkeypatch.setattr(profiling, "PROFILES_DIR", tmp_path)
+    return TestClient(app)
+
+
+def test_admin_profile_is_linked_and_summarised(client, tmp_path):
+    r = client.get(
+        "/v1/panchang/month",
+        params={"year": 2024, "month": 2, "lat": 12.97, "lon": 77.59, "tz": "Asia/Kolkata"},
+        headers={"Authorization": "Bearer admin-key", "X-Profile": "1"},
+    )
+    assert r.status_code == 200
+    profile = r.json()["meta"]["profile"]
+    assert r.headers["Link"] == f'<{profile["url"]}>; rel="profile"'
+    assert profile["samples"] > 0 and profile["top"]
+    folded = (tmp_path / f'{profile["id"]}.folded').read_text()
+    # The month's days were computed inline, where the sampler could see them.
+    assert "panchang" in folded
+
+
+def test_profile_header_is_ignored_without_admin_key(client):
+    r = client.get("/__health", headers={"Authorization": "Bearer someone", "X-Profile": "1"})
+    assert "Link" not in r.headers and "profile" not in r.json()
+    assert not profiling.active()
@@ -0,0 +1,118 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api.app import app
+from api.middleware import ratelimit
+from api.middleware.ratelimit import MemoryBuckets, RedisBuckets, route_cost
+
+
+class FakeRedis:
+    """Runs the token-bucket script's logic in Python against a dict."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.ttl = {}
+        self.now = 0.0
+
+    def register_script(self, source):
+        assert "HMGET" in source and "EXPIRE" in source and "'TIME'" in source
+
+        def script(keys, args):
+            cost, capacity, rate = (float(a) for a in args)
+            now = self.now
+            bucket = self.hashes.get(keys[0], {})
+            tokens = float(bucket.get("tokens", capacity))
+            updated = float(bucket.get("updated", now))
+            tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+            allowed = 0
+            if tokens >= cost:
+                tokens -= cost
+                allowed = 1
+            self.hashes[keys[0]] = {"tokens": str(tokens), "updated": str(now)}
+            self.ttl[keys[0]] = int(capacity / rate) + 1
+            return [allowed, str(tokens).encode()]
+
+        return script
+
+
+def test_buckets_refill_and_stay_bounded():
+    fake = FakeRedis()
+    for buckets in (MemoryBuckets(max_keys=2), RedisBuckets(fake)):
+
+        def acquire(cost, now):
+            fake.now = now  # Redis buckets read the server clock instead
+            return buckets.acquire("a", cost, 60, 1.0, now=now)
+
+        # 60/min: capacity 60, one token a second.
+        assert acquire(50, now=0.0) == (True, 0.0)
+        allowed, retry_after = acquire(20, now=1.0)
+        assert not allowed and retry_after == 9.0
+        assert acquire(20, now=10.0) == (True, 0.0)
+
+    lru = MemoryBuckets(max_keys=2)
+    for key in ("a", "b", "c"):
+        lru.acquire(key, 1, 10, 1.0, now=0.0)
+    assert len(lru) == 2 and "a" not in lru._buckets
+
+
+def test_route_costs(monkeypatch):
+    assert route_cost("POST", "/v1/reports") == 5.0
+    assert route_cost("GET", "/v1/reports/rpt_1") == 1.0
+    assert route_cost("POST", "/v1/charts/compute") == 1.0
+    monkeypatch.setenv("RATE_LIMIT_ROUTE_COSTS", "/v1/charts=2,POST /v1/charts/compute=4")
+    assert route_cost("POST", "/v1/charts/compute") == 4.0
+    assert route_cost("GET", "/v1/charts/other") == 2.0
+
+
+def test_limits_per_api_key_with_retry_after(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_ENABLED", "true")
+    monkeypatch.setenv("RATE_LIMIT_PER_MINUTE", "1")
+    monkeypatch.setenv("RATE_LIMIT_KEY_LIMITS", "gold=3,forged=100")
+    monkeypatch.setenv("AUTH_ENABLED", "true")
+    monkeypatch.setenv("API_KEYS", "gold")
+    ratelimit._counters.clear()
+    client = TestClient(app)
+
+    codes = [client.get("/", headers={"Authorization": "Bearer gold"}).status_code for _ in range(4)]
+    assert codes == [200, 200, 200, 429]
+    # Rejected keys are refused by authentication before they reach a bucket.
+    assert client.get("/", headers={"Authorization": "Bearer forged"}).status_code == 403
+
+    # Without a validated key the client address is the key, whatever token is sent.
+    monkeypatch.setenv("AUTH_ENABLED", "false")
+    assert client.get("/", headers={"Authorization": "Bearer forged"}).status_code == 200
+    blocked = client.get("/", headers={"Authorization": "Bearer other"})
+    assert blocked.status_code == 429 and blocked.headers["Retry-After"] == "60"
+
+
+def test_redis_script_matches_the_memory_buckets():
+    lupa = pytest.importorskip("lupa")
+    lua = lupa.LuaRuntime()
+    state = {"hashes": {}, "now": 0.0}
+
+    def call(command, *args):
+        if command == "TIME":
+            seconds = int(state["now"])
+            micros = int(round((state["now"] - seconds) * 1000000))
+            return lua.table(str(seconds), str(micros))
+        key, *args = args
+        bucket = state["hashes"].setdefault(key, {})
+        if command == "HMGET":
+            return lua.table(*(bucket.get(field) for field in args))
+        if command == "HSET":
+            bucket.update(zip(args[::2], args[1::2]))
+        return 1
+
+    run = lua.eval(
+        "function(source, call, keys, argv)"
+        " redis = {call = call}; KEYS = keys; ARGV = argv; return load(source)() end"
+    )
+    model = MemoryBuckets()
+    steps = [(50, 0.0), (20, 1.0), (20, 10.0), (60, 10.5), (5, 200.25), (61, 200.25)]
+    for cost, now in steps:
+        state["now"] = now
+        argv = lua.table(cost, 60, 1.0)
+        allowed, tokens = run(ratelimit._TOKEN_BUCKET_LUA, call, lua.table("k"), argv).values()
+        expected, _ = model.acquire("k", cost, 60, 1.0, now=now)
+        assert bool(allowed) == expected
+        assert float(tokens) == pytest.approx(model._buckets["k"][0])
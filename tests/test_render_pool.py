@@ -0,0 +1,119 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from api.app import app
+from api.jobs import queue as jobs_queue
+from api.jobs import render_pool, render_report
+from api.services.job_store import JobStore
+
+
+def _wait(store, rids, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if all(store.get(rid)["status"] in ("done", "error") for rid in rids):
+            return
+        time.sleep(0.01)
+    raise AssertionError("render pool did not finish")
+
+
+def _gated_renderer(monkeypatch, gate):
+    order = []
+
+    def fake_render_job(rid, payload):
+        gate.wait(5)
+        order.append(payload["product"])
+        return {"file_path": f"/tmp/{rid}.pdf", "render_ms": 1.0, "worker_pid": 0}
+
+    monkeypatch.setattr(render_report, "render_job", fake_render_job)
+    return order
+
+
+def test_priority_lanes_and_job_timings(monkeypatch):
+    gate = threading.Event()
+    order = _gated_renderer(monkeypatch, gate)
+    store = JobStore()
+    pool = render_pool.RenderPool(workers=1, max_queue=8, mode="thread", store=store)
+    pool.start()
+
+    products = ["monthly_horoscope_pdf", "yearly_forecast_pdf", "compatibility_pdf", "western_natal_pdf"]
+    rids = []
+    for idx, product in enumerate(products):
+        rid = store.create(payload={"product": product}, idempotency_key=str(idx))
+        assert pool.submit(rid, product)
+        rids.append(rid)
+        time.sleep(0.02)  # the first job is picked up before the rest arrive
+    assert not pool.submit(rids[-1], products[-1])
+    gate.set()
+    _wait(store, rids)
+
+    assert order == ["monthly_horoscope_pdf", "western_natal_pdf", "compatibility_pdf", "yearly_forecast_pdf"]
+    job = store.get(rids[1])
+    assert job["status"] == "done"
+    assert job["queue_ms"] > 0 and job["render_ms"] == 1.0 and job["run_ms"] >= 0
+    assert pool.stats()["completed"] == 4
+    pool.shutdown()
+
+
+def test_full_queue_returns_503_with_retry_after(monkeypatch):
+    gate = threading.Event()
+    _gated_renderer(monkeypatch, gate)
+    store = JobStore()
+    pool = render_pool.RenderPool(workers=1, max_queue=1, mode="thread", store=store)
+    pool.start()
+    for idx in range(2):
+        rid = store.create(payload={"product": "yearly_forecast_pdf"}, idempotency_key=str(idx))
+        pool.submit(rid, "yearly_forecast_pdf")
+        time.sleep(0.02)
+
+    monkeypatch.setattr(jobs_queue, "get_pool", lambda: pool)
+    with TestClient(app) as client:
+        r = client.post(
+            "/v1/reports",
+            json={
+                "product": "western_natal_pdf",
+                "chart_input": {
+                    "system": "western",
+                    "date": "1990-08-18",
+                    "time": "14:32:00",
+                    "time_known": True,
+                    "place": {"lat": 17.385, "lon": 78.4867, "tz": "Asia/Kolkata"},
+                },
+            },
+        )
+    gate.set()
+    assert r.status_code == 503
+    # One queued and one rendering job at the 2s default estimate, one worker.
+    assert r.headers["Retry-After"] == "4"
+    pool.shutdown()
+
+
+def test_concurrent_submissions_never_overshoot_the_queue_bound():
+    store = JobStore()
+    pool = render_pool.RenderPool(workers=1, max_queue=5, mode="thread", store=store)
+    payload = {"product": "western_natal_pdf"}
+    rids = [store.create(payload=dict(payload), idempotency_key=str(idx)) for idx in range(40)]
+    accepted, refused = [], []
+    barrier = threading.Barrier(8)
+
+    def _worker(chunk):
+        barrier.wait()
+        for rid in chunk:
+            try:
+                pool.submit(rid, "western_natal_pdf")
+                accepted.append(rid)
+            except render_pool.QueueFull:
+                refused.append(rid)
+
+    threads = [threading.Thread(target=_worker, args=(rids[i::8],)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(accepted) == 5 and len(refused) == 35
+    assert pool.queue.depth() == 5
+    # A refused job stays queued but unsent, so resubmitting it retries.
+    job = store.get(refused[0])
+    assert job["status"] == "queued" and not job.get("enqueued_at")
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+swe = pytest.importorskip("swisseph")
+if not hasattr(swe, "houses"):
+    pytest.skip("Swiss Ephemeris not available", allow_module_level=True)
+
+os.environ.setdefault("EPHEMERIS_BACKEND", "moseph")
+
+from fastapi.testclient import TestClient
+
+from api.app import app
+from api.services import response_cache
+
+CHART = {
+    "system": "western",
+    "date": "1990-08-18",
+    "time": "14:32:00",
+    "time_known": True,
+    "place": {"lat": 17.385, "lon": 78.4867, "tz": "Asia/Kolkata"},
+}
+
+
+def test_chart_is_served_from_cache_with_etag(monkeypatch):
+    response_cache.reset_response_cache()
+    client = TestClient(app)
+
+    monkeypatch.setenv("RESPONSE_CACHE_ENABLED", "false")
+    plain = client.post("/v1/charts/compute", json=CHART)
+    monkeypatch.setenv("RESPONSE_CACHE_ENABLED", "true")
+
+    first = client.post("/v1/charts/compute", json=CHART)
+    # Same request, different key order and float spelling.
+    reordered = dict(reversed(list(CHART.items())), place={"tz": "Asia/Kolkata", "lon": 78.48670, "lat": 17.385})
+    second = client.post("/v1/charts/compute", json=reordered)
+
+    assert first.headers["X-Cache"] == "MISS" and second.headers["X-Cache"] == "HIT"
+    assert first.content == second.content
+    assert first.json() == plain.json()
+    etag = first.headers["ETag"]
+    assert second.headers["ETag"] == etag
+
+    revalidated = client.post("/v1/charts/compute", json=CHART, headers={"If-None-Match": f"W/{etag}"})
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    other = client.post("/v1/charts/compute", json=dict(CHART, time="14:33:00"))
+    assert other.headers["ETag"] != etag and other.headers["X-Cache"] == "MISS"
+
+
+def test_byte_lru_evicts_oldest_within_budget():
+    lru = response_cache.ByteLRU(max_bytes=10, ttl_seconds=60)
+    lru.set("a", b"1234")
+    lru.set("b", b"5678")
+    assert lru.get("a") == b"1234"  # "a" is now the most recent
+    lru.set("c", b"90ab")
+    assert lru.get("b") is None and lru.get("a") == b"1234" and lru.size == 8
+    lru.set("huge", b"x" * 11)
+    assert lru.get("huge") is None and len(lru) == 2
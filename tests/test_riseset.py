@@ -0,0 +1,98 @@
+import math
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from api.services import panchang_algos, panchang_cache, riseset
+
+
+def _next_after(jd, phase, period):
+    k = math.floor((jd - phase) / period) + 1
+    return phase + k * period
+
+
+@pytest.fixture
+def fake_swe(monkeypatch, tmp_path):
+    calls = []
+
+    def rise_trans(jd, body, flags, _geopos, _press, _temp, _flag):
+        calls.append(jd)
+        rise = flags & fake.CALC_RISE
+        if body == fake.SUN:
+            # Sunrise 00:30 UTC, sunset 12:30 UTC every day.
+            return 0, (_next_after(jd, 0.0 if rise else 0.5, 1.0),)
+        # Moon slips ~50 minutes a day.
+        return 0, (_next_after(jd, 0.2 if rise else 0.7, 1.035),)
+
+    fake = SimpleNamespace(
+        SUN=0,
+        MOON=1,
+        CALC_RISE=1,
+        CALC_SET=2,
+        BIT_DISC_CENTER=256,
+        Error=RuntimeError,
+        rise_trans=rise_trans,
+    )
+    monkeypatch.setattr(riseset, "swe", fake)
+    monkeypatch.setattr(panchang_algos, "swe", fake)
+    panchang_cache.reset_cache(
+        panchang_cache.PanchangCache(panchang_cache.MemoryLRU(16, 60), panchang_cache.DiskStore(tmp_path))
+    )
+    riseset.clear_memory()
+    yield calls
+    riseset.wait_for_builds()
+    riseset.clear_memory()
+    panchang_cache.reset_cache()
+
+
+def test_table_lookups_match_per_day_searches(fake_swe):
+    tz = ZoneInfo("Asia/Kolkata")
+    for day in (1, 15, 31):
+        start = datetime(2025, 12, day, tzinfo=tz)
+        direct_solar = panchang_algos.compute_solar_events(start, 17.385, 78.4867)
+        direct_moon = panchang_algos.compute_moon_events(start, 17.385, 78.4867)
+        table_solar = riseset.solar_events(start, 17.385, 78.4867)
+        table_moon = riseset.moon_events(start, 17.385, 78.4867)
+        for ours, theirs in zip(table_solar + table_moon, direct_solar + direct_moon):
+            assert abs((ours - theirs).total_seconds()) < 1e-3
+            assert ours.tzinfo == tz
+
+
+def test_cold_lookup_searches_directly_and_builds_in_background(fake_swe):
+    start = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    riseset.solar_events(start, 17.385, 78.4867)
+    # Three direct searches; the year is built off the request path.
+    assert len(fake_swe) >= 3
+    riseset.wait_for_builds()
+    first_pass = len(fake_swe)
+    # ~370 padded days of sun events plus ~360 moon events per kind.
+    assert first_pass < 1600
+
+    riseset.solar_events_range([datetime(2025, 3, d, tzinfo=timezone.utc) for d in range(2, 29)], 17.3851, 78.4866)
+    assert len(fake_swe) == first_pass
+
+    riseset.clear_memory()
+    riseset.moon_events(start, 17.385, 78.4867)
+    assert len(fake_swe) == first_pass
+
+
+def test_table_year_follows_the_local_date(fake_swe, monkeypatch):
+    monkeypatch.setenv("PANCHANG_RISESET_BUILD", "inline")
+    # Local midnight on Jan 1 in India is still Dec 31 in UTC.
+    riseset.solar_events(datetime(2026, 1, 1, tzinfo=ZoneInfo("Asia/Kolkata")), 17.385, 78.4867)
+    assert [key[-1] for key in riseset._TABLES] == [2026]
+
+
+def test_off_mode_never_builds(fake_swe, monkeypatch):
+    monkeypatch.setenv("PANCHANG_RISESET_BUILD", "off")
+    riseset.solar_events(datetime(2025, 3, 1, tzinfo=timezone.utc), 17.385, 78.4867)
+    riseset.wait_for_builds()
+    assert len(fake_swe) == 3
+    assert not riseset._TABLES
+
+
+def test_missing_events_return_none(fake_swe):
+    table = riseset.RiseSetTable(70.0, 20.0, 0, 2025, {"sunrise": [], "sunset": [], "moonrise": [], "moonset": []})
+    assert table.next_event("sunrise", datetime(2025, 6, 21, tzinfo=timezone.utc)) is None
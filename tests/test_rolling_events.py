@@ -0,0 +1,102 @@
+from api.services import forecast_builders, rolling_events
+
+
+def _chart_input():
+    return {
+        "system": "western",
+        "date": "1990-08-18",
+        "time": "14:32:00",
+        "time_known": True,
+        "place": {"lat": 17.385, "lon": 78.4867, "tz": "Asia/Kolkata"},
+    }
+
+
+def _fake_compute(calls):
+    def _compute(_chart_input, opts):
+        calls.append((opts["from_date"], opts["to_date"]))
+        return [
+            {
+                "date": opts["from_date"],
+                "transit_body": "Moon",
+                "natal_body": "Sun",
+                "aspect": "trine",
+                "score": -1.5,
+                "note": "Gently period for self-expression. Trust the momentum.",
+            },
+            {
+                "date": opts["from_date"],
+                "transit_body": "Saturn",
+                "natal_body": "Venus",
+                "aspect": "square",
+                "score": 6.0,
+                "note": "Notably disciplined challenges around relationships. Take decisive steps.",
+            },
+        ]
+
+    return _compute
+
+
+def test_store_only_computes_newly_entered_day():
+    store = rolling_events.RollingEventStore(horizon_days=10)
+    calls = []
+    compute = _fake_compute(calls)
+    opts = {"from_date": "2025-03-09", "to_date": "2025-03-11", "step_days": 1}
+
+    first = store.events_between(_chart_input(), opts, compute)
+    assert len(first) == 6
+    assert calls == [(d, d) for d in ("2025-03-09", "2025-03-10", "2025-03-11")]
+
+    calls.clear()
+    second = store.events_between(
+        _chart_input(), {**opts, "from_date": "2025-03-10", "to_date": "2025-03-12"}, compute
+    )
+    assert calls == [("2025-03-12", "2025-03-12")]
+    assert [e["date"] for e in second][::2] == ["2025-03-10", "2025-03-11", "2025-03-12"]
+
+
+def test_store_expires_days_behind_horizon():
+    store = rolling_events.RollingEventStore(horizon_days=2)
+    calls = []
+    compute = _fake_compute(calls)
+    opts = {"from_date": "2025-03-01", "to_date": "2025-03-01", "step_days": 1}
+
+    store.events_between(_chart_input(), opts, compute)
+    store.events_between(
+        _chart_input(), {**opts, "from_date": "2025-03-05", "to_date": "2025-03-05"}, compute
+    )
+    calls.clear()
+    store.events_between(_chart_input(), opts, compute)
+    assert calls == [("2025-03-01", "2025-03-01")]
+
+
+def test_store_keys_on_detection_options():
+    store = rolling_events.RollingEventStore()
+    calls = []
+    compute = _fake_compute(calls)
+    opts = {"from_date": "2025-03-01", "to_date": "2025-03-01", "step_days": 1}
+
+    store.events_between(_chart_input(), opts, compute)
+    store.events_between(_chart_input(), {**opts, "transit_bodies": ["Moon"]}, compute)
+    assert len(calls) == 2
+
+
+def test_daily_payload_uses_rolling_store(monkeypatch):
+    calls = []
+    monkeypatch.setattr(forecast_builders, "_compute_transits", _fake_compute(calls))
+    monkeypatch.setattr(rolling_events, "STORE", rolling_events.RollingEventStore())
+
+    forecast_builders.daily_payload(_chart_input(), {"date": "2025-03-10", "window_days": 1})
+    assert len(calls) == 3
+    calls.clear()
+    payload = forecast_builders.daily_payload(
+        _chart_input(), {"date": "2025-03-11", "window_days": 1}
+    )
+    assert calls == [("2025-03-12", "2025-03-12")]
+    assert payload["top_events"][0]["transit_body"] == "Saturn"
+    assert {e["date"] for e in payload["events"]} == {"2025-03-11"}
+
+
+def test_hourly_windows_bypass_store():
+    assert rolling_events.supports({"step_days": 1})
+    assert not rolling_events.supports({"step_days": 1, "step_hours": 6})
+    assert not rolling_events.supports({"step_days": 2})
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from api.services.single_flight import SingleFlight
+
+
+def test_concurrent_sync_callers_share_one_execution():
+    flight = SingleFlight("test")
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return {"rows": [1, 2, 3]}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", compute))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    while flight.stats()["coalesced"] < 7:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"rows": [1, 2, 3]}] * 8
+    # Every caller gets its own copy: mutating one result does not touch the others.
+    results[0]["rows"].append(4)
+    assert sum(r["rows"] == [1, 2, 3] for r in results) == 7
+    assert len({id(r) for r in results}) == 8
+    assert flight.stats() == {"executed": 1, "coalesced": 7, "failed": 0, "in_flight": 0}
+
+    # Nothing in flight: the next call computes again.
+    flight.do("k", compute)
+    assert len(calls) == 2
+
+
+def test_async_callers_coalesce_and_share_errors():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def compute(fail):
+        calls.append(fail)
+        await asyncio.sleep(0.05)
+        if fail:
+            raise ValueError("boom")
+        return "ok"
+
+    async def run():
+        ok = await asyncio.gather(*(flight.do_async("a", lambda: compute(False)) for _ in range(5)))
+        failed = await asyncio.gather(
+            *(flight.do_async("b", lambda: compute(True)) for _ in range(3)), return_exceptions=True
+        )
+        return ok, failed
+
+    ok, failed = asyncio.run(run())
+    assert ok == ["ok"] * 5
+    assert all(isinstance(exc, ValueError) for exc in failed)
+    assert calls == [False, True]
+    assert flight.stats()["failed"] == 1
+
+
+def test_cancelled_async_leader_hands_over_to_a_follower():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do_async("k", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do_async("k", compute))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(run()) == 2
@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+
+import pytest
+
+swe = pytest.importorskip("swisseph")
+if not hasattr(swe, "sol_eclipse_when_glob"):
+    pytest.skip("Swiss Ephemeris not available", allow_module_level=True)
+
+from api.services import advanced_transits, station_catalog
+
+
+def test_brent_finds_root_inside_bracket():
+    root = station_catalog.brent(lambda x: x * x - 2.0, 0.0, 2.0, -2.0, 2.0, xtol=1e-12)
+    assert root == pytest.approx(2.0 ** 0.5, abs=1e-10)
+
+
+def test_mercury_2026_first_retrograde_and_shadow():
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2026, 4, 1, tzinfo=timezone.utc)
+    stations = station_catalog.stations_between(start, end, ["Mercury"])
+    assert [s["station_type"] for s in stations] == ["retrograde", "direct"]
+    assert stations[0]["datetime_utc"].startswith("2026-02-26T06:4")
+    assert stations[1]["datetime_utc"].startswith("2026-03-20T19:3")
+
+    (period,) = station_catalog.retrograde_periods("Mercury", start, end)
+    order = [
+        period["pre_shadow_start"]["julian_day"],
+        period["start"]["julian_day"],
+        period["end"]["julian_day"],
+        period["post_shadow_end"]["julian_day"],
+    ]
+    assert order == sorted(order)
+    # The shadow opens where the planet will later station direct.
+    code = station_catalog.BODIES["Mercury"]
+    lon = swe.calc_ut(order[0], code, swe.FLG_SWIEPH)[0][0]
+    assert lon == pytest.approx(period["end"]["longitude"], abs=1e-4)
+
+
+def test_station_from_catalogue_reports_exact_time():
+    stations = station_catalog.stations_between(
+        datetime(2026, 2, 1, tzinfo=timezone.utc),
+        datetime(2026, 3, 1, tzinfo=timezone.utc),
+        ["Mercury"],
+    )
+    info = advanced_transits.station_from_catalogue(
+        "Mercury", -0.01, datetime(2026, 2, 26, 12, tzinfo=timezone.utc), stations
+    )
+    assert info is not None
+    assert info["station_type"] == "stationary_retrograde"
+    assert info["exact_time_utc"] == stations[0]["datetime_utc"]
+    assert 0 < info["hours_from_station"] < 6
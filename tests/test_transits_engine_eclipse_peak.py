@@ -13,6 +13,11 @@ from api.services import transits_engine
     ],
 )
 def test_eclipse_uses_peak_datetime(monkeypatch, peak_iso, forecast_date):
+    # Without a catalogue the engine falls back to per-sample detection.
+    def no_catalogue(*_args, **_kwargs):
+        raise RuntimeError("no ephemeris")
+
+    monkeypatch.setattr(transits_engine.eclipse_catalog, "eclipses_between", no_catalogue)
 
     def fake_natal_positions(_chart_input):
         return {
@@ -84,3 +89,82 @@ def test_eclipse_uses_peak_datetime(monkeypatch, peak_iso, forecast_date):
 
     assert eclipse_event["date"] == peak_date
     assert eclipse_event.get("exact_hit_time_utc") == peak_iso
+
+
+def test_catalogue_eclipse_is_joined_once_at_its_maximum(monkeypatch):
+    entry = {
+        "category": "lunar",
+        "type": "total",
+        "flags": 4,
+        "julian_day": 2461102.98,
+        "datetime_utc": "2026-03-03T11:33:42Z",
+        "magnitude": 1.15,
+    }
+    seen_windows = []
+
+    def fake_between(start, end):
+        seen_windows.append((start, end))
+        return [entry]
+
+    def fake_positions(_dt, _system, _ayan):
+        return {
+            "Sun": {"lon": 342.9, "speed_lon": 1.0, "lat": 0.0},
+            "Moon": {"lon": 162.9, "speed_lon": 13.0, "lat": 0.1},
+        }
+
+    monkeypatch.setattr(transits_engine, "_natal_positions", lambda _c: {"Sun": {"lon": 163.5, "speed_lon": 0.0}})
+    monkeypatch.setattr(transits_engine, "_transit_positions", fake_positions)
+    monkeypatch.setattr(transits_engine.advanced_transits, "detect_lunar_phase", lambda *a, **k: None)
+    monkeypatch.setattr(transits_engine.advanced_transits, "detect_void_of_course_moon", lambda *a, **k: None)
+    monkeypatch.setattr(transits_engine.advanced_transits, "detect_out_of_bounds_moon", lambda *a, **k: None)
+    monkeypatch.setattr(transits_engine.eclipse_catalog, "eclipses_between", fake_between)
+
+    def per_sample(*_args, **_kwargs):
+        raise AssertionError("per-sample eclipse detection should not run")
+
+    monkeypatch.setattr(transits_engine.advanced_transits, "detect_eclipse", per_sample)
+
+    chart_input = {
+        "system": "western",
+        "place": {"tz": "UTC"},
+        "date": "2000-01-01",
+        "time": "00:00:00",
+        "time_known": True,
+    }
+    opts = {"from_date": "2026-03-01", "to_date": "2026-03-05", "step_hours": 6, "transit_bodies": []}
+
+    events = transits_engine.compute_transits(chart_input, opts)
+    eclipse_events = [ev for ev in events if ev.get("event_type") == "eclipse"]
+
+    assert len(eclipse_events) == 1
+    event = eclipse_events[0]
+    assert event["date"] == "2026-03-03"
+    assert event["exact_hit_time_utc"] == "2026-03-03T11:33:42Z"
+    assert event["eclipse_type"] == "total"
+    assert event["transit_sign"] == "Virgo"
+    assert event["eclipse_info"]["personalization_boost"] == 0.4
+    # Half a step either side of the noon samples.
+    assert seen_windows == [
+        (
+            dt.datetime(2026, 3, 1, 9, tzinfo=dt.timezone.utc),
+            dt.datetime(2026, 3, 5, 15, tzinfo=dt.timezone.utc),
+        )
+    ]
+
+
+def test_unexpected_catalogue_errors_are_logged(monkeypatch, caplog):
+    def broken(*_args, **_kwargs):
+        raise KeyError("julian_day")
+
+    monkeypatch.setattr(transits_engine.eclipse_catalog, "eclipses_between", broken)
+    with caplog.at_level("ERROR", logger="api.services.transits_engine"):
+        assert transits_engine._catalogue_eclipses("2026-01-01", "2026-01-31", 1, 0) is None
+    assert [r.message for r in caplog.records] == ["eclipse_catalogue_failed"]
+
+    def unavailable(*_args, **_kwargs):
+        raise RuntimeError("Swiss Ephemeris is required for the eclipse catalogue")
+
+    caplog.clear()
+    monkeypatch.setattr(transits_engine.eclipse_catalog, "eclipses_between", unavailable)
+    assert transits_engine._catalogue_eclipses("2026-01-01", "2026-01-31", 1, 0) is None
+    assert not caplog.records
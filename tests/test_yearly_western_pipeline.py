@@ -371,3 +371,24 @@ def test_month_index_preserves_highest_scoring_events():
             "event_id": "ev-20",
         },
     ]
+
+
+def test_station_catalogue_logs_unexpected_errors(monkeypatch, caplog):
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+    def broken(*_args, **_kwargs):
+        raise KeyError("speed")
+
+    monkeypatch.setattr(yearly_western.station_catalog, "stations_between", broken)
+    with caplog.at_level("ERROR", logger="api.services.yearly_western"):
+        assert yearly_western._station_catalogue(start, end, ["Mercury"], None) is None
+    assert [r.message for r in caplog.records] == ["station_catalogue_failed"]
+
+    def unavailable(*_args, **_kwargs):
+        raise RuntimeError("Swiss Ephemeris is required for the station catalogue")
+
+    caplog.clear()
+    monkeypatch.setattr(yearly_western.station_catalog, "stations_between", unavailable)
+    assert yearly_western._station_catalogue(start, end, ["Mercury"], None) is None
+    assert not caplog.records